@@ -1,7 +1,34 @@
 """Factory Flask pour créer l'application."""
+import importlib
+import time
+
 from flask import Flask
 from app.config import config
 
+# Blueprints dans l'ordre d'enregistrement (module, attribut)
+BLUEPRINTS = (
+    # Routes principales (sans préfixe)
+    ('app.routes.main', 'main_bp'),
+    # Routes avec préfixes (correspondant aux URLs originales)
+    ('app.routes.storage', 'storage_bp'),          # /s3
+    ('app.routes.compute', 'compute_bp'),          # /ec2, /lambda
+    ('app.routes.database', 'database_bp'),        # /rds
+    ('app.routes.network', 'network_bp'),          # /vpc, /elb, /cloudfront, /route53
+    ('app.routes.security', 'security_bp'),        # /iam, /secrets-manager
+    ('app.routes.monitoring', 'monitoring_bp'),    # /cloudwatch
+    ('app.routes.devops', 'devops_bp'),            # /codepipeline, /codebuild, /codedeploy
+    ('app.routes.management', 'management_bp'),    # /ssm
+    ('app.routes.cost', 'cost_bp'),                # /cost-explorer, /trusted-advisor
+    ('app.routes.jobs', 'jobs_bp'),                # /jobs/<id>, /jobs/stats
+    ('app.routes.bulk', 'bulk_bp'),                # /bulk/<service>
+    ('app.routes.deployments', 'deployments_bp'),  # /deployments/<id>, /deployments/<id>/events
+    ('app.routes.history', 'history_bp'),          # /history, /history/stats
+    ('app.routes.api', 'api_bp'),                  # /api/v1/<service>, /api/v1/jobs/<id>, /api/v1/history
+    ('app.routes.assets', 'assets_bp'),            # /assets/<fichier empreinté>
+    ('app.routes.metrics', 'metrics_bp'),          # /metrics
+    ('app.routes.admin', 'admin_bp'),              # /rate-limit, /credentials, /page-cache, /startup
+)
+
 def create_app(config_name='default'):
     """
     Factory pour créer l'application Flask.
@@ -12,6 +39,7 @@ def create_app(config_name='default'):
     Returns:
         Application Flask configurée avec tous les blueprints
     """
+    app_started = time.perf_counter()
     app = Flask(__name__)
     
     # Charger la configuration
@@ -20,30 +48,52 @@ def create_app(config_name='default'):
     # Configuration supplémentaire
     app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50 MB max upload
     
-    # Enregistrer les blueprints
-    from app.routes.main import main_bp
-    from app.routes.storage import storage_bp
-    from app.routes.compute import compute_bp
-    from app.routes.database import database_bp
-    from app.routes.network import network_bp
-    from app.routes.security import security_bp
-    from app.routes.monitoring import monitoring_bp
-    from app.routes.devops import devops_bp
-    from app.routes.management import management_bp
-    from app.routes.cost import cost_bp
+    # Enregistrer les blueprints (import + enregistrement chronométrés)
+    timings = {}
+    for module_name, attr in BLUEPRINTS:
+        started = time.perf_counter()
+        blueprint = getattr(importlib.import_module(module_name), attr)
+        imported = time.perf_counter()
+        app.register_blueprint(blueprint)
+        timings[attr] = {
+            "import_ms": round((imported - started) * 1000, 2),
+            "register_ms": round((time.perf_counter() - imported) * 1000, 2),
+        }
     
-    # Routes principales (sans préfixe)
-    app.register_blueprint(main_bp)
+    # Schémas de formulaire déclarés par les blueprints, compilés une fois
+    from app.services.form_schema import compile_schemas
+    compile_schemas(app)
     
-    # Routes avec préfixes (correspondant aux URLs originales)
-    app.register_blueprint(storage_bp)      # /s3
-    app.register_blueprint(compute_bp)      # /ec2, /lambda
-    app.register_blueprint(database_bp)     # /rds
-    app.register_blueprint(network_bp)      # /vpc, /elb, /cloudfront, /route53
-    app.register_blueprint(security_bp)     # /iam, /secrets-manager
-    app.register_blueprint(monitoring_bp)   # /cloudwatch
-    app.register_blueprint(devops_bp)       # /codepipeline, /codebuild, /codedeploy
-    app.register_blueprint(management_bp)   # /ssm
-    app.register_blueprint(cost_bp)         # /cost-explorer, /trusted-advisor
+    # Variables Terraform des modules (infra/) : pré-validation des payloads, `flask infra drift`
+    from app.services.infra_schema import init_infra_schema
+    init_infra_schema(app)
+    
+    # Métriques Prometheus (latences, codes HTTP, dispatches, validation)
+    from app.services.metrics import init_metrics
+    init_metrics(app)
+    
+    # Traces échantillonnées (requête → validation → dispatch → GitHub → rendu)
+    from app.services.tracing import init_tracing
+    init_tracing(app)
+    
+    # Journaux JSON d'accès et d'audit (file + thread d'écriture par worker)
+    from app.services.request_log import init_request_log
+    init_request_log(app)
+    
+    # Fichiers statiques empreintés : asset_url() et `flask assets build`
+    from app.services.assets import init_assets
+    init_assets(app)
+    
+    # Cache de bytecode Jinja, `flask templates compile` et mesures de démarrage
+    from app.services.warmup import init_warmup
+    init_warmup(app, timings, app_started)
+    
+    # Sonde de disponibilité : vérifications en fond, résultat en cache
+    from app.services.health import init_health
+    init_health(app)
+    
+    # Dispatcher de fond de l'outbox, démarré une fois par worker (après le fork)
+    from app.services.outbox import get_outbox
+    app.before_request(lambda: get_outbox().ensure_started())
     
     return app
\ No newline at end of file
@@ -0,0 +1,286 @@
+"""
+Adaptateur ASGI de l'application Flask (point d'entrée : asgi.py).
+
+Chaque requête traverse le pipeline Flask habituel (hooks before/after
+request, vue, teardown) dans un pool de threads borné (ASGI_THREADS). Les
+routes de déclenchement rendent leurs étapes (DeferredSteps) au lieu d'une
+réponse : l'adaptateur exécute les étapes dans le pool (validation,
+idempotence, outbox, SQLite) mais attend sur la boucle d'événements les
+pauses (créneau de quota, requête identique en cours) et l'appel GitHub,
+ce dernier avec un client aiohttp à connexions réutilisées (son pool
+reste en temps constant avec des centaines de connexions, contrairement à
+celui de httpx, limité à ~40 appels/s sur 200 connexions).
+Un worker peut ainsi garder des centaines de déclenchements en vol avec
+une poignée de threads, quand un worker gthread en est limité à un par
+thread. Un adaptateur WSGI→ASGI générique (asgiref.wsgi.WsgiToAsgi) ne
+le permet pas : il exécute toute la requête, appel GitHub compris, dans
+un seul thread. Le pipeline est donc découpé avec les méthodes publiques
+de Flask (preprocess_request, dispatch_request, finalize_request).
+
+Toutes les étapes d'une requête s'exécutent dans le même contexte
+contextvars (copié à la réception) : requête Flask, span courant et
+horodatages restent valides d'un thread à l'autre.
+
+Les flux (SSE, NDJSON du provisioning en masse) sont relayés morceau par
+morceau ; chaque morceau est lu dans le pool.
+"""
+import asyncio
+import contextvars
+import io
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from flask import request_started
+
+from app.services.github_service import GITHUB_HEADERS, DeferredSteps, Pause
+from app.services.history import drain_history
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp n'est requis que pour le mode ASGI
+    aiohttp = None
+
+
+class GitHubResponse:
+    """Réponse lue en entier, avec l'interface de requests.Response utilisée par les étapes."""
+
+    __slots__ = ('status_code', 'headers', 'content')
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', 'replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class PortalASGI:
+    """
+    Application ASGI (HTTP + lifespan) servant une application Flask.
+
+    Le pool de threads et le client HTTP sont créés paresseusement dans
+    chaque worker (rien ne survit à un fork depuis un maître préchargé).
+    """
+
+    def __init__(self, flask_app):
+        if aiohttp is None:
+            raise RuntimeError("Le mode ASGI nécessite aiohttp (pip install aiohttp uvicorn)")
+        self.flask_app = flask_app
+        self.threads = flask_app.config['ASGI_THREADS']
+        self.max_connections = flask_app.config['ASGI_GITHUB_MAX_CONNECTIONS']
+        self._executor = None
+        self._client = None
+        self._client_pid = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="asgi")
+            self._pid = os.getpid()
+
+    def _github_client(self):
+        """Session aiohttp du worker, créée dans sa boucle d'événements."""
+        if self._client_pid != os.getpid():
+            self._client = aiohttp.ClientSession(
+                headers=GITHUB_HEADERS,
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+            )
+            self._client_pid = os.getpid()
+        return self._client
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+        # websocket : non servi
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._ensure_started()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._client is not None and self._client_pid == os.getpid():
+                    await self._client.close()
+                # uvicorn termine le worker par le signal reçu : ni atexit ni worker_exit
+                await self._in_thread(contextvars.copy_context(), drain_history, self.flask_app)
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        self._ensure_started()
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+
+        environ = wsgi_environ(scope, bytes(body))
+        context = contextvars.copy_context()
+        ctx, rv, error = await self._in_thread(context, self._begin, environ)
+        if error is None and isinstance(rv, DeferredSteps):
+            rv, error = await self._drive(context, rv.steps)
+        status, headers, app_iter = await self._in_thread(context, self._end, ctx, environ, rv, error)
+
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        iterator = iter(app_iter)
+        try:
+            while True:
+                chunk = await self._in_thread(context, next, iterator, None)
+                if chunk is None:
+                    break
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            close = getattr(app_iter, 'close', None)
+            if close is not None:
+                await self._in_thread(context, close)
+
+    async def _in_thread(self, context, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, context.run, func, *args)
+
+    def _begin(self, environ):
+        """Contexte de requête, hooks before_request et vue (comme Flask.full_dispatch_request)."""
+        app = self.flask_app
+        ctx = app.request_context(environ)
+        ctx.push()
+        try:
+            request_started.send(app, _async_wrapper=app.ensure_sync)
+            rv = app.preprocess_request()
+            if rv is None:
+                rv = app.dispatch_request()
+        except Exception as e:
+            return ctx, None, e
+        return ctx, rv, None
+
+    async def _drive(self, context, steps):
+        """
+        Pilote asynchrone des étapes : chaque étape dans le pool, chaque HttpCall et Pause sur la boucle.
+
+        Returns:
+            (valeur de retour des étapes, exception levée par les étapes ou None)
+        """
+        value, error = None, None
+        while True:
+            call, result, raised = await self._in_thread(context, _advance, steps, value, error)
+            if call is None:
+                return result, raised
+            if isinstance(call, Pause):
+                await asyncio.sleep(call.seconds)
+                value, error = None, None
+                continue
+            try:
+                value, error = await self._request(call), None
+            except Exception as e:
+                value, error = None, e
+
+    async def _request(self, call):
+        """Exécute un HttpCall ; les erreurs réseau sont levées en exceptions requests."""
+        connect, read = call.timeout
+        try:
+            async with self._github_client().request(
+                call.method, call.url, headers=call.headers, json=call.json,
+                timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+            ) as response:
+                return GitHubResponse(response.status, response.headers, await response.read())
+        except aiohttp.ConnectionTimeoutError as e:
+            raise requests.ConnectTimeout(str(e)) from e
+        except asyncio.TimeoutError as e:
+            raise requests.Timeout(str(e)) from e
+        except aiohttp.ClientError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+    def _end(self, ctx, environ, rv, error):
+        """Réponse finale, hooks after_request et teardown (comme Flask.wsgi_app)."""
+        app = self.flask_app
+        try:
+            try:
+                if error is not None:
+                    rv = app.handle_user_exception(error)
+                response = app.finalize_request(rv)
+            except Exception as e:
+                error = e
+                response = app.handle_exception(e)
+            started = {}
+
+            def start_response(status, headers, exc_info=None):
+                started['status'] = int(status.split(' ', 1)[0])
+                started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                      for name, value in headers]
+
+            app_iter = response(environ, start_response)
+            return started['status'], started['headers'], app_iter
+        finally:
+            if error is not None and app.should_ignore_error(error):
+                error = None
+            ctx.pop(error)
+
+
+def _advance(steps, value, error):
+    """Avance les étapes jusqu'au prochain HttpCall ou Pause : (call, None, None), ou leur issue (None, retour, exception)."""
+    try:
+        call = steps.throw(error) if error is not None else steps.send(value)
+    except StopIteration as stop:
+        return None, stop.value, None
+    except Exception as e:
+        return None, None, e
+    return call, None, None
+
+
+def wsgi_environ(scope, body):
+    """Environ WSGI (PEP 3333) d'une requête HTTP ASGI au corps déjà lu."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+        'portal.asgi': True,
+    }
+    for raw_name, raw_value in scope['headers']:
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+            continue
+        if name == 'CONTENT_LENGTH':
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
@@ -14,7 +14,179 @@ class Config:
     GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
     GITHUB_REPO_OWNER = os.getenv('GITHUB_REPO_OWNER', 'votre-organisation')
     GITHUB_REPO_NAME = os.getenv('GITHUB_REPO_NAME', 'sonatel-iac')
-    
+    GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+
+    # Pool de jetons : PAT supplémentaires (séparés par des virgules) et/ou
+    # installations d'une GitHub App (nécessite PyJWT[crypto])
+    GITHUB_TOKENS = os.getenv('GITHUB_TOKENS', '')
+    GITHUB_APP_ID = os.getenv('GITHUB_APP_ID', '')
+    GITHUB_APP_PRIVATE_KEY = os.getenv('GITHUB_APP_PRIVATE_KEY', '')
+    GITHUB_APP_PRIVATE_KEY_PATH = os.getenv('GITHUB_APP_PRIVATE_KEY_PATH', '')
+    GITHUB_APP_INSTALLATION_IDS = os.getenv('GITHUB_APP_INSTALLATION_IDS', '')
+    GITHUB_APP_TOKEN_REFRESH_MARGIN = float(os.getenv('GITHUB_APP_TOKEN_REFRESH_MARGIN', '300'))
+    CREDENTIAL_COOLDOWN = float(os.getenv('CREDENTIAL_COOLDOWN', '300'))
+
+    # Pool HTTP vers l'API GitHub (une session keep-alive par worker)
+    GITHUB_POOL_SIZE = int(os.getenv('GITHUB_POOL_SIZE', '10'))
+    GITHUB_MAX_RETRIES = int(os.getenv('GITHUB_MAX_RETRIES', '3'))
+    GITHUB_CONNECT_TIMEOUT = float(os.getenv('GITHUB_CONNECT_TIMEOUT', '3.05'))
+    GITHUB_READ_TIMEOUT = float(os.getenv('GITHUB_READ_TIMEOUT', '10'))
+
+    # Base SQLite d'état partagée entre workers (défaut : instance/state.db)
+    STATE_DB = os.getenv('STATE_DB', '')
+
+    # Ordonnancement selon le quota GitHub (token bucket partagé + priorités).
+    # Recharge au rythme du quota observé (restant - réserve, étalé jusqu'au
+    # reset), plafonnée par RATE_LIMIT_RATE ; défauts : limite secondaire de
+    # GitHub sur les requêtes qui créent du contenu (80 par minute)
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_RATE = float(os.getenv('RATE_LIMIT_RATE', str(80 / 60)))  # jetons / seconde, au plus
+    RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', '80'))
+    RATE_LIMIT_RESERVE = int(os.getenv('RATE_LIMIT_RESERVE', '100'))    # quota réservé à la prod
+    RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '20'))
+    RATE_LIMIT_PRIORITIES = {
+        "prod": 0, "production": 0,
+        "preprod": 1, "staging": 1,
+        "dev": 2,
+    }
+    RATE_LIMIT_DEFAULT_PRIORITY = 1
+
+    # Dé-duplication des déclenchements (double-clic, POST rafraîchi)
+    IDEMPOTENCY_ENABLED = os.getenv('IDEMPOTENCY_ENABLED', 'true').lower() == 'true'
+    IDEMPOTENCY_WINDOW = float(os.getenv('IDEMPOTENCY_WINDOW', '300'))
+    IDEMPOTENCY_MAX_ENTRIES = int(os.getenv('IDEMPOTENCY_MAX_ENTRIES', '10000'))
+    IDEMPOTENCY_PENDING_TIMEOUT = float(os.getenv('IDEMPOTENCY_PENDING_TIMEOUT', '60'))
+    IDEMPOTENCY_WAIT = float(os.getenv('IDEMPOTENCY_WAIT', '10'))
+
+    # Suivi des runs GitHub Actions (polling conditionnel ETag, intervalle adaptatif)
+    RUN_TRACKING_ENABLED = os.getenv('RUN_TRACKING_ENABLED', 'true').lower() == 'true'
+    RUN_POLL_MIN = float(os.getenv('RUN_POLL_MIN', '2'))
+    RUN_POLL_MAX = float(os.getenv('RUN_POLL_MAX', '60'))
+    RUN_MATCH_SKEW = float(os.getenv('RUN_MATCH_SKEW', '10'))
+    RUN_RESOLVE_TIMEOUT = float(os.getenv('RUN_RESOLVE_TIMEOUT', '300'))
+    RUN_CACHE_SIZE = int(os.getenv('RUN_CACHE_SIZE', '1000'))
+
+    # Flux SSE /deployments/<id>/events (secondes, sauf SSE_RETRY_MS)
+    SSE_HEARTBEAT = float(os.getenv('SSE_HEARTBEAT', '15'))
+    SSE_MAX_DURATION = float(os.getenv('SSE_MAX_DURATION', '300'))
+    SSE_RETRY_MS = int(os.getenv('SSE_RETRY_MS', '3000'))
+
+    # Outbox durable des déclenchements et retentatives (secondes)
+    OUTBOX_LEASE = float(os.getenv('OUTBOX_LEASE', '60'))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '8'))
+    OUTBOX_BACKOFF_BASE = float(os.getenv('OUTBOX_BACKOFF_BASE', '2'))
+    OUTBOX_BACKOFF_MAX = float(os.getenv('OUTBOX_BACKOFF_MAX', '300'))
+    OUTBOX_POLL_INTERVAL = float(os.getenv('OUTBOX_POLL_INTERVAL', '1'))
+    OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '10'))
+    OUTBOX_RETENTION = float(os.getenv('OUTBOX_RETENTION', str(7 * 24 * 3600)))
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', '30'))
+
+    # Déclenchement asynchrone : 'sync' (défaut) ou 'async' (202 + file de jobs)
+    DISPATCH_MODE = os.getenv('DISPATCH_MODE', 'sync')
+    DISPATCH_WORKERS = int(os.getenv('DISPATCH_WORKERS', '8'))
+    DISPATCH_QUEUE_SIZE = int(os.getenv('DISPATCH_QUEUE_SIZE', '500'))
+    DISPATCH_JOB_RETENTION = int(os.getenv('DISPATCH_JOB_RETENTION', '1000'))
+
+    # API JSON /api/v1 : compression gzip des réponses au-delà de ce seuil (octets)
+    API_GZIP_MIN_SIZE = int(os.getenv('API_GZIP_MIN_SIZE', '512'))
+    API_GZIP_LEVEL = int(os.getenv('API_GZIP_LEVEL', '6'))
+    NAME_VALIDATION_MAX_ITEMS = int(os.getenv('NAME_VALIDATION_MAX_ITEMS', '200000'))
+
+    # Fichiers statiques empreintés (flask assets build), servis sous /assets
+    ASSETS_FOLDER = os.getenv('ASSETS_FOLDER', '')      # défaut : app/static/dist
+    ASSETS_MAX_AGE = int(os.getenv('ASSETS_MAX_AGE', str(365 * 24 * 3600)))
+
+    # Cache des pages rendues (accueil, aide, formulaires) ; vérification
+    # des templates / SERVICES au plus toutes les N secondes
+    PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', 'true').lower() == 'true'
+    PAGE_CACHE_CHECK_INTERVAL = float(os.getenv('PAGE_CACHE_CHECK_INTERVAL', '2'))
+
+    # Démarrage des workers : cache de bytecode Jinja (rempli au build de
+    # l'image par `flask templates compile`) et préchauffage (gunicorn.conf.py)
+    JINJA_BYTECODE_CACHE = os.getenv('JINJA_BYTECODE_CACHE', '')
+    WARMUP_ON_START = os.getenv('WARMUP_ON_START', 'true').lower() == 'true'
+    WARMUP_ENCODINGS = os.getenv('WARMUP_ENCODINGS', 'gzip,br')
+
+    # Métriques Prometheus sur /metrics (agrégées entre workers gunicorn via
+    # PROMETHEUS_MULTIPROC_DIR, positionné par gunicorn.conf.py)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+    # Endpoints d'administration (/rate-limit, /credentials, /page-cache,
+    # /startup et les /…/stats) : 404 sauf si activés ; avec ADMIN_TOKEN,
+    # l'en-tête `Authorization: Bearer <ADMIN_TOKEN>` est exigé
+    ADMIN_ENDPOINTS_ENABLED = os.getenv('ADMIN_ENDPOINTS_ENABLED', 'false').lower() == 'true'
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+
+    # Traces des requêtes (spans JSON OTLP, écrits par lots hors requête dans
+    # TRACE_FILE, défaut : instance/traces.jsonl) ; 0 = désactivées
+    TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', '0'))
+    TRACE_FILE = os.getenv('TRACE_FILE', '')
+    TRACE_SERVICE_NAME = os.getenv('TRACE_SERVICE_NAME', 'aws-portal')
+    TRACE_FLUSH_INTERVAL = float(os.getenv('TRACE_FLUSH_INTERVAL', '2'))
+    TRACE_BUFFER_SIZE = int(os.getenv('TRACE_BUFFER_SIZE', '10000'))
+
+    # Journaux JSON d'accès et d'audit (défaut : instance/access.log et
+    # instance/audit.log), écrits par lots hors requête, rotation par taille
+    ACCESS_LOG_ENABLED = os.getenv('ACCESS_LOG_ENABLED', 'true').lower() == 'true'
+    AUDIT_LOG_ENABLED = os.getenv('AUDIT_LOG_ENABLED', 'true').lower() == 'true'
+    ACCESS_LOG_FILE = os.getenv('ACCESS_LOG_FILE', '')
+    AUDIT_LOG_FILE = os.getenv('AUDIT_LOG_FILE', '')
+    ACCESS_LOG_EXCLUDE = os.getenv('ACCESS_LOG_EXCLUDE', '/health,/health/live,/health/ready,/metrics')
+    AUDIT_USER_HEADER = os.getenv('AUDIT_USER_HEADER', 'X-Forwarded-User')   # posé par le proxy d'authentification
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(50 * 1024 * 1024)))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+    LOG_BATCH_SIZE = int(os.getenv('LOG_BATCH_SIZE', '256'))
+    LOG_AUDIT_BLOCK_TIMEOUT = float(os.getenv('LOG_AUDIT_BLOCK_TIMEOUT', '0.5'))  # file pleine : attente max d'un audit
+
+    # Sonde de disponibilité (/health/ready) : vérifications faites en fond par
+    # chaque worker (GitHub, jetons, quota, outbox, file), résultat mis en cache.
+    # Un arriéré d'outbox (HEALTH_MAX_OUTBOX_*) rend « degraded » (200), pas 503.
+    # Désactivée : /health/ready répond 200 avec "checks": "disabled".
+    HEALTH_CHECK_ENABLED = os.getenv('HEALTH_CHECK_ENABLED', 'true').lower() == 'true'
+    HEALTH_CHECK_INTERVAL = float(os.getenv('HEALTH_CHECK_INTERVAL', '15'))
+    HEALTH_CHECK_TTL = float(os.getenv('HEALTH_CHECK_TTL', '60'))               # au-delà : « stale », 503
+    HEALTH_GITHUB_TIMEOUT = float(os.getenv('HEALTH_GITHUB_TIMEOUT', '3'))
+    HEALTH_MIN_RATE_REMAINING = int(os.getenv('HEALTH_MIN_RATE_REMAINING', '50'))
+    HEALTH_MAX_OUTBOX_PENDING = int(os.getenv('HEALTH_MAX_OUTBOX_PENDING', '1000'))
+    HEALTH_MAX_OUTBOX_AGE = float(os.getenv('HEALTH_MAX_OUTBOX_AGE', '600'))
+    HEALTH_MAX_QUEUE_RATIO = float(os.getenv('HEALTH_MAX_QUEUE_RATIO', '0.9'))
+
+    # Mode ASGI (asgi.py) : threads du pool Flask et connexions du client
+    # GitHub asynchrone, par worker
+    ASGI_THREADS = int(os.getenv('ASGI_THREADS', '32'))
+    ASGI_GITHUB_MAX_CONNECTIONS = int(os.getenv('ASGI_GITHUB_MAX_CONNECTIONS', '200'))
+
+    # Historique des déploiements (/history, /api/v1/history), base SQLite
+    # séparée de la base d'état (défaut : instance/history.db)
+    HISTORY_ENABLED = os.getenv('HISTORY_ENABLED', 'true').lower() == 'true'
+    HISTORY_DB = os.getenv('HISTORY_DB', '')
+    HISTORY_PAGE_SIZE = int(os.getenv('HISTORY_PAGE_SIZE', '50'))
+    HISTORY_MAX_PAGE_SIZE = int(os.getenv('HISTORY_MAX_PAGE_SIZE', '500'))
+    # Recherche plein texte (/history?q=) : index FTS5 tenu à jour à l'insertion
+    HISTORY_SEARCH_ENABLED = os.getenv('HISTORY_SEARCH_ENABLED', 'true').lower() == 'true'
+    # Écriture différée par worker : lots de HISTORY_BATCH_SIZE lignes ou toutes
+    # les HISTORY_FLUSH_INTERVAL s ; tampon plein : attente bornée puis
+    # déversement sur disque (<HISTORY_DB>.spill/)
+    HISTORY_BUFFER_ENABLED = os.getenv('HISTORY_BUFFER_ENABLED', 'true').lower() == 'true'
+    HISTORY_BATCH_SIZE = int(os.getenv('HISTORY_BATCH_SIZE', '200'))
+    HISTORY_FLUSH_INTERVAL = float(os.getenv('HISTORY_FLUSH_INTERVAL', '0.5'))
+    HISTORY_BUFFER_SIZE = int(os.getenv('HISTORY_BUFFER_SIZE', '10000'))
+    HISTORY_BUFFER_BLOCK_TIMEOUT = float(os.getenv('HISTORY_BUFFER_BLOCK_TIMEOUT', '0.05'))
+
+    # Pré-validation des payloads contre les variables Terraform des modules
+    # (INFRA_MODULES, lues au démarrage) ; défauts : infra/ et .github/workflows/
+    # à la racine du dépôt. `flask infra drift` liste les écarts.
+    INFRA_VALIDATION_ENABLED = os.getenv('INFRA_VALIDATION_ENABLED', 'true').lower() == 'true'
+    INFRA_DIR = os.getenv('INFRA_DIR', '')
+    WORKFLOWS_DIR = os.getenv('WORKFLOWS_DIR', '')
+
+    # Provisioning en masse (/bulk/<service>)
+    BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', '1000'))
+    BULK_DEFAULT_CONCURRENCY = int(os.getenv('BULK_DEFAULT_CONCURRENCY', '8'))
+    BULK_MAX_CONCURRENCY = int(os.getenv('BULK_MAX_CONCURRENCY', '32'))
+
     # AWS (optionnel, pour validation)
     AWS_REGION = os.getenv('AWS_REGION', 'eu-west-3')
     
@@ -39,6 +211,27 @@ class Config:
         "trusted-advisor": "terraform-trusted-advisor.yml",
     }
     
+    # Module Terraform (dossier de INFRA_DIR) de chaque workflow
+    INFRA_MODULES = {
+        "ec2":        "ec2",
+        "s3":         "s3",
+        "rds":        "rds",
+        "lambda":     "lambda",
+        "iam":        "iam",
+        "vpc":        "vpc",
+        "cloudwatch": "cloudwatch",
+        "route53":    "route53",
+        "elb":        "elb",
+        "cloudfront": "cloudfront",
+        "codepipeline": "pipeline",
+        "codebuild": "codebuild",
+        "codedeploy": "codedeploy",
+        "ssm": "ssm",
+        "budgets": "budgets",
+        "cost-explorer": "cost_explorer",
+        "trusted-advisor": "trusted_advisor",
+    }
+    
     # Service colors pour l'UI
     SERVICE_COLORS = {
         "EC2":        "#f97316",  # Orange
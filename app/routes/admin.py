@@ -0,0 +1,50 @@
+"""Routes d'administration : quota, jetons, cache de pages et démarrage du worker."""
+import os
+
+from flask import Blueprint, current_app
+
+from app.services.admin import admin_required
+from app.services.credential_pool import get_credential_pool
+from app.services.page_cache import get_page_cache
+from app.services.rate_limit_service import get_rate_limiter
+from app.services.warmup import process_memory
+
+admin_bp = Blueprint('admin', __name__)
+
+
+@admin_bp.route('/rate-limit')
+@admin_required
+def rate_limit():
+    """Marge de quota GitHub et délais d'attente de l'ordonnanceur."""
+    scheduler = get_rate_limiter()
+    if scheduler is None:
+        return {"enabled": False}
+    return dict(scheduler.stats(), enabled=True)
+
+
+@admin_bp.route('/credentials')
+@admin_required
+def credentials():
+    """Usage, quota restant et santé de chaque jeton GitHub du pool."""
+    return get_credential_pool().stats()
+
+
+@admin_bp.route('/page-cache')
+@admin_required
+def page_cache():
+    """Pages rendues en cache sur ce worker et taux de succès."""
+    cache = get_page_cache()
+    if cache is None:
+        return {"enabled": False}
+    return dict(cache.stats(), enabled=True)
+
+
+@admin_bp.route('/startup')
+@admin_required
+def startup():
+    """Mesures de démarrage (create_app, blueprints, préchauffage) et mémoire de ce worker."""
+    report = dict(current_app.extensions['startup'])
+    report['preloaded'] = report['pid'] != os.getpid()
+    report['worker_pid'] = os.getpid()
+    report['memory_kb'] = process_memory()
+    return report
@@ -0,0 +1,159 @@
+"""API JSON versionnée pour les clients machine (CI, scripts)."""
+import gzip
+import io
+import itertools
+
+from flask import Blueprint, current_app, request
+
+from app.services.bulk_service import BulkService
+from app.services.dispatch_service import DispatchService
+from app.services.form_schema import get_schema
+from app.services.history import InvalidCursor, InvalidSearch, get_history
+from app.services.job_queue import JOB_RETRYING, Job, get_job_queue
+from app.services.outbox import get_outbox
+from app.services.request_log import audit
+from app.services.response_service import ResponseService
+from app.services.validation_service import ValidationError
+
+api_bp = Blueprint('api', __name__)
+
+
+@api_bp.after_request
+def compress(response):
+    """Compresse en gzip les réponses JSON si le client l'accepte."""
+    if (
+        response.direct_passthrough
+        or 'Content-Encoding' in response.headers
+        or response.mimetype != 'application/json'
+        or not request.accept_encodings['gzip']
+    ):
+        return response
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < current_app.config['API_GZIP_MIN_SIZE']:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=current_app.config['API_GZIP_LEVEL']))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+@api_bp.route('/api/v1/services')
+def api_services():
+    """Services déclenchables et description de leurs champs."""
+    schemas = current_app.extensions['form_schemas']
+    return {"services": {slug: schema.describe() for slug, schema in sorted(schemas.items())}}
+
+
+@api_bp.route('/api/v1/history')
+def api_history():
+    """
+    Historique des déploiements paginé par clé, du plus récent au plus ancien.
+
+    Paramètres : q (recherche plein texte : termes combinés par ET,
+    `champ:valeur` pour resource, owner, cost_center, tags, description...,
+    `*` final pour un préfixe), service, environment, limit
+    (HISTORY_MAX_PAGE_SIZE au plus) et cursor (`next_cursor` de la page
+    précédente). `next` est l'URL de la page suivante, null en fin
+    d'historique.
+    """
+    store = get_history()
+    if store is None:
+        return ResponseService.api_error("Historique désactivé", status=404)
+    query = request.args.get('q', '').strip()
+    if query and not store.searchable:
+        return ResponseService.api_error("Recherche indisponible", status=404)
+    filters = {
+        "service": request.args.get('service') or None,
+        "environment": request.args.get('environment') or None,
+        "limit": request.args.get('limit', type=int),
+    }
+    try:
+        if query:
+            entries, next_cursor = store.search(query, cursor=request.args.get('cursor'), **filters)
+        else:
+            entries, next_cursor = store.page(cursor=request.args.get('cursor'), **filters)
+    except (InvalidSearch, InvalidCursor) as e:
+        return ResponseService.api_error(str(e), status=400)
+    return ResponseService.history_response(entries, next_cursor, dict(filters, q=query or None), as_json=True)
+
+
+@api_bp.route('/api/v1/<service>', methods=['POST'])
+def api_trigger(service):
+    """
+    Valide un corps JSON et déclenche le workflow du service.
+
+    Le corps est un objet plat {champ: valeur} avec les mêmes champs que
+    le formulaire HTML (booléens pour les cases à cocher). Réponses :
+    200 déclenché, 202 job en file ou en retentative (Location vers
+    /api/v1/jobs/<id>), 422 avec toutes les erreurs par champ.
+    """
+    schema = get_schema(service)
+    if schema is None:
+        return ResponseService.api_error(f"Service inconnu: '{service}'", status=404)
+
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return ResponseService.api_error("Corps JSON attendu (objet {champ: valeur})", status=400)
+
+    try:
+        payload, details = schema.build(BulkService.normalize_item(body))
+    except ValidationError as e:
+        audit('deployment.dispatch', service=service, outcome='invalid', status=422, api=True,
+              errors=[error["field"] for error in e.errors])
+        errors = [dict(error, path=f"/{error['field']}") for error in e.errors]
+        return ResponseService.api_error("Requête invalide", status=422, errors=errors)
+
+    return DispatchService.dispatch(
+        service,
+        payload,
+        service=schema.service,
+        title=schema.title,
+        details=details,
+        api=True,
+    )
+
+
+@api_bp.route('/api/v1/<service>/names', methods=['POST'])
+def api_validate_names(service):
+    """
+    Valide un lot de noms de ressources pour un service, sans déclencher.
+
+    Corps : liste JSON, objet {"names": [...]}, ou texte brut (un nom par
+    ligne, lu en flux). Paramètre ?deployed=false pour ignorer les
+    collisions avec les noms déjà déployés. Toutes les erreurs (format,
+    doublons dans le lot, collisions) sont retournées en une réponse.
+    """
+    schema = get_schema(service)
+    if schema is None or schema.name_field is None:
+        return ResponseService.api_error(f"Pas de validation de noms pour '{service}'", status=404)
+
+    if request.mimetype == 'text/plain':
+        lines = io.TextIOWrapper(request.stream, encoding='utf-8-sig')
+        names = (line.rstrip('\r\n') for line in lines)
+    else:
+        body = request.get_json(silent=True)
+        names = body.get('names') if isinstance(body, dict) else body
+        if not isinstance(names, list):
+            return ResponseService.api_error("Corps attendu : liste JSON, {\"names\": [...]} ou texte brut", status=400)
+
+    existing = frozenset()
+    if request.args.get('deployed', 'true') != 'false':
+        existing = get_outbox().deployed_values(service, schema.name_input)
+
+    max_items = current_app.config['NAME_VALIDATION_MAX_ITEMS']
+    result = schema.validate_names(itertools.islice(names, max_items + 1), existing)
+    if result['total'] > max_items:
+        return ResponseService.api_error(f"Lot trop volumineux (> {max_items} noms)", status=413)
+    return dict(result, service=service)
+
+
+@api_bp.route('/api/v1/jobs/<job_id>')
+def api_job(job_id):
+    """Statut JSON d'un déclenchement (file asynchrone ou outbox)."""
+    job = get_job_queue().get(job_id)
+    if job is None or job.status == JOB_RETRYING:
+        item = get_outbox().get(job_id)
+        job = Job.from_outbox(item) if item else job
+    if job is None:
+        return ResponseService.api_error("Job introuvable", f"Aucun job '{job_id}' (expiré ou inconnu)", status=404)
+    return ResponseService.job_response(job, as_json=True)
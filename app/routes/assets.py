@@ -0,0 +1,40 @@
+"""Routes des fichiers statiques empreintés (/assets)."""
+import mimetypes
+
+from flask import Blueprint, abort, current_app, request, send_from_directory
+
+from app.services.assets import ENCODINGS, assets_folder, get_manifest
+
+assets_bp = Blueprint('assets', __name__)
+
+
+@assets_bp.route('/assets/<path:filename>')
+def asset(filename):
+    """
+    Sert un fichier empreinté, en variante précompressée si le client l'accepte.
+
+    Le nom contient l'empreinte du contenu : la réponse est cachée un an
+    (immutable), une nouvelle version ayant forcément une autre URL.
+    """
+    entry = get_manifest().by_path(filename)
+    if entry is None:
+        abort(404)
+
+    suffix, encoding = '', None
+    for name, extension in ENCODINGS:
+        if name in entry["encodings"] and request.accept_encodings[name]:
+            suffix, encoding = extension, name
+            break
+
+    response = send_from_directory(
+        assets_folder(),
+        filename + suffix,
+        mimetype=mimetypes.guess_type(filename)[0],
+        max_age=current_app.config['ASSETS_MAX_AGE'],
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
@@ -0,0 +1,61 @@
+"""Routes de provisioning en masse (un fichier JSON/CSV, N ressources)."""
+import json
+
+from flask import Blueprint, Response, current_app, request, stream_with_context
+
+from app.services.bulk_service import BulkService
+from app.services.form_schema import get_schema
+from app.services.request_log import request_actor
+from app.services.validation_service import ValidationError
+
+bulk_bp = Blueprint('bulk', __name__)
+
+
+@bulk_bp.route('/bulk/<service>', methods=['POST'])
+def bulk_trigger(service):
+    """
+    Valide puis déclenche un lot de ressources pour un service.
+
+    Le lot est lu depuis un fichier multipart (champ `file`, .json ou .csv)
+    ou depuis le corps de la requête (application/json ou text/csv).
+    Le lot entier est rejeté (422) si un seul élément est invalide ; sinon
+    les résultats sont streamés en NDJSON au fur et à mesure des dispatches.
+    Paramètre optionnel : ?concurrency=N (plafonné par BULK_MAX_CONCURRENCY).
+    """
+    if service not in current_app.config['WORKFLOWS'] or get_schema(service) is None:
+        return {"error": f"Service inconnu: '{service}'"}, 404
+
+    upload = request.files.get('file')
+    try:
+        if upload is not None:
+            items = BulkService.parse_items(upload.read(), upload.filename or "", upload.mimetype or "")
+        else:
+            items = BulkService.parse_items(request.get_data(), content_type=request.mimetype or "")
+    except ValidationError as e:
+        return {"error": str(e)}, 400
+
+    max_items = current_app.config['BULK_MAX_ITEMS']
+    if not items:
+        return {"error": "Lot vide"}, 400
+    if len(items) > max_items:
+        return {"error": f"Lot trop volumineux ({len(items)} > {max_items} éléments)"}, 413
+
+    built, errors = BulkService.validate(service, items)
+    if errors:
+        return {"error": "Lot invalide", "total": len(items), "invalid": len(errors), "errors": errors}, 422
+
+    concurrency = request.args.get('concurrency', type=int) or current_app.config['BULK_DEFAULT_CONCURRENCY']
+    concurrency = max(1, min(concurrency, current_app.config['BULK_MAX_CONCURRENCY'], len(built)))
+    app = current_app._get_current_object()
+    actor = request_actor()
+
+    def generate():
+        yield json.dumps({"type": "start", "service": service, "total": len(built), "concurrency": concurrency}) + "\n"
+        for result in BulkService.dispatch_stream(app, service, built, concurrency, actor=actor):
+            yield json.dumps(result) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'},
+    )
@@ -1,144 +1,95 @@
 """Routes pour les services de coût (Budgets, Cost Explorer, Trusted Advisor)."""
 from flask import Blueprint, render_template, request
 import json
-from app.services.github_service import GitHubService
-from app.services.response_service import ResponseService
+from app.services.dispatch_service import DispatchService
+from app.services.form_schema import FLAG, JSON, NUMBER, Field, form_schema
+from app.services.page_cache import cached_page
 
 cost_bp = Blueprint('cost', __name__)
 
 # ========== BUDGETS ==========
 @cost_bp.route('/budgets')
+@cached_page
 def budgets_form():
     """Formulaire AWS Budgets."""
     return render_template('form_budgets.html')
 
+form_schema(
+    "budgets", service="BUDGETS", title="Budget AWS",
+    name_field="budget_name",
+    fields=[
+        Field("budget_name", "Nom du budget", required=True),
+        Field("budget_amount", "Montant", kind=NUMBER, required=True, minimum=0.01),
+        Field("time_unit", "Période", default="MONTHLY", choices=("MONTHLY", "QUARTERLY", "ANNUALLY")),
+        Field("alerts", "Alertes", kind=JSON, default="[]"),
+    ],
+    details=[
+        ("Budget",  "{budget_name}"),
+        ("Montant", "${budget_amount} USD"),
+        ("Période", "{time_unit}"),
+        ("Alertes", lambda v: f"{len(json.loads(v['alerts'] or '[]'))} seuils"),
+    ],
+)
+
 @cost_bp.route('/trigger-budgets', methods=['POST'])
 def trigger_budgets():
     """Déclenche le workflow Budgets."""
-    try:
-        budget_name = request.form.get("budget_name", "").strip()
-        budget_amount = request.form.get("budget_amount", "").strip()
-        time_unit = request.form.get("time_unit", "MONTHLY").strip()
-        alerts = request.form.get("alerts", "[]")
-        
-        if not all([budget_name, budget_amount]):
-            return ResponseService.error_response("Champs obligatoires manquants", service="BUDGETS")
-        
-        payload = {
-            "ref": "main",
-            "inputs": {
-                "budget_name": budget_name,
-                "budget_amount": budget_amount,
-                "time_unit": time_unit,
-                "alerts": alerts
-            }
-        }
-
-        response = GitHubService.trigger_workflow("budgets", payload)
-        
-        if response.status_code == 204:
-            alerts_count = len(json.loads(alerts))
-            return ResponseService.success_response(
-                service="BUDGETS",
-                title="Budget AWS",
-                details={
-                    "Budget": budget_name,
-                    "Montant": f"${budget_amount} USD",
-                    "Période": time_unit,
-                    "Alertes": f"{alerts_count} seuils"
-                }
-            )
-        else:
-            return ResponseService.error_response(
-                f"Erreur GitHub API ({response.status_code})",
-                response.text,
-                service="BUDGETS"
-            )
-    except Exception as e:
-        return ResponseService.error_response("Erreur inattendue", str(e), service="BUDGETS")
+    return DispatchService.handle_form("budgets", request.form)
 
 # ========== COST EXPLORER ==========
 @cost_bp.route('/cost-explorer')
+@cached_page
 def cost_explorer_form():
     """Formulaire Cost Explorer."""
     return render_template('form_cost_explorer.html')
 
+form_schema(
+    "cost-explorer", service="COSTEXPLORER", title="Cost Explorer",
+    name_field="report_name",
+    fields=[
+        Field("report_name", "Nom du rapport", default="cost-report"),
+        Field("enable_reports", kind=FLAG),
+        Field("report_email", "Email des rapports", pattern=r'^[^@\s]+@[^@\s]+\.[^@\s]+$'),
+    ],
+    details=[
+        ("Rapport",        "{report_name}"),
+        ("API",            "Activée (gratuite)"),
+        ("Rapports email", lambda v: "Activés" if v["enable_reports"] == "true" else None),
+    ],
+)
+
 @cost_bp.route('/trigger-cost-explorer', methods=['POST'])
 def trigger_cost_explorer():
     """Déclenche le workflow Terraform Cost Explorer."""
-    try:
-        report_name = request.form.get("report_name", "cost-report").strip()
-        enable_reports = "true" if request.form.get("enable_reports") else "false"
-        report_email = request.form.get("report_email", "").strip()
-
-        payload = {
-            "ref": "main",
-            "inputs": {
-                "report_name": report_name,
-                "enable_reports": enable_reports,
-                "report_email": report_email
-            }
-        }
-
-        response = GitHubService.trigger_workflow("cost-explorer", payload)
-        
-        if response.status_code == 204:
-            details = {
-                "Rapport": report_name,
-                "API": "Activée (gratuite)",
-            }
-            
-            if enable_reports == "true":
-                details["Rapports email"] = "Activés"
-
-            return ResponseService.success_response(service="COSTEXPLORER", title="Cost Explorer", details=details)
-        else:
-            return ResponseService.error_response(f"Erreur GitHub API ({response.status_code})", response.text, service="COSTEXPLORER")
-    except Exception as e:
-        return ResponseService.error_response("Erreur inattendue", str(e), service="COSTEXPLORER")
+    return DispatchService.handle_form("cost-explorer", request.form)
 
 # ========== TRUSTED ADVISOR ==========
 @cost_bp.route('/trusted-advisor')
+@cached_page
 def trusted_advisor_form():
     """Formulaire Trusted Advisor."""
     return render_template('form_trusted_advisor.html')
 
+TRUSTED_ADVISOR_NOTIFICATIONS = (
+    ("notify_cost", "Coûts"),
+    ("notify_security", "Sécurité"),
+    ("notify_performance", "Performance"),
+    ("notify_limits", "Limites"),
+)
+
+form_schema(
+    "trusted-advisor", service="TRUSTEDADVISOR", title="Trusted Advisor",
+    fields=[Field(name, kind=FLAG) for name, _ in TRUSTED_ADVISOR_NOTIFICATIONS],
+    details=[
+        ("Vérifications gratuites", "7 actives"),
+        ("Notifications", lambda v: ", ".join(
+            label for name, label in TRUSTED_ADVISOR_NOTIFICATIONS if v[name] == "true"
+        ) or "Aucune"),
+        ("Accès complet", "Plan Business requis"),
+    ],
+)
+
 @cost_bp.route('/trigger-trusted-advisor', methods=['POST'])
 def trigger_trusted_advisor():
     """Déclenche le workflow Terraform Trusted Advisor."""
-    try:
-        notify_cost = "true" if request.form.get("notify_cost") else "false"
-        notify_security = "true" if request.form.get("notify_security") else "false"
-        notify_performance = "true" if request.form.get("notify_performance") else "false"
-        notify_limits = "true" if request.form.get("notify_limits") else "false"
-
-        payload = {
-            "ref": "main",
-            "inputs": {
-                "notify_cost": notify_cost,
-                "notify_security": notify_security,
-                "notify_performance": notify_performance,
-                "notify_limits": notify_limits
-            }
-        }
-
-        response = GitHubService.trigger_workflow("trusted-advisor", payload)
-        
-        if response.status_code == 204:
-            notifications = []
-            if notify_cost == "true": notifications.append("Coûts")
-            if notify_security == "true": notifications.append("Sécurité")
-            if notify_performance == "true": notifications.append("Performance")
-            if notify_limits == "true": notifications.append("Limites")
-            
-            details = {
-                "Vérifications gratuites": "7 actives",
-                "Notifications": ", ".join(notifications) if notifications else "Aucune",
-                "Accès complet": "Plan Business requis"
-            }
-
-            return ResponseService.success_response(service="TRUSTEDADVISOR", title="Trusted Advisor", details=details)
-        else:
-            return ResponseService.error_response(f"Erreur GitHub API ({response.status_code})", response.text, service="TRUSTEDADVISOR")
-    except Exception as e:
-        return ResponseService.error_response("Erreur inattendue", str(e), service="TRUSTEDADVISOR")
+    return DispatchService.handle_form("trusted-advisor", request.form)
@@ -0,0 +1,79 @@
+"""Routes de suivi des runs GitHub Actions déclenchés."""
+import json
+import queue
+import time
+
+from flask import Blueprint, Response, current_app, jsonify, stream_with_context
+
+from app.services.admin import admin_required
+from app.services.run_events import get_run_event_hub
+from app.services.run_tracker import get_run_tracker
+
+deployments_bp = Blueprint('deployments', __name__)
+
+
+@deployments_bp.route('/deployments/stats')
+@admin_required
+def deployment_stats():
+    """Pollers de runs actifs et flux SSE ouverts sur ce worker."""
+    hub = get_run_event_hub()
+    return jsonify(hub.stats() if hub else {'pollers': 0, 'subscribers': 0})
+
+
+@deployments_bp.route('/deployments/<deployment_id>')
+def deployment_status(deployment_id):
+    """Statut du run associé à un déploiement (JSON), rafraîchi auprès de GitHub si dû."""
+    tracker = get_run_tracker()
+    if tracker is None:
+        return {"error": "Suivi des runs désactivé"}, 404
+    record = tracker.refresh(deployment_id)
+    if record is None:
+        return {"error": "Déploiement introuvable", "id": deployment_id}, 404
+    body = tracker.to_dict(record)
+    # Rien ne peut changer avant la prochaine échéance de polling
+    max_age = 3600 if body['final'] else int(body['next_poll_in'])
+    return body, 200, {'Cache-Control': f"private, max-age={max_age}"}
+
+
+@deployments_bp.route('/deployments/<deployment_id>/events')
+def deployment_events(deployment_id):
+    """
+    Flux Server-Sent Events des changements d'état du run.
+
+    Un événement `status` est envoyé à l'ouverture puis à chaque
+    changement ; le flux se termine quand le run est terminé. Au-delà de
+    SSE_MAX_DURATION le serveur ferme le flux et le navigateur se
+    reconnecte, pour ne pas immobiliser un thread indéfiniment.
+    """
+    hub = get_run_event_hub()
+    if hub is None:
+        return {"error": "Suivi des runs désactivé"}, 404
+    if hub.tracker.get(deployment_id) is None:
+        return {"error": "Déploiement introuvable", "id": deployment_id}, 404
+
+    heartbeat = current_app.config['SSE_HEARTBEAT']
+    deadline = time.time() + current_app.config['SSE_MAX_DURATION']
+
+    def stream():
+        subscriber = hub.subscribe(deployment_id)
+        try:
+            yield f"retry: {current_app.config['SSE_RETRY_MS']}\n\n"
+            while time.time() < deadline:
+                try:
+                    event = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield f"event: status\ndata: {json.dumps(event)}\n\n"
+                if event['final']:
+                    break
+        finally:
+            hub.unsubscribe(deployment_id, subscriber)
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
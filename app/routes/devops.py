@@ -1,491 +1,269 @@
 """Routes pour les services DevOps (CodePipeline, CodeBuild, CodeDeploy)."""
 from flask import Blueprint, render_template, request
-import re
-from app.services.github_service import GitHubService
-from app.services.response_service import ResponseService
-from app.services.validation_service import ValidationService
+from app.services.dispatch_service import DispatchService
+from app.services.form_schema import FLAG, INT, JSON, Field, form_schema, required_if, required_unless
+from app.services.page_cache import cached_page
 
 devops_bp = Blueprint('devops', __name__)
 
+ENVIRONMENTS = ("dev", "staging", "prod")
+
 # ========== CODEPIPELINE ==========
 @devops_bp.route('/codepipeline')
+@cached_page
 def codepipeline_form():
     """Formulaire CodePipeline — CI/CD Pipeline."""
     return render_template('form_codepipeline.html')
 
+form_schema(
+    "codepipeline", service="CODEPIPELINE", title="Pipeline CI/CD",
+    name_field="pipeline_name",
+    fields=[
+        # Base
+        Field("pipeline_name", "Nom de pipeline", required=True, max_length=100, pattern=r'^[a-zA-Z0-9_-]+$'),
+        Field("environment", "Environnement", required=True, choices=ENVIRONMENTS),
+        Field("region", "Région", default="eu-west-3"),
+        Field("description", "Description"),
+
+        # Source
+        Field("source_provider", "Provider source", required=True,
+              choices=("GitHub", "GitHubEnterprise", "CodeCommit", "S3", "Bitbucket")),
+        Field("github_connection", "Connexion GitHub", input="github_connection_arn"),
+        Field("repository", "Repository"),
+        Field("branch", "Branche", default="main"),
+        Field("codecommit_repository", "Nom du repository CodeCommit", input="codecommit_repository_name"),
+        Field("codecommit_branch", "Branche CodeCommit", default="main"),
+        Field("s3_bucket", "Bucket S3 source", input="s3_source_bucket"),
+        Field("s3_object_key", "Clé S3 source", input="s3_source_object_key"),
+
+        # Build
+        Field("enable_build", kind=FLAG),
+        Field("build_project", "Projet de build", input="build_project_name"),
+        Field("build_env", "Environnement de build", default="ubuntu-standard-7.0", input="build_environment"),
+        Field("build_compute", "Compute de build", default="small", input="build_compute_type",
+              choices=("small", "medium", "large", "2xlarge")),
+        Field("buildspec", "Buildspec"),
+        Field("build_env_vars", "Variables de build", kind=JSON, default="[]"),
+        Field("enable_build_cache", kind=FLAG),
+
+        # Test
+        Field("enable_test", kind=FLAG),
+        Field("test_project", "Projet de test", input="test_project_name"),
+        Field("test_type", "Type de test", default="integration",
+              choices=("integration", "e2e", "security", "performance", "custom")),
+
+        # Approval
+        Field("manual_approval", kind=FLAG),
+        Field("approval_sns_topic", "Topic SNS d'approbation", input="approval_sns_topic_arn"),
+        Field("approvers", "Approbateurs"),
+
+        # Deploy
+        Field("deploy_provider", "Provider de déploiement", required=True,
+              choices=("CodeDeploy", "ECS", "ECS-BlueGreen", "S3", "Lambda", "CloudFormation", "EKS", "Beanstalk")),
+        Field("ecs_cluster", "Cluster ECS", input="ecs_cluster_name"),
+        Field("ecs_service", "Service ECS", input="ecs_service_name"),
+        Field("ecs_image_definition_file", "Fichier d'image ECS", default="imagedefinitions.json"),
+        Field("codedeploy_application", "Application CodeDeploy", input="codedeploy_application_name"),
+        Field("codedeploy_deployment_group", "Deployment group CodeDeploy",
+              input="codedeploy_deployment_group_name"),
+        Field("lambda_function_name", "Nom de fonction Lambda"),
+        Field("s3_deploy_bucket", "Bucket S3 de destination"),
+        Field("s3_extract", kind=FLAG, input="s3_extract_archive"),
+
+        # Notifications
+        Field("enable_notifications", kind=FLAG),
+        Field("notification_sns_topic", "Topic SNS de notification", input="notification_sns_topic_arn"),
+        Field("enable_cloudwatch_alarms", kind=FLAG),
+
+        # Tags
+        Field("tags", "Tags", kind=JSON, default="[]"),
+        Field("owner", "Propriétaire"),
+        Field("cost_center", "Centre de coût"),
+    ],
+    rules=[
+        # Selon le provider source
+        required_if("source_provider", ["GitHub", "GitHubEnterprise", "Bitbucket"], "repository",
+                    message="Repository obligatoire pour GitHub/Bitbucket"),
+        required_if("source_provider", ["CodeCommit"], "codecommit_repository"),
+        required_if("source_provider", ["S3"], "s3_bucket", "s3_object_key"),
+        # Selon le provider de déploiement
+        required_if("deploy_provider", ["ECS", "ECS-BlueGreen"], "ecs_cluster", "ecs_service"),
+        required_if("deploy_provider", ["CodeDeploy"], "codedeploy_application", "codedeploy_deployment_group"),
+        required_if("deploy_provider", ["Lambda"], "lambda_function_name"),
+        required_if("deploy_provider", ["S3"], "s3_deploy_bucket"),
+    ],
+    details=[
+        ("Nom du pipeline", "{pipeline_name}"),
+        ("Environnement",   "{environment}"),
+        ("Source",          lambda v: f"{v['source_provider']} → "
+                                      f"{v['repository'] or v['codecommit_repository'] or v['s3_bucket']}"),
+        ("Build",           lambda v: "Activé" if v["enable_build"] == "true" else "Désactivé"),
+        ("Tests",           lambda v: v["test_type"].capitalize() if v["enable_test"] == "true" else None),
+        ("Approbation",     lambda v: "Manuelle requise" if v["manual_approval"] == "true" else None),
+        ("Déploiement",     "{deploy_provider}"),
+        ("Notifications",   lambda v: "SNS activé" if v["enable_notifications"] == "true" else None),
+    ],
+)
+
 @devops_bp.route('/trigger-codepipeline', methods=['POST'])
 def trigger_codepipeline():
     """Déclenche le workflow Terraform CodePipeline."""
-    try:
-        # Récupération des champs de base
-        pipeline_name = request.form.get("pipeline_name", "").strip()
-        environment = request.form.get("environment", "").strip()
-        region = request.form.get("region", "eu-west-3").strip()
-        description = request.form.get("description", "").strip()
-
-        # Configuration source
-        source_provider = request.form.get("source_provider", "").strip()
-        github_connection = request.form.get("github_connection", "").strip()
-        repository = request.form.get("repository", "").strip()
-        branch = request.form.get("branch", "main").strip()
-        
-        # CodeCommit
-        codecommit_repository = request.form.get("codecommit_repository", "").strip()
-        codecommit_branch = request.form.get("codecommit_branch", "main").strip()
-        
-        # S3
-        s3_bucket = request.form.get("s3_bucket", "").strip()
-        s3_object_key = request.form.get("s3_object_key", "").strip()
-
-        # Configuration build
-        enable_build = "true" if request.form.get("enable_build") else "false"
-        build_project = request.form.get("build_project", "").strip()
-        build_env = request.form.get("build_env", "ubuntu-standard-7.0").strip()
-        build_compute = request.form.get("build_compute", "small").strip()
-        buildspec = request.form.get("buildspec", "").strip()
-        enable_build_cache = "true" if request.form.get("enable_build_cache") else "false"
-
-        # Variables d'environnement (JSON string)
-        build_env_vars = request.form.get("build_env_vars", "[]")
-
-        # Configuration test
-        enable_test = "true" if request.form.get("enable_test") else "false"
-        test_project = request.form.get("test_project", "").strip()
-        test_type = request.form.get("test_type", "integration").strip()
-
-        # Configuration approbation
-        manual_approval = "true" if request.form.get("manual_approval") else "false"
-        approval_sns_topic = request.form.get("approval_sns_topic", "").strip()
-        approvers = request.form.get("approvers", "").strip()
-
-        # Configuration déploiement
-        deploy_provider = request.form.get("deploy_provider", "").strip()
-        
-        # ECS
-        ecs_cluster = request.form.get("ecs_cluster", "").strip()
-        ecs_service = request.form.get("ecs_service", "").strip()
-        ecs_image_definition_file = request.form.get("ecs_image_definition_file", "imagedefinitions.json").strip()
-        
-        # CodeDeploy
-        codedeploy_application = request.form.get("codedeploy_application", "").strip()
-        codedeploy_deployment_group = request.form.get("codedeploy_deployment_group", "").strip()
-        
-        # Lambda
-        lambda_function_name = request.form.get("lambda_function_name", "").strip()
-        
-        # S3
-        s3_deploy_bucket = request.form.get("s3_deploy_bucket", "").strip()
-        s3_extract = "true" if request.form.get("s3_extract") else "false"
-
-        # Notifications
-        enable_notifications = "true" if request.form.get("enable_notifications") else "false"
-        notification_sns_topic = request.form.get("notification_sns_topic", "").strip()
-        enable_cloudwatch_alarms = "true" if request.form.get("enable_cloudwatch_alarms") else "false"
-
-        # Tags et métadonnées
-        tags = request.form.get("tags", "[]")
-        owner = request.form.get("owner", "").strip()
-        cost_center = request.form.get("cost_center", "").strip()
-
-        # Validations de base
-        if not all([pipeline_name, environment, source_provider, deploy_provider]):
-            return ResponseService.error_response("Champs obligatoires manquants", service="CODEPIPELINE")
-
-        if not re.match(r'^[a-zA-Z0-9_-]+$', pipeline_name):
-            return ResponseService.error_response(f"Nom de pipeline invalide: '{pipeline_name}'", service="CODEPIPELINE")
-
-        if environment not in ["dev", "staging", "prod"]:
-            return ResponseService.error_response(f"Environnement invalide: '{environment}'", service="CODEPIPELINE")
-
-        # Validation selon le provider source
-        if source_provider in ["GitHub", "GitHubEnterprise", "Bitbucket"]:
-            if not repository:
-                return ResponseService.error_response("Repository obligatoire pour GitHub/Bitbucket", service="CODEPIPELINE")
-        elif source_provider == "CodeCommit":
-            if not codecommit_repository:
-                return ResponseService.error_response("Nom du repository CodeCommit obligatoire", service="CODEPIPELINE")
-        elif source_provider == "S3":
-            if not s3_bucket or not s3_object_key:
-                return ResponseService.error_response("Bucket et clé S3 obligatoires", service="CODEPIPELINE")
-
-        # Validation selon le provider de déploiement
-        if deploy_provider in ["ECS", "ECS-BlueGreen"]:
-            if not ecs_cluster or not ecs_service:
-                return ResponseService.error_response("Cluster et service ECS obligatoires", service="CODEPIPELINE")
-        elif deploy_provider == "CodeDeploy":
-            if not codedeploy_application or not codedeploy_deployment_group:
-                return ResponseService.error_response("Application et deployment group CodeDeploy obligatoires", service="CODEPIPELINE")
-        elif deploy_provider == "Lambda":
-            if not lambda_function_name:
-                return ResponseService.error_response("Nom de fonction Lambda obligatoire", service="CODEPIPELINE")
-        elif deploy_provider == "S3":
-            if not s3_deploy_bucket:
-                return ResponseService.error_response("Bucket S3 de destination obligatoire", service="CODEPIPELINE")
-
-        # Payload GitHub Actions
-        payload = {
-            "ref": "main",
-            "inputs": {
-                # Base
-                "pipeline_name": pipeline_name,
-                "environment": environment,
-                "region": region,
-                "description": description,
-                
-                # Source
-                "source_provider": source_provider,
-                "github_connection_arn": github_connection,
-                "repository": repository,
-                "branch": branch,
-                "codecommit_repository_name": codecommit_repository,
-                "codecommit_branch": codecommit_branch,
-                "s3_source_bucket": s3_bucket,
-                "s3_source_object_key": s3_object_key,
-                
-                # Build
-                "enable_build": enable_build,
-                "build_project_name": build_project,
-                "build_environment": build_env,
-                "build_compute_type": build_compute,
-                "buildspec": buildspec,
-                "build_env_vars": build_env_vars,
-                "enable_build_cache": enable_build_cache,
-                
-                # Test
-                "enable_test": enable_test,
-                "test_project_name": test_project,
-                "test_type": test_type,
-                
-                # Approval
-                "manual_approval": manual_approval,
-                "approval_sns_topic_arn": approval_sns_topic,
-                "approvers": approvers,
-                
-                # Deploy
-                "deploy_provider": deploy_provider,
-                "ecs_cluster_name": ecs_cluster,
-                "ecs_service_name": ecs_service,
-                "ecs_image_definition_file": ecs_image_definition_file,
-                "codedeploy_application_name": codedeploy_application,
-                "codedeploy_deployment_group_name": codedeploy_deployment_group,
-                "lambda_function_name": lambda_function_name,
-                "s3_deploy_bucket": s3_deploy_bucket,
-                "s3_extract_archive": s3_extract,
-                
-                # Notifications
-                "enable_notifications": enable_notifications,
-                "notification_sns_topic_arn": notification_sns_topic,
-                "enable_cloudwatch_alarms": enable_cloudwatch_alarms,
-                
-                # Tags
-                "tags": tags,
-                "owner": owner,
-                "cost_center": cost_center
-            }
-        }
-
-        # Déclenchement du workflow
-        response = GitHubService.trigger_workflow("codepipeline", payload)
-        
-        if response.status_code == 204:
-            # Construire les détails selon la configuration
-            details = {
-                "Nom du pipeline": pipeline_name,
-                "Environnement": environment,
-                "Source": f"{source_provider} → {repository if repository else codecommit_repository if codecommit_repository else s3_bucket}",
-                "Build": "Activé" if enable_build == "true" else "Désactivé",
-            }
-            
-            if enable_test == "true":
-                details["Tests"] = test_type.capitalize()
-            
-            if manual_approval == "true":
-                details["Approbation"] = "Manuelle requise"
-            
-            details["Déploiement"] = deploy_provider
-            
-            if enable_notifications == "true":
-                details["Notifications"] = "SNS activé"
-
-            return ResponseService.success_response(
-                service="CODEPIPELINE",
-                title="Pipeline CI/CD",
-                details=details
-            )
-        else:
-            return ResponseService.error_response(
-                f"Erreur GitHub API (Code: {response.status_code})",
-                response.text,
-                service="CODEPIPELINE"
-            )
-
-    except Exception as e:
-        return ResponseService.error_response("Erreur inattendue", str(e), service="CODEPIPELINE")
+    return DispatchService.handle_form("codepipeline", request.form)
 
 # ========== CODEBUILD ==========
 @devops_bp.route('/codebuild')
+@cached_page
 def codebuild_form():
     """Formulaire CodeBuild — Projet Build Serverless."""
     return render_template('form_codebuild.html')
 
+form_schema(
+    "codebuild", service="CODEBUILD", title="Projet Build",
+    name_field="project_name",
+    fields=[
+        # Base
+        Field("project_name", "Nom de projet", required=True, pattern=r'^[a-zA-Z0-9_-]+$'),
+        Field("environment", "Environnement", required=True, choices=ENVIRONMENTS),
+        Field("region", "Région", default="eu-west-3"),
+        Field("description", "Description"),
+
+        # Source
+        Field("source_type", "Type de source", required=True,
+              choices=("CODECOMMIT", "CODEPIPELINE", "GITHUB", "GITHUB_ENTERPRISE", "BITBUCKET", "S3", "NO_SOURCE")),
+        Field("source_location", "Emplacement source"),
+        Field("source_version", "Version source", default="main"),
+
+        # Environnement
+        Field("environment_type", "Type d'environnement", default="LINUX_CONTAINER",
+              choices=("LINUX_CONTAINER", "LINUX_GPU_CONTAINER", "ARM_CONTAINER", "WINDOWS_CONTAINER",
+                       "WINDOWS_SERVER_2019_CONTAINER")),
+        Field("image", "Image", input=False),
+        Field("custom_image", "Image personnalisée", input=False),
+        Field("compute_type", "Type de compute", default="BUILD_GENERAL1_MEDIUM",
+              choices=("BUILD_GENERAL1_SMALL", "BUILD_GENERAL1_MEDIUM", "BUILD_GENERAL1_LARGE",
+                       "BUILD_GENERAL1_2XLARGE")),
+        Field("privileged_mode", kind=FLAG),
+
+        # Buildspec
+        Field("buildspec_type", "Type de buildspec", default="file", choices=("file", "inline")),
+        Field("buildspec", "Buildspec"),
+        Field("buildspec_path", "Chemin du buildspec", default="buildspec.yml"),
+
+        # Variables d'environnement
+        Field("environment_variables", "Variables d'environnement", kind=JSON, default="[]"),
+
+        # Artifacts
+        Field("artifacts_type", "Type d'artifacts", default="NO_ARTIFACTS",
+              choices=("NO_ARTIFACTS", "S3", "CODEPIPELINE")),
+        Field("artifacts_bucket", "Bucket S3 des artifacts"),
+        Field("artifacts_path", "Chemin des artifacts"),
+
+        # Cache
+        Field("enable_cache", kind=FLAG),
+        Field("cache_bucket", "Bucket S3 du cache"),
+        Field("cache_paths", "Chemins en cache"),
+
+        # Logs
+        Field("cloudwatch_logs", kind=FLAG, input="cloudwatch_logs_enabled"),
+        Field("s3_logs", kind=FLAG, input="s3_logs_enabled"),
+
+        # Timeouts
+        Field("timeout", "Timeout", kind=INT, default="60", minimum=5, maximum=480, input="timeout_minutes"),
+        Field("queued_timeout", "Timeout en file", kind=INT, default="480", minimum=5, maximum=480,
+              input="queued_timeout_minutes"),
+    ],
+    rules=[
+        required_unless("source_type", ["NO_SOURCE", "CODEPIPELINE"], "source_location",
+                        message="Emplacement source obligatoire pour ce type de source"),
+        required_if("image", ["CUSTOM"], "custom_image"),
+        required_if("artifacts_type", ["S3"], "artifacts_bucket", message="Bucket S3 obligatoire pour les artifacts"),
+        required_if("enable_cache", ["true"], "cache_bucket", message="Bucket S3 obligatoire pour le cache"),
+    ],
+    computed={
+        # Image finale transmise au workflow
+        "image": lambda v: v["custom_image"] if v["image"] == "CUSTOM" else v["image"],
+    },
+    details=[
+        ("Nom du projet",   "{project_name}"),
+        ("Environnement",   "{environment}"),
+        ("Source",          "{source_type}"),
+        ("Image",           lambda v: v["image"].split('/')[-1]),
+        ("Compute",         lambda v: v["compute_type"].replace('BUILD_GENERAL1_', '')),
+        ("Mode privilégié", lambda v: "Activé (Docker)" if v["privileged_mode"] == "true" else None),
+        ("Cache S3",        lambda v: "Activé" if v["enable_cache"] == "true" else None),
+        ("Artifacts",       lambda v: v["artifacts_type"] if v["artifacts_type"] != "NO_ARTIFACTS" else None),
+    ],
+)
+
 @devops_bp.route('/trigger-codebuild', methods=['POST'])
 def trigger_codebuild():
     """Déclenche le workflow Terraform CodeBuild."""
-    try:
-        # Récupération des champs de base
-        project_name = request.form.get("project_name", "").strip()
-        environment = request.form.get("environment", "").strip()
-        region = request.form.get("region", "eu-west-3").strip()
-        description = request.form.get("description", "").strip()
-
-        # Configuration source
-        source_type = request.form.get("source_type", "").strip()
-        source_location = request.form.get("source_location", "").strip()
-        source_version = request.form.get("source_version", "main").strip()
-
-        # Configuration environnement
-        environment_type = request.form.get("environment_type", "LINUX_CONTAINER").strip()
-        image = request.form.get("image", "").strip()
-        custom_image = request.form.get("custom_image", "").strip()
-        compute_type = request.form.get("compute_type", "BUILD_GENERAL1_MEDIUM").strip()
-        privileged_mode = "true" if request.form.get("privileged_mode") else "false"
-
-        # Configuration buildspec
-        buildspec_type = request.form.get("buildspec_type", "file").strip()
-        buildspec = request.form.get("buildspec", "").strip()
-        buildspec_path = request.form.get("buildspec_path", "buildspec.yml").strip()
-
-        # Variables d'environnement (JSON string)
-        environment_variables = request.form.get("environment_variables", "[]")
-
-        # Configuration artifacts
-        artifacts_type = request.form.get("artifacts_type", "NO_ARTIFACTS").strip()
-        artifacts_bucket = request.form.get("artifacts_bucket", "").strip()
-        artifacts_path = request.form.get("artifacts_path", "").strip()
-
-        # Configuration cache
-        enable_cache = "true" if request.form.get("enable_cache") else "false"
-        cache_bucket = request.form.get("cache_bucket", "").strip()
-        cache_paths = request.form.get("cache_paths", "").strip()
-
-        # Configuration logs
-        cloudwatch_logs = "true" if request.form.get("cloudwatch_logs") else "false"
-        s3_logs = "true" if request.form.get("s3_logs") else "false"
-
-        # Timeouts
-        timeout = request.form.get("timeout", "60").strip()
-        queued_timeout = request.form.get("queued_timeout", "480").strip()
-
-        # Validations de base
-        if not all([project_name, environment, source_type]):
-            return ResponseService.error_response("Champs obligatoires manquants", service="CODEBUILD")
-
-        if not re.match(r'^[a-zA-Z0-9_-]+$', project_name):
-            return ResponseService.error_response(f"Nom de projet invalide: '{project_name}'", service="CODEBUILD")
-
-        if environment not in ["dev", "staging", "prod"]:
-            return ResponseService.error_response(f"Environnement invalide: '{environment}'", service="CODEBUILD")
-
-        # Validation selon le type de source
-        if source_type not in ["NO_SOURCE", "CODEPIPELINE"] and not source_location:
-            return ResponseService.error_response(f"Emplacement source obligatoire pour le type '{source_type}'", service="CODEBUILD")
-
-        # Validation artifacts S3
-        if artifacts_type == "S3" and not artifacts_bucket:
-            return ResponseService.error_response("Bucket S3 obligatoire pour les artifacts", service="CODEBUILD")
-
-        # Validation cache S3
-        if enable_cache == "true" and not cache_bucket:
-            return ResponseService.error_response("Bucket S3 obligatoire pour le cache", service="CODEBUILD")
-
-        # Déterminer l'image finale
-        final_image = custom_image if image == "CUSTOM" else image
-
-        # Payload GitHub Actions
-        payload = {
-            "ref": "main",
-            "inputs": {
-                # Base
-                "project_name": project_name,
-                "environment": environment,
-                "region": region,
-                "description": description,
-                
-                # Source
-                "source_type": source_type,
-                "source_location": source_location,
-                "source_version": source_version,
-                
-                # Environnement
-                "environment_type": environment_type,
-                "image": final_image,
-                "compute_type": compute_type,
-                "privileged_mode": privileged_mode,
-                
-                # Buildspec
-                "buildspec_type": buildspec_type,
-                "buildspec": buildspec,
-                "buildspec_path": buildspec_path,
-                
-                # Variables d'environnement
-                "environment_variables": environment_variables,
-                
-                # Artifacts
-                "artifacts_type": artifacts_type,
-                "artifacts_bucket": artifacts_bucket,
-                "artifacts_path": artifacts_path,
-                
-                # Cache
-                "enable_cache": enable_cache,
-                "cache_bucket": cache_bucket,
-                "cache_paths": cache_paths,
-                
-                # Logs
-                "cloudwatch_logs_enabled": cloudwatch_logs,
-                "s3_logs_enabled": s3_logs,
-                
-                # Timeouts
-                "timeout_minutes": timeout,
-                "queued_timeout_minutes": queued_timeout
-            }
-        }
-
-        # Déclenchement du workflow
-        response = GitHubService.trigger_workflow("codebuild", payload)
-        
-        if response.status_code == 204:
-            # Construire les détails
-            details = {
-                "Nom du projet": project_name,
-                "Environnement": environment,
-                "Source": f"{source_type}",
-                "Image": final_image.split('/')[-1] if '/' in final_image else final_image,
-                "Compute": compute_type.replace('BUILD_GENERAL1_', ''),
-            }
-            
-            if privileged_mode == "true":
-                details["Mode privilégié"] = "Activé (Docker)"
-            
-            if enable_cache == "true":
-                details["Cache S3"] = "Activé"
-            
-            if artifacts_type != "NO_ARTIFACTS":
-                details["Artifacts"] = artifacts_type
-
-            return ResponseService.success_response(
-                service="CODEBUILD",
-                title="Projet Build",
-                details=details
-            )
-        else:
-            return ResponseService.error_response(
-                f"Erreur GitHub API (Code: {response.status_code})",
-                response.text,
-                service="CODEBUILD"
-            )
-
-    except Exception as e:
-        return ResponseService.error_response("Erreur inattendue", str(e), service="CODEBUILD")
+    return DispatchService.handle_form("codebuild", request.form)
 
 # ========== CODEDEPLOY ==========
 @devops_bp.route('/codedeploy')
+@cached_page
 def codedeploy_form():
     """Formulaire CodeDeploy."""
     return render_template('form_codedeploy.html')
 
-@devops_bp.route('/trigger-codedeploy', methods=['POST'])
-def trigger_codedeploy():
-    """Déclenche le workflow Terraform CodeDeploy."""
-    try:
-        application_name = request.form.get("application_name", "").strip()
-        compute_platform = request.form.get("compute_platform", "").strip()
-        deployment_group_name = request.form.get("deployment_group_name", "").strip()
-        environment = request.form.get("environment", "").strip()
-        region = request.form.get("region", "eu-west-3").strip()
-        deployment_config = request.form.get("deployment_config", "").strip()
+form_schema(
+    "codedeploy", service="CODEDEPLOY", title="Application",
+    name_field="application_name",
+    fields=[
+        Field("application_name", "Nom", required=True, pattern=r'^[a-zA-Z0-9_-]+$'),
+        Field("compute_platform", "Plateforme", required=True, choices=("Server", "Lambda", "ECS")),
+        Field("deployment_group_name", "Deployment group", required=True),
+        Field("environment", "Environnement", required=True, choices=ENVIRONMENTS),
+        Field("region", "Région", default="eu-west-3"),
+        Field("deployment_config", "Stratégie", input="deployment_config_name"),
 
         # EC2
-        ec2_tag_filters = request.form.get("ec2_tag_filters", "").strip()
-        autoscaling_groups = request.form.get("autoscaling_groups", "").strip()
+        Field("ec2_tag_filters", "Filtres de tags EC2"),
+        Field("autoscaling_groups", "Groupes Auto Scaling"),
 
         # Lambda
-        lambda_function_name = request.form.get("lambda_function_name", "").strip()
-        lambda_alias = request.form.get("lambda_alias", "live").strip()
+        Field("lambda_function_name", "Nom de fonction Lambda"),
+        Field("lambda_alias", "Alias Lambda", default="live"),
 
         # ECS
-        ecs_cluster_name = request.form.get("ecs_cluster_name", "").strip()
-        ecs_service_name = request.form.get("ecs_service_name", "").strip()
+        Field("ecs_cluster_name", "Cluster ECS"),
+        Field("ecs_service_name", "Service ECS"),
 
         # Blue/Green
-        blue_green = "true" if request.form.get("blue_green_deployment") else "false"
-        green_fleet_option = request.form.get("green_fleet_option", "").strip()
-        terminate_blue = request.form.get("terminate_blue_instances", "").strip()
-        bg_timeout = request.form.get("blue_green_timeout", "60").strip()
+        Field("blue_green_deployment", kind=FLAG, input="blue_green_enabled"),
+        Field("green_fleet_option", "Option de flotte green",
+              choices=("COPY_AUTO_SCALING_GROUP", "DISCOVER_EXISTING")),
+        Field("terminate_blue_instances", "Instances blue", choices=("TERMINATE", "KEEP_ALIVE")),
+        Field("blue_green_timeout", "Timeout Blue/Green", kind=INT, default="60", minimum=0, maximum=2880),
 
         # Rollback
-        auto_rollback = "true" if request.form.get("auto_rollback") else "false"
-        rollback_on_failure = "true" if request.form.get("rollback_on_failure") else "false"
-        rollback_on_alarm = "true" if request.form.get("rollback_on_alarm") else "false"
+        Field("auto_rollback", kind=FLAG, input="auto_rollback_enabled"),
+        Field("rollback_on_failure", kind=FLAG),
+        Field("rollback_on_alarm", kind=FLAG),
 
         # Load Balancer
-        use_lb = "true" if request.form.get("use_load_balancer") else "false"
-        lb_type = request.form.get("load_balancer_type", "").strip()
-        tg_name = request.form.get("target_group_name", "").strip()
-        classic_lb = request.form.get("classic_lb_name", "").strip()
-
-        if not all([application_name, compute_platform, deployment_group_name, environment]):
-            return ResponseService.error_response("Champs obligatoires manquants", service="CODEDEPLOY")
-
-        if not re.match(r'^[a-zA-Z0-9_-]+$', application_name):
-            return ResponseService.error_response(f"Nom invalide: '{application_name}'", service="CODEDEPLOY")
-
-        payload = {
-            "ref": "main",
-            "inputs": {
-                "application_name": application_name,
-                "compute_platform": compute_platform,
-                "deployment_group_name": deployment_group_name,
-                "environment": environment,
-                "region": region,
-                "deployment_config_name": deployment_config,
-                "ec2_tag_filters": ec2_tag_filters,
-                "autoscaling_groups": autoscaling_groups,
-                "lambda_function_name": lambda_function_name,
-                "lambda_alias": lambda_alias,
-                "ecs_cluster_name": ecs_cluster_name,
-                "ecs_service_name": ecs_service_name,
-                "blue_green_enabled": blue_green,
-                "green_fleet_option": green_fleet_option,
-                "terminate_blue_instances": terminate_blue,
-                "blue_green_timeout": bg_timeout,
-                "auto_rollback_enabled": auto_rollback,
-                "rollback_on_failure": rollback_on_failure,
-                "rollback_on_alarm": rollback_on_alarm,
-                "use_load_balancer": use_lb,
-                "load_balancer_type": lb_type,
-                "target_group_name": tg_name,
-                "classic_lb_name": classic_lb
-            }
-        }
-
-        response = GitHubService.trigger_workflow("codedeploy", payload)
-        
-        if response.status_code == 204:
-            details = {
-                "Application": application_name,
-                "Plateforme": compute_platform,
-                "Deployment Group": deployment_group_name,
-                "Environnement": environment,
-                "Stratégie": deployment_config.replace('CodeDeployDefault.', '')
-            }
-            
-            if blue_green == "true":
-                details["Mode"] = "Blue/Green"
-            if auto_rollback == "true":
-                details["Rollback"] = "Automatique"
-
-            return ResponseService.success_response(service="CODEDEPLOY", title="Application", details=details)
-        else:
-            return ResponseService.error_response(f"Erreur GitHub API ({response.status_code})", response.text, service="CODEDEPLOY")
-    except Exception as e:
-        return ResponseService.error_response("Erreur inattendue", str(e), service="CODEDEPLOY")
\ No newline at end of file
+        Field("use_load_balancer", kind=FLAG),
+        Field("load_balancer_type", "Type de load balancer", choices=("target_group", "classic")),
+        Field("target_group_name", "Target group"),
+        Field("classic_lb_name", "Load balancer classique"),
+    ],
+    rules=[
+        required_if("compute_platform", ["Lambda"], "lambda_function_name"),
+        required_if("compute_platform", ["ECS"], "ecs_cluster_name", "ecs_service_name"),
+    ],
+    details=[
+        ("Application",      "{application_name}"),
+        ("Plateforme",       "{compute_platform}"),
+        ("Deployment Group", "{deployment_group_name}"),
+        ("Environnement",    "{environment}"),
+        ("Stratégie",        lambda v: v["deployment_config"].replace('CodeDeployDefault.', '')),
+        ("Mode",             lambda v: "Blue/Green" if v["blue_green_deployment"] == "true" else None),
+        ("Rollback",         lambda v: "Automatique" if v["auto_rollback"] == "true" else None),
+    ],
+)
+
+@devops_bp.route('/trigger-codedeploy', methods=['POST'])
+def trigger_codedeploy():
+    """Déclenche le workflow Terraform CodeDeploy."""
+    return DispatchService.handle_form("codedeploy", request.form)
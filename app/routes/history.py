@@ -0,0 +1,50 @@
+"""Routes de l'historique des déploiements."""
+from flask import Blueprint, request
+
+from app.services.admin import admin_required
+from app.services.history import InvalidCursor, InvalidSearch, get_history
+from app.services.response_service import ResponseService
+
+history_bp = Blueprint('history', __name__)
+
+
+@history_bp.route('/history/stats')
+@admin_required
+def history_stats():
+    """Taille de l'historique et tampon d'écriture de ce worker (lots, débordements)."""
+    store = get_history()
+    if store is None:
+        return {"enabled": False}
+    return dict(store.stats(), enabled=True)
+
+
+@history_bp.route('/history')
+def history():
+    """
+    Historique des déploiements, du plus récent au plus ancien (HTML, ou JSON).
+
+    Paramètres : q (recherche plein texte, ex: `owner:alice sonatel-*`),
+    service, environment, limit, cursor (lien « page suivante »).
+    """
+    store = get_history()
+    if store is None:
+        return ResponseService.error_response("Historique désactivé", "HISTORY_ENABLED=false", status=404)
+    query = request.args.get('q', '').strip()
+    if query and not store.searchable:
+        return ResponseService.error_response("Recherche indisponible", "HISTORY_SEARCH_ENABLED=false ou SQLite sans FTS5",
+                                              status=404)
+    filters = {
+        "service": request.args.get('service') or None,
+        "environment": request.args.get('environment') or None,
+        "limit": request.args.get('limit', type=int),
+    }
+    try:
+        if query:
+            entries, next_cursor = store.search(query, cursor=request.args.get('cursor'), **filters)
+        else:
+            entries, next_cursor = store.page(cursor=request.args.get('cursor'), **filters)
+    except InvalidSearch as e:
+        return ResponseService.error_response("Recherche invalide", str(e), status=400)
+    except InvalidCursor as e:
+        return ResponseService.error_response("Pagination invalide", str(e), status=400)
+    return ResponseService.history_response(entries, next_cursor, dict(filters, q=query or None))
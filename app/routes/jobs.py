@@ -0,0 +1,42 @@
+"""Routes de suivi des déclenchements asynchrones."""
+from flask import Blueprint, jsonify
+
+from app.services.admin import admin_required
+from app.services.job_queue import JOB_RETRYING, Job, get_job_queue
+from app.services.outbox import get_outbox
+from app.services.response_service import ResponseService
+
+jobs_bp = Blueprint('jobs', __name__)
+
+
+@jobs_bp.route('/jobs/stats')
+@admin_required
+def job_stats():
+    """Profondeur de la file, occupation des workers et temps d'attente."""
+    return jsonify(get_job_queue().stats())
+
+
+@jobs_bp.route('/outbox/stats')
+@admin_required
+def outbox_stats():
+    """Débit, retentatives, ancienneté de l'attente et état du disjoncteur."""
+    return jsonify(get_outbox().stats())
+
+
+@jobs_bp.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Statut d'un job (HTML, ou JSON avec Accept: application/json / ?format=json)."""
+    job = get_job_queue().get(job_id)
+    if job is None or job.status == JOB_RETRYING:
+        # Job d'un autre worker, repris par le dispatcher de fond ou en retentative
+        item = get_outbox().get(job_id)
+        job = Job.from_outbox(item) if item else job
+    if job is None:
+        if ResponseService.wants_json():
+            return {"error": "Job introuvable", "id": job_id}, 404
+        return ResponseService.error_response(
+            "Job introuvable",
+            f"Aucun job '{job_id}' (expiré ou inconnu)",
+            status=404,
+        )
+    return ResponseService.job_response(job)
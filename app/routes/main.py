@@ -1,9 +1,12 @@
 """Routes principales de l'application."""
 from flask import Blueprint, render_template, current_app
+from app.services.health import get_health_checker
+from app.services.page_cache import cached_page
 
 main_bp = Blueprint('main', __name__)
 
 @main_bp.route('/')
+@cached_page
 def index():
     services = current_app.config['SERVICES']
     return render_template(
@@ -14,10 +17,32 @@ def index():
 
 
 @main_bp.route('/aide')
+@cached_page
 def aide():
     """Page d'aide et guide d'utilisation."""
     return render_template('aide.html')
 
 @main_bp.route('/health')
+@main_bp.route('/health/live')
 def health():
-    return {"status": "ok", "services": len(current_app.config['SERVICES'])}
\ No newline at end of file
+    """Vivacité : le worker répond (aucune dépendance externe vérifiée)."""
+    return {"status": "ok", "services": len(current_app.config['SERVICES'])}
+
+
+@main_bp.route('/health/ready')
+def ready():
+    """
+    Disponibilité : dernier résultat du vérificateur de fond (503 si non prêt,
+    200 si prêt ou seulement dégradé). Vérificateur désactivé
+    (HEALTH_CHECK_ENABLED=false) : 200 avec "checks": "disabled", aucune
+    dépendance n'est vérifiée.
+    """
+    checker = get_health_checker()
+    if checker is None:
+        response = current_app.make_response({"status": "ready", "checks": "disabled"})
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    is_ready, body = checker.probe()
+    response = current_app.response_class(body, status=200 if is_ready else 503, mimetype='application/json')
+    response.headers['Cache-Control'] = 'no-store'
+    return response
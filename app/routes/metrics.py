@@ -0,0 +1,15 @@
+"""Route d'exposition des métriques Prometheus."""
+from flask import Blueprint, Response, current_app
+
+from app.services.metrics import render_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics')
+def metrics():
+    """Métriques au format texte Prometheus, agrégées sur tous les workers."""
+    if not current_app.extensions['metrics']:
+        return {"error": "Métriques désactivées (METRICS_ENABLED ou prometheus-client absent)"}, 404
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
@@ -1,198 +1,116 @@
 """Routes pour les services réseau (VPC, ELB, CloudFront, Route53)."""
 from flask import Blueprint, render_template, request
-from app.services.github_service import GitHubService
-from app.services.response_service import ResponseService
+from app.services.dispatch_service import DispatchService
+from app.services.form_schema import INT, Field, form_schema
+from app.services.page_cache import cached_page
 
 network_bp = Blueprint('network', __name__)
 
 # ========== VPC ==========
 @network_bp.route('/vpc')
+@cached_page
 def vpc_form():
     """Formulaire VPC — Virtual Private Cloud."""
     return render_template('form_vpc.html')
 
+form_schema(
+    "vpc", service="VPC", title="Virtual Private Cloud",
+    name_field="vpc_name",
+    fields=[
+        Field("vpc_name", "Nom du VPC", required=True),
+        Field("cidr_block", "Bloc CIDR", default="10.0.0.0/16", pattern=r'^\d{1,3}(\.\d{1,3}){3}/\d{1,2}$'),
+        Field("availability_zones", "Zones de disponibilité", kind=INT, default="2", minimum=1, maximum=6),
+    ],
+    details=[
+        ("Nom",  "{vpc_name}"),
+        ("CIDR", "{cidr_block}"),
+        ("AZs",  "{availability_zones} zones"),
+    ],
+)
+
 @network_bp.route('/vpc/trigger', methods=['POST'])
 def trigger_vpc():
     """Déclenche le workflow Terraform VPC."""
-    try:
-        vpc_name   = request.form.get("vpc_name", "").strip()
-        cidr_block = request.form.get("cidr_block", "10.0.0.0/16").strip()
-        azs        = request.form.get("availability_zones", "2").strip()
-
-        if not vpc_name:
-            return ResponseService.error_response("Nom du VPC obligatoire", service="VPC")
-
-        payload = {
-            "ref": "main",
-            "inputs": {
-                "vpc_name":            vpc_name,
-                "cidr_block":          cidr_block,
-                "availability_zones":  azs,
-            }
-        }
-
-        response = GitHubService.trigger_workflow("vpc", payload)
-        
-        if response.status_code == 204:
-            return ResponseService.success_response(
-                service="VPC",
-                title="Virtual Private Cloud",
-                details={
-                    "Nom":   vpc_name,
-                    "CIDR":  cidr_block,
-                    "AZs":   f"{azs} zones",
-                }
-            )
-        else:
-            return ResponseService.error_response(
-                f"Erreur GitHub API ({response.status_code})", 
-                response.text, 
-                service="VPC"
-            )
-
-    except Exception as e:
-        return ResponseService.error_response("Erreur inattendue", str(e), service="VPC")
+    return DispatchService.handle_form("vpc", request.form)
 
 # ========== ELB ==========
 @network_bp.route('/elb')
+@cached_page
 def elb_form():
     """Formulaire ELB — Elastic Load Balancing."""
     return render_template('form_elb.html')
 
+form_schema(
+    "elb", service="ELB", title="Elastic Load Balancer",
+    name_field="lb_name",
+    fields=[
+        Field("lb_name", "Nom du Load Balancer", required=True),
+        Field("lb_type", "Type", default="application", choices=("application", "network")),
+        Field("target_group_port", "Port du target group", kind=INT, default="80", minimum=1, maximum=65535),
+    ],
+    details=[
+        ("Nom",  "{lb_name}"),
+        ("Type", lambda v: v["lb_type"].upper()),
+        ("Port", "{target_group_port}"),
+    ],
+)
+
 @network_bp.route('/elb/trigger', methods=['POST'])
 def trigger_elb():
     """Déclenche le workflow Terraform ELB."""
-    try:
-        lb_name  = request.form.get("lb_name", "").strip()
-        lb_type  = request.form.get("lb_type", "application").strip()
-        tg_port  = request.form.get("target_group_port", "80").strip()
-
-        if not lb_name:
-            return ResponseService.error_response("Nom du Load Balancer obligatoire", service="ELB")
-
-        payload = {
-            "ref": "main",
-            "inputs": {
-                "lb_name":            lb_name,
-                "lb_type":            lb_type,
-                "target_group_port":  tg_port,
-            }
-        }
-
-        response = GitHubService.trigger_workflow("elb", payload)
-        
-        if response.status_code == 204:
-            return ResponseService.success_response(
-                service="ELB",
-                title="Elastic Load Balancer",
-                details={
-                    "Nom":   lb_name,
-                    "Type":  lb_type.upper(),
-                    "Port":  tg_port,
-                }
-            )
-        else:
-            return ResponseService.error_response(
-                f"Erreur GitHub API ({response.status_code})", 
-                response.text, 
-                service="ELB"
-            )
-
-    except Exception as e:
-        return ResponseService.error_response("Erreur inattendue", str(e), service="ELB")
+    return DispatchService.handle_form("elb", request.form)
 
 # ========== CLOUDFRONT ==========
 @network_bp.route('/cloudfront')
+@cached_page
 def cloudfront_form():
     """Formulaire CloudFront — Content Delivery Network."""
     return render_template('form_cloudfront.html')
 
+form_schema(
+    "cloudfront", service="CLOUDFRONT", title="Distribution CloudFront",
+    fields=[
+        Field("origin_domain", "Domaine d'origine", required=True),
+        Field("distribution_comment", "Commentaire"),
+        Field("price_class", "Price Class", default="PriceClass_100",
+              choices=("PriceClass_100", "PriceClass_200", "PriceClass_All")),
+    ],
+    details=[
+        ("Origine",     "{origin_domain}"),
+        ("Comment",     lambda v: v["distribution_comment"] or "N/A"),
+        ("Price Class", "{price_class}"),
+    ],
+)
+
 @network_bp.route('/cloudfront/trigger', methods=['POST'])
 def trigger_cloudfront():
     """Déclenche le workflow Terraform CloudFront."""
-    try:
-        origin_domain = request.form.get("origin_domain", "").strip()
-        comment       = request.form.get("distribution_comment", "").strip()
-        price_class   = request.form.get("price_class", "PriceClass_100").strip()
-
-        if not origin_domain:
-            return ResponseService.error_response("Domaine d'origine obligatoire", service="CLOUDFRONT")
-
-        payload = {
-            "ref": "main",
-            "inputs": {
-                "origin_domain":         origin_domain,
-                "distribution_comment":  comment,
-                "price_class":           price_class,
-            }
-        }
-
-        response = GitHubService.trigger_workflow("cloudfront", payload)
-        
-        if response.status_code == 204:
-            return ResponseService.success_response(
-                service="CLOUDFRONT",
-                title="Distribution CloudFront",
-                details={
-                    "Origine":      origin_domain,
-                    "Comment":      comment or "N/A",
-                    "Price Class":  price_class,
-                }
-            )
-        else:
-            return ResponseService.error_response(
-                f"Erreur GitHub API ({response.status_code})", 
-                response.text, 
-                service="CLOUDFRONT"
-            )
-
-    except Exception as e:
-        return ResponseService.error_response("Erreur inattendue", str(e), service="CLOUDFRONT")
+    return DispatchService.handle_form("cloudfront", request.form)
 
 # ========== ROUTE53 ==========
 @network_bp.route('/route53')
+@cached_page
 def route53_form():
     """Formulaire Route 53 — DNS."""
     return render_template('form_route53.html')
 
+form_schema(
+    "route53", service="ROUTE53", title="Zone DNS Route 53",
+    name_field="zone_name",
+    fields=[
+        Field("zone_name", "Nom de zone", required=True),
+        Field("record_type", "Type d'enregistrement", default="A",
+              choices=("A", "AAAA", "CNAME", "MX", "TXT", "NS")),
+        Field("record_value", "Valeur de l'enregistrement", required=True),
+    ],
+    details=[
+        ("Zone",   "{zone_name}"),
+        ("Type",   "{record_type}"),
+        ("Valeur", "{record_value}"),
+    ],
+)
+
 @network_bp.route('/route53/trigger', methods=['POST'])
 def trigger_route53():
     """Déclenche le workflow Terraform Route 53."""
-    try:
-        zone_name   = request.form.get("zone_name", "").strip()
-        record_type = request.form.get("record_type", "A").strip()
-        record_value = request.form.get("record_value", "").strip()
-
-        if not all([zone_name, record_value]):
-            return ResponseService.error_response("Champs obligatoires manquants", service="ROUTE53")
-
-        payload = {
-            "ref": "main",
-            "inputs": {
-                "zone_name":     zone_name,
-                "record_type":   record_type,
-                "record_value":  record_value,
-            }
-        }
-
-        response = GitHubService.trigger_workflow("route53", payload)
-        
-        if response.status_code == 204:
-            return ResponseService.success_response(
-                service="ROUTE53",
-                title="Zone DNS Route 53",
-                details={
-                    "Zone":    zone_name,
-                    "Type":    record_type,
-                    "Valeur":  record_value,
-                }
-            )
-        else:
-            return ResponseService.error_response(
-                f"Erreur GitHub API ({response.status_code})", 
-                response.text, 
-                service="ROUTE53"
-            )
-
-    except Exception as e:
-        return ResponseService.error_response("Erreur inattendue", str(e), service="ROUTE53")
\ No newline at end of file
+    return DispatchService.handle_form("route53", request.form)
@@ -0,0 +1,35 @@
+"""Accès aux endpoints d'administration (état interne des services)."""
+import functools
+import hmac
+
+from flask import current_app, request
+
+
+def admin_required(view):
+    """
+    Réserve une vue aux opérateurs.
+
+    Les endpoints d'administration exposent l'état du pool de jetons, le
+    quota, les délais internes : ils répondent 404 tant que
+    ADMIN_ENDPOINTS_ENABLED est faux. Si ADMIN_TOKEN est défini, l'en-tête
+    `Authorization: Bearer <ADMIN_TOKEN>` est exigé (401 sinon).
+
+    Args:
+        view: Fonction de vue Flask
+
+    Returns:
+        Vue protégée
+    """
+    @functools.wraps(view)
+    def protected(*args, **kwargs):
+        config = current_app.config
+        if not config['ADMIN_ENDPOINTS_ENABLED']:
+            return {"error": "Endpoint d'administration désactivé (ADMIN_ENDPOINTS_ENABLED)"}, 404
+        token = config['ADMIN_TOKEN']
+        if token:
+            supplied = request.headers.get('Authorization', '').encode('utf-8')
+            if not hmac.compare_digest(supplied, f"Bearer {token}".encode('utf-8')):
+                return {"error": "Authentification requise"}, 401, {'WWW-Authenticate': 'Bearer'}
+        return view(*args, **kwargs)
+
+    return protected
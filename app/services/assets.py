@@ -0,0 +1,208 @@
+"""
+Fichiers statiques empreintés : build, manifeste et résolution des URL.
+
+`flask assets build` copie chaque fichier de app/static/css et app/static/js
+vers ASSETS_FOLDER sous un nom qui contient l'empreinte de son contenu
+(css/forms.css -> css/forms.3f9a1c2b7d4e.css), écrit à côté ses variantes
+précompressées (.gz, et .br si le paquet brotli est installé) puis le
+manifeste nom logique -> fichier empreinté. Un fichier empreinté ne change
+jamais de contenu : il est servi sous /assets avec Cache-Control immutable.
+
+Les templates passent par asset_url() ; sans manifeste (développement sans
+build), l'URL retombe sur /static et le fichier source.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+import click
+from flask import current_app, url_for
+from flask.cli import AppGroup
+
+try:
+    import brotli
+except ImportError:  # optionnel : sans lui, seules les variantes .gz sont produites
+    brotli = None
+
+# Sous-dossiers de app/static traités par le build
+ASSET_DIRS = ('css', 'js')
+
+# Encodages précompressés, par ordre de préférence
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+MANIFEST_NAME = 'manifest.json'
+
+_create_lock = threading.Lock()
+
+
+def assets_folder(app=None):
+    """Dossier de sortie du build : ASSETS_FOLDER, sinon app/static/dist."""
+    app = app or current_app
+    return app.config.get('ASSETS_FOLDER') or os.path.join(app.static_folder, 'dist')
+
+
+def _write(path, data):
+    """Écrit un fichier de façon atomique (un worker ne lit jamais un fichier partiel)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def compress(data, encoding):
+    """Compresse au niveau maximal (contenu compressé une fois, servi souvent) ; None si indisponible."""
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == 'br' and brotli is not None:
+        return brotli.compress(data, quality=11)
+    return None
+
+
+def build_assets(source_folder, output_folder):
+    """
+    Empreinte, précompresse et indexe les fichiers statiques.
+
+    Les fichiers empreintés déjà présents (même contenu) ne sont pas
+    réécrits ; les anciennes versions sont conservées pour les pages encore
+    servies par des workers non redémarrés.
+
+    Args:
+        source_folder: Dossier static de l'application
+        output_folder: Dossier de sortie (ASSETS_FOLDER)
+
+    Returns:
+        dict manifeste {nom logique: {"path", "size", "encodings"}}
+    """
+    assets = {}
+    for directory in ASSET_DIRS:
+        for root, dirs, files in os.walk(os.path.join(source_folder, directory)):
+            dirs.sort()
+            for name in sorted(files):
+                if name.startswith('.'):
+                    continue
+                source = os.path.join(root, name)
+                logical = os.path.relpath(source, source_folder).replace(os.sep, '/')
+                with open(source, 'rb') as f:
+                    data = f.read()
+
+                stem, ext = os.path.splitext(logical)
+                hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+                target = os.path.join(output_folder, *hashed.split('/'))
+                entry = {"path": hashed, "size": len(data), "encodings": {}}
+
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                if not os.path.exists(target):
+                    _write(target, data)
+                for encoding, suffix in ENCODINGS:
+                    if not os.path.exists(target + suffix):
+                        compressed = compress(data, encoding)
+                        # Variante inutile si elle n'est pas plus petite (petits fichiers)
+                        if compressed is None or len(compressed) >= len(data):
+                            continue
+                        _write(target + suffix, compressed)
+                    entry["encodings"][encoding] = os.path.getsize(target + suffix)
+                assets[logical] = entry
+
+    os.makedirs(output_folder, exist_ok=True)
+    _write(os.path.join(output_folder, MANIFEST_NAME), json.dumps(assets, indent=2, sort_keys=True).encode())
+    return assets
+
+
+class AssetManifest:
+    """
+    Manifeste chargé en mémoire (une lecture par worker).
+
+    En mode debug, le fichier est relu quand il change, pour suivre un
+    `flask assets build` lancé pendant que le serveur tourne.
+    """
+
+    def __init__(self, folder, reload=False):
+        self.folder = folder
+        self.reload = reload
+        self._mtime = None
+        self._assets = {}
+        self._by_path = {}
+        self._load()
+
+    def _load(self):
+        path = os.path.join(self.folder, MANIFEST_NAME)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        assets = {}
+        if mtime is not None:
+            with open(path, encoding='utf-8') as f:
+                assets = json.load(f)
+        self._assets = assets
+        self._by_path = {entry["path"]: entry for entry in assets.values()}
+        self._mtime = mtime
+
+    def get(self, logical):
+        """Entrée du manifeste pour un nom logique (css/forms.css), ou None."""
+        if self.reload:
+            self._load()
+        return self._assets.get(logical)
+
+    def by_path(self, hashed):
+        """Entrée du manifeste pour un nom empreinté, ou None."""
+        if self.reload:
+            self._load()
+        return self._by_path.get(hashed)
+
+
+def get_manifest():
+    """Retourne le manifeste de l'application courante (chargé au besoin)."""
+    app = current_app._get_current_object()
+    manifest = app.extensions.get('assets')
+    if manifest is None:
+        with _create_lock:
+            manifest = app.extensions.get('assets')
+            if manifest is None:
+                manifest = AssetManifest(assets_folder(app), reload=app.debug)
+                app.extensions['assets'] = manifest
+    return manifest
+
+
+def asset_url(filename):
+    """
+    URL d'un fichier statique pour les templates.
+
+    Args:
+        filename: Chemin relatif à app/static (ex. 'css/forms.css')
+
+    Returns:
+        /assets/<nom empreinté> si le fichier est dans le manifeste,
+        sinon /static/<filename>
+    """
+    entry = get_manifest().get(filename)
+    if entry is None:
+        return url_for('static', filename=filename)
+    return url_for('assets.asset', filename=entry["path"])
+
+
+assets_cli = AppGroup('assets', help="Fichiers statiques empreintés.")
+
+
+@assets_cli.command('build')
+def build_command():
+    """Empreinte et précompresse app/static/css et app/static/js."""
+    output = assets_folder()
+    assets = build_assets(current_app.static_folder, output)
+    raw = sum(entry["size"] for entry in assets.values())
+    for encoding, _ in ENCODINGS:
+        sizes = [entry["encodings"].get(encoding, entry["size"]) for entry in assets.values()]
+        click.echo(f"{encoding:>5} : {sum(sizes)} octets")
+    click.echo(f"{len(assets)} fichiers ({raw} octets) -> {output}")
+    if brotli is None:
+        click.echo("brotli non installé : variantes .br non générées")
+
+
+def init_assets(app):
+    """Enregistre asset_url() pour les templates et la commande `flask assets`."""
+    app.jinja_env.globals['asset_url'] = asset_url
+    app.cli.add_command(assets_cli)
@@ -0,0 +1,174 @@
+"""Service de provisioning en masse (fichier JSON/CSV de N ressources)."""
+import csv
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from app.services.form_schema import get_schema
+from app.services.history import get_history
+from app.services.outbox import DELIVERED, LOST, RETRY, get_outbox
+from app.services.request_log import audit, deployment_fields
+from app.services.validation_service import ValidationError
+
+
+class BulkService:
+    """Lecture, validation groupée et déclenchement concurrent d'un lot."""
+
+    @staticmethod
+    def normalize_item(item):
+        """
+        Convertit une entrée JSON/CSV en champs de formulaire (chaînes).
+
+        Les booléens suivent la sémantique des cases à cocher HTML :
+        True → "on", False/None → "" (champ absent). Les listes et objets
+        sont sérialisés en JSON, comme les champs cachés des formulaires.
+        """
+        if not isinstance(item, dict):
+            raise ValidationError("Chaque élément doit être un objet clé/valeur")
+        fields = {}
+        for key, value in item.items():
+            if value is True:
+                fields[key] = "on"
+            elif value is False or value is None:
+                fields[key] = ""
+            elif isinstance(value, (list, dict)):
+                fields[key] = json.dumps(value)
+            else:
+                fields[key] = str(value)
+        return fields
+
+    @staticmethod
+    def parse_items(data: bytes, filename: str = "", content_type: str = ""):
+        """
+        Lit un lot de ressources depuis un contenu JSON ou CSV.
+
+        JSON : liste d'objets, ou {"items": [...]}. CSV : une ligne d'en-tête
+        avec les noms de champs du formulaire, puis une ressource par ligne.
+
+        Returns:
+            Liste de dicts de champs normalisés
+
+        Raises:
+            ValidationError: Si le contenu est illisible
+        """
+        is_csv = filename.lower().endswith('.csv') or 'csv' in content_type
+        try:
+            text = data.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise ValidationError("Le fichier doit être encodé en UTF-8")
+
+        if is_csv:
+            rows = list(csv.DictReader(io.StringIO(text)))
+        else:
+            try:
+                document = json.loads(text)
+            except json.JSONDecodeError as e:
+                raise ValidationError(f"JSON invalide: {e}")
+            rows = document.get('items') if isinstance(document, dict) else document
+            if not isinstance(rows, list):
+                raise ValidationError("Le JSON doit être une liste ou un objet {\"items\": [...]}")
+
+        return [BulkService.normalize_item(row) for row in rows]
+
+    @staticmethod
+    def validate(workflow_name: str, items):
+        """
+        Valide tous les éléments en une passe avec le schéma de la route.
+
+        Returns:
+            (built, errors) : liste de (payload, details) et liste
+            d'erreurs {"index", "error", "fields"} (vide si tout le lot est valide)
+        """
+        schema = get_schema(workflow_name)
+        built, errors = [], []
+        for index, fields in enumerate(items):
+            try:
+                built.append(schema.build(fields))
+            except ValidationError as e:
+                errors.append({"index": index, "error": str(e), "fields": e.errors})
+            except Exception as e:
+                errors.append({"index": index, "error": f"Erreur inattendue: {e}"})
+        return built, errors
+
+    @staticmethod
+    def dispatch_stream(app, workflow_name: str, built, concurrency: int, actor=None):
+        """
+        Déclenche les payloads en parallèle et produit les résultats au fil de l'eau.
+
+        Args:
+            app:           Application Flask (contexte pour les threads)
+            workflow_name: Clé du workflow dans WORKFLOWS
+            built:         Liste de (payload, details) validés
+            concurrency:   Nombre maximum de déclenchements simultanés
+            actor:         Utilisateur à l'origine du lot (journal d'audit)
+
+        Yields:
+            dicts de résultat par élément, dans l'ordre de complétion,
+            puis un résumé final. Les éléments en échec transitoire restent
+            dans l'outbox (statut 'retrying', suivi via /jobs/<id>).
+        """
+        schema = get_schema(workflow_name)
+        statuses = {DELIVERED: "dispatched", RETRY: "retrying", LOST: "retrying"}
+
+        def dispatch_one(index, payload, details):
+            start = time.perf_counter()
+            try:
+                with app.app_context():
+                    outbox = get_outbox()
+                    item = outbox.record(workflow_name, payload, schema.service, schema.title, details)
+                    delivery = outbox.attempt(item)
+                result = {
+                    "index": index,
+                    "id": item['id'],
+                    "status": statuses.get(delivery.outcome, "failed"),
+                    "github_status": delivery.status_code,
+                }
+                if delivery.deployment_id:
+                    result["deployment_id"] = delivery.deployment_id
+                if delivery.outcome != DELIVERED:
+                    result["error"] = delivery.error
+            except Exception as e:
+                result = {"index": index, "status": "failed", "github_status": None, "error": str(e)}
+            result["elapsed"] = round(time.perf_counter() - start, 4)
+            with app.app_context():
+                audit('deployment.dispatch', outcome=result["status"], bulk_index=index, user=actor,
+                      dispatch_id=result.get("id"), github_status=result["github_status"],
+                      deployment_id=result.get("deployment_id"), error=result.get("error"),
+                      duration_ms=round(result["elapsed"] * 1000, 3), **deployment_fields(workflow_name, payload))
+                history = get_history()
+                if history is not None and "id" in result:
+                    try:
+                        history.record(workflow_name, payload, result["status"], dispatch_id=result["id"],
+                                       github_status=result["github_status"], error=result.get("error"),
+                                       deployment_id=result.get("deployment_id"), user=actor,
+                                       created_at=time.time() - result["elapsed"],
+                                       duration_ms=round(result["elapsed"] * 1000, 3))
+                    except Exception:
+                        app.logger.exception("Historique : déclenchement %s non enregistré", result["id"])
+            return result
+
+        started = time.perf_counter()
+        counts = {"dispatched": 0, "retrying": 0, "failed": 0}
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bulk-dispatch")
+        try:
+            futures = [
+                executor.submit(dispatch_one, index, payload, details)
+                for index, (payload, details) in enumerate(built)
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                counts[result["status"]] += 1
+                yield result
+        finally:
+            # Client déconnecté : on abandonne les éléments pas encore partis
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        yield {
+            "type": "summary",
+            "total": len(built),
+            "dispatched": counts["dispatched"],
+            "retrying": counts["retrying"],
+            "failed": counts["failed"],
+            "elapsed": round(time.perf_counter() - started, 4),
+        }
@@ -0,0 +1,110 @@
+"""Disjoncteur partagé entre workers pour les appels GitHub."""
+import os
+import time
+
+from app.services.state_store import connect, transaction
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS circuit_breakers (
+    name       TEXT PRIMARY KEY,
+    failures   INTEGER NOT NULL DEFAULT 0,
+    open_until REAL NOT NULL DEFAULT 0,
+    opened_at  REAL,
+    trips      INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur à trois états, persisté dans SQLite.
+
+    Après `threshold` échecs consécutifs le circuit s'ouvre pendant
+    `reset_timeout` secondes : les appels échouent immédiatement au lieu
+    d'attendre les timeouts GitHub. Ensuite un seul appel de test passe
+    (semi-ouvert) ; un succès referme le circuit, un échec le rouvre.
+    """
+
+    def __init__(self, db_path, name, threshold, reset_timeout):
+        self.db_path = db_path
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._initialized_pid = None
+
+    def _conn(self):
+        conn = connect(self.db_path)
+        if self._initialized_pid != os.getpid():
+            conn.executescript(_SCHEMA)
+            conn.execute('INSERT OR IGNORE INTO circuit_breakers (name) VALUES (?)', (self.name,))
+            self._initialized_pid = os.getpid()
+        return conn
+
+    def allow(self):
+        """
+        Indique si un appel peut partir maintenant.
+
+        Returns:
+            (True, None) si l'appel est autorisé (éventuellement comme appel
+            de test), sinon (False, epoch de la prochaine tentative possible)
+        """
+        conn = self._conn()
+        now = time.time()
+        with transaction(conn):
+            row = conn.execute('SELECT * FROM circuit_breakers WHERE name = ?', (self.name,)).fetchone()
+            if row['failures'] < self.threshold:
+                return True, None
+            if row['open_until'] > now:
+                return False, row['open_until']
+            # Semi-ouvert : ce worker réserve l'unique appel de test
+            conn.execute(
+                'UPDATE circuit_breakers SET open_until = ? WHERE name = ?',
+                (now + self.reset_timeout, self.name),
+            )
+        return True, None
+
+    def record_success(self):
+        """Referme le circuit."""
+        conn = self._conn()
+        with transaction(conn):
+            conn.execute(
+                'UPDATE circuit_breakers SET failures = 0, open_until = 0, opened_at = NULL WHERE name = ?',
+                (self.name,),
+            )
+
+    def record_failure(self):
+        """Compte un échec ; ouvre (ou rouvre) le circuit au-delà du seuil."""
+        conn = self._conn()
+        now = time.time()
+        with transaction(conn):
+            row = conn.execute('SELECT * FROM circuit_breakers WHERE name = ?', (self.name,)).fetchone()
+            failures = row['failures'] + 1
+            if failures >= self.threshold:
+                conn.execute(
+                    'UPDATE circuit_breakers SET failures = ?, open_until = ?, '
+                    'opened_at = COALESCE(opened_at, ?), trips = trips + ? WHERE name = ?',
+                    (failures, now + self.reset_timeout, now, int(failures == self.threshold), self.name),
+                )
+            else:
+                conn.execute('UPDATE circuit_breakers SET failures = ? WHERE name = ?', (failures, self.name))
+
+    def stats(self):
+        """État courant, échecs consécutifs et nombre d'ouvertures."""
+        row = self._conn().execute('SELECT * FROM circuit_breakers WHERE name = ?', (self.name,)).fetchone()
+        now = time.time()
+        if row['failures'] < self.threshold:
+            state = STATE_CLOSED
+        elif row['open_until'] > now:
+            state = STATE_OPEN
+        else:
+            state = STATE_HALF_OPEN
+        return {
+            'state': state,
+            'failures': row['failures'],
+            'trips': row['trips'],
+            'open_for': round(max(0.0, row['open_until'] - now), 1) if state == STATE_OPEN else 0.0,
+        }
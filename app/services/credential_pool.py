@@ -0,0 +1,287 @@
+"""Pool de jetons GitHub (PAT et installations GitHub App)."""
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+
+from app.services.rate_limit_service import parse_rate_limit_headers
+from app.services.state_store import connect, state_db_path, transaction
+
+try:
+    import jwt
+except ImportError:  # PyJWT[crypto] n'est requis que pour les GitHub Apps
+    jwt = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS credential_usage (
+    name            TEXT PRIMARY KEY,
+    requests        INTEGER NOT NULL DEFAULT 0,
+    failures        INTEGER NOT NULL DEFAULT 0,
+    last_status     INTEGER,
+    last_used_at    REAL,
+    api_limit       INTEGER,
+    api_remaining   INTEGER,
+    api_reset       REAL,
+    unhealthy_until REAL NOT NULL DEFAULT 0
+);
+"""
+
+_create_lock = threading.Lock()
+
+
+class TokenCredential:
+    """Jeton d'accès personnel (PAT), identifié par une empreinte non secrète."""
+
+    kind = 'pat'
+
+    def __init__(self, token):
+        self.token = token
+        digest = hashlib.sha256(token.encode('utf-8')).hexdigest()[:8] if token else 'anonymous'
+        self.name = f"pat-{digest}"
+
+    @property
+    def bucket(self):
+        """Clé du quota dans l'ordonnanceur (un bucket par jeton)."""
+        return self.name
+
+    def headers(self, session):
+        """En-tête d'authentification ({} sans jeton configuré)."""
+        return {'Authorization': f"token {self.token}"} if self.token else {}
+
+    def invalidate(self):
+        """Rien à rafraîchir pour un PAT."""
+
+    def describe(self):
+        return {'kind': self.kind}
+
+
+class AppInstallationCredential:
+    """
+    Jeton d'installation GitHub App, renouvelé avant expiration.
+
+    Le jeton (valide une heure) est obtenu en échange d'un JWT signé avec
+    la clé privée de l'App, puis mis en cache jusqu'à `refresh_margin`
+    secondes de son expiration.
+    """
+
+    kind = 'app'
+
+    def __init__(self, app_id, installation_id, private_key, api_url, refresh_margin):
+        self.app_id = app_id
+        self.installation_id = installation_id
+        self.private_key = private_key
+        self.api_url = api_url
+        self.refresh_margin = refresh_margin
+        self.name = f"app-{app_id}-{installation_id}"
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def bucket(self):
+        return self.name
+
+    def _app_jwt(self):
+        now = int(time.time())
+        # iat antidaté de 60 s pour absorber un décalage d'horloge
+        return jwt.encode({'iat': now - 60, 'exp': now + 540, 'iss': str(self.app_id)},
+                          self.private_key, algorithm='RS256')
+
+    def _refresh(self, session):
+        response = session.post(
+            f"{self.api_url}/app/installations/{self.installation_id}/access_tokens",
+            headers={'Authorization': f"Bearer {self._app_jwt()}"},
+            timeout=(current_app.config['GITHUB_CONNECT_TIMEOUT'], current_app.config['GITHUB_READ_TIMEOUT']),
+        )
+        if response.status_code != 201:
+            raise RuntimeError(
+                f"Jeton d'installation {self.installation_id} refusé (Code: {response.status_code})"
+            )
+        body = response.json()
+        self._token = body['token']
+        self._expires_at = datetime.fromisoformat(body['expires_at'].replace('Z', '+00:00')).timestamp()
+
+    def headers(self, session):
+        """En-tête d'authentification, avec renouvellement du jeton si proche de l'expiration."""
+        if self._token is None or time.time() > self._expires_at - self.refresh_margin:
+            with self._lock:
+                if self._token is None or time.time() > self._expires_at - self.refresh_margin:
+                    self._refresh(session)
+        return {'Authorization': f"token {self._token}"}
+
+    def invalidate(self):
+        """Force le renouvellement au prochain appel (jeton révoqué, 401)."""
+        with self._lock:
+            self._token = None
+
+    def describe(self):
+        return {
+            'kind': self.kind,
+            'token_expires_in': round(max(0.0, self._expires_at - time.time()), 1) if self._token else None,
+        }
+
+
+class CredentialPool:
+    """
+    Répartit les appels GitHub entre plusieurs jetons.
+
+    Chaque appel part avec le jeton qui a le plus de quota restant
+    (d'après les derniers en-têtes X-RateLimit-* vus par n'importe quel
+    worker), à égalité le moins récemment utilisé. Un jeton refusé (401)
+    est écarté pendant `cooldown` secondes. Usage et santé sont partagés
+    entre workers via la base d'état.
+    """
+
+    def __init__(self, credentials, db_path, cooldown):
+        self.credentials = credentials
+        self.db_path = db_path
+        self.cooldown = cooldown
+        self._initialized_pid = None
+
+    def _conn(self):
+        conn = connect(self.db_path)
+        if self._initialized_pid != os.getpid():
+            conn.executescript(_SCHEMA)
+            conn.executemany(
+                'INSERT OR IGNORE INTO credential_usage (name) VALUES (?)',
+                [(c.name,) for c in self.credentials],
+            )
+            self._initialized_pid = os.getpid()
+        return conn
+
+    def _usage(self):
+        rows = self._conn().execute('SELECT * FROM credential_usage').fetchall()
+        return {row['name']: dict(row) for row in rows}
+
+    def select(self):
+        """
+        Choisit le jeton pour le prochain appel.
+
+        Returns:
+            Credential avec le plus de quota restant parmi les jetons sains
+            (tous les jetons si aucun n'est sain)
+        """
+        if len(self.credentials) == 1:
+            return self.credentials[0]
+        usage = self._usage()
+        now = time.time()
+
+        def headroom(credential):
+            row = usage.get(credential.name) or {}
+            remaining, reset = row.get('api_remaining'), row.get('api_reset')
+            if remaining is None or (reset is not None and reset <= now):
+                remaining = float('inf')  # quota inconnu ou renouvelé
+            return remaining, -(row.get('last_used_at') or 0)
+
+        healthy = [c for c in self.credentials if (usage.get(c.name) or {}).get('unhealthy_until', 0) <= now]
+        return max(healthy or self.credentials, key=headroom)
+
+    def record(self, credential, response):
+        """Enregistre l'usage d'un jeton et son quota d'après la réponse GitHub."""
+        info = parse_rate_limit_headers(response.headers)
+        unauthorized = response.status_code == 401
+        if unauthorized:
+            credential.invalidate()
+        conn = self._conn()
+        now = time.time()
+        with transaction(conn):
+            conn.execute(
+                '''UPDATE credential_usage SET
+                       requests = requests + 1,
+                       failures = failures + ?,
+                       last_status = ?,
+                       last_used_at = ?,
+                       api_limit = COALESCE(?, api_limit),
+                       api_remaining = COALESCE(?, api_remaining),
+                       api_reset = COALESCE(?, api_reset),
+                       unhealthy_until = ?
+                   WHERE name = ?''',
+                (
+                    int(response.status_code >= 400),
+                    response.status_code,
+                    now,
+                    info['limit'],
+                    info['remaining'],
+                    info['reset'],
+                    now + self.cooldown if unauthorized else 0,
+                    credential.name,
+                ),
+            )
+
+    def record_error(self, credential):
+        """Compte un échec sans réponse (connexion, renouvellement de jeton)."""
+        conn = self._conn()
+        with transaction(conn):
+            conn.execute(
+                'UPDATE credential_usage SET failures = failures + 1, last_used_at = ? WHERE name = ?',
+                (time.time(), credential.name),
+            )
+
+    def stats(self):
+        """Usage, quota restant et santé de chaque jeton."""
+        usage = self._usage()
+        now = time.time()
+        credentials = {}
+        for credential in self.credentials:
+            row = usage.get(credential.name) or {}
+            credentials[credential.name] = dict(
+                credential.describe(),
+                requests=row.get('requests', 0),
+                failures=row.get('failures', 0),
+                last_status=row.get('last_status'),
+                limit=row.get('api_limit'),
+                remaining=row.get('api_remaining'),
+                reset_in=round(max(0.0, row['api_reset'] - now), 1) if row.get('api_reset') else None,
+                healthy=row.get('unhealthy_until', 0) <= now,
+            )
+        return {'credentials': credentials}
+
+
+def _load_credentials(config):
+    """Construit la liste des jetons depuis la configuration."""
+    tokens = [config.get('GITHUB_TOKEN')] + (config.get('GITHUB_TOKENS') or '').split(',')
+    credentials = []
+    for token in dict.fromkeys(t.strip() for t in tokens if t and t.strip()):
+        credentials.append(TokenCredential(token))
+
+    app_id = config.get('GITHUB_APP_ID')
+    if app_id:
+        if jwt is None:
+            raise RuntimeError("GITHUB_APP_ID configuré mais PyJWT[crypto] n'est pas installé")
+        # Clé PEM sur une ligne dans l'environnement : '\n' littéraux
+        private_key = (config.get('GITHUB_APP_PRIVATE_KEY') or '').replace('\\n', '\n')
+        if not private_key and config.get('GITHUB_APP_PRIVATE_KEY_PATH'):
+            with open(config['GITHUB_APP_PRIVATE_KEY_PATH']) as f:
+                private_key = f.read()
+        for installation_id in (config.get('GITHUB_APP_INSTALLATION_IDS') or '').split(','):
+            if installation_id.strip():
+                credentials.append(AppInstallationCredential(
+                    app_id,
+                    installation_id.strip(),
+                    private_key,
+                    config['GITHUB_API_URL'],
+                    config['GITHUB_APP_TOKEN_REFRESH_MARGIN'],
+                ))
+
+    # Sans jeton, les appels partent sans authentification (GitHub répondra 401)
+    return credentials or [TokenCredential(None)]
+
+
+def get_credential_pool():
+    """Retourne le pool de jetons de l'application courante (créé au besoin)."""
+    app = current_app._get_current_object()
+    pool = app.extensions.get('credential_pool')
+    if pool is None:
+        with _create_lock:
+            pool = app.extensions.get('credential_pool')
+            if pool is None:
+                pool = CredentialPool(
+                    _load_credentials(app.config),
+                    state_db_path(app),
+                    cooldown=app.config['CREDENTIAL_COOLDOWN'],
+                )
+                app.extensions['credential_pool'] = pool
+    return pool
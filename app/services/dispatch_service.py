@@ -0,0 +1,289 @@
+"""Service de déclenchement des workflows (synchrone ou via la file de jobs)."""
+import json
+import time
+
+from flask import Response, current_app, request
+
+from app.services.form_schema import get_schema
+from app.services.github_service import DeferredSteps, pauses, run_steps
+from app.services.history import get_history
+from app.services.idempotency_service import (
+    IdempotencyConflict,
+    canonical_fingerprint,
+    get_idempotency_store,
+)
+from app.services.job_queue import Job, QueueFullError, get_job_queue
+from app.services.metrics import label_service
+from app.services.outbox import DELIVERED, LOST, RETRY, get_outbox
+from app.services.request_log import audit, deployment_fields, request_actor
+from app.services.response_service import ResponseService
+from app.services.tracing import span
+from app.services.validation_service import ValidationError
+
+class DispatchService:
+    """
+    Point d'entrée unique des routes trigger_* vers GitHub Actions.
+
+    Le traitement est écrit en étapes (générateurs) qui produisent l'appel
+    GitHub au lieu de l'exécuter : sous WSGI, _run() les pilote aussitôt
+    avec la session requests ; sous ASGI (asgi.py), la vue rend les étapes
+    à l'adaptateur, qui attend l'appel GitHub sans occuper de thread.
+    """
+
+    @staticmethod
+    def async_requested():
+        """
+        Indique si le déclenchement doit passer par la file asynchrone.
+
+        Activé globalement par DISPATCH_MODE=async, ou par requête avec
+        l'en-tête `Prefer: respond-async`.
+        """
+        if current_app.config['DISPATCH_MODE'] == 'async':
+            return True
+        return 'respond-async' in request.headers.get('Prefer', '')
+
+    @staticmethod
+    def _run(steps):
+        """Exécute les étapes d'un déclenchement, ou les confie à l'adaptateur ASGI."""
+        if request.environ.get('portal.asgi'):
+            return DeferredSteps(steps)
+        return run_steps(steps)
+
+    @staticmethod
+    def handle_form(workflow_name: str, form):
+        """
+        Valide un formulaire avec le schéma compilé du service puis déclenche.
+
+        Args:
+            workflow_name: Clé du workflow dans WORKFLOWS
+            form:          Champs soumis (request.form)
+
+        Returns:
+            Réponse HTTP de dispatch(), ou page d'erreur listant toutes
+            les erreurs de validation
+        """
+        return DispatchService._run(DispatchService._handle_form(workflow_name, form))
+
+    @staticmethod
+    def _handle_form(workflow_name, form):
+        label_service(workflow_name)
+        schema = get_schema(workflow_name)
+        try:
+            payload, details = schema.build(form)
+            return (yield from DispatchService._dispatch_steps(
+                workflow_name,
+                payload,
+                service=schema.service,
+                title=schema.title,
+                details=details,
+            ))
+        except ValidationError as e:
+            audit('deployment.dispatch', service=workflow_name, outcome='invalid', status=400,
+                  errors=[error["field"] for error in e.errors])
+            if len(e.errors) > 1:
+                return ResponseService.error_response(
+                    f"Formulaire invalide ({len(e.errors)} erreurs)",
+                    "\n".join(error["error"] for error in e.errors),
+                    service=schema.service,
+                )
+            return ResponseService.error_response(str(e), service=schema.service)
+        except Exception as e:
+            return ResponseService.error_response("Erreur inattendue", str(e), service=schema.service)
+
+    @staticmethod
+    def idempotency_key():
+        """Clé fournie par le client (en-tête Idempotency-Key ou champ idempotency_key)."""
+        return request.headers.get('Idempotency-Key') or request.form.get('idempotency_key') or None
+
+    @staticmethod
+    def _error(api, message, details="", service="", status=400):
+        """Erreur au format de l'appelant (page HTML ou JSON de l'API)."""
+        if api:
+            return ResponseService.api_error(message, details, status=status)
+        return ResponseService.error_response(message, details, service=service, status=status)
+
+    @staticmethod
+    def dispatch(workflow_name: str, payload: dict, service: str, title: str, details: dict, api: bool = False):
+        """
+        Déclenche un workflow validé et construit la réponse HTTP.
+
+        Une requête identique (même clé d'idempotence, ou à défaut même
+        workflow et mêmes inputs) reçue pendant IDEMPOTENCY_WINDOW rejoue
+        la réponse d'origine sans nouvel appel GitHub.
+
+        Args:
+            workflow_name: Clé du workflow dans WORKFLOWS
+            payload:       Payload GitHub Actions (ref + inputs)
+            service:       Nom du service AWS (ex: 'EC2')
+            title:         Titre affiché sur la page de succès
+            details:       Détails affichés sur la page de succès
+            api:           Réponses JSON de /api/v1 au lieu des pages HTML
+
+        Returns:
+            202 + suivi du job en mode asynchrone ou si le déclenchement
+            sera retenté, sinon succès (204 GitHub) ou erreur
+        """
+        return DispatchService._run(
+            DispatchService._dispatch_steps(workflow_name, payload, service, title, details, api)
+        )
+
+    @staticmethod
+    def _dispatch_steps(workflow_name, payload, service, title, details, api=False):
+        store = get_idempotency_store()
+        if store is None:
+            return (yield from DispatchService._dispatch(workflow_name, payload, service, title, details, api))
+
+        fingerprint = canonical_fingerprint(workflow_name, payload)
+        key = store.make_key(workflow_name, fingerprint, DispatchService.idempotency_key())
+        if api:
+            # Rejeux séparés : une page HTML ne doit pas être rejouée à un client JSON
+            key = f"api:{key}"
+        try:
+            outcome, row = store.begin(key, fingerprint)
+            if outcome == 'pending':
+                # Attente de la requête identique, puis nouvelle réservation :
+                # sa réponse est rejouée, ou, si elle a échoué et libéré la clé,
+                # ce renvoi déclenche à sa place ; 409 si elle est toujours en cours
+                yield from pauses(store.wait_for_steps(key, current_app.config['IDEMPOTENCY_WAIT']))
+                outcome, row = store.begin(key, fingerprint)
+        except IdempotencyConflict as e:
+            DispatchService._audit(workflow_name, payload, api, 422, 'rejected', error=str(e))
+            return DispatchService._error(api, str(e), service=service, status=422)
+
+        if outcome == 'pending':
+            DispatchService._audit(workflow_name, payload, api, 409, 'rejected',
+                                   error="déploiement identique en cours")
+            return DispatchService._error(
+                api,
+                "Un déploiement identique est déjà en cours",
+                "Patientez quelques secondes avant de renvoyer le formulaire.",
+                service=service,
+                status=409,
+            )
+        if row is not None:
+            DispatchService._audit(workflow_name, payload, api, row['status'], 'replayed')
+            return DispatchService._replay(row)
+
+        try:
+            response = current_app.make_response(
+                (yield from DispatchService._dispatch(workflow_name, payload, service, title, details, api))
+            )
+        except BaseException:
+            store.release(key)
+            raise
+        if 200 <= response.status_code < 300:
+            store.complete(key, response)
+        else:
+            store.release(key)
+        return response
+
+    @staticmethod
+    def _replay(row):
+        """Reconstruit la réponse d'origine stockée pour une clé d'idempotence."""
+        response = Response(row['body'], status=row['status'], headers=json.loads(row['headers'] or '{}'))
+        response.headers['Idempotent-Replayed'] = 'true'
+        return response
+
+    @staticmethod
+    def _audit(workflow_name, payload, api, status, outcome, started=None, **fields):
+        """Enregistre un déclenchement dans le journal d'audit (secrets masqués à l'écriture)."""
+        if started is not None:
+            fields["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        audit('deployment.dispatch', outcome=outcome, status=status, api=api,
+              **deployment_fields(workflow_name, payload), **fields)
+
+    @staticmethod
+    def _dispatch(workflow_name, payload, service, title, details, api=False):
+        """Déclenchement effectif (file asynchrone ou appel GitHub direct), tracé et audité."""
+        started = time.perf_counter()
+        asynchronous = DispatchService.async_requested()
+        attributes = {"portal.service": workflow_name, "dispatch.mode": 'async' if asynchronous else 'sync'}
+        outcome = {"outcome": "failed"}
+        with span('dispatch', attributes) as current:
+            response = current_app.make_response((yield from DispatchService._deliver(
+                workflow_name, payload, service, title, details, api, asynchronous, outcome
+            )))
+            current.set_attribute("http.response.status_code", response.status_code)
+        DispatchService._audit(workflow_name, payload, api, response.status_code, started=started, **outcome)
+        DispatchService._record(workflow_name, payload, api, response.status_code, started, outcome)
+        return response
+
+    @staticmethod
+    def _record(workflow_name, payload, api, status, started, outcome):
+        """Ajoute le déclenchement à l'historique (issue vue par la requête, durée, utilisateur)."""
+        history = get_history()
+        if history is None:
+            return
+        elapsed = time.perf_counter() - started
+        try:
+            history.record(
+                workflow_name, payload, outcome['outcome'],
+                dispatch_id=outcome.get('dispatch_id'),
+                status=status,
+                github_status=outcome.get('github_status'),
+                deployment_id=outcome.get('deployment_id'),
+                error=outcome.get('error'),
+                user=request_actor(),
+                api=api,
+                created_at=time.time() - elapsed,
+                duration_ms=round(elapsed * 1000, 3),
+            )
+        except Exception:
+            current_app.logger.exception("Historique : déclenchement %s non enregistré", outcome.get('dispatch_id'))
+
+    @staticmethod
+    def _deliver(workflow_name, payload, service, title, details, api, asynchronous, outcome):
+        """Déclenche et renseigne `outcome` (issue, identifiants, statut GitHub) pour l'audit."""
+        if asynchronous:
+            try:
+                job = get_job_queue().submit(workflow_name, payload, service, title, details)
+            except QueueFullError as e:
+                outcome.update(outcome='rejected', error=str(e))
+                return DispatchService._error(
+                    api,
+                    "Trop de déploiements en attente, réessayez plus tard",
+                    str(e),
+                    service=service,
+                    status=503,
+                )
+            outcome.update(outcome='queued', dispatch_id=job.id)
+            return ResponseService.job_response(job, status=202, as_json=api)
+
+        # Payload écrit dans l'outbox avant l'appel : rien n'est perdu si
+        # GitHub est lent ou si le worker redémarre en cours de requête.
+        outbox = get_outbox()
+        with span('outbox.record'):
+            item = outbox.record(workflow_name, payload, service, title, details)
+        result = yield from outbox.attempt_steps(item)
+        outcome.update(
+            outcome={DELIVERED: 'dispatched', RETRY: 'retrying', LOST: 'retrying'}.get(result.outcome, 'failed'),
+            dispatch_id=item['id'],
+            github_status=result.status_code,
+            deployment_id=result.deployment_id,
+            error=result.error,
+        )
+
+        if result.outcome == DELIVERED:
+            if api:
+                return ResponseService.api_dispatched(
+                    item['id'], workflow_name, service, details, deployment_id=result.deployment_id
+                )
+            return ResponseService.success_response(
+                service=service, title=title, details=details, deployment_id=result.deployment_id
+            )
+
+        if result.outcome in (RETRY, LOST):
+            # Échec transitoire, quota, circuit ouvert ou bail expiré : le dispatcher de fond retentera
+            job = Job.from_outbox(outbox.get(item['id']))
+            return ResponseService.job_response(job, status=202, as_json=api)
+
+        if result.status_code:
+            return DispatchService._error(
+                api,
+                f"Erreur GitHub API (Code: {result.status_code})",
+                result.error,
+                service=service,
+                status=502 if api else 400,
+            )
+        return DispatchService._error(api, "Erreur inattendue", result.error, service=service,
+                                      status=500 if api else 400)
@@ -0,0 +1,461 @@
+"""
+Schémas déclaratifs des formulaires de déclenchement.
+
+Chaque service déclare ses champs (type, défaut, valeurs permises, motif,
+bornes), ses règles inter-champs et la présentation de sa page de succès.
+Les déclarations sont compilées une fois à la création de l'application
+en validateurs qui lisent le formulaire en une seule passe, remontent
+toutes les erreurs d'un coup et construisent (payload, details).
+"""
+import json
+import re
+
+from flask import current_app
+
+from app.services.metrics import observe_validation
+from app.services.tracing import span
+from app.services.validation_service import ValidationError
+
+# Types de champ
+TEXT = 'text'      # chaîne nettoyée (strip)
+RAW = 'raw'        # chaîne telle quelle
+FLAG = 'flag'      # case à cocher → "true" / "false"
+INT = 'int'        # entier (transmis en chaîne)
+NUMBER = 'number'  # nombre décimal (transmis en chaîne)
+JSON = 'json'      # document JSON (champ caché, transmis tel quel)
+
+KINDS = (TEXT, RAW, FLAG, INT, NUMBER, JSON)
+
+# Schémas déclarés par les blueprints, clé = slug de Config.SERVICES
+SCHEMAS = {}
+
+
+class Field:
+    """
+    Déclaration d'un champ de formulaire.
+
+    Args:
+        name:       Nom du champ dans le formulaire
+        label:      Libellé utilisé dans les messages d'erreur
+        kind:       Type du champ (TEXT, RAW, FLAG, INT, NUMBER, JSON)
+        required:   Champ obligatoire (non vide)
+        default:    Valeur si le champ est absent du formulaire
+        choices:    Valeurs permises
+        pattern:    Expression régulière que la valeur doit respecter
+        message:    Message si le motif ne correspond pas ({value}, {label})
+        min_length: Longueur minimale
+        max_length: Longueur maximale
+        minimum:    Borne inférieure (INT, NUMBER)
+        maximum:    Borne supérieure (INT, NUMBER)
+        lower:      Convertit la valeur en minuscules
+        input:      Nom de l'input GitHub Actions (défaut : name, False : non transmis)
+        validators: Paires (prédicat, message) supplémentaires
+    """
+
+    def __init__(self, name, label=None, kind=TEXT, required=False, default='', choices=None,
+                 pattern=None, message=None, min_length=None, max_length=None, minimum=None,
+                 maximum=None, lower=False, input=None, validators=()):
+        self.name = name
+        self.label = label or name
+        self.kind = kind
+        self.required = required
+        self.default = default
+        self.choices = choices
+        self.pattern = pattern
+        self.message = message
+        self.min_length = min_length
+        self.max_length = max_length
+        self.minimum = minimum
+        self.maximum = maximum
+        self.lower = lower
+        self.input = name if input is None else input
+        self.validators = validators
+
+
+class Rule:
+    """
+    Règle inter-champs : champs obligatoires selon la valeur d'un autre.
+
+    Args:
+        field:   Champ dont dépend la règle
+        values:  Valeurs de `field` qui déclenchent la règle
+        targets: Champs alors obligatoires
+        message: Message d'erreur (défaut : « <libellé> obligatoire »)
+        negate:  Déclenche la règle quand `field` n'est PAS dans `values`
+    """
+
+    def __init__(self, field, values, targets, message=None, negate=False):
+        self.field = field
+        self.values = frozenset(values)
+        self.targets = tuple(targets)
+        self.message = message
+        self.negate = negate
+
+
+def required_if(field, values, *targets, message=None):
+    """Rend `targets` obligatoires quand `field` vaut l'une des `values`."""
+    return Rule(field, values, targets, message)
+
+
+def required_unless(field, values, *targets, message=None):
+    """Rend `targets` obligatoires quand `field` ne vaut aucune des `values`."""
+    return Rule(field, values, targets, message, negate=True)
+
+
+class FormSchema:
+    """Déclaration complète du formulaire d'un service (non compilée)."""
+
+    def __init__(self, slug, service, title, fields, rules=(), computed=None, details=(), name_field=None):
+        self.slug = slug
+        self.service = service
+        self.title = title
+        self.fields = tuple(fields)
+        self.rules = tuple(rules)
+        self.computed = computed or {}
+        self.details = details
+        self.name_field = name_field
+
+
+def form_schema(slug, service, title, fields, rules=(), computed=None, details=(), name_field=None):
+    """
+    Déclare le schéma du formulaire d'un service.
+
+    Args:
+        slug:     Slug du service dans Config.SERVICES (clé du workflow)
+        service:  Nom du service AWS (ex: 'EC2')
+        title:    Titre affiché sur la page de succès
+        fields:   Liste de Field
+        rules:    Règles inter-champs (required_if / required_unless)
+        computed: {input: fonction(valeurs)} calculés après validation
+        details:  Paires (libellé, gabarit str.format ou fonction(valeurs)) de
+                  la page de succès ; une valeur None masque la ligne. Peut
+                  aussi être une fonction(valeurs) retournant le dict complet.
+        name_field: Champ qui nomme la ressource (validation de noms en lot)
+
+    Returns:
+        FormSchema enregistré
+    """
+    schema = FormSchema(slug, service, title, fields, rules, computed, details, name_field)
+    SCHEMAS[slug] = schema
+    return schema
+
+
+def _field_checks(field):
+    """Compile les contrôles d'un champ en liste de (prédicat, message)."""
+    checks = []
+    if field.kind in (INT, NUMBER):
+        cast = int if field.kind == INT else float
+        noun = "un nombre entier" if field.kind == INT else "un nombre"
+
+        def parses(value, cast=cast):
+            try:
+                cast(value)
+            except ValueError:
+                return False
+            return True
+
+        checks.append((parses, f"{field.label} doit être {noun}"))
+        if field.minimum is not None or field.maximum is not None:
+            low = float('-inf') if field.minimum is None else field.minimum
+            high = float('inf') if field.maximum is None else field.maximum
+            if field.minimum is None:
+                bounds = f"au plus {field.maximum}"
+            elif field.maximum is None:
+                bounds = f"au moins {field.minimum}"
+            else:
+                bounds = f"entre {field.minimum} et {field.maximum}"
+            checks.append((lambda value, cast=cast, low=low, high=high: low <= cast(value) <= high,
+                           f"{field.label} doit être {bounds}"))
+    if field.kind == JSON:
+        def parses_json(value):
+            try:
+                json.loads(value)
+            except ValueError:
+                return False
+            return True
+        checks.append((parses_json, f"{field.label} : JSON invalide"))
+    if field.choices is not None:
+        allowed = frozenset(field.choices)
+        checks.append((allowed.__contains__, f"{field.label} invalide: '{{value}}' ({', '.join(field.choices)})"))
+    if field.pattern is not None:
+        match = re.compile(field.pattern).match
+        checks.append((lambda value: match(value) is not None, field.message or f"{field.label} invalide: '{{value}}'"))
+    if field.min_length is not None or field.max_length is not None:
+        low = field.min_length or 0
+        high = field.max_length if field.max_length is not None else float('inf')
+        if field.max_length is None:
+            bounds = f"au moins {field.min_length} caractères"
+        elif not field.min_length:
+            bounds = f"au plus {field.max_length} caractères"
+        else:
+            bounds = f"entre {field.min_length} et {field.max_length} caractères"
+        checks.append((lambda value, low=low, high=high: low <= len(value) <= high,
+                       f"{field.label} doit contenir {bounds}"))
+    checks.extend(field.validators)
+    return tuple(checks)
+
+
+class CompiledSchema:
+    """
+    Validateur et constructeur de payload compilés depuis un FormSchema.
+
+    Les contrôles sont pré-calculés (regex compilées, ensembles de valeurs,
+    bornes) : build() ne fait qu'une passe sur les champs puis une sur les
+    règles, sans interpréter la déclaration à chaque requête.
+    """
+
+    def __init__(self, schema):
+        self.slug = schema.slug
+        self.service = schema.service
+        self.title = schema.title
+        self.declaration = schema
+
+        names = set()
+        fields = []
+        for field in schema.fields:
+            if field.kind not in KINDS:
+                raise ValueError(f"{schema.slug}.{field.name} : type inconnu '{field.kind}'")
+            if field.name in names:
+                raise ValueError(f"{schema.slug}.{field.name} : champ déclaré deux fois")
+            names.add(field.name)
+            fields.append((field.name, field.kind, field.default, field.required, field.lower,
+                           field.label, _field_checks(field)))
+        self._fields = tuple(fields)
+        self._specs = {spec[0]: spec for spec in fields}
+        self.labels = {field.name: field.label for field in schema.fields}
+        if schema.name_field is not None and schema.name_field not in names:
+            raise ValueError(f"{schema.slug} : name_field '{schema.name_field}' non déclaré")
+        self.name_field = schema.name_field
+        self.name_input = next((f.input for f in schema.fields if f.name == schema.name_field), None)
+        # Input de l'environnement cible (journal d'audit) : 'environment' ou '<x>_env' à choix fermés
+        self.environment_input = next(
+            (f.input for f in schema.fields
+             if f.input and (f.input == 'environment' or (f.input.endswith('_env') and f.choices))),
+            None,
+        )
+
+        for rule in schema.rules:
+            unknown = {rule.field, *rule.targets} - names
+            if unknown:
+                raise ValueError(f"{schema.slug} : règle sur des champs inconnus {sorted(unknown)}")
+        self._rules = tuple(
+            (rule.field, rule.values, rule.negate, tuple(
+                (target, (rule.message or "{label} obligatoire").format(label=self.labels[target]))
+                for target in rule.targets
+            ))
+            for rule in schema.rules
+        )
+
+        self._inputs = tuple((field.input, field.name) for field in schema.fields if field.input is not False)
+        self._input_fields = {key: name for key, name in self._inputs}
+        self._computed = tuple(schema.computed.items())
+        # Variables Terraform du module (app.services.infra_schema), attachées au démarrage
+        self.contract = None
+        if callable(schema.details):
+            self._details = schema.details
+        else:
+            self._details = None
+            self._detail_items = tuple(
+                (label, value if callable(value) else value.format_map)
+                for label, value in schema.details
+            )
+
+    @property
+    def field_names(self):
+        """Noms des champs déclarés, dans l'ordre."""
+        return [name for name, *_ in self._fields]
+
+    @property
+    def input_names(self):
+        """Inputs GitHub Actions du payload, champs calculés compris."""
+        return [key for key, _ in self._inputs] + [name for name, _ in self._computed]
+
+    def describe(self):
+        """Description JSON des champs (pour les clients de l'API)."""
+        fields = []
+        for field in self.declaration.fields:
+            spec = {"name": field.name, "type": field.kind, "required": field.required}
+            if field.default:
+                spec["default"] = field.default
+            if field.choices is not None:
+                spec["choices"] = list(field.choices)
+            if field.minimum is not None:
+                spec["minimum"] = field.minimum
+            if field.maximum is not None:
+                spec["maximum"] = field.maximum
+            fields.append(spec)
+        return {"service": self.service, "title": self.title, "fields": fields}
+
+    def field_validator(self, name):
+        """
+        Validateur d'un seul champ, avec les contrôles compilés du formulaire.
+
+        Returns:
+            fonction(valeur brute) → (valeur nettoyée, message d'erreur ou None)
+        """
+        _, kind, default, required, lower, label, checks = self._specs[name]
+        strip = kind not in (RAW, JSON, FLAG)
+
+        def check(raw):
+            value = default if raw is None else (raw.strip() if strip else raw)
+            if lower:
+                value = value.lower()
+            if not value or value.isspace():
+                return value, f"{label} obligatoire" if required else None
+            for predicate, message in checks:
+                if not predicate(value):
+                    return value, message.format(value=value, label=label)
+            return value, None
+        return check
+
+    def _contract_errors(self, inputs):
+        errors = []
+        for key, message in self.contract.check(inputs):
+            name = self._input_fields.get(key, key)
+            errors.append({"field": name, "error": f"{self.labels.get(name, name)} : {message}"})
+        return errors
+
+    def validate_names(self, names, existing=frozenset()):
+        """
+        Valide un lot de noms de ressources en une passe (coût linéaire).
+
+        Chaque nom passe les mêmes contrôles que le champ `name_field` du
+        formulaire ; s'y ajoutent les doublons dans le lot et les collisions
+        avec des noms déjà déployés.
+
+        Args:
+            names:    Itérable de noms (liste ou flux, consommé une fois)
+            existing: Ensemble des noms déjà déployés (valeurs nettoyées)
+
+        Returns:
+            dict avec total, valid, invalid et errors [{"index", "name", "error"}]
+        """
+        check = self.field_validator(self.name_field)
+        seen = {}
+        errors = []
+        total = 0
+        for index, raw in enumerate(names):
+            total = index + 1
+            value, error = check("" if raw is None else str(raw))
+            if error is None:
+                first = seen.setdefault(value, index)
+                if first != index:
+                    error = f"Doublon de l'élément {first}"
+                elif value in existing:
+                    error = "Déjà déployé"
+            if error is not None:
+                errors.append({"index": index, "name": value, "error": error})
+        return {
+            "field": self.name_field,
+            "total": total,
+            "valid": total - len(errors),
+            "invalid": len(errors),
+            "errors": errors,
+        }
+
+    def validate(self, form):
+        """
+        Lit et valide un formulaire en une passe.
+
+        Args:
+            form: Mapping de champs (request.form ou dict de chaînes)
+
+        Returns:
+            (valeurs nettoyées, liste d'erreurs {"field", "error"})
+        """
+        # MultiDict.get lève puis rattrape une exception par champ absent :
+        # une copie en dict simple coûte moins cher dès quelques champs
+        if hasattr(form, 'to_dict'):
+            form = form.to_dict()
+        get = form.get
+        values = {}
+        errors = []
+        for name, kind, default, required, lower, label, checks in self._fields:
+            raw = get(name)
+            if kind == FLAG:
+                values[name] = "true" if raw else "false"
+                continue
+            if raw is None:
+                # Défaut déclaré : déjà valide, aucun contrôle à refaire
+                values[name] = default
+                if required and not default:
+                    errors.append({"field": name, "error": f"{label} obligatoire"})
+                continue
+            if kind == RAW or kind == JSON:
+                value = raw
+            else:
+                value = raw.strip()
+            if lower:
+                value = value.lower()
+            values[name] = value
+            if not value or (kind == RAW or kind == JSON) and value.isspace():
+                if required:
+                    errors.append({"field": name, "error": f"{label} obligatoire"})
+                continue
+            for check, message in checks:
+                if not check(value):
+                    errors.append({"field": name, "error": message.format(value=value, label=label)})
+                    break
+
+        for field, trigger, negate, targets in self._rules:
+            if (values[field] in trigger) is negate:
+                continue
+            for target, message in targets:
+                if not values[target]:
+                    errors.append({"field": target, "error": message})
+        return values, errors
+
+    def build(self, form):
+        """
+        Valide un formulaire et construit (payload, details).
+
+        Un formulaire valide est ensuite contrôlé contre les variables
+        Terraform du module (contract) : ce que Terraform refuserait est
+        rejeté ici plutôt que dans le run.
+
+        Raises:
+            ValidationError: Avec toutes les erreurs du formulaire
+        """
+        with span('form.validate', {"portal.service": self.slug}) as current:
+            values, errors = self.validate(form)
+            if not errors:
+                for name, compute in self._computed:
+                    values[name] = compute(values)
+                inputs = {key: values[name] for key, name in self._inputs}
+                for name, _ in self._computed:
+                    inputs[name] = values[name]
+                if self.contract is not None:
+                    errors = self._contract_errors(inputs)
+            current.set_attribute("form.errors", len(errors))
+        observe_validation(self.slug, errors)
+        if errors:
+            raise ValidationError("; ".join(e["error"] for e in errors), errors)
+        payload = {"ref": "main", "inputs": inputs}
+
+        if self._details is not None:
+            return payload, self._details(values)
+        details = {}
+        for label, render in self._detail_items:
+            value = render(values)
+            if value is not None:
+                details[label] = value
+        return payload, details
+
+
+def compile_schemas(app):
+    """
+    Compile les schémas déclarés et les attache à l'application.
+
+    Raises:
+        ValueError: Schéma invalide ou slug absent de Config.SERVICES
+    """
+    slugs = {service['slug'] for service in app.config['SERVICES']}
+    unknown = set(SCHEMAS) - slugs
+    if unknown:
+        raise ValueError(f"Schémas sans service déclaré dans SERVICES: {sorted(unknown)}")
+    app.extensions['form_schemas'] = {slug: CompiledSchema(schema) for slug, schema in SCHEMAS.items()}
+
+
+def get_schema(slug):
+    """Retourne le schéma compilé d'un service (None si inconnu)."""
+    return current_app.extensions['form_schemas'].get(slug)
@@ -1,40 +1,276 @@
 """Service pour interagir avec l'API GitHub."""
+import os
+import threading
+import time
+from collections import namedtuple
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import current_app
 
+from app.services.credential_pool import get_credential_pool
+from app.services.metrics import observe_github_dispatch
+from app.services.rate_limit_service import get_rate_limiter
+from app.services.tracing import KIND_CLIENT, span
+
+# En-têtes communs aux appels GitHub (session synchrone et client asynchrone)
+GITHUB_HEADERS = {'Accept': 'application/vnd.github.v3+json'}
+
+# Requête HTTP produite par des étapes de déclenchement (générateurs) et
+# exécutée par leur pilote : run_steps() avec la session requests, ou
+# l'adaptateur ASGI (app/asgi.py) avec un client asynchrone. Le pilote
+# renvoie la réponse dans le générateur, ou y lève l'exception de requests.
+HttpCall = namedtuple('HttpCall', ['method', 'url', 'headers', 'json', 'timeout'])
+
+# Attente produite par les mêmes étapes (créneau de quota, requête identique
+# en cours) : time.sleep() sous run_steps(), asyncio.sleep() sous ASGI, sans
+# occuper de thread du pool. Le pilote renvoie None dans le générateur.
+Pause = namedtuple('Pause', ['seconds'])
+
+# Session HTTP partagée par processus : une par worker gunicorn.
+# Le PID est mémorisé pour recréer le pool après un fork (preload, reload).
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def _build_session(config):
+    """
+    Construit une session requests avec pool de connexions keep-alive.
+
+    Les retries ne portent que sur les erreurs de connexion : la requête
+    n'a alors jamais atteint GitHub, la rejouer ne peut pas dupliquer un
+    déclenchement de workflow.
+    """
+    retries = Retry(
+        total=config['GITHUB_MAX_RETRIES'],
+        connect=config['GITHUB_MAX_RETRIES'],
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=0.2,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=config['GITHUB_POOL_SIZE'],
+        max_retries=retries,
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(GITHUB_HEADERS)
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+def _reset_after_fork():
+    """Oublie la session héritée du processus parent (sockets partagées)."""
+    global _session, _session_pid
+    _session = None
+    _session_pid = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class DeferredSteps:
+    """Étapes rendues par une vue au lieu d'une réponse, pilotées par l'adaptateur ASGI."""
+
+    __slots__ = ('steps',)
+
+    def __init__(self, steps):
+        self.steps = steps
+
+
+def pauses(waits):
+    """
+    Relaie en étapes Pause un générateur d'attentes (secondes à patienter).
+
+    Returns:
+        Valeur de retour du générateur d'attentes
+    """
+    while True:
+        try:
+            seconds = next(waits)
+        except StopIteration as stop:
+            return stop.value
+        yield Pause(seconds)
+
+
+def run_steps(steps):
+    """
+    Pilote synchrone : exécute chaque HttpCall avec la session du processus
+    et chaque Pause avec time.sleep().
+
+    Args:
+        steps: Générateur produisant des HttpCall ou Pause et recevant leurs réponses
+
+    Returns:
+        Valeur de retour du générateur
+    """
+    session = GitHubService.get_session()
+    try:
+        call = next(steps)
+        while True:
+            if isinstance(call, Pause):
+                time.sleep(call.seconds)
+                call = steps.send(None)
+                continue
+            try:
+                response = session.request(call.method, call.url, headers=call.headers, json=call.json,
+                                           timeout=call.timeout)
+            except Exception as e:
+                call = steps.throw(e)
+            else:
+                call = steps.send(response)
+    except StopIteration as stop:
+        return stop.value
+
+
 class GitHubService:
     """Service GitHub pour déclencher les workflows."""
-    
+
+    @staticmethod
+    def get_session():
+        """
+        Retourne la session HTTP du processus courant.
+
+        La session est créée paresseusement au premier appel, puis réutilisée
+        par toutes les requêtes du worker. Après un fork, le PID change et une
+        nouvelle session est construite.
+
+        Returns:
+            requests.Session configurée (pool, keep-alive, retries)
+        """
+        global _session, _session_pid
+        pid = os.getpid()
+        if _session is None or _session_pid != pid:
+            with _session_lock:
+                if _session is None or _session_pid != pid:
+                    _session = _build_session(current_app.config)
+                    _session_pid = pid
+        return _session
+
+    @staticmethod
+    def close_session():
+        """Ferme le pool de connexions du processus courant."""
+        global _session, _session_pid
+        with _session_lock:
+            if _session is not None:
+                _session.close()
+            _session = None
+            _session_pid = None
+
+    @staticmethod
+    def timeouts():
+        """Retourne le couple (connect, read) de timeouts configurés."""
+        return (
+            current_app.config['GITHUB_CONNECT_TIMEOUT'],
+            current_app.config['GITHUB_READ_TIMEOUT'],
+        )
+
+    @staticmethod
+    def repo_url(path=""):
+        """URL de l'API pour le dépôt configuré (path relatif, ex: 'actions/runs/1')."""
+        return (
+            f"{current_app.config['GITHUB_API_URL']}/repos/"
+            f"{current_app.config['GITHUB_REPO_OWNER']}/"
+            f"{current_app.config['GITHUB_REPO_NAME']}/{path}"
+        )
+
+    @staticmethod
+    def api_get(path, params=None, etag=None):
+        """
+        Requête GET conditionnelle sur l'API du dépôt.
+
+        Avec `etag`, GitHub répond 304 sans corps si la ressource n'a pas
+        changé, et ne décompte pas l'appel du quota.
+
+        Args:
+            path:   Chemin relatif au dépôt (ex: 'actions/runs/123')
+            params: Paramètres de query string
+            etag:   ETag de la dernière réponse 200 connue
+
+        Returns:
+            Response object de requests
+        """
+        pool = get_credential_pool()
+        credential = pool.select()
+        session = GitHubService.get_session()
+        headers = credential.headers(session)
+        if etag:
+            headers['If-None-Match'] = etag
+        response = session.get(GitHubService.repo_url(path), headers=headers, params=params,
+                               timeout=GitHubService.timeouts())
+        pool.record(credential, response)
+        scheduler = get_rate_limiter()
+        if scheduler:
+            scheduler.record_response(response, bucket=credential.bucket)
+        return response
+
     @staticmethod
     def trigger_workflow(workflow_name, payload):
         """
         Déclenche un workflow GitHub Actions.
-        
+
         Args:
             workflow_name: Nom du workflow (clé dans WORKFLOWS)
             payload: Données à envoyer au workflow
-            
+
         Returns:
             Response object de requests
-            
+
         Raises:
             ValueError: Si le workflow n'existe pas
+            RateLimitExceeded: Si le quota GitHub ne libère pas de créneau à temps
+        """
+        return run_steps(GitHubService.trigger_workflow_steps(workflow_name, payload))
+
+    @staticmethod
+    def trigger_workflow_steps(workflow_name, payload):
         """
-        
+        Étapes de trigger_workflow() : produit le POST de dispatch (HttpCall)
+        et reçoit sa réponse du pilote (synchrone ou ASGI).
+        """
+
         workflow_file = current_app.config['WORKFLOWS'].get(workflow_name)
         if not workflow_file:
             raise ValueError(f"Workflow '{workflow_name}' non trouvé dans la configuration")
-        
-        url = (
-            f"https://api.github.com/repos/"
-            f"{current_app.config['GITHUB_REPO_OWNER']}/"
-            f"{current_app.config['GITHUB_REPO_NAME']}/"
-            f"actions/workflows/{workflow_file}/dispatches"
-        )
-        
-        headers = {
-            'Accept': 'application/vnd.github.v3+json',
-            'Authorization': f"token {current_app.config['GITHUB_TOKEN']}"
-        }
-        
-        return requests.post(url, headers=headers, json=payload, timeout=10)
\ No newline at end of file
+
+        url = GitHubService.repo_url(f"actions/workflows/{workflow_file}/dispatches")
+
+        # Jeton le plus riche en quota, puis attente d'un créneau dans son
+        # bucket ; si GitHub refuse quand même (403/429 de quota), on retente
+        # une fois avec le jeton alors le mieux placé.
+        pool = get_credential_pool()
+        scheduler = get_rate_limiter()
+        priority = scheduler.priority_for(payload) if scheduler else None
+        session = GitHubService.get_session()
+        for attempt in range(2):
+            credential = pool.select()
+            if scheduler:
+                with span('rate_limit.acquire', {"rate_limit.bucket": credential.bucket}):
+                    yield from pauses(scheduler.acquire_steps(priority, bucket=credential.bucket))
+            started = time.perf_counter()
+            with span('github.dispatch', {
+                "portal.service": workflow_name,
+                "github.workflow_file": workflow_file,
+                "github.attempt": attempt + 1,
+                "http.request.method": "POST",
+            }, kind=KIND_CLIENT) as current:
+                try:
+                    headers = credential.headers(session)
+                    response = yield HttpCall('POST', url, headers, payload, GitHubService.timeouts())
+                except Exception:
+                    observe_github_dispatch(workflow_name, 'error', time.perf_counter() - started)
+                    pool.record_error(credential)
+                    raise
+                observe_github_dispatch(workflow_name, response.status_code, time.perf_counter() - started)
+                current.set_attribute("http.response.status_code", response.status_code)
+            pool.record(credential, response)
+            if not (scheduler and scheduler.record_response(response, bucket=credential.bucket)):
+                break
+        return response
@@ -0,0 +1,210 @@
+"""
+Sondes de santé : vivacité (/health/live) et disponibilité (/health/ready).
+
+La vivacité ne dépend de rien d'externe : un worker qui répond est vivant.
+La disponibilité dit au load balancer si ce worker peut traiter des
+déclenchements : GitHub joignable, au moins un jeton valide avec assez de
+quota, file de jobs du worker non engorgée. L'outbox est partagée par tous
+les workers : son engorgement (GitHub en panne, par exemple) les
+toucherait tous à la fois. Il est donc signalé en « degraded » (200) sans
+retirer le worker du load balancer, qui continue d'accepter les
+déclenchements dans l'outbox.
+
+Ces vérifications sont faites par un thread de fond de chaque worker toutes
+les HEALTH_CHECK_INTERVAL secondes, jamais dans la requête de la sonde :
+celle-ci renvoie le dernier résultat, déjà sérialisé. Le quota est lu sur
+GET /rate_limit, que GitHub ne décompte pas du quota. Un résultat plus vieux
+que HEALTH_CHECK_TTL (thread bloqué ou mort) rend le worker indisponible.
+"""
+import json
+import os
+import threading
+import time
+
+from flask import current_app
+
+from app.services.credential_pool import get_credential_pool
+from app.services.github_service import GitHubService
+from app.services.job_queue import get_job_queue
+from app.services.outbox import get_outbox
+
+STATUS_READY = 'ready'
+STATUS_DEGRADED = 'degraded'
+STATUS_NOT_READY = 'not_ready'
+STATUS_STARTING = 'starting'
+STATUS_STALE = 'stale'
+
+_STARTING_BODY = json.dumps({"status": STATUS_STARTING}).encode('utf-8')
+
+# Vérifications propres au worker : un échec le rend indisponible (503).
+# Les autres (outbox, partagée) ne font que dégrader le statut.
+READINESS_CHECKS = ('github', 'queue')
+
+
+class HealthChecker:
+    """
+    Vérifications de disponibilité d'un processus, mises en cache.
+
+    Le thread est démarré paresseusement à la première requête de chaque
+    worker (les threads ne survivent pas à un fork) ; la première
+    vérification part aussitôt.
+    """
+
+    def __init__(self, app, interval, ttl, github_timeout, min_rate_remaining, max_outbox_pending,
+                 max_outbox_age, max_queue_ratio):
+        self.app = app
+        self.interval = interval
+        self.ttl = ttl
+        self.github_timeout = github_timeout
+        self.min_rate_remaining = min_rate_remaining
+        self.max_outbox_pending = max_outbox_pending
+        self.max_outbox_age = max_outbox_age
+        self.max_queue_ratio = max_queue_ratio
+        # (prêt, corps JSON, time.monotonic() de la vérification) : remplacé d'un bloc
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._pid = None
+        self.checks = 0
+
+    def ensure_started(self):
+        """Démarre le thread de vérification du processus courant (une fois par worker)."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._snapshot = None  # résultat hérité du maître : pas celui de ce worker
+            threading.Thread(target=self._run, name="health-checker", daemon=True).start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                self.app.logger.exception("Vérification de disponibilité : erreur inattendue")
+            time.sleep(self.interval)
+
+    def refresh(self):
+        """
+        Exécute toutes les vérifications et remplace le résultat en cache.
+
+        Returns:
+            dict du résultat (status, checks)
+        """
+        started = time.perf_counter()
+        with self.app.app_context():
+            checks = {
+                "github": self.check_github(),
+                "outbox": self.check_outbox(),
+                "queue": self.check_queue(),
+            }
+        ready = all(checks[name]['ok'] for name in READINESS_CHECKS)
+        if not ready:
+            status = STATUS_NOT_READY
+        elif all(check['ok'] for check in checks.values()):
+            status = STATUS_READY
+        else:
+            status = STATUS_DEGRADED
+        result = {
+            "status": status,
+            "checked_at": round(time.time(), 3),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "pid": os.getpid(),
+            "checks": checks,
+        }
+        self._snapshot = (ready, json.dumps(result, separators=(',', ':')).encode('utf-8'), time.monotonic())
+        self.checks += 1
+        return result
+
+    def check_github(self):
+        """
+        Joignabilité de GitHub, validité et quota de chaque jeton du pool.
+
+        Returns:
+            dict avec ok=True si au moins un jeton valide a encore
+            `min_rate_remaining` appels (ou un quota renouvelé)
+        """
+        session = GitHubService.get_session()
+        url = f"{current_app.config['GITHUB_API_URL']}/rate_limit"
+        timeout = (current_app.config['GITHUB_CONNECT_TIMEOUT'], self.github_timeout)
+        credentials = {}
+        for credential in get_credential_pool().credentials:
+            try:
+                response = session.get(url, headers=credential.headers(session), timeout=timeout)
+            except Exception as e:
+                credentials[credential.name] = {"ok": False, "error": f"{type(e).__name__}: {e}"[:200]}
+                continue
+            if response.status_code != 200:
+                if response.status_code == 401:
+                    credential.invalidate()
+                credentials[credential.name] = {"ok": False, "status": response.status_code}
+                continue
+            core = (response.json().get('resources') or {}).get('core') or {}
+            remaining, reset = core.get('remaining'), core.get('reset')
+            credentials[credential.name] = {
+                "ok": remaining is None or remaining >= self.min_rate_remaining or (reset or 0) <= time.time(),
+                "remaining": remaining,
+                "limit": core.get('limit'),
+                "reset_in": round(max(0.0, reset - time.time()), 1) if reset else None,
+            }
+        return {"ok": any(c['ok'] for c in credentials.values()), "credentials": credentials}
+
+    def check_outbox(self):
+        """Déclenchements en attente dans l'outbox (tous workers) et ancienneté du plus vieux (dégradé si engorgée)."""
+        backlog = get_outbox().backlog()
+        return dict(
+            backlog,
+            ok=backlog['pending'] <= self.max_outbox_pending and backlog['oldest_pending_age'] <= self.max_outbox_age,
+        )
+
+    def check_queue(self):
+        """Remplissage de la file de jobs de ce worker."""
+        stats = get_job_queue().stats()
+        ratio = stats['depth'] / stats['capacity'] if stats['capacity'] else 0.0
+        return {
+            "ok": ratio < self.max_queue_ratio,
+            "depth": stats['depth'],
+            "capacity": stats['capacity'],
+            "busy": stats['busy'],
+        }
+
+    def probe(self):
+        """
+        Résultat en cache pour la sonde, sans aucune vérification.
+
+        Returns:
+            (prêt, corps JSON en bytes)
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return False, _STARTING_BODY
+        ready, body, checked = snapshot
+        age = time.monotonic() - checked
+        if age > self.ttl:
+            return False, json.dumps({"status": STATUS_STALE, "age": round(age, 1)}).encode('utf-8')
+        return ready, body
+
+
+def get_health_checker():
+    """Retourne le vérificateur de disponibilité de l'application courante (None si désactivé)."""
+    return current_app.extensions.get('health_checker')
+
+
+def init_health(app):
+    """Crée le vérificateur si HEALTH_CHECK_ENABLED et le démarre à la première requête du worker."""
+    if not app.config['HEALTH_CHECK_ENABLED']:
+        app.extensions['health_checker'] = None
+        return
+    checker = HealthChecker(
+        app,
+        interval=app.config['HEALTH_CHECK_INTERVAL'],
+        ttl=app.config['HEALTH_CHECK_TTL'],
+        github_timeout=app.config['HEALTH_GITHUB_TIMEOUT'],
+        min_rate_remaining=app.config['HEALTH_MIN_RATE_REMAINING'],
+        max_outbox_pending=app.config['HEALTH_MAX_OUTBOX_PENDING'],
+        max_outbox_age=app.config['HEALTH_MAX_OUTBOX_AGE'],
+        max_queue_ratio=app.config['HEALTH_MAX_QUEUE_RATIO'],
+    )
+    app.extensions['health_checker'] = checker
+    app.before_request(checker.ensure_started)
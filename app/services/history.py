@@ -0,0 +1,491 @@
+"""
+Historique des déploiements (SQLite), paginé par clé.
+
+Une ligne par déclenchement : service, environnement, ressource, inputs
+(secrets masqués), issue, statut GitHub et durées. Elle est écrite par
+deux chemins, dans un ordre quelconque :
+  - complete() à l'issue définitive de la ligne d'outbox (requête, file
+    asynchrone, dispatcher de fond ou provisioning en masse) ;
+  - record() par la requête qui a déclenché (utilisateur, API, statut HTTP,
+    durée de la requête), ou seule si rien n'a été écrit dans l'outbox.
+dispatch_id est unique : le second écrivain complète la ligne du premier.
+Les écritures passent par le tampon du worker (app.services.write_behind) :
+une ligne apparaît au plus HISTORY_FLUSH_INTERVAL secondes après le
+déclenchement, écrite avec les autres en une transaction.
+
+La base est un fichier séparé de la base d'état (HISTORY_DB) : elle grossit
+sans limite, la base d'état reste petite. Les listes sont paginées par clé
+(created_at, id) sur les index (service, environment, created_at),
+(service, created_at) et (created_at) : une page coûte le même temps au
+début ou au millionième enregistrement, contrairement à OFFSET.
+
+Recherche plein texte (HISTORY_SEARCH_ENABLED) : index FTS5 sans contenu
+(deployment_search, rowid = id de la ligne) alimenté par un trigger à
+l'insertion, donc à jour dans la même transaction que la ligne, quel que
+soit l'écrivain. Colonnes : service, environment, resource, owner,
+cost_center, tags (clés et valeurs), description et inputs (toutes les
+valeurs). Les champs indexés ne changent plus après l'insertion : les
+upserts suivants ne touchent pas l'index.
+"""
+import base64
+import itertools
+import json
+import logging
+import operator
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from flask import current_app
+
+from app.services.request_log import deployment_fields, redact
+from app.services.state_store import connect, transaction
+from app.services.write_behind import WriteBehindBuffer
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deployment_history (
+    id            INTEGER PRIMARY KEY,
+    dispatch_id   TEXT,
+    service       TEXT NOT NULL,
+    environment   TEXT,
+    resource      TEXT,
+    workflow      TEXT,
+    inputs        TEXT NOT NULL,
+    outcome       TEXT NOT NULL,
+    status        INTEGER,
+    github_status INTEGER,
+    deployment_id TEXT,
+    error         TEXT,
+    attempts      INTEGER,
+    user          TEXT,
+    api           INTEGER NOT NULL DEFAULT 0,
+    created_at    REAL NOT NULL,
+    duration_ms   REAL,
+    finished_at   REAL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_deployment_history_dispatch ON deployment_history (dispatch_id);
+CREATE INDEX IF NOT EXISTS ix_deployment_history_service_env
+    ON deployment_history (service, environment, created_at);
+CREATE INDEX IF NOT EXISTS ix_deployment_history_service ON deployment_history (service, created_at);
+CREATE INDEX IF NOT EXISTS ix_deployment_history_created ON deployment_history (created_at);
+"""
+
+# Colonnes de la recherche et leur valeur pour une ligne de deployment_history `{row}`
+_SEARCH_FIELDS = {
+    'service': "{row}.service",
+    'environment': "{row}.environment",
+    'resource': "{row}.resource",
+    'owner': "json_extract({row}.inputs, '$.owner')",
+    'cost_center': "json_extract({row}.inputs, '$.cost_center')",
+    # Document JSON transmis tel quel ([{"key": ..., "value": ...}]) : ses valeurs
+    'tags': (
+        "(SELECT group_concat(value, ' ') FROM json_tree(CASE WHEN json_valid(json_extract({row}.inputs, '$.tags')) "
+        "THEN json_extract({row}.inputs, '$.tags') ELSE json_quote(json_extract({row}.inputs, '$.tags')) END) "
+        "WHERE type IN ('text', 'integer', 'real'))"
+    ),
+    'description': "COALESCE(json_extract({row}.inputs, '$.description'), "
+                   "json_extract({row}.inputs, '$.alarm_description'))",
+    # Drapeaux true/false exclus : présents partout, ils ne distinguent rien
+    'inputs': (
+        "(SELECT group_concat(value, ' ') FROM json_each({row}.inputs) "
+        "WHERE type IN ('text', 'integer', 'real') AND key != 'tags' AND value NOT IN ('true', 'false'))"
+    ),
+}
+
+
+def _search_values(row):
+    return ', '.join(expression.format(row=row) for expression in _SEARCH_FIELDS.values())
+
+
+# Index sans contenu (les lignes sont relues dans deployment_history) ; index de
+# préfixes de 2 et 3 caractères pour les recherches `ab*` et `abc*`
+_SEARCH_TABLE = f"""
+CREATE VIRTUAL TABLE deployment_search USING fts5(
+    {', '.join(_SEARCH_FIELDS)},
+    content='', columnsize=0, prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+)
+"""
+_SEARCH_TRIGGER = f"""
+CREATE TRIGGER deployment_history_search AFTER INSERT ON deployment_history BEGIN
+    INSERT INTO deployment_search (rowid, {', '.join(_SEARCH_FIELDS)}) VALUES (new.id, {_search_values('new')});
+END
+"""
+
+_COLUMNS = (
+    'id', 'dispatch_id', 'service', 'environment', 'resource', 'workflow', 'inputs', 'outcome', 'status',
+    'github_status', 'deployment_id', 'error', 'attempts', 'user', 'api', 'created_at', 'duration_ms',
+    'finished_at',
+)
+
+_FIELD_COLUMNS = ('service', 'environment', 'resource', 'workflow', 'inputs')
+_RECORD_COLUMNS = _FIELD_COLUMNS + (
+    'dispatch_id', 'outcome', 'status', 'github_status', 'deployment_id', 'error', 'user', 'api', 'created_at',
+    'duration_ms',
+)
+_COMPLETE_COLUMNS = _FIELD_COLUMNS + (
+    'dispatch_id', 'outcome', 'github_status', 'deployment_id', 'error', 'attempts', 'created_at', 'finished_at',
+)
+
+# Opérations d'écriture : upserts sur dispatch_id, applicables dans n'importe quel ordre
+_UPSERTS = {
+    'record': (
+        f"INSERT INTO deployment_history ({', '.join(_RECORD_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(_RECORD_COLUMNS))}) "
+        "ON CONFLICT (dispatch_id) DO UPDATE SET status = excluded.status, user = excluded.user, "
+        "api = excluded.api, duration_ms = excluded.duration_ms, "
+        "deployment_id = COALESCE(deployment_id, excluded.deployment_id)"
+    ),
+    'complete': (
+        f"INSERT INTO deployment_history ({', '.join(_COMPLETE_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(_COMPLETE_COLUMNS))}) "
+        "ON CONFLICT (dispatch_id) DO UPDATE SET outcome = excluded.outcome, "
+        "github_status = excluded.github_status, deployment_id = excluded.deployment_id, "
+        "error = excluded.error, attempts = excluded.attempts, finished_at = excluded.finished_at"
+    ),
+}
+
+_create_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+# Terme de recherche : [champ:]valeur, valeur entre guillemets ou sans espace, `*` final = préfixe
+_SEARCH_TERM = re.compile(r'(?:(\w+):)?("[^"]*"\*?|\S+)')
+
+
+class InvalidCursor(ValueError):
+    """Curseur de pagination illisible (client ou version incompatible)."""
+
+
+class InvalidSearch(ValueError):
+    """Recherche sans aucun terme exploitable."""
+
+
+def search_expression(query):
+    """
+    Traduit une recherche utilisateur en expression FTS5.
+
+    Les termes sont combinés par ET. `champ:valeur` restreint un terme à une
+    colonne (resource, owner, cost_center, tags, description, service,
+    environment, inputs) ; un préfixe inconnu fait partie du terme
+    (ex: arn:aws:...). Un `*` final cherche un préfixe. Chaque valeur est
+    cherchée comme une phrase : `sonatel-assets` trouve les mots sonatel et
+    assets qui se suivent, sans syntaxe FTS5 à connaître ni à échapper.
+
+    Args:
+        query: Recherche saisie (ex: 'owner:alice resource:sonatel-* "base clients"')
+
+    Returns:
+        Expression pour `deployment_search MATCH ?`
+
+    Raises:
+        InvalidSearch: Si la recherche ne contient aucun mot
+    """
+    terms = []
+    for field, value in _SEARCH_TERM.findall(query or ''):
+        if field and field not in _SEARCH_FIELDS:
+            value, field = f"{field}:{value}", ''
+        prefix = value.endswith('*')
+        value = value.rstrip('*')
+        if value.startswith('"') and value.endswith('"') and len(value) > 1:
+            value = value[1:-1]
+        if not re.search(r'\w', value):
+            continue
+        phrase = '"' + value.replace('"', '""') + '"' + ('*' if prefix else '')
+        terms.append(f"{field} : {phrase}" if field else phrase)
+    if not terms:
+        raise InvalidSearch(f"Recherche vide: {query!r}")
+    return ' AND '.join(terms)
+
+
+def encode_cursor(created_at, row_id):
+    """Curseur opaque de la page suivante : position (created_at, id) de la dernière ligne."""
+    return base64.urlsafe_b64encode(f"{created_at!r}:{row_id}".encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Position (created_at, id) d'un curseur produit par encode_cursor().
+
+    Raises:
+        InvalidCursor: Si le curseur est illisible
+    """
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii').split(':')
+        return float(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"Curseur invalide: {cursor!r}") from e
+
+
+class DeploymentHistory:
+    """
+    Table deployment_history d'une base SQLite (connexion par thread et par processus).
+
+    Avec un tampon (HISTORY_BUFFER_ENABLED), record() et complete() rendent
+    la main aussitôt et les lignes sont écrites par lots par le thread du
+    tampon ; sans tampon, chaque appel est une transaction.
+    """
+
+    def __init__(self, db_path, page_size, max_page_size, buffer=None, search=False):
+        self.db_path = db_path
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.buffer = buffer
+        self._initialized_pid = None
+        # Schéma créé avant tout partage de l'objet : une connexion ouverte pendant sa
+        # création garderait un schéma sans l'index unique (upsert refusé à la préparation)
+        conn = self._conn()
+        self.searchable = search and self._create_search_index(conn)
+
+    def _conn(self):
+        conn = connect(self.db_path)
+        if self._initialized_pid != os.getpid():
+            conn.executescript(_SCHEMA)
+            self._initialized_pid = os.getpid()
+        return conn
+
+    def _create_search_index(self, conn):
+        """
+        Crée l'index de recherche et y verse les lignes existantes (base antérieure).
+
+        Une seule transaction : les workers qui démarrent ensemble ne
+        l'indexent qu'une fois et aucune ligne n'échappe au trigger.
+
+        Returns:
+            False si SQLite est compilé sans FTS5
+        """
+        try:
+            with transaction(conn):
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'deployment_search'"
+                ).fetchone()
+                if exists:
+                    return True
+                started = time.perf_counter()
+                conn.execute(_SEARCH_TABLE)
+                conn.execute(_SEARCH_TRIGGER)
+                conn.execute(
+                    f"INSERT INTO deployment_search (rowid, {', '.join(_SEARCH_FIELDS)}) "
+                    f"SELECT id, {_search_values('h')} FROM deployment_history AS h"
+                )
+        except sqlite3.OperationalError as e:
+            if 'fts5' not in str(e):
+                raise
+            logger.warning("Historique : SQLite sans FTS5, recherche désactivée")
+            return False
+        logger.info("Historique : index de recherche créé en %.1f s", time.perf_counter() - started)
+        return True
+
+    @staticmethod
+    def _fields(workflow_name, payload):
+        fields = deployment_fields(workflow_name, payload)
+        return (
+            fields['service'],
+            fields['environment'],
+            fields['resource'],
+            fields['workflow'],
+            json.dumps(redact(fields['inputs']), separators=(',', ':')),
+        )
+
+    def write(self, ops):
+        """
+        Écrit des opérations ('record' ou 'complete', ligne) en une transaction.
+
+        Les opérations consécutives de même nom partent en un seul executemany.
+        """
+        conn = self._conn()
+        with transaction(conn):
+            for op, group in itertools.groupby(ops, key=operator.itemgetter(0)):
+                conn.executemany(_UPSERTS[op], [row for _, row in group])
+
+    def _submit(self, op, row):
+        if self.buffer is not None:
+            self.buffer.add(op, row)
+        else:
+            self.write([(op, row)])
+
+    def record(self, workflow_name, payload, outcome, dispatch_id=None, status=None, github_status=None,
+               deployment_id=None, error=None, user=None, api=False, created_at=None, duration_ms=None):
+        """
+        Enregistre un déclenchement vu par la requête.
+
+        Si complete() a déjà écrit la ligne (même dispatch_id), seuls les
+        champs propres à la requête sont ajoutés : l'issue définitive est
+        conservée.
+
+        Args:
+            workflow_name: Clé du workflow dans WORKFLOWS
+            payload:       Payload GitHub Actions (ref + inputs)
+            outcome:       Issue vue par la requête (dispatched, queued, retrying, failed, rejected)
+            dispatch_id:   Identifiant de la ligne d'outbox (None si rien n'a été enregistré)
+            status:        Code HTTP renvoyé au client
+            created_at:    Début de la requête (time.time()), maintenant par défaut
+            duration_ms:   Durée de la requête
+        """
+        self._submit('record', self._fields(workflow_name, payload) + (
+            dispatch_id, outcome, status, github_status, deployment_id, error, user, int(bool(api)),
+            created_at if created_at is not None else time.time(), duration_ms,
+        ))
+
+    def complete(self, item, outcome, github_status, error, attempts, deployment_id=None):
+        """
+        Enregistre l'issue définitive d'une ligne d'outbox.
+
+        Args:
+            item:    Ligne d'outbox (id, workflow_name, payload, created_at)
+            outcome: 'dispatched' ou 'failed'
+        """
+        self._submit('complete', self._fields(item['workflow_name'], item['payload']) + (
+            item['id'], outcome, github_status, deployment_id, error, attempts, item['created_at'], time.time(),
+        ))
+
+    def stats(self):
+        """Lignes en base et état du tampon d'écriture de ce worker."""
+        count = self._conn().execute('SELECT MAX(id) AS n FROM deployment_history').fetchone()['n'] or 0
+        return {"rows": count, "buffer": self.buffer.stats() if self.buffer is not None else None}
+
+    def get(self, dispatch_id):
+        """Retourne la ligne d'un déclenchement ou None."""
+        row = self._conn().execute(
+            'SELECT * FROM deployment_history WHERE dispatch_id = ?', (dispatch_id,)
+        ).fetchone()
+        return self._row(row) if row else None
+
+    @staticmethod
+    def _row(row):
+        entry = dict(row)
+        entry['inputs'] = json.loads(entry['inputs'])
+        entry['api'] = bool(entry['api'])
+        return entry
+
+    def page(self, service=None, environment=None, limit=None, cursor=None):
+        """
+        Une page de l'historique, du plus récent au plus ancien.
+
+        Args:
+            service:     Filtre sur la clé du workflow (ex: 'ec2')
+            environment: Filtre sur l'environnement
+            limit:       Taille de page (page_size par défaut, bornée à max_page_size)
+            cursor:      Curseur renvoyé par la page précédente
+
+        Returns:
+            (liste de lignes, curseur de la page suivante ou None)
+
+        Raises:
+            InvalidCursor: Si le curseur est illisible
+        """
+        limit = max(1, min(limit or self.page_size, self.max_page_size))
+        clauses, params = [], []
+        if service:
+            clauses.append('service = ?')
+            params.append(service)
+        if environment:
+            clauses.append('environment = ?')
+            params.append(environment)
+        if cursor:
+            clauses.append('(created_at, id) < (?, ?)')
+            params.extend(decode_cursor(cursor))
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ''
+        rows = self._conn().execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM deployment_history {where}"
+            "ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+        entries = [self._row(row) for row in rows[:limit]]
+        following = encode_cursor(rows[limit - 1]['created_at'], rows[limit - 1]['id']) if len(rows) > limit else None
+        return entries, following
+
+    def search(self, query, service=None, environment=None, limit=None, cursor=None):
+        """
+        Une page des déploiements qui correspondent à une recherche plein texte.
+
+        Les résultats sont triés du plus récent au plus ancien par ordre
+        d'écriture (id), l'ordre de l'index FTS5 : la requête s'arrête dès
+        la page remplie, sans trier toutes les correspondances.
+
+        Args:
+            query:       Recherche (voir search_expression())
+            service:     Filtre sur la clé du workflow (ex: 'ec2')
+            environment: Filtre sur l'environnement
+            limit:       Taille de page (page_size par défaut, bornée à max_page_size)
+            cursor:      Curseur renvoyé par la page précédente
+
+        Returns:
+            (liste de lignes, curseur de la page suivante ou None)
+
+        Raises:
+            InvalidSearch: Si la recherche est vide
+            InvalidCursor: Si le curseur est illisible
+        """
+        limit = max(1, min(limit or self.page_size, self.max_page_size))
+        match = search_expression(query)
+        clauses, params = ['deployment_search MATCH ?'], []
+        # Filtres aussi dans l'expression : l'index croise les listes au lieu de relire les lignes
+        if service:
+            match += ' AND service : "' + service.replace('"', '""') + '"'
+            clauses.append('h.service = ?')
+            params.append(service)
+        if environment:
+            match += ' AND environment : "' + environment.replace('"', '""') + '"'
+            clauses.append('h.environment = ?')
+            params.append(environment)
+        if cursor:
+            clauses.append('s.rowid < ?')
+            params.append(decode_cursor(cursor)[1])
+        rows = self._conn().execute(
+            f"SELECT {', '.join('h.' + column for column in _COLUMNS)} "
+            "FROM deployment_search AS s JOIN deployment_history AS h ON h.id = s.rowid "
+            f"WHERE {' AND '.join(clauses)} ORDER BY s.rowid DESC LIMIT ?",
+            (match, *params, limit + 1),
+        ).fetchall()
+        entries = [self._row(row) for row in rows[:limit]]
+        following = encode_cursor(rows[limit - 1]['created_at'], rows[limit - 1]['id']) if len(rows) > limit else None
+        return entries, following
+
+
+def history_db_path(app=None):
+    """HISTORY_DB s'il est configuré, sinon `history.db` dans le dossier instance/."""
+    app = app or current_app
+    path = app.config.get('HISTORY_DB')
+    if not path:
+        os.makedirs(app.instance_path, exist_ok=True)
+        path = os.path.join(app.instance_path, 'history.db')
+    return path
+
+
+def get_history():
+    """Retourne l'historique de l'application courante, ou None s'il est désactivé."""
+    app = current_app._get_current_object()
+    if not app.config['HISTORY_ENABLED']:
+        return None
+    history = app.extensions.get('history')
+    if history is None:
+        with _create_lock:
+            history = app.extensions.get('history')
+            if history is None:
+                db_path = history_db_path(app)
+                history = DeploymentHistory(
+                    db_path,
+                    page_size=app.config['HISTORY_PAGE_SIZE'],
+                    max_page_size=app.config['HISTORY_MAX_PAGE_SIZE'],
+                    search=app.config['HISTORY_SEARCH_ENABLED'],
+                )
+                if app.config['HISTORY_BUFFER_ENABLED']:
+                    history.buffer = WriteBehindBuffer(
+                        history.write,
+                        spill_dir=f"{db_path}.spill",
+                        batch_size=app.config['HISTORY_BATCH_SIZE'],
+                        flush_interval=app.config['HISTORY_FLUSH_INTERVAL'],
+                        capacity=app.config['HISTORY_BUFFER_SIZE'],
+                        block_timeout=app.config['HISTORY_BUFFER_BLOCK_TIMEOUT'],
+                    )
+                app.extensions['history'] = history
+    return history
+
+
+def drain_history(app):
+    """Écrit les lignes encore dans le tampon du worker (arrêt propre, voir gunicorn.conf.py)."""
+    history = app.extensions.get('history')
+    if history is not None and history.buffer is not None:
+        history.buffer.close()
@@ -0,0 +1,183 @@
+"""Dé-duplication des déclenchements (clés d'idempotence partagées entre workers)."""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from flask import current_app
+
+from app.services.state_store import connect, state_db_path, transaction
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key         TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    state       TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    expires_at  REAL NOT NULL,
+    status      INTEGER,
+    headers     TEXT,
+    body        BLOB
+);
+CREATE INDEX IF NOT EXISTS ix_idempotency_keys_expires ON idempotency_keys (expires_at);
+"""
+
+STATE_PENDING = 'pending'
+STATE_DONE = 'done'
+
+# En-têtes rejoués avec la réponse d'origine
+REPLAYED_HEADERS = ('Content-Type', 'Location', 'Retry-After')
+
+_create_lock = threading.Lock()
+
+
+class IdempotencyConflict(Exception):
+    """Clé déjà utilisée pour un autre payload, ou requête identique toujours en cours."""
+
+
+def canonical_fingerprint(workflow_name, payload):
+    """Empreinte SHA-256 du workflow et de ses inputs (JSON canonique)."""
+    inputs = (payload or {}).get('inputs') or {}
+    canonical = json.dumps([workflow_name, inputs], sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Réponses mises en cache par clé d'idempotence pendant une fenêtre.
+
+    Une clé passe par 'pending' (déclenchement en cours) puis 'done'
+    (réponse stockée). Seules les réponses 2xx sont conservées : un échec
+    libère la clé pour que l'utilisateur puisse réessayer. La table est
+    bornée à `max_entries` ; les entrées expirées sont purgées à l'écriture.
+    """
+
+    def __init__(self, db_path, window, max_entries, pending_timeout):
+        self.db_path = db_path
+        self.window = window
+        self.max_entries = max_entries
+        self.pending_timeout = pending_timeout
+        self._initialized_pid = None
+
+    def _conn(self):
+        conn = connect(self.db_path)
+        if self._initialized_pid != os.getpid():
+            conn.executescript(_SCHEMA)
+            self._initialized_pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def make_key(workflow_name, fingerprint, explicit_key=None):
+        """Clé de stockage : clé explicite du client, sinon l'empreinte du payload."""
+        if explicit_key:
+            return hashlib.sha256(f"{workflow_name}\0{explicit_key}".encode('utf-8')).hexdigest()
+        return fingerprint
+
+    def begin(self, key, fingerprint):
+        """
+        Réserve une clé avant déclenchement.
+
+        Returns:
+            ('new', None) si l'appelant doit déclencher,
+            ('replay', row) si une réponse est en cache,
+            ('pending', None) si une requête identique est en cours
+
+        Raises:
+            IdempotencyConflict: Si la clé a servi pour un autre payload
+        """
+        conn = self._conn()
+        now = time.time()
+        with transaction(conn):
+            conn.execute(
+                'DELETE FROM idempotency_keys WHERE expires_at < ? OR (state = ? AND created_at < ?)',
+                (now, STATE_PENDING, now - self.pending_timeout),
+            )
+            row = conn.execute('SELECT * FROM idempotency_keys WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                if row['fingerprint'] != fingerprint:
+                    raise IdempotencyConflict("Clé d'idempotence déjà utilisée pour une autre requête")
+                if row['state'] == STATE_DONE:
+                    return 'replay', dict(row)
+                return 'pending', None
+
+            conn.execute(
+                'INSERT INTO idempotency_keys (key, fingerprint, state, created_at, expires_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, fingerprint, STATE_PENDING, now, now + self.window),
+            )
+            conn.execute(
+                'DELETE FROM idempotency_keys WHERE key IN ('
+                '  SELECT key FROM idempotency_keys ORDER BY created_at DESC LIMIT -1 OFFSET ?'
+                ')',
+                (self.max_entries,),
+            )
+        return 'new', None
+
+    def wait_for(self, key, timeout, interval=0.1):
+        """
+        Attend qu'une requête identique en cours se termine.
+
+        Returns:
+            La ligne 'done' si elle arrive à temps, sinon None
+        """
+        steps = self.wait_for_steps(key, timeout, interval)
+        try:
+            while True:
+                time.sleep(next(steps))
+        except StopIteration as stop:
+            return stop.value
+
+    def wait_for_steps(self, key, timeout, interval=0.1):
+        """
+        Étapes de wait_for() : produit chaque attente (secondes) au lieu de
+        dormir. La connexion est reprise à chaque réveil (thread du pool ASGI
+        éventuellement différent).
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            row = self._conn().execute('SELECT * FROM idempotency_keys WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if row['state'] == STATE_DONE:
+                return dict(row)
+            yield interval
+        return None
+
+    def complete(self, key, response):
+        """Stocke la réponse d'un déclenchement réussi pour la fenêtre configurée."""
+        headers = {name: response.headers[name] for name in REPLAYED_HEADERS if name in response.headers}
+        now = time.time()
+        conn = self._conn()
+        with transaction(conn):
+            conn.execute(
+                'UPDATE idempotency_keys SET state = ?, status = ?, headers = ?, body = ?, expires_at = ? '
+                'WHERE key = ?',
+                (STATE_DONE, response.status_code, json.dumps(headers), response.get_data(), now + self.window, key),
+            )
+
+    def release(self, key):
+        """Libère une clé réservée dont le déclenchement a échoué."""
+        conn = self._conn()
+        with transaction(conn):
+            conn.execute('DELETE FROM idempotency_keys WHERE key = ? AND state = ?', (key, STATE_PENDING))
+
+
+def get_idempotency_store():
+    """Retourne le store de l'application courante, ou None s'il est désactivé."""
+    app = current_app._get_current_object()
+    if not app.config['IDEMPOTENCY_ENABLED']:
+        return None
+    store = app.extensions.get('idempotency')
+    if store is None:
+        with _create_lock:
+            store = app.extensions.get('idempotency')
+            if store is None:
+                store = IdempotencyStore(
+                    state_db_path(app),
+                    window=app.config['IDEMPOTENCY_WINDOW'],
+                    max_entries=app.config['IDEMPOTENCY_MAX_ENTRIES'],
+                    pending_timeout=app.config['IDEMPOTENCY_PENDING_TIMEOUT'],
+                )
+                app.extensions['idempotency'] = store
+    return store
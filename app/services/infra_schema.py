@@ -0,0 +1,999 @@
+"""
+Variables des modules Terraform et pré-validation des payloads.
+
+Au démarrage, les fichiers variable*.tf de chaque module de INFRA_MODULES
+(infra/<module>/variables.tf, ou variable.tf) sont lus par un analyseur HCL
+restreint (blocs, attributs, expressions) dans un index en mémoire : nom,
+type, défaut et blocs `validation` de chaque variable. Le workflow GitHub
+Actions du service indique quel input devient quelle variable
+(`-var="x=${{ github.event.inputs.y }}"` ou `TF_VAR_x: ...`) ; sans
+workflow lisible, un input alimente la variable de même nom.
+
+Les conditions `validation` sont compilées en fonctions Python : contrôler
+un payload (conversion string/number/bool comme le fait `-var`, puis
+conditions) coûte quelques microsecondes, et un payload que Terraform
+refuserait est rejeté avant le dispatch au lieu d'échouer dans le run.
+Ne sont rejetés que les refus certains :
+  - les variables list/map/object, construites par le workflow (jq, sed),
+    ne sont pas contrôlées ;
+  - un input vide vers une variable qui a un défaut vaut « non fourni » :
+    le défaut du module s'applique, sans contrôle de type ni condition ;
+  - une condition hors du sous-ensemble évalué (fonction inconnue,
+    expression `for`) est ignorée ; `flask infra drift` la signale.
+"""
+import functools
+import json
+import os
+import re
+import textwrap
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.services.form_schema import FLAG, RAW, TEXT
+
+
+class HclError(ValueError):
+    """Fichier .tf hors du sous-ensemble HCL lu par l'analyseur."""
+
+
+class _Unsupported(Exception):
+    """Expression hors du sous-ensemble évalué (compilation)."""
+
+
+class _EvalError(Exception):
+    """Erreur d'évaluation (type, motif sans correspondance) : rattrapée par can() et try()."""
+
+
+class _Unknown(Exception):
+    """Valeur inconnue avant le run (autre variable non transmise) : condition non décidée."""
+
+
+# ── Analyse lexicale ────────────────────────────────────────────────────────
+
+_TOKEN = re.compile(r'''
+    (?P<space>[ \t\r\n]+|\#[^\n]*|//[^\n]*|/\*.*?\*/)
+  | (?P<heredoc><<(?P<indent>-?)(?P<marker>[A-Za-z_][A-Za-z0-9_]*)[ \t]*\r?\n)
+  | (?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_-]*)
+  | (?P<op>==|!=|<=|>=|&&|\|\||=>|\.\.\.|[{}\[\](),=:?.!<>+\-*/%])
+''', re.VERBOSE | re.DOTALL)
+
+_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', '"': '"', '\\': '\\'}
+_ESCAPE = re.compile(r'\\(?:u([0-9a-fA-F]{4})|U([0-9a-fA-F]{8})|(.))|\$\$\{|%%\{', re.DOTALL)
+
+
+def _unescape(text, path, line):
+    def replace(match):
+        if match.group(0) in ('$${', '%%{'):
+            return match.group(0)[1:]
+        code = match.group(1) or match.group(2)
+        if code:
+            return chr(int(code, 16))
+        if match.group(3) not in _ESCAPES:
+            raise HclError(f"{path}:{line}: séquence d'échappement inconnue \\{match.group(3)}")
+        return _ESCAPES[match.group(3)]
+    return _ESCAPE.sub(replace, text)
+
+
+def _string_node(text):
+    # Gabarit ${...} ou directive %{...} : texte conservé, jamais évalué
+    if re.search(r'(?<![$%])[$%]\{', text.replace('$${', '').replace('%%{', '')):
+        return ('template', text)
+    return ('lit', text)
+
+
+def _tokenize(text, path):
+    """Jetons (genre, valeur, ligne) ; espaces et commentaires ignorés."""
+    pos, line = 0, 1
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            raise HclError(f"{path}:{line}: caractère inattendu {text[pos]!r}")
+        kind = match.lastgroup
+        if kind == 'heredoc':
+            marker = match.group('marker')
+            end = re.compile(rf'^[ \t]*{marker}[ \t]*\r?$', re.MULTILINE).search(text, match.end())
+            if end is None:
+                raise HclError(f"{path}:{line}: heredoc <<{marker} non terminé")
+            body = text[match.end():end.start()]
+            if match.group('indent'):
+                body = textwrap.dedent(body)
+            yield ('string', _string_node(body), line)
+            line += text.count('\n', pos, end.end())
+            pos = end.end()
+            continue
+        value = match.group(kind)
+        if kind == 'string':
+            yield ('string', _string_node(_unescape(value[1:-1], path, line)), line)
+        elif kind != 'space':
+            yield (kind, value, line)
+        line += value.count('\n')
+        pos = match.end()
+    yield ('eof', None, line)
+
+
+# ── Analyse syntaxique ──────────────────────────────────────────────────────
+
+# Opérateurs binaires, de la priorité la plus faible à la plus forte
+_PRECEDENCE = (('||',), ('&&',), ('==', '!='), ('<', '>', '<=', '>='), ('+', '-'), ('*', '/', '%'))
+_KEYWORDS = {'true': True, 'false': False, 'null': None}
+
+
+class _Parser:
+    """
+    Analyseur descendant d'un fichier .tf.
+
+    Corps : liste de ('attr', nom, expression, ligne) et
+    ('block', type, libellés, corps, ligne). Expressions : tuples
+    ('lit', valeur), ('template', texte), ('list', éléments),
+    ('object', [(clé, expression)]), ('name', identifiant),
+    ('attr', expression, nom), ('index', expression, expression),
+    ('call', fonction, arguments), ('unary', op, expression),
+    ('binary', op, gauche, droite), ('cond', condition, si_vrai, si_faux),
+    ('unsupported', raison).
+    """
+
+    def __init__(self, text, path):
+        self.path = path
+        self.tokens = list(_tokenize(text, path))
+        self.pos = 0
+
+    def _peek(self, kind=None, value=None, offset=0):
+        token = self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+        return (kind is None or token[0] == kind) and (value is None or token[1] == value)
+
+    def _next(self):
+        token = self.tokens[self.pos]
+        if token[0] != 'eof':
+            self.pos += 1
+        return token
+
+    def _expect(self, kind, value=None):
+        if not self._peek(kind, value):
+            _, found, line = self.tokens[self.pos]
+            raise HclError(f"{self.path}:{line}: {value or kind} attendu, trouvé {found!r}")
+        return self._next()
+
+    def parse(self):
+        body = self._body()
+        self._expect('eof')
+        return body
+
+    def _body(self):
+        items = []
+        while not self._peek('eof') and not self._peek('op', '}'):
+            _, name, line = self._expect('ident')
+            if self._peek('op', '='):
+                self._next()
+                items.append(('attr', name, self._expression(), line))
+                continue
+            labels = []
+            while self._peek('string') or self._peek('ident'):
+                kind, label, _ = self._next()
+                labels.append(label[1] if kind == 'string' else label)
+            self._expect('op', '{')
+            body = self._body()
+            self._expect('op', '}')
+            items.append(('block', name, labels, body, line))
+        return items
+
+    def _expression(self):
+        condition = self._binary(0)
+        if not self._peek('op', '?'):
+            return condition
+        self._next()
+        when_true = self._expression()
+        self._expect('op', ':')
+        return ('cond', condition, when_true, self._expression())
+
+    def _binary(self, level):
+        if level == len(_PRECEDENCE):
+            return self._unary()
+        left = self._binary(level + 1)
+        while self._peek('op') and self.tokens[self.pos][1] in _PRECEDENCE[level]:
+            operator = self._next()[1]
+            left = ('binary', operator, left, self._binary(level + 1))
+        return left
+
+    def _unary(self):
+        if self._peek('op', '!') or self._peek('op', '-'):
+            operator = self._next()[1]
+            return ('unary', operator, self._unary())
+        return self._postfix(self._primary())
+
+    def _postfix(self, node):
+        while True:
+            if self._peek('op', '.'):
+                self._next()
+                if self._peek('op', '*'):
+                    self._next()
+                    node = ('unsupported', "splat .*")
+                    continue
+                kind, name, _ = self._next()
+                if kind not in ('ident', 'number'):
+                    raise HclError(f"{self.path}: attribut attendu après '.'")
+                node = ('attr', node, name)
+            elif self._peek('op', '['):
+                self._next()
+                if self._peek('op', '*'):
+                    self._next()
+                    self._expect('op', ']')
+                    node = ('unsupported', "splat [*]")
+                    continue
+                index = self._expression()
+                self._expect('op', ']')
+                node = ('index', node, index)
+            else:
+                return node
+
+    def _skip_balanced(self, closing):
+        depth = 1
+        pairs = {'{': '}', '[': ']', '(': ')'}
+        stack = [closing]
+        while depth:
+            kind, value, line = self._next()
+            if kind == 'eof':
+                raise HclError(f"{self.path}:{line}: {closing} manquant")
+            if kind == 'op' and value in pairs:
+                stack.append(pairs[value])
+                depth += 1
+            elif kind == 'op' and value == stack[-1]:
+                stack.pop()
+                depth -= 1
+
+    def _primary(self):
+        kind, value, line = self._next()
+        if kind == 'number':
+            return ('lit', float(value) if any(c in value for c in '.eE') else int(value))
+        if kind == 'string':
+            return value
+        if kind == 'ident':
+            if value in _KEYWORDS:
+                return ('lit', _KEYWORDS[value])
+            if self._peek('op', '('):
+                self._next()
+                args = []
+                while not self._peek('op', ')'):
+                    args.append(self._expression())
+                    if self._peek('op', '...'):
+                        self._next()
+                        args.append(('unsupported', "expansion ..."))
+                    if not self._peek('op', ')'):
+                        self._expect('op', ',')
+                self._next()
+                return ('call', value, args)
+            return ('name', value)
+        if kind == 'op' and value == '(':
+            node = self._expression()
+            self._expect('op', ')')
+            return node
+        if kind == 'op' and value == '[':
+            if self._peek('ident', 'for'):
+                self._skip_balanced(']')
+                return ('unsupported', "expression for")
+            items = []
+            while not self._peek('op', ']'):
+                items.append(self._expression())
+                if not self._peek('op', ']'):
+                    self._expect('op', ',')
+            self._next()
+            return ('list', items)
+        if kind == 'op' and value == '{':
+            if self._peek('ident', 'for'):
+                self._skip_balanced('}')
+                return ('unsupported', "expression for")
+            items = []
+            while not self._peek('op', '}'):
+                if self._peek('op', '('):
+                    key = self._primary()
+                else:
+                    key_kind, key, _ = self._next()
+                    if key_kind == 'string':
+                        key = key[1]
+                    elif key_kind != 'ident':
+                        raise HclError(f"{self.path}:{line}: clé d'objet attendue")
+                if not (self._peek('op', '=') or self._peek('op', ':')):
+                    self._expect('op', '=')
+                self._next()
+                items.append((key, self._expression()))
+                if self._peek('op', ','):
+                    self._next()
+            self._next()
+            return ('object', items)
+        raise HclError(f"{self.path}:{line}: expression attendue, trouvé {value!r}")
+
+
+def _literal(node):
+    """Valeur Python d'une expression constante (défaut d'une variable)."""
+    kind = node[0]
+    if kind in ('lit', 'template'):
+        return node[1]
+    if kind == 'list':
+        return [_literal(item) for item in node[1]]
+    if kind == 'object':
+        return {key if isinstance(key, str) else _literal(key): _literal(value) for key, value in node[1]}
+    if kind == 'unary' and node[1] == '-':
+        value = _literal(node[2])
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return -value
+    raise _Unsupported("valeur non littérale")
+
+
+def _type_name(node):
+    """Type Terraform tel qu'écrit (ex: 'list(object({key = string}))')."""
+    kind = node[0]
+    if kind == 'name':
+        return node[1]
+    if kind == 'call':
+        return f"{node[1]}({', '.join(_type_name(arg) for arg in node[2])})"
+    if kind == 'object':
+        return '{' + ', '.join(f"{key} = {_type_name(value)}" for key, value in node[1]) + '}'
+    if kind == 'list':
+        return '[' + ', '.join(_type_name(item) for item in node[1]) + ']'
+    if kind == 'lit':
+        return json.dumps(node[1])
+    return '?'
+
+
+# ── Évaluation des conditions ───────────────────────────────────────────────
+
+def _number(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise _EvalError(f"nombre attendu : {value!r}")
+    return value
+
+
+def _boolean(value):
+    if not isinstance(value, bool):
+        raise _EvalError(f"booléen attendu : {value!r}")
+    return value
+
+
+def _string(value):
+    if not isinstance(value, str):
+        raise _EvalError(f"chaîne attendue : {value!r}")
+    return value
+
+
+@functools.lru_cache(maxsize=256)
+def _pattern(source):
+    try:
+        return re.compile(source)
+    except re.error as e:
+        raise _EvalError(f"motif invalide {source!r}: {e}") from e
+
+
+def _regex(pattern, value):
+    match = (pattern if isinstance(pattern, re.Pattern) else _pattern(_string(pattern))).search(_string(value))
+    if match is None:
+        raise _EvalError("aucune correspondance")
+    if match.re.groupindex:
+        return match.groupdict()
+    if match.re.groups:
+        return list(match.groups())
+    return match.group(0)
+
+
+def _length(value):
+    if isinstance(value, (str, list, dict)):
+        return len(value)
+    raise _EvalError(f"length() sur {value!r}")
+
+
+def _contains(collection, value):
+    if not isinstance(collection, (list, tuple, frozenset, set)):
+        raise _EvalError("contains() attend une liste")
+    return value in collection
+
+
+def _coalesce(*values):
+    for value in values:
+        if value is not None and value != '':
+            return value
+    raise _EvalError("coalesce() sans valeur")
+
+
+def _tonumber(value):
+    if isinstance(value, str):
+        return convert_number(value)
+    return _number(value)
+
+
+def _tostring(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float, str)):
+        return str(value)
+    raise _EvalError(f"tostring() sur {value!r}")
+
+
+_FUNCTIONS = {
+    'contains': _contains,
+    'regex': _regex,
+    'length': _length,
+    'lower': lambda s: _string(s).lower(),
+    'upper': lambda s: _string(s).upper(),
+    'trimspace': lambda s: _string(s).strip(),
+    'startswith': lambda s, prefix: _string(s).startswith(_string(prefix)),
+    'endswith': lambda s, suffix: _string(s).endswith(_string(suffix)),
+    'alltrue': lambda values: all(_boolean(v) for v in values),
+    'anytrue': lambda values: any(_boolean(v) for v in values),
+    'coalesce': _coalesce,
+    'tonumber': _tonumber,
+    'tostring': _tostring,
+    'split': lambda separator, s: _string(s).split(_string(separator)),
+    'join': lambda separator, values: _string(separator).join(_string(v) for v in values),
+    'substr': lambda s, offset, length: _string(s)[_number(offset):][:None if _number(length) < 0 else length],
+}
+
+_COMPARISONS = {
+    '<': lambda a, b: _number(a) < _number(b),
+    '>': lambda a, b: _number(a) > _number(b),
+    '<=': lambda a, b: _number(a) <= _number(b),
+    '>=': lambda a, b: _number(a) >= _number(b),
+    '+': lambda a, b: _number(a) + _number(b),
+    '-': lambda a, b: _number(a) - _number(b),
+    '*': lambda a, b: _number(a) * _number(b),
+    '/': lambda a, b: _number(a) / _number(b) if b else _raise(_EvalError("division par zéro")),
+    '%': lambda a, b: _number(a) % _number(b) if b else _raise(_EvalError("division par zéro")),
+    '==': lambda a, b: type(a) is type(b) and a == b or _numeric_equal(a, b),
+    '!=': lambda a, b: not (type(a) is type(b) and a == b or _numeric_equal(a, b)),
+}
+
+
+def _raise(error):
+    raise error
+
+
+def _numeric_equal(a, b):
+    return (isinstance(a, (int, float)) and isinstance(b, (int, float))
+            and not isinstance(a, bool) and not isinstance(b, bool) and a == b)
+
+
+def _compile(node):
+    """
+    Compile une expression en fonction(env) → valeur, env = {variable: valeur}.
+
+    Les sous-expressions constantes sont évaluées une fois à la compilation.
+
+    Raises:
+        _Unsupported: Expression hors du sous-ensemble évalué
+    """
+    try:
+        constant = _literal(node)
+    except _Unsupported:
+        pass
+    else:
+        if node[0] == 'template':
+            raise _Unsupported("gabarit ${...}")
+        if isinstance(constant, list) and all(isinstance(item, str) for item in constant):
+            constant = frozenset(constant)
+        return lambda env: constant
+
+    kind = node[0]
+    if kind == 'attr' and node[1] == ('name', 'var'):
+        name = node[2]
+
+        def variable(env):
+            try:
+                return env[name]
+            except KeyError:
+                raise _Unknown(name) from None
+        return variable
+    if kind == 'attr':
+        base, key = _compile(node[1]), node[2]
+
+        def attribute(env):
+            value = base(env)
+            if not isinstance(value, dict) or key not in value:
+                raise _EvalError(f"attribut {key} absent")
+            return value[key]
+        return attribute
+    if kind == 'index':
+        base, index = _compile(node[1]), _compile(node[2])
+
+        def item(env):
+            value, position = base(env), index(env)
+            try:
+                return value[position]
+            except (KeyError, IndexError, TypeError) as e:
+                raise _EvalError(str(e)) from e
+        return item
+    if kind == 'unary':
+        operand = _compile(node[2])
+        if node[1] == '!':
+            return lambda env: not _boolean(operand(env))
+        return lambda env: -_number(operand(env))
+    if kind == 'binary':
+        operator, left, right = node[1], _compile(node[2]), _compile(node[3])
+        if operator == '&&':
+            return lambda env: _boolean(left(env)) and _boolean(right(env))
+        if operator == '||':
+            return lambda env: _boolean(left(env)) or _boolean(right(env))
+        apply = _COMPARISONS[operator]
+        return lambda env: apply(left(env), right(env))
+    if kind == 'cond':
+        condition, when_true, when_false = (_compile(part) for part in node[1:])
+        return lambda env: when_true(env) if _boolean(condition(env)) else when_false(env)
+    if kind == 'call':
+        return _compile_call(node[1], node[2])
+    if kind == 'unsupported':
+        raise _Unsupported(node[1])
+    if kind == 'template':
+        raise _Unsupported("gabarit ${...}")
+    raise _Unsupported(f"référence {_type_name(node)}")
+
+
+def _compile_call(name, args):
+    if name in ('can', 'try'):
+        branches = [_compile(arg) for arg in args]
+        if name == 'can' and len(branches) == 1:
+            branch = branches[0]
+
+            def can(env):
+                try:
+                    branch(env)
+                except _EvalError:
+                    return False
+                return True
+            return can
+
+        def attempt(env):
+            for branch in branches:
+                try:
+                    return branch(env)
+                except _EvalError:
+                    continue
+            raise _EvalError("try() : aucune expression valide")
+        return attempt
+    function = _FUNCTIONS.get(name)
+    if function is None:
+        raise _Unsupported(f"fonction {name}()")
+    compiled = [_compile(arg) for arg in args]
+    if name == 'regex' and args and args[0][0] == 'lit' and isinstance(args[0][1], str):
+        # Motif constant : compilé une fois
+        pattern, value = _pattern(args[0][1]), compiled[1]
+        return lambda env: _regex(pattern, value(env))
+    if len(compiled) == 1:
+        only = compiled[0]
+        return lambda env: _call(function, only(env))
+    if len(compiled) == 2:
+        first, second = compiled
+        return lambda env: _call(function, first(env), second(env))
+    return lambda env: _call(function, *(arg(env) for arg in compiled))
+
+
+def _call(function, *args):
+    try:
+        return function(*args)
+    except TypeError as e:
+        raise _EvalError(str(e)) from e
+
+
+# ── Conversion des valeurs transmises (-var, TF_VAR_) ─────────────────────────
+
+_NUMBER = re.compile(r'-?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?\Z')
+_BOOLS = {'true': True, 'false': False, '1': True, '0': False}
+
+
+def convert_number(raw):
+    """Nombre Terraform d'une chaîne transmise en -var (ValueError sinon)."""
+    if not _NUMBER.match(raw):
+        raise ValueError(raw)
+    value = float(raw)
+    return int(value) if value.is_integer() and 'e' not in raw.lower() and '.' not in raw else value
+
+
+def convert_bool(raw):
+    """Booléen Terraform d'une chaîne transmise en -var (ValueError sinon)."""
+    try:
+        return _BOOLS[raw]
+    except KeyError:
+        raise ValueError(raw) from None
+
+
+_CONVERTERS = {'string': None, 'number': convert_number, 'bool': convert_bool}
+
+
+# ── Index des modules ───────────────────────────────────────────────────────
+
+class Validation:
+    """
+    Bloc `validation` compilé.
+
+    Args:
+        condition: Texte de la condition (rapport de dérive)
+        message:   error_message du bloc
+        predicate: fonction(env) → False si la valeur est refusée, None si
+                   la condition n'est pas évaluable
+        reason:    Pourquoi la condition n'est pas évaluée
+    """
+
+    def __init__(self, condition, message, predicate, reason=None):
+        self.condition = condition
+        self.message = message
+        self.predicate = predicate
+        self.reason = reason
+
+
+class Variable:
+    """Variable déclarée par un module (bloc `variable`)."""
+
+    def __init__(self, name, type_name, default, required, sensitive, validations, path, line):
+        self.name = name
+        self.type_name = type_name
+        # Types convertis depuis une chaîne -var ; None = list/map/object (non contrôlé)
+        self.primitive = type_name if type_name in _CONVERTERS else ('string' if type_name == 'any' else None)
+        self.default = default
+        self.required = required
+        self.sensitive = sensitive
+        self.validations = tuple(validations)
+        self.path = path
+        self.line = line
+
+
+def _predicate(compiled):
+    def predicate(env):
+        try:
+            return compiled(env) is not False
+        except (_EvalError, _Unknown):
+            # Erreur d'évaluation ou valeur inconnue : Terraform tranchera
+            return True
+    return predicate
+
+
+def _source(text, line):
+    """Texte de la condition à la ligne `line` (rapport)."""
+    return text.splitlines()[line - 1].split('=', 1)[-1].strip() if line else ''
+
+
+def read_variables(path):
+    """
+    Lit les blocs `variable` d'un fichier .tf.
+
+    Returns:
+        {nom: Variable}
+
+    Raises:
+        HclError: Fichier hors du sous-ensemble HCL lu
+    """
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    variables = {}
+    for item in _Parser(text, path).parse():
+        if item[0] != 'block' or item[1] != 'variable':
+            continue
+        _, _, labels, body, line = item
+        if len(labels) != 1:
+            raise HclError(f"{path}:{line}: bloc variable sans nom")
+        name = labels[0]
+        attributes = {entry[1]: entry[2] for entry in body if entry[0] == 'attr'}
+        validations = []
+        for entry in body:
+            if entry[0] != 'block' or entry[1] != 'validation':
+                continue
+            rule = {attr[1]: (attr[2], attr[3]) for attr in entry[3] if attr[0] == 'attr'}
+            condition, condition_line = rule.get('condition', (('lit', True), 0))
+            message = _literal(rule['error_message'][0]) if 'error_message' in rule else "Valeur invalide."
+            try:
+                predicate, reason = _predicate(_compile(condition)), None
+            except _Unsupported as e:
+                predicate, reason = None, str(e)
+            validations.append(Validation(_source(text, condition_line), message, predicate, reason))
+        try:
+            default = _literal(attributes['default']) if 'default' in attributes else None
+        except _Unsupported:
+            default = None
+        type_name = _type_name(attributes['type']) if 'type' in attributes else 'any'
+        sensitive = attributes.get('sensitive', ('lit', False)) == ('lit', True)
+        variables[name] = Variable(name, type_name, default, 'default' not in attributes, sensitive,
+                                   validations, path, line)
+    return variables
+
+
+class Module:
+    """Variables d'un module infra/<nom>, lues dans ses fichiers variable*.tf."""
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.files = []
+        self.variables = {}
+        self.errors = []
+        try:
+            names = sorted(os.listdir(path))
+        except OSError as e:
+            self.errors.append(f"module introuvable : {e}")
+            return
+        for filename in names:
+            if not (filename.startswith('variable') and filename.endswith('.tf')):
+                continue
+            self.files.append(filename)
+            try:
+                self.variables.update(read_variables(os.path.join(path, filename)))
+            except (HclError, OSError, UnicodeDecodeError) as e:
+                self.errors.append(str(e))
+        if not self.files and not self.errors:
+            self.errors.append("aucun fichier variable*.tf")
+
+
+_WORKFLOW_VAR = re.compile(
+    r'''-var[= ]["']?([A-Za-z_][A-Za-z0-9_-]*)=(.*)|\bTF_VAR_([A-Za-z_][A-Za-z0-9_-]*)\s*[:=]\s*(.*)'''
+)
+_INPUT_REF = re.compile(
+    r'''["']?\$\{\{\s*(?:github\.event\.)?inputs\.([A-Za-z_][A-Za-z0-9_-]*)\s*\}\}["']?\s*\\?\s*\Z'''
+)
+_INPUT_USE = re.compile(r'\binputs\.([A-Za-z_][A-Za-z0-9_-]*)')
+
+
+def read_workflow(path):
+    """
+    Variables Terraform passées par un workflow (-var ou TF_VAR_).
+
+    Returns:
+        ([(input, variable)] passées telles quelles depuis un input,
+         {variables calculées par le workflow (jq, sed, valeur fixe)},
+         {inputs lus quelque part dans le workflow})
+    """
+    pairs, computed, used = [], set(), set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            used.update(_INPUT_USE.findall(line))
+            match = _WORKFLOW_VAR.search(line)
+            if match is None:
+                continue
+            variable = match.group(1) or match.group(3)
+            value = (match.group(2) if match.group(1) else match.group(4)).strip()
+            reference = _INPUT_REF.match(value)
+            if reference:
+                pairs.append((reference.group(1), variable))
+            else:
+                computed.add(variable)
+    return pairs, computed, used
+
+
+class Contract:
+    """
+    Contrôle des inputs d'un service contre les variables de son module.
+
+    Args:
+        service:  Clé du workflow (ex: 'codebuild')
+        module:   Module lu
+        inputs:   Inputs envoyés par le formulaire du service
+        workflow: Chemin du workflow GitHub Actions (None si illisible)
+    """
+
+    def __init__(self, service, module, inputs, workflow=None):
+        self.service = service
+        self.module = module
+        self.inputs = tuple(inputs)
+        self.workflow = workflow
+        self.used = None
+        if workflow is not None:
+            self.pairs, self.computed, self.used = read_workflow(workflow)
+        if workflow is None or not (self.pairs or self.computed):
+            # Pas de correspondance lisible : l'input alimente la variable de même nom
+            self.pairs = [(name, name) for name in self.inputs if name in module.variables]
+            self.computed = set()
+
+        checks = []
+        for input_name, name in self.pairs:
+            variable = module.variables.get(name)
+            if variable is None or variable.primitive is None:
+                continue
+            predicates = tuple((v.predicate, v.message) for v in variable.validations if v.predicate is not None)
+            checks.append((input_name, name, _CONVERTERS[variable.primitive], variable.primitive,
+                           variable.sensitive, not variable.required, predicates))
+        self._checks = tuple(checks)
+        self._validated = tuple(check for check in checks if check[6])
+
+    def check(self, inputs):
+        """
+        Erreurs que Terraform opposerait à ces inputs.
+
+        Args:
+            inputs: Inputs du payload {nom: chaîne}
+
+        Returns:
+            Liste de (input, message), vide si le payload passe
+        """
+        errors = []
+        env = {}
+        for input_name, name, convert, primitive, sensitive, optional, _ in self._checks:
+            raw = inputs.get(input_name)
+            if raw is None or optional and not raw.strip():
+                continue
+            if convert is None:
+                env[name] = raw
+                continue
+            try:
+                env[name] = convert(raw)
+            except ValueError:
+                noun = "un nombre" if primitive == 'number' else "true ou false"
+                errors.append((input_name, f"var.{name} attend {noun}" + ("" if sensitive else f", reçu '{raw}'")))
+        for input_name, name, _, _, _, _, predicates in self._validated:
+            if name not in env:
+                continue
+            for predicate, message in predicates:
+                if not predicate(env):
+                    errors.append((input_name, message))
+                    break
+        return errors
+
+
+class InfraIndex:
+    """Modules lus au démarrage et contrats des services (app.extensions['infra_schema'])."""
+
+    def __init__(self, modules, contracts, load_ms):
+        self.modules = modules
+        self.contracts = contracts
+        self.load_ms = load_ms
+
+
+def _default_folder(app, setting, *parts):
+    return app.config.get(setting) or os.path.join(os.path.dirname(app.root_path), *parts)
+
+
+def load_index(app):
+    """
+    Lit les modules de INFRA_MODULES et compile les contrats des services.
+
+    Returns:
+        InfraIndex
+    """
+    started = time.perf_counter()
+    infra_dir = _default_folder(app, 'INFRA_DIR', 'infra')
+    workflows_dir = _default_folder(app, 'WORKFLOWS_DIR', '.github', 'workflows')
+    schemas = app.extensions['form_schemas']
+    modules, contracts = {}, {}
+    for service, module_name in app.config['INFRA_MODULES'].items():
+        module = modules.get(module_name)
+        if module is None:
+            module = modules[module_name] = Module(module_name, os.path.join(infra_dir, module_name))
+        schema = schemas.get(service)
+        if schema is None or not module.variables:
+            continue
+        workflow = os.path.join(workflows_dir, app.config['WORKFLOWS'].get(service, ''))
+        contracts[service] = Contract(service, module, schema.input_names,
+                                      workflow if os.path.isfile(workflow) else None)
+    return InfraIndex(modules, contracts, round((time.perf_counter() - started) * 1000, 2))
+
+
+def init_infra_schema(app):
+    """
+    Lit les modules Terraform et attache leur contrat aux schémas compilés.
+
+    Sans effet sur les payloads si INFRA_VALIDATION_ENABLED est faux ;
+    `flask infra drift` reste disponible.
+    """
+    app.cli.add_command(infra_cli)
+    if not app.config['INFRA_VALIDATION_ENABLED']:
+        return
+    index = load_index(app)
+    for service, contract in index.contracts.items():
+        app.extensions['form_schemas'][service].contract = contract
+    app.extensions['infra_schema'] = index
+    for module in index.modules.values():
+        for error in module.errors:
+            app.logger.warning("Module Terraform %s : %s", module.name, error)
+    app.logger.info("Variables Terraform : %d modules, %d services contrôlés en %.1f ms",
+                    len(index.modules), len(index.contracts), index.load_ms)
+
+
+# ── Dérive routes / workflows / modules ─────────────────────────────────────
+
+ERROR, WARNING, INFO = 'erreur', 'attention', 'info'
+
+
+def drift_report(app):
+    """
+    Écarts entre les formulaires, les workflows et les modules Terraform.
+
+    Erreurs : ce que Terraform refusera (choix ou défaut du formulaire
+    rejeté, variable obligatoire jamais transmise, variable non déclarée,
+    module illisible). Avertissements : inputs qui n'atteignent pas
+    Terraform, saisie libre vers une variable number/bool, nom de fichier
+    inhabituel. Infos : conditions non évaluées, services sans module.
+
+    Returns:
+        Liste de {"service", "level", "message"} triée par service
+    """
+    index = load_index(app)
+    schemas = app.extensions['form_schemas']
+    report = []
+
+    def add(service, level, message):
+        report.append({"service": service, "level": level, "message": message})
+
+    for service in sorted(schemas):
+        module_name = app.config['INFRA_MODULES'].get(service)
+        if module_name is None:
+            add(service, INFO, "aucun module Terraform déclaré dans INFRA_MODULES")
+            continue
+        module = index.modules[module_name]
+        for error in module.errors:
+            add(service, ERROR, f"infra/{module_name} : {error}")
+        for filename in module.files:
+            if filename != 'variables.tf':
+                add(service, WARNING, f"infra/{module_name}/{filename} : nom inhabituel (variables.tf attendu)")
+        contract = index.contracts.get(service)
+        if contract is None:
+            continue
+        if contract.workflow is None:
+            add(service, WARNING, "workflow introuvable : inputs associés aux variables de même nom")
+
+        schema = schemas[service]
+        mapped = {}
+        for input_name, name in contract.pairs:
+            mapped.setdefault(input_name, []).append(name)
+            if name not in module.variables:
+                add(service, ERROR, f"le workflow passe var.{name} (input {input_name}), non déclarée par le module")
+        for name in sorted(contract.computed - set(module.variables)):
+            add(service, ERROR, f"le workflow passe var.{name}, non déclarée par le module")
+        sent = set(contract.inputs)
+        for input_name in contract.inputs:
+            if contract.used is None and input_name not in mapped:
+                add(service, WARNING, f"input {input_name} envoyé, aucune variable de même nom")
+            elif contract.used is not None and input_name not in contract.used:
+                add(service, WARNING, f"input {input_name} envoyé mais jamais lu par le workflow")
+        for input_name in sorted(mapped):
+            if input_name not in sent:
+                add(service, WARNING, f"var.{', var.'.join(mapped[input_name])} lue depuis l'input {input_name}, "
+                                      "que le formulaire n'envoie pas")
+        provided = {name for names in mapped.values() for name in names} | contract.computed
+        for name, variable in module.variables.items():
+            if variable.required and name not in provided:
+                add(service, ERROR, f"var.{name} obligatoire (sans défaut) jamais transmise")
+            for validation in variable.validations:
+                if validation.predicate is None and name in provided:
+                    add(service, INFO, f"var.{name} : condition non évaluée ({validation.reason}) : "
+                                       f"{validation.condition}")
+
+        # Valeurs proposées par le formulaire (choix, défaut) que Terraform refuserait
+        for field in schema.declaration.fields:
+            names = mapped.get(field.input) if field.input else None
+            if not names:
+                continue
+            for name in names:
+                variable = module.variables.get(name)
+                if variable is None or variable.primitive is None:
+                    continue
+                if variable.primitive != 'string' and field.kind in (TEXT, RAW) and not field.choices:
+                    add(service, WARNING, f"{field.name} : saisie libre vers var.{name} ({variable.type_name})")
+                if field.kind == FLAG:
+                    candidates = ['true', 'false']
+                else:
+                    candidates = list(field.choices or ())
+                    if field.default and field.default not in candidates:
+                        candidates.append(field.default)
+                for value in candidates:
+                    for _, message in contract.check({field.input: value}):
+                        add(service, ERROR, f"{field.name}='{value}' refusé par var.{name} : {message}")
+    return report
+
+
+infra_cli = AppGroup('infra', help="Modules Terraform (infra/).")
+
+
+@infra_cli.command('drift')
+@click.option('--json', 'as_json', is_flag=True, help="Rapport JSON.")
+def drift_command(as_json):
+    """Écarts entre formulaires, workflows et variables Terraform (code 1 si erreurs)."""
+    report = drift_report(current_app)
+    if as_json:
+        click.echo(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        service = None
+        for entry in report:
+            if entry["service"] != service:
+                service = entry["service"]
+                click.echo(f"\n[{service}]")
+            click.echo(f"  {entry['level']:<9} {entry['message']}")
+        counts = {level: sum(entry["level"] == level for entry in report) for level in (ERROR, WARNING, INFO)}
+        click.echo(f"\n{counts[ERROR]} erreurs, {counts[WARNING]} avertissements, {counts[INFO]} infos")
+    if any(entry["level"] == ERROR for entry in report):
+        raise SystemExit(1)
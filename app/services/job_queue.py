@@ -0,0 +1,265 @@
+"""File d'attente en mémoire pour les déclenchements asynchrones."""
+import os
+import queue
+import statistics
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+from flask import current_app
+
+from app.services.outbox import DELIVERED, ITEM_DISPATCHED, ITEM_FAILED, LOST, RETRY, get_outbox
+from app.services.request_log import audit, deployment_fields, request_actor
+from app.services.tracing import attach, current_span, span
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_RETRYING = 'retrying'
+JOB_DISPATCHED = 'dispatched'
+JOB_FAILED = 'failed'
+
+_create_lock = threading.Lock()
+
+
+class QueueFullError(Exception):
+    """Levée quand la file d'attente a atteint sa capacité maximale."""
+
+
+class Job:
+    """Un déclenchement de workflow en attente ou traité."""
+
+    def __init__(self, workflow_name, payload, service, title, details, job_id=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.workflow_name = workflow_name
+        self.payload = payload
+        self.service = service
+        self.title = title
+        self.details = details
+        self.status = JOB_QUEUED
+        self.enqueued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.github_status = None
+        self.error = None
+        self.deployment_id = None
+        self.outbox_item = None
+        self.trace_parent = None
+        self.actor = None
+
+    @classmethod
+    def from_outbox(cls, item):
+        """
+        Reconstruit un job depuis sa ligne d'outbox.
+
+        Sert quand le job n'est pas (ou plus) dans la mémoire de ce worker :
+        reprise par le dispatcher de fond, autre worker, redémarrage.
+        """
+        job = cls(item['workflow_name'], item['payload'], item['service'], item['title'],
+                  item['details'], job_id=item['id'])
+        job.enqueued_at = item['created_at']
+        job.started_at = item['last_attempt_at']
+        job.github_status = item['github_status']
+        job.error = item['last_error']
+        if item['state'] == ITEM_DISPATCHED:
+            job.status = JOB_DISPATCHED
+            job.finished_at = item['dispatched_at']
+            job.deployment_id = item['id'] if current_app.config['RUN_TRACKING_ENABLED'] else None
+        elif item['state'] == ITEM_FAILED:
+            job.status = JOB_FAILED
+            job.finished_at = item['last_attempt_at']
+        elif item['attempts'] or item['last_error']:
+            job.status = JOB_RETRYING
+        return job
+
+    @property
+    def wait_time(self):
+        """Temps passé dans la file (jusqu'à maintenant si pas encore pris)."""
+        end = self.started_at or time.time()
+        return end - self.enqueued_at
+
+    def to_dict(self):
+        """Représentation JSON du job (sans le payload, qui peut contenir des secrets)."""
+        return {
+            "id": self.id,
+            "workflow": self.workflow_name,
+            "service": self.service,
+            "title": self.title,
+            "details": self.details,
+            "status": self.status,
+            "enqueued_at": self.enqueued_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wait_time": round(self.wait_time, 4),
+            "github_status": self.github_status,
+            "error": self.error,
+            "deployment_id": self.deployment_id,
+        }
+
+
+class JobQueue:
+    """
+    File de jobs vidée par un pool borné de threads.
+
+    Une instance par processus : les threads ne survivent pas à un fork,
+    le pool est donc démarré paresseusement au premier job soumis.
+    """
+
+    def __init__(self, app, workers, max_size, retention):
+        self.app = app
+        self.workers = workers
+        self.retention = retention
+        self._queue = queue.Queue(maxsize=max_size)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=1000)
+        self._busy = 0
+        self._threads = []
+        self._pid = None
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._threads = []
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"dispatch-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            self._pid = os.getpid()
+
+    def submit(self, workflow_name, payload, service, title, details):
+        """
+        Place un déclenchement dans la file.
+
+        Returns:
+            Job créé (statut 'queued')
+
+        Raises:
+            QueueFullError: Si la file est pleine
+        """
+        self._ensure_started()
+        # Enregistré avant la mise en file : repris par l'outbox si ce worker meurt
+        item = get_outbox().record(workflow_name, payload, service, title, details)
+        job = Job(workflow_name, payload, service, title, details, job_id=item['id'])
+        job.outbox_item = item
+        # Le traitement en file est rattaché à la trace et à l'utilisateur de la requête
+        job.trace_parent = current_span()
+        job.actor = request_actor()
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            # Refusé au client : la ligne ne doit pas être reprise par le dispatcher
+            get_outbox().discard(item, "File de déclenchement saturée")
+            raise QueueFullError(f"File de déclenchement saturée ({self._queue.maxsize} jobs en attente)")
+        return job
+
+    def get(self, job_id):
+        """Retourne le job correspondant ou None."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _evict(self):
+        """Oublie les plus vieux jobs terminés au-delà de la rétention."""
+        excess = len(self._jobs) - self.retention
+        if excess <= 0:
+            return
+        for job_id in [jid for jid, j in self._jobs.items() if j.finished_at][:excess]:
+            del self._jobs[job_id]
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            job.started_at = time.time()
+            job.status = JOB_RUNNING
+            with self._lock:
+                self._busy += 1
+                self._waits.append(job.started_at - job.enqueued_at)
+            try:
+                with self.app.app_context(), attach(job.trace_parent), span('job.run', {
+                    "portal.service": job.workflow_name,
+                    "job.wait_ms": round((job.started_at - job.enqueued_at) * 1000, 3),
+                }):
+                    outbox = get_outbox()
+                    if not outbox.renew(job.outbox_item):
+                        # Bail expiré pendant l'attente : le dispatcher de fond a repris la ligne
+                        job.status = JOB_RETRYING
+                        continue
+                    result = outbox.attempt(job.outbox_item)
+                job.github_status = result.status_code
+                job.error = result.error
+                if result.outcome == DELIVERED:
+                    job.status = JOB_DISPATCHED
+                    job.deployment_id = result.deployment_id
+                elif result.outcome in (RETRY, LOST):
+                    job.status = JOB_RETRYING
+                else:
+                    job.status = JOB_FAILED
+            except Exception as e:
+                job.status = JOB_FAILED
+                job.error = str(e)
+            finally:
+                job.finished_at = time.time()
+                with self._lock:
+                    self._busy -= 1
+                self._audit(job)
+                self._queue.task_done()
+
+    def _audit(self, job):
+        """Issue du déclenchement asynchrone dans le journal d'audit."""
+        with self.app.app_context():
+            audit('deployment.completed', outcome=job.status, user=job.actor, dispatch_id=job.id,
+                  github_status=job.github_status, deployment_id=job.deployment_id, error=job.error,
+                  wait_ms=round(job.wait_time * 1000, 3),
+                  duration_ms=round((job.finished_at - job.started_at) * 1000, 3),
+                  trace_id=job.trace_parent.trace_id if job.trace_parent else None,
+                  **deployment_fields(job.workflow_name, job.payload))
+
+    def stats(self):
+        """Profondeur de file, occupation du pool et temps d'attente (secondes)."""
+        with self._lock:
+            waits = list(self._waits)
+            jobs = list(self._jobs.values())
+            busy = self._busy
+        queued = [j for j in jobs if j.status == JOB_QUEUED]
+        counts = {}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "depth": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "workers": self.workers,
+            "busy": busy,
+            "jobs": counts,
+            "oldest_queued_age": round(max((j.wait_time for j in queued), default=0.0), 4),
+            "wait_time": {
+                "samples": len(waits),
+                "mean": round(statistics.fmean(waits), 4) if waits else 0.0,
+                "max": round(max(waits), 4) if waits else 0.0,
+            },
+        }
+
+
+def get_job_queue():
+    """Retourne la file de jobs de l'application courante (créée au besoin)."""
+    app = current_app._get_current_object()
+    job_queue = app.extensions.get('job_queue')
+    if job_queue is None:
+        with _create_lock:
+            job_queue = app.extensions.get('job_queue')
+            if job_queue is None:
+                job_queue = JobQueue(
+                    app,
+                    workers=app.config['DISPATCH_WORKERS'],
+                    max_size=app.config['DISPATCH_QUEUE_SIZE'],
+                    retention=app.config['DISPATCH_JOB_RETENTION'],
+                )
+                app.extensions['job_queue'] = job_queue
+    return job_queue
@@ -0,0 +1,144 @@
+"""
+Métriques Prometheus : latences et codes HTTP, dispatches GitHub, validation.
+
+Sous gunicorn, PROMETHEUS_MULTIPROC_DIR (positionné par gunicorn.conf.py
+avant tout import de prometheus_client) active le mode multiprocessus :
+chaque worker écrit ses valeurs dans des fichiers mmap de ce dossier et
+/metrics les agrège à la lecture, quel que soit le worker qui répond.
+Sans cette variable (serveur de développement), le registre du processus
+est exposé tel quel.
+"""
+import os
+import time
+
+from flask import current_app, has_app_context, has_request_context, request
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+except ImportError:  # prometheus-client absent : instrumentation désactivée
+    Counter = None
+
+if Counter is not None:
+    REQUEST_LATENCY = Histogram(
+        'portal_http_request_duration_seconds',
+        "Durée de traitement des requêtes HTTP (jusqu'à la réponse, hors flux)",
+        ['blueprint', 'endpoint', 'service'],
+    )
+    REQUESTS = Counter(
+        'portal_http_requests',
+        "Requêtes HTTP par code de statut",
+        ['blueprint', 'endpoint', 'service', 'method', 'status'],
+    )
+    GITHUB_DISPATCH_LATENCY = Histogram(
+        'portal_github_dispatch_duration_seconds',
+        "Durée des appels workflow_dispatch à l'API GitHub (hors attente de quota)",
+        ['service', 'status'],
+        buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    )
+    VALIDATIONS = Counter(
+        'portal_form_validations',
+        "Validations de formulaire par résultat (ok / invalid)",
+        ['service', 'result'],
+    )
+    VALIDATION_ERRORS = Counter(
+        'portal_form_validation_errors',
+        "Erreurs de validation par champ",
+        ['service', 'field'],
+    )
+
+
+def _enabled():
+    return has_app_context() and current_app.extensions.get('metrics', False)
+
+
+def label_service(service):
+    """Associe la requête en cours à une clé de service (label `service`)."""
+    if has_request_context():
+        request.environ['portal.metrics_service'] = service
+
+
+def observe_github_dispatch(service, status, seconds):
+    """Enregistre un appel workflow_dispatch (status : code HTTP ou 'error')."""
+    if _enabled():
+        GITHUB_DISPATCH_LATENCY.labels(service, str(status)).observe(seconds)
+
+
+def observe_validation(service, errors):
+    """Enregistre le résultat d'une validation de formulaire (errors : [{"field", ...}])."""
+    if not _enabled():
+        return
+    VALIDATIONS.labels(service, 'invalid' if errors else 'ok').inc()
+    for error in errors:
+        VALIDATION_ERRORS.labels(service, error['field']).inc()
+
+
+# (endpoint, service, method, status) -> (histogramme, compteur) déjà étiquetés :
+# évite deux appels labels() (verrou + validation) par requête
+_request_children = {}
+
+
+def _request_metrics(endpoint, service, method, status):
+    key = (endpoint, service, method, status)
+    children = _request_children.get(key)
+    if children is None:
+        blueprint = endpoint.rpartition('.')[0] if endpoint else ''
+        endpoint = endpoint or 'none'
+        children = (
+            REQUEST_LATENCY.labels(blueprint, endpoint, service),
+            REQUESTS.labels(blueprint, endpoint, service, method, str(status)),
+        )
+        _request_children[key] = children
+    return children
+
+
+def _start_timer():
+    request.environ['portal.metrics_started'] = time.perf_counter()
+
+
+def _record_request(response):
+    req = request._get_current_object()
+    started = req.environ.pop('portal.metrics_started', None)
+    if started is None:
+        return response
+    service = req.environ.get('portal.metrics_service')
+    if service is None:
+        # /api/v1/<service>, /bulk/<service> : seulement les clés connues (cardinalité bornée)
+        service = req.view_args.get('service', '') if req.view_args else ''
+        if service and service not in current_app.extensions['form_schemas']:
+            service = ''
+    latency, requests = _request_metrics(req.endpoint, service, req.method, response.status_code)
+    latency.observe(time.perf_counter() - started)
+    requests.inc()
+    return response
+
+
+def render_metrics():
+    """
+    Exposition texte des métriques (agrégées sur tous les workers en mode multiprocessus).
+
+    Returns:
+        (corps, content-type)
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def init_metrics(app):
+    """Instrumente les requêtes si METRICS_ENABLED et prometheus-client est installé."""
+    enabled = bool(app.config['METRICS_ENABLED'] and Counter is not None)
+    app.extensions['metrics'] = enabled
+    if enabled:
+        app.before_request(_start_timer)
+        app.after_request(_record_request)
@@ -0,0 +1,447 @@
+"""Outbox durable des déclenchements (SQLite) et dispatcher en arrière-plan."""
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+import requests
+from flask import current_app
+
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.github_service import GitHubService, run_steps
+from app.services.history import get_history
+from app.services.rate_limit_service import RateLimitExceeded, parse_rate_limit_headers
+from app.services.run_tracker import get_run_tracker
+from app.services.state_store import connect, state_db_path, transaction
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dispatch_outbox (
+    id              TEXT PRIMARY KEY,
+    workflow_name   TEXT NOT NULL,
+    payload         TEXT NOT NULL,
+    service         TEXT NOT NULL,
+    title           TEXT NOT NULL,
+    details         TEXT NOT NULL,
+    state           TEXT NOT NULL,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    created_at      REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    lease_until     REAL NOT NULL DEFAULT 0,
+    lease_token     TEXT,
+    last_attempt_at REAL,
+    dispatched_at   REAL,
+    github_status   INTEGER,
+    last_error      TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_dispatch_outbox_due ON dispatch_outbox (state, next_attempt_at);
+CREATE INDEX IF NOT EXISTS ix_dispatch_outbox_dispatched ON dispatch_outbox (dispatched_at);
+"""
+
+ITEM_PENDING = 'pending'
+ITEM_DISPATCHED = 'dispatched'
+ITEM_FAILED = 'failed'
+
+# Issue d'une tentative : envoyé, à retenter plus tard, refus définitif, ou
+# bail expiré pendant la tentative (la ligne appartient à un autre thread)
+DELIVERED = 'delivered'
+RETRY = 'retry'
+FAILED = 'failed'
+LOST = 'lost'
+
+DeliveryResult = namedtuple('DeliveryResult', ['outcome', 'status_code', 'error', 'retry_at', 'deployment_id'])
+
+_create_lock = threading.Lock()
+
+
+class LeaseLost(Exception):
+    """Le bail d'une ligne a expiré : un autre thread l'a reprise ou terminée."""
+
+
+def is_transient(response):
+    """Indique si une réponse GitHub en échec mérite une nouvelle tentative."""
+    if response.status_code >= 500 or response.status_code == 429:
+        return True
+    if response.status_code == 403:
+        info = parse_rate_limit_headers(response.headers)
+        return info['retry_after'] is not None or info['remaining'] == 0
+    return False
+
+
+class Outbox:
+    """
+    Table des déclenchements à effectuer, écrite avant tout appel GitHub.
+
+    Une ligne est sous bail (`lease_until`, `lease_token`) tant qu'un
+    thread la traite : la requête HTTP qui l'a créée, un worker de la file
+    asynchrone ou le dispatcher de fond. Si ce thread disparaît (worker
+    redémarré, timeout), le bail expire et le dispatcher reprend la ligne.
+    Le bail est prolongé juste avant chaque appel GitHub, et l'issue n'est
+    écrite que par le détenteur du bail (`lease_token`) : un thread dont le
+    bail a expiré (attente de quota, GitHub lent) s'efface (LOST).
+    Les échecs transitoires sont retentés avec un backoff exponentiel à
+    jitter complet ; le disjoncteur évite de marteler GitHub en panne.
+    La livraison est « au moins une fois » : un worker tué entre le 204 et
+    l'écriture du statut peut provoquer un second déclenchement.
+    """
+
+    def __init__(self, app, db_path, lease, max_attempts, backoff_base, backoff_max,
+                 poll_interval, batch_size, retention, breaker):
+        self.app = app
+        self.db_path = db_path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.retention = retention
+        self.breaker = breaker
+        self._lock = threading.Lock()
+        self._initialized_pid = None
+        self._pid = None
+
+    def _conn(self):
+        conn = connect(self.db_path)
+        if self._initialized_pid != os.getpid():
+            conn.executescript(_SCHEMA)
+            self._initialized_pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _item(row):
+        item = dict(row)
+        item['payload'] = json.loads(item['payload'])
+        item['details'] = json.loads(item['details'])
+        return item
+
+    def record(self, workflow_name, payload, service, title, details):
+        """
+        Enregistre un payload validé avant son déclenchement.
+
+        La ligne est créée sous bail au nom de l'appelant, qui doit ensuite
+        appeler attempt() (ou la laisser au dispatcher à l'expiration).
+
+        Returns:
+            dict de la ligne (avec lease_token)
+        """
+        now = time.time()
+        item = {
+            'id': uuid.uuid4().hex,
+            'workflow_name': workflow_name,
+            'payload': json.dumps(payload),
+            'service': service,
+            'title': title,
+            'details': json.dumps(details),
+            'state': ITEM_PENDING,
+            'created_at': now,
+            'next_attempt_at': now,
+            'lease_until': now + self.lease,
+            'lease_token': uuid.uuid4().hex,
+        }
+        conn = self._conn()
+        with transaction(conn):
+            conn.execute(
+                f"INSERT INTO dispatch_outbox ({', '.join(item)}) VALUES ({', '.join('?' * len(item))})",
+                tuple(item.values()),
+            )
+        return self._item(dict(item, attempts=0, last_attempt_at=None, dispatched_at=None,
+                               github_status=None, last_error=None))
+
+    def get(self, item_id):
+        """Retourne la ligne correspondante ou None."""
+        row = self._conn().execute('SELECT * FROM dispatch_outbox WHERE id = ?', (item_id,)).fetchone()
+        return self._item(row) if row else None
+
+    def deployed_values(self, workflow_name, input_name):
+        """
+        Valeurs d'un input pour les déclenchements envoyés ou en cours.
+
+        Sert à détecter les collisions de noms avec ce qui est déjà
+        déployé (dans la limite de OUTBOX_RETENTION).
+
+        Returns:
+            set des valeurs distinctes
+        """
+        rows = self._conn().execute(
+            "SELECT DISTINCT json_extract(payload, '$.inputs.' || ?) FROM dispatch_outbox "
+            "WHERE workflow_name = ? AND state != ?",
+            (input_name, workflow_name, ITEM_FAILED),
+        )
+        return {value for (value,) in rows if value is not None}
+
+    def renew(self, item):
+        """
+        Prolonge le bail d'une ligne avant de la traiter.
+
+        Returns:
+            False si la ligne a été reprise par un autre thread ou n'est plus en attente
+        """
+        conn = self._conn()
+        now = time.time()
+        with transaction(conn):
+            renewed = conn.execute(
+                'UPDATE dispatch_outbox SET lease_until = ? WHERE id = ? AND state = ? AND lease_token = ?',
+                (now + self.lease, item['id'], ITEM_PENDING, item['lease_token']),
+            ).rowcount
+        return bool(renewed)
+
+    def discard(self, item, reason="Refusé avant déclenchement"):
+        """Abandonne une ligne encore sous bail de l'appelant (jamais déclenchée)."""
+        conn = self._conn()
+        with transaction(conn):
+            conn.execute(
+                'UPDATE dispatch_outbox SET state = ?, lease_until = 0, last_error = ? '
+                'WHERE id = ? AND state = ? AND lease_token = ?',
+                (ITEM_FAILED, reason, item['id'], ITEM_PENDING, item['lease_token']),
+            )
+
+    def claim_due(self, limit):
+        """Prend sous bail les lignes échues dont aucun thread ne s'occupe."""
+        conn = self._conn()
+        now = time.time()
+        claimed = []
+        with transaction(conn):
+            rows = conn.execute(
+                'SELECT id FROM dispatch_outbox WHERE state = ? AND next_attempt_at <= ? AND lease_until < ? '
+                'ORDER BY next_attempt_at LIMIT ?',
+                (ITEM_PENDING, now, now, limit),
+            ).fetchall()
+            for row in rows:
+                token = uuid.uuid4().hex
+                conn.execute(
+                    'UPDATE dispatch_outbox SET lease_until = ?, lease_token = ? WHERE id = ?',
+                    (now + self.lease, token, row['id']),
+                )
+                claimed.append(row['id'])
+        return [self.get(item_id) for item_id in claimed]
+
+    def backoff(self, attempts):
+        """Délai avant la tentative suivante : jitter complet sur une exponentielle bornée."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempts))
+
+    def attempt(self, item):
+        """
+        Tente un déclenchement et enregistre son issue.
+
+        Returns:
+            DeliveryResult (outcome DELIVERED, RETRY, FAILED ou LOST ;
+            deployment_id renseigné si le run est suivi)
+        """
+        return run_steps(self.attempt_steps(item))
+
+    def _leased(self, item, steps):
+        """
+        Relaie les étapes d'un déclenchement en prolongeant le bail juste
+        avant chaque appel GitHub et chaque pause (l'attente d'un créneau de
+        quota a pu l'entamer).
+
+        Raises:
+            LeaseLost: Si la ligne a été reprise entre-temps (aucun appel fait)
+        """
+        try:
+            call = next(steps)
+            while True:
+                if not self.renew(item):
+                    steps.close()
+                    raise LeaseLost(item['id'])
+                try:
+                    response = yield call
+                except Exception as e:
+                    call = steps.throw(e)
+                else:
+                    call = steps.send(response)
+        except StopIteration as stop:
+            return stop.value
+
+    def attempt_steps(self, item):
+        """Étapes de attempt() : l'appel GitHub est exécuté par le pilote (voir run_steps)."""
+        allowed, retry_at = self.breaker.allow()
+        if not allowed:
+            # Circuit ouvert : pas de tentative décomptée, reprise à la réouverture
+            return self._reschedule(item, retry_at, "GitHub indisponible (circuit ouvert)", count=False)
+
+        attempts = item['attempts'] + 1
+        dispatched_at = time.time()
+        try:
+            response = yield from self._leased(
+                item, GitHubService.trigger_workflow_steps(item['workflow_name'], item['payload'])
+            )
+        except LeaseLost:
+            return self._lost(item)
+        except RateLimitExceeded as e:
+            return self._reschedule(item, time.time() + e.retry_after, str(e), count=False)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self.breaker.record_failure()
+            return self._retry_or_fail(item, attempts, None, f"{type(e).__name__}: {e}")
+        except ValueError as e:
+            return self._finish(item, attempts, ITEM_FAILED, None, str(e))
+        except Exception as e:
+            return self._retry_or_fail(item, attempts, None, f"{type(e).__name__}: {e}")
+
+        if response.status_code == 204:
+            self.breaker.record_success()
+            tracker = get_run_tracker()
+            deployment_id = tracker.register(item['workflow_name'], dispatched_at, item['id']) if tracker else None
+            return self._finish(item, attempts, ITEM_DISPATCHED, 204, None, dispatched_at, deployment_id)
+
+        error = f"Erreur GitHub API (Code: {response.status_code}): {response.text[:500]}"
+        if is_transient(response):
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            return self._retry_or_fail(item, attempts, response.status_code, error)
+        self.breaker.record_success()
+        return self._finish(item, attempts, ITEM_FAILED, response.status_code, error)
+
+    def _retry_or_fail(self, item, attempts, status_code, error):
+        if attempts >= self.max_attempts:
+            return self._finish(item, attempts, ITEM_FAILED, status_code, error)
+        retry_at = time.time() + self.backoff(attempts)
+        return self._reschedule(item, retry_at, error, attempts=attempts, status_code=status_code)
+
+    def _reschedule(self, item, retry_at, error, count=True, attempts=None, status_code=None):
+        now = time.time()
+        attempts = attempts if attempts is not None else item['attempts'] + int(count)
+        conn = self._conn()
+        with transaction(conn):
+            updated = conn.execute(
+                'UPDATE dispatch_outbox SET attempts = ?, next_attempt_at = ?, lease_until = 0, '
+                'last_attempt_at = ?, github_status = ?, last_error = ? WHERE id = ? AND lease_token = ?',
+                (attempts, retry_at, now, status_code, error, item['id'], item['lease_token']),
+            ).rowcount
+        if not updated:
+            return self._lost(item, status_code)
+        return DeliveryResult(RETRY, status_code, error, retry_at, None)
+
+    def _finish(self, item, attempts, state, status_code, error, dispatched_at=None, deployment_id=None):
+        conn = self._conn()
+        with transaction(conn):
+            updated = conn.execute(
+                'UPDATE dispatch_outbox SET state = ?, attempts = ?, lease_until = 0, last_attempt_at = ?, '
+                'dispatched_at = ?, github_status = ?, last_error = ? WHERE id = ? AND lease_token = ?',
+                (state, attempts, time.time(), dispatched_at, status_code, error, item['id'], item['lease_token']),
+            ).rowcount
+        if not updated:
+            return self._lost(item, status_code, deployment_id)
+        history = get_history()
+        if history is not None:
+            try:
+                history.complete(item, state, status_code, error, attempts, deployment_id)
+            except Exception:
+                # Le déclenchement a eu lieu : l'historique ne doit pas le faire passer pour un échec
+                self.app.logger.exception("Historique : issue de %s non enregistrée", item['id'])
+        return DeliveryResult(DELIVERED if state == ITEM_DISPATCHED else FAILED, status_code, error, None,
+                              deployment_id)
+
+    def _lost(self, item, status_code=None, deployment_id=None):
+        """Issue d'une tentative dont le bail a expiré : rien n'est écrit, la ligne suit son nouveau détenteur."""
+        error = "Bail expiré : déclenchement repris par le dispatcher"
+        if status_code is not None:
+            # GitHub a répondu hors bail : un second déclenchement est possible (livraison « au moins une fois »)
+            self.app.logger.warning("Outbox : %s terminé hors bail (GitHub %s)", item['id'], status_code)
+        return DeliveryResult(LOST, status_code, error, None, deployment_id)
+
+    def ensure_started(self):
+        """Démarre le dispatcher de fond du processus courant (une fois par worker)."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True).start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        last_purge = 0.0
+        while True:
+            try:
+                with self.app.app_context():
+                    items = self.claim_due(self.batch_size)
+                    for item in items:
+                        self.attempt(item)
+                    if time.time() - last_purge > 60:
+                        self.purge()
+                        last_purge = time.time()
+            except Exception:
+                self.app.logger.exception("Dispatcher outbox : erreur inattendue")
+                items = []
+            if not items:
+                time.sleep(self.poll_interval)
+
+    def purge(self):
+        """Supprime les lignes terminées plus anciennes que la rétention."""
+        conn = self._conn()
+        with transaction(conn):
+            conn.execute(
+                'DELETE FROM dispatch_outbox WHERE state != ? AND created_at < ?',
+                (ITEM_PENDING, time.time() - self.retention),
+            )
+
+    def backlog(self):
+        """Lignes en attente (tous workers) et ancienneté de la plus vieille, en une requête."""
+        row = self._conn().execute(
+            'SELECT COUNT(*) AS n, MIN(created_at) AS t FROM dispatch_outbox WHERE state = ?', (ITEM_PENDING,)
+        ).fetchone()
+        return {
+            'pending': row['n'],
+            'oldest_pending_age': round(time.time() - row['t'], 1) if row['t'] else 0.0,
+        }
+
+    def stats(self):
+        """Lignes par état, débit, retentatives, ancienneté de l'attente et état du disjoncteur."""
+        conn = self._conn()
+        now = time.time()
+        counts = {row['state']: row['n'] for row in conn.execute(
+            'SELECT state, COUNT(*) AS n FROM dispatch_outbox GROUP BY state'
+        )}
+        oldest = conn.execute(
+            'SELECT MIN(created_at) AS t FROM dispatch_outbox WHERE state = ?', (ITEM_PENDING,)
+        ).fetchone()['t']
+        retries = conn.execute(
+            'SELECT COALESCE(SUM(attempts - 1), 0) AS n, COUNT(*) AS items FROM dispatch_outbox WHERE attempts > 1'
+        ).fetchone()
+        throughput = {}
+        for window in (60, 300):
+            n = conn.execute(
+                'SELECT COUNT(*) AS n FROM dispatch_outbox WHERE dispatched_at >= ?', (now - window,)
+            ).fetchone()['n']
+            throughput[f'last_{window}s'] = round(n / window, 4)
+        return {
+            'items': counts,
+            'throughput_per_s': throughput,
+            'retries': {'total': retries['n'], 'items': retries['items']},
+            'oldest_pending_age': round(now - oldest, 1) if oldest else 0.0,
+            'circuit': self.breaker.stats(),
+        }
+
+
+def get_outbox():
+    """Retourne l'outbox de l'application courante (créée au besoin)."""
+    app = current_app._get_current_object()
+    outbox = app.extensions.get('outbox')
+    if outbox is None:
+        with _create_lock:
+            outbox = app.extensions.get('outbox')
+            if outbox is None:
+                db_path = state_db_path(app)
+                outbox = Outbox(
+                    app,
+                    db_path,
+                    lease=app.config['OUTBOX_LEASE'],
+                    max_attempts=app.config['OUTBOX_MAX_ATTEMPTS'],
+                    backoff_base=app.config['OUTBOX_BACKOFF_BASE'],
+                    backoff_max=app.config['OUTBOX_BACKOFF_MAX'],
+                    poll_interval=app.config['OUTBOX_POLL_INTERVAL'],
+                    batch_size=app.config['OUTBOX_BATCH_SIZE'],
+                    retention=app.config['OUTBOX_RETENTION'],
+                    breaker=CircuitBreaker(
+                        db_path,
+                        'github',
+                        threshold=app.config['CIRCUIT_FAILURE_THRESHOLD'],
+                        reset_timeout=app.config['CIRCUIT_RESET_TIMEOUT'],
+                    ),
+                )
+                app.extensions['outbox'] = outbox
+    return outbox
@@ -0,0 +1,176 @@
+"""
+Cache des pages rendues (accueil, aide, formulaires de service).
+
+Ces pages ne dépendent que des templates, de Config.SERVICES et du
+manifeste d'assets : elles sont rendues une fois par worker, au premier
+accès, puis servies depuis la mémoire avec leurs variantes compressées
+(gzip, br) calculées à la demande. Les requêtes conditionnelles
+If-None-Match reçoivent un 304.
+
+Le cache est vidé quand un template, le manifeste ou Config.SERVICES
+change (vérifié au plus toutes les PAGE_CACHE_CHECK_INTERVAL secondes).
+"""
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+
+from flask import Response, current_app, request
+
+from app.services.assets import ENCODINGS, MANIFEST_NAME, assets_folder, compress
+
+_create_lock = threading.Lock()
+
+
+class CachedPage:
+    """Page rendue : corps, ETag (faible, commun aux encodages) et variantes compressées."""
+
+    def __init__(self, body, mimetype, etag):
+        self.mimetype = mimetype
+        self.etag = etag
+        self.variants = {None: body}
+
+    def variant(self, encoding):
+        """Corps dans l'encodage demandé, compressé au premier besoin (None si inutile)."""
+        if encoding not in self.variants:
+            compressed = compress(self.variants[None], encoding)
+            if compressed is not None and len(compressed) >= len(self.variants[None]):
+                compressed = None
+            self.variants[encoding] = compressed
+        return self.variants[encoding]
+
+
+class PageCache:
+    """Pages rendues de ce worker, indexées par endpoint."""
+
+    def __init__(self, app, check_interval=2.0):
+        self.app = app
+        self.check_interval = check_interval
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._version = self._fingerprint()
+        self._checked_at = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+
+    def _fingerprint(self):
+        """Empreinte des entrées du rendu : templates, manifeste d'assets, SERVICES."""
+        digest = hashlib.sha1()
+        folders = [os.path.join(self.app.root_path, self.app.template_folder)]
+        folders.append(assets_folder(self.app))
+        for folder in folders:
+            try:
+                entries = sorted(os.scandir(folder), key=lambda entry: entry.name)
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_file() and (entry.name.endswith('.html') or entry.name == MANIFEST_NAME):
+                    digest.update(f"{entry.path}:{entry.stat().st_mtime_ns}\n".encode())
+        digest.update(json.dumps(self.app.config['SERVICES'], sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _check(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        version = self._fingerprint()
+        if version != self._version:
+            with self._lock:
+                self._version = version
+                self._pages.clear()
+
+    def get(self, key, render):
+        """
+        Page en cache pour `key`, rendue via `render()` si absente ou périmée.
+
+        Args:
+            key: Clé de la page (endpoint)
+            render: Callable sans argument retournant une réponse Flask
+
+        Returns:
+            CachedPage, ou la réponse de render() si elle n'est pas cachable
+        """
+        self._check()
+        page = self._pages.get(key)
+        if page is not None:
+            self.hits += 1
+            return page
+
+        self.misses += 1
+        response = current_app.make_response(render())
+        if response.status_code != 200 or response.direct_passthrough:
+            return response
+        body = response.get_data()
+        page = CachedPage(body, response.mimetype, hashlib.sha1(body).hexdigest()[:20])
+        with self._lock:
+            self._pages[key] = page
+        return page
+
+    def preload(self, key, render, encodings=()):
+        """Rend une page (préchauffage) et calcule d'avance ses variantes compressées."""
+        page = self.get(key, render)
+        if isinstance(page, CachedPage):
+            for encoding in encodings:
+                page.variant(encoding)
+        return page
+
+    def stats(self):
+        """Pages en cache et compteurs de ce worker."""
+        return {
+            "pages": len(self._pages),
+            "bytes": sum(len(body) for page in self._pages.values() for body in page.variants.values() if body),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def get_page_cache():
+    """Retourne le cache de pages de l'application courante (None si désactivé)."""
+    app = current_app._get_current_object()
+    if not app.config.get('PAGE_CACHE_ENABLED', True):
+        return None
+    cache = app.extensions.get('page_cache')
+    if cache is None:
+        with _create_lock:
+            cache = app.extensions.get('page_cache')
+            if cache is None:
+                cache = PageCache(app, check_interval=app.config['PAGE_CACHE_CHECK_INTERVAL'])
+                app.extensions['page_cache'] = cache
+    return cache
+
+
+def cached_page(view):
+    """
+    Décorateur pour les pages GET sans paramètre dont le rendu ne dépend
+    que des templates et de la configuration.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        cache = get_page_cache()
+        if cache is None:
+            return view(*args, **kwargs)
+        page = cache.get(request.endpoint, lambda: view(*args, **kwargs))
+        if not isinstance(page, CachedPage):
+            return page
+
+        headers = {
+            'ETag': f'W/"{page.etag}"',
+            'Vary': 'Accept-Encoding',
+            # Revalidation à chaque visite : la page change au déploiement
+            'Cache-Control': 'no-cache',
+        }
+        if request.if_none_match.contains_weak(page.etag):
+            return Response(status=304, headers=headers)
+
+        for encoding, _ in ENCODINGS:
+            if request.accept_encodings[encoding]:
+                body = page.variant(encoding)
+                if body is not None:
+                    headers['Content-Encoding'] = encoding
+                    return Response(body, mimetype=page.mimetype, headers=headers)
+        return Response(page.variants[None], mimetype=page.mimetype, headers=headers)
+    wrapper.cached_page = True  # repéré par le préchauffage (app.services.warmup)
+    return wrapper
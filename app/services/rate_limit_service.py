@@ -0,0 +1,354 @@
+"""Ordonnanceur des déclenchements selon le quota de l'API GitHub."""
+import email.utils
+import os
+import statistics
+import threading
+import time
+from collections import deque
+
+from flask import current_app
+
+from app.services.state_store import connect, state_db_path, transaction
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    bucket        TEXT PRIMARY KEY,
+    tokens        REAL NOT NULL,
+    updated_at    REAL NOT NULL,
+    api_limit     INTEGER,
+    api_remaining INTEGER,
+    api_reset     REAL,
+    blocked_until REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS rate_limit_waiters (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    bucket      TEXT NOT NULL,
+    priority    INTEGER NOT NULL,
+    enqueued_at REAL NOT NULL,
+    pid         INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_rate_limit_waiters_order
+    ON rate_limit_waiters (bucket, priority, id);
+"""
+
+# Clés d'inputs portant l'environnement cible selon les workflows
+ENVIRONMENT_KEYS = ("environment", "instance_env", "bucket_env")
+
+_create_lock = threading.Lock()
+
+
+class RateLimitExceeded(Exception):
+    """Le quota GitHub ne permet pas de déclencher dans le délai d'attente maximal."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_rate_limit_headers(headers, now=None):
+    """
+    Extrait les informations de quota d'une réponse GitHub.
+
+    Returns:
+        dict avec limit, remaining, reset (epoch) et retry_after (secondes),
+        chaque valeur pouvant être None si l'en-tête est absent
+    """
+    now = now or time.time()
+
+    def as_int(name):
+        try:
+            return int(headers.get(name))
+        except (TypeError, ValueError):
+            return None
+
+    retry_after = None
+    raw = headers.get('Retry-After')
+    if raw:
+        try:
+            retry_after = max(0.0, float(raw))
+        except ValueError:
+            try:
+                parsed = email.utils.parsedate_to_datetime(raw)
+            except (TypeError, ValueError):
+                parsed = None  # en-tête invalide (proxy) : ignoré plutôt que faire échouer l'appel
+            retry_after = max(0.0, parsed.timestamp() - now) if parsed else None
+
+    reset = as_int('X-RateLimit-Reset')
+    return {
+        'limit': as_int('X-RateLimit-Limit'),
+        'remaining': as_int('X-RateLimit-Remaining'),
+        'reset': float(reset) if reset is not None else None,
+        'retry_after': retry_after,
+    }
+
+
+def payload_environment(payload):
+    """Environnement cible déclaré dans les inputs du payload ('' si absent)."""
+    inputs = (payload or {}).get('inputs') or {}
+    for key in ENVIRONMENT_KEYS:
+        value = inputs.get(key)
+        if value:
+            return str(value).lower()
+    return ''
+
+
+class RateLimitScheduler:
+    """
+    Token bucket partagé entre workers (SQLite) + file de priorité.
+
+    Chaque déclenchement prend un ticket dans `rate_limit_waiters` ; seul
+    le ticket en tête (priorité la plus forte, puis ordre d'arrivée) peut
+    consommer un jeton. Les jetons se rechargent jusqu'à `burst` au
+    rythme du quota observé : le quota restant au-delà de `reserve`, étalé
+    jusqu'au reset annoncé par GitHub, sans dépasser `rate` (limite
+    secondaire de GitHub sur les requêtes qui créent du contenu). Sous le
+    seuil `reserve`, seuls les déploiements prioritaires passent, et à
+    zéro tout le monde attend le reset plutôt que d'échouer en 403/429.
+    """
+
+    def __init__(self, db_path, rate, burst, reserve, max_wait, priorities, default_priority):
+        self.db_path = db_path
+        self.rate = rate
+        self.burst = burst
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.priorities = priorities
+        self.default_priority = default_priority
+        self._waits = deque(maxlen=1000)
+        self._lock = threading.Lock()
+        self._initialized_pid = None
+
+    def _conn(self):
+        conn = connect(self.db_path)
+        if self._initialized_pid != os.getpid():
+            conn.executescript(_SCHEMA)
+            self._initialized_pid = os.getpid()
+        return conn
+
+    def priority_for(self, payload):
+        """Priorité d'un payload (0 = la plus forte) selon son environnement."""
+        return self.priorities.get(payload_environment(payload), self.default_priority)
+
+    def _load_bucket(self, conn, bucket, now):
+        row = conn.execute('SELECT * FROM rate_limit_buckets WHERE bucket = ?', (bucket,)).fetchone()
+        if row is None:
+            conn.execute(
+                'INSERT INTO rate_limit_buckets (bucket, tokens, updated_at) VALUES (?, ?, ?)',
+                (bucket, float(self.burst), now),
+            )
+            row = conn.execute('SELECT * FROM rate_limit_buckets WHERE bucket = ?', (bucket,)).fetchone()
+        return dict(row)
+
+    def _refill_rate(self, state, now):
+        """
+        Jetons rechargés par seconde pour ce bucket.
+
+        Tant qu'une réponse GitHub n'a pas renseigné le quota (ou une fois
+        le reset passé), `rate` ; ensuite le quota disponible au-delà de la
+        réserve divisé par le temps restant avant le reset, plafonné à
+        `rate`. Sous la réserve, _wait_needed() fait attendre le reset aux
+        non prioritaires : la prod consomme la réserve au rythme `rate`.
+        """
+        remaining, reset = state['api_remaining'], state['api_reset']
+        if remaining is None or reset is None or reset <= now or remaining <= self.reserve:
+            return self.rate
+        return min(self.rate, (remaining - self.reserve) / (reset - now))
+
+    def _wait_needed(self, state, priority, is_head, now):
+        """Délai (secondes) avant de pouvoir consommer un jeton, 0 si possible maintenant."""
+        if state['blocked_until'] > now:
+            return state['blocked_until'] - now
+
+        remaining, reset = state['api_remaining'], state['api_reset']
+        if remaining is not None and reset is not None and reset > now:
+            if remaining <= 0:
+                return reset - now
+            if remaining <= self.reserve and priority > 0:
+                return reset - now
+
+        if not is_head:
+            return 0.05
+        if state['tokens'] < 1:
+            return (1 - state['tokens']) / self._refill_rate(state, now)
+        return 0.0
+
+    def acquire(self, priority, bucket='default'):
+        """
+        Attend un créneau de déclenchement pour ce bucket.
+
+        Args:
+            priority: 0 = le plus prioritaire (prod)
+            bucket:   Identifiant du quota (un par jeton GitHub)
+
+        Returns:
+            Temps d'attente en secondes
+
+        Raises:
+            RateLimitExceeded: Si le créneau dépasse le délai maximal
+        """
+        steps = self.acquire_steps(priority, bucket)
+        try:
+            while True:
+                time.sleep(next(steps))
+        except StopIteration as stop:
+            return stop.value
+
+    def acquire_steps(self, priority, bucket='default'):
+        """
+        Étapes de acquire() : produit chaque attente (secondes) au lieu de
+        dormir, pour que le pilote des étapes de déclenchement l'exécute
+        (voir github_service.Pause).
+
+        La connexion SQLite est reprise à chaque réveil : sous ASGI, le
+        générateur reprend sur n'importe quel thread du pool, et une
+        connexion appartient au thread qui l'a ouverte.
+        """
+        conn = self._conn()
+        start = time.time()
+        deadline = start + self.max_wait
+        with transaction(conn):
+            ticket = conn.execute(
+                'INSERT INTO rate_limit_waiters (bucket, priority, enqueued_at, pid) VALUES (?, ?, ?, ?)',
+                (bucket, priority, start, os.getpid()),
+            ).lastrowid
+
+        try:
+            while True:
+                now = time.time()
+                conn = self._conn()
+                with transaction(conn):
+                    # Tickets orphelins (worker tué pendant l'attente)
+                    conn.execute(
+                        'DELETE FROM rate_limit_waiters WHERE enqueued_at < ?',
+                        (now - self.max_wait - 60,),
+                    )
+                    state = self._load_bucket(conn, bucket, now)
+                    state['tokens'] = min(
+                        float(self.burst),
+                        state['tokens'] + (now - state['updated_at']) * self._refill_rate(state, now),
+                    )
+                    head = conn.execute(
+                        'SELECT id FROM rate_limit_waiters WHERE bucket = ? ORDER BY priority, id LIMIT 1',
+                        (bucket,),
+                    ).fetchone()
+                    wait = self._wait_needed(state, priority, head is not None and head['id'] == ticket, now)
+                    if wait <= 0:
+                        state['tokens'] -= 1
+                        if state['api_remaining'] is not None:
+                            state['api_remaining'] -= 1
+                        conn.execute('DELETE FROM rate_limit_waiters WHERE id = ?', (ticket,))
+                        ticket = None
+                    conn.execute(
+                        'UPDATE rate_limit_buckets SET tokens = ?, updated_at = ?, api_remaining = ? WHERE bucket = ?',
+                        (state['tokens'], now, state['api_remaining'], bucket),
+                    )
+
+                if ticket is None:
+                    waited = time.time() - start
+                    with self._lock:
+                        self._waits.append(waited)
+                    return waited
+
+                if now + wait > deadline:
+                    raise RateLimitExceeded(
+                        f"Quota GitHub insuffisant : prochain créneau dans {wait:.0f}s",
+                        retry_after=wait,
+                    )
+                yield min(wait, 1.0)
+        finally:
+            if ticket is not None:
+                conn = self._conn()
+                with transaction(conn):
+                    conn.execute('DELETE FROM rate_limit_waiters WHERE id = ?', (ticket,))
+
+    def record_response(self, response, bucket='default'):
+        """
+        Met à jour le quota partagé depuis les en-têtes d'une réponse GitHub.
+
+        Returns:
+            True si la réponse est un refus pour dépassement de quota
+        """
+        now = time.time()
+        info = parse_rate_limit_headers(response.headers, now)
+        limited = response.status_code in (403, 429) and (
+            info['retry_after'] is not None or info['remaining'] == 0
+        )
+
+        blocked_until = 0.0
+        if limited:
+            if info['retry_after'] is not None:
+                blocked_until = now + info['retry_after']
+            elif info['reset']:
+                blocked_until = info['reset']
+            else:
+                blocked_until = now + 60
+
+        conn = self._conn()
+        with transaction(conn):
+            self._load_bucket(conn, bucket, now)
+            conn.execute(
+                '''UPDATE rate_limit_buckets SET
+                       api_limit = COALESCE(?, api_limit),
+                       api_remaining = COALESCE(?, api_remaining),
+                       api_reset = COALESCE(?, api_reset),
+                       blocked_until = MAX(blocked_until, ?)
+                   WHERE bucket = ?''',
+                (info['limit'], info['remaining'], info['reset'], blocked_until, bucket),
+            )
+        return limited
+
+    def stats(self):
+        """Marge de quota par bucket, file d'attente et délais observés (secondes)."""
+        conn = self._conn()
+        now = time.time()
+        buckets = {}
+        for row in conn.execute('SELECT * FROM rate_limit_buckets'):
+            limit, remaining = row['api_limit'], row['api_remaining']
+            rate = self._refill_rate(row, now)
+            buckets[row['bucket']] = {
+                'limit': limit,
+                'remaining': remaining,
+                'headroom': round(remaining / limit, 4) if limit and remaining is not None else None,
+                'reset_in': round(max(0.0, row['api_reset'] - now), 1) if row['api_reset'] else None,
+                'blocked_for': round(max(0.0, row['blocked_until'] - now), 1),
+                'tokens': round(min(float(self.burst), row['tokens'] + (now - row['updated_at']) * rate), 2),
+                'refill_rate': round(rate, 4),
+            }
+        pending = {}
+        for row in conn.execute('SELECT priority, COUNT(*) AS n FROM rate_limit_waiters GROUP BY priority'):
+            pending[str(row['priority'])] = row['n']
+
+        with self._lock:
+            waits = list(self._waits)
+        return {
+            'buckets': buckets,
+            'pending': pending,
+            'queue_delay': {
+                'samples': len(waits),
+                'mean': round(statistics.fmean(waits), 4) if waits else 0.0,
+                'max': round(max(waits), 4) if waits else 0.0,
+            },
+        }
+
+
+def get_rate_limiter():
+    """Retourne l'ordonnanceur de l'application courante, ou None s'il est désactivé."""
+    app = current_app._get_current_object()
+    if not app.config['RATE_LIMIT_ENABLED']:
+        return None
+    scheduler = app.extensions.get('rate_limiter')
+    if scheduler is None:
+        with _create_lock:
+            scheduler = app.extensions.get('rate_limiter')
+            if scheduler is None:
+                scheduler = RateLimitScheduler(
+                    state_db_path(app),
+                    rate=app.config['RATE_LIMIT_RATE'],
+                    burst=app.config['RATE_LIMIT_BURST'],
+                    reserve=app.config['RATE_LIMIT_RESERVE'],
+                    max_wait=app.config['RATE_LIMIT_MAX_WAIT'],
+                    priorities=app.config['RATE_LIMIT_PRIORITIES'],
+                    default_priority=app.config['RATE_LIMIT_DEFAULT_PRIORITY'],
+                )
+                app.extensions['rate_limiter'] = scheduler
+    return scheduler
@@ -0,0 +1,405 @@
+"""
+Journaux structurés (JSON) : accès HTTP et audit des déploiements.
+
+- portal.access : une ligne par requête (méthode, route, statut, durée,
+  taille, client, utilisateur, service, trace) ;
+- portal.audit : qui a déclenché quoi (service, environnement, ressource,
+  inputs, issue, statut GitHub, durée).
+
+Le thread de la requête ne fait que déposer l'enregistrement dans une file
+bornée. File pleine : un enregistrement d'audit attend au plus
+LOG_AUDIT_BLOCK_TIMEOUT secondes qu'une place se libère (contre-pression),
+une ligne d'accès est comptée puis abandonnée sans attendre. Un thread
+d'écriture par worker formate en JSON, masque les secrets, puis écrit par
+lots : un write, et une rotation éventuelle, par lot. La rotation par
+taille est coordonnée entre workers gunicorn par un verrou sur
+<fichier>.lock.
+"""
+import atexit
+import contextlib
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
+
+from flask import current_app, has_request_context, request
+
+from app.services.form_schema import get_schema
+from app.services.tracing import current_span
+
+try:
+    import fcntl
+except ImportError:  # Windows (développement) : rotation sans verrou inter-processus
+    fcntl = None
+
+REDACTED = '[REDACTED]'
+
+# Champs dont la valeur est secrète : nom complet ou suffixe après '_'
+# (db_password, secret_value… mais pas secret_name ni kms_key_id)
+SECRET_KEY_RE = re.compile(
+    r'(?:^|_)(?:password|passwd|secret|secret_value|secret_key|token|api_key|access_key|private_key'
+    r'|credentials?|authorization|cookie)$',
+    re.IGNORECASE,
+)
+# Secrets reconnaissables dans n'importe quelle chaîne (jetons GitHub, clés AWS, clés privées),
+# tous d'au moins SECRET_VALUE_MIN_LENGTH caractères
+SECRET_VALUE_RE = re.compile(
+    r'gh[pousr]_[A-Za-z0-9]{20,}|github_pat_\w{20,}|(?:AKIA|ASIA)[0-9A-Z]{16}'
+    r'|-----BEGIN [A-Z ]*PRIVATE KEY-----[\s\S]*?(?:-----END [A-Z ]*PRIVATE KEY-----|$)'
+)
+SECRET_VALUE_MIN_LENGTH = 20
+
+_encoder = json.JSONEncoder(ensure_ascii=False, default=str, separators=(',', ':'))
+
+access_logger = logging.getLogger('portal.access')
+audit_logger = logging.getLogger('portal.audit')
+
+
+@functools.lru_cache(maxsize=1024)
+def _secret_key(key):
+    return SECRET_KEY_RE.search(key) is not None
+
+
+def redact(value, key=None):
+    """Copie de `value` où les champs secrets et les jetons reconnus sont masqués."""
+    if key is not None and value not in (None, '') and _secret_key(key):
+        return REDACTED
+    if isinstance(value, str):
+        return SECRET_VALUE_RE.sub(REDACTED, value) if len(value) >= SECRET_VALUE_MIN_LENGTH else value
+    if isinstance(value, dict):
+        return {k: redact(v, str(k)) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(v) for v in value]
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par enregistrement : ts, level, logger, event puis record.fields masqués."""
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "event": redact(record.getMessage()),
+        }
+        entry.update(redact(getattr(record, 'fields', None) or {}))
+        return _encoder.encode(entry)
+
+
+class BatchRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler qui accumule les lignes et les écrit au flush().
+
+    emit() ne fait que formater ; flush() écrit le lot en une fois, après
+    rotation si le fichier dépasserait max_bytes (un fichier neuf peut donc
+    dépasser max_bytes d'au plus un lot). Plusieurs processus
+    peuvent partager le fichier : la rotation se fait sous verrou fcntl, et
+    un processus dont le fichier a été déplacé par un autre le rouvre.
+    """
+
+    def __init__(self, filename, max_bytes, backup_count):
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+        self._lines = []
+        self._lock_fd = None
+        self._lock_pid = None
+
+    def emit(self, record):
+        try:
+            self._lines.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+    @contextlib.contextmanager
+    def _interprocess_lock(self):
+        if fcntl is None:
+            yield
+            return
+        if self._lock_pid != os.getpid():
+            # Descripteur propre au processus : un flock sur un descripteur
+            # hérité du fork n'exclurait pas les autres workers
+            self._lock_fd = os.open(self.baseFilename + '.lock', os.O_WRONLY | os.O_CREAT, 0o644)
+            self._lock_pid = os.getpid()
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _moved(self):
+        """Le fichier ouvert n'est plus celui du chemin (rotation par un autre worker)."""
+        try:
+            return os.stat(self.baseFilename).st_ino != os.fstat(self.stream.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def flush(self):
+        self.acquire()
+        try:
+            if not self._lines:
+                return
+            data = '\n'.join(self._lines) + '\n'
+            self._lines = []
+            with self._interprocess_lock():
+                if self.stream is not None and self._moved():
+                    self.stream.close()
+                    self.stream = None
+                if self.stream is None:
+                    self.stream = self._open()
+                size = os.fstat(self.stream.fileno()).st_size
+                if self.maxBytes and size and size + len(data.encode('utf-8')) > self.maxBytes:
+                    self.doRollover()
+                    self.stream = self._open()
+                self.stream.write(data)
+                self.stream.flush()
+        except Exception:
+            logging.getLogger(__name__).warning("Écriture du journal %s impossible", self.baseFilename, exc_info=True)
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
+        if self._lock_pid == os.getpid():
+            os.close(self._lock_fd)
+            self._lock_fd = self._lock_pid = None
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """QueueListener qui fait écrire ses handlers quand la file est vide ou tous les batch_size enregistrements."""
+
+    def __init__(self, log_queue, *handlers, batch_size=256):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self._pending = 0
+
+    def handle(self, record):
+        super().handle(record)
+        self._pending += 1
+        if self._pending >= self.batch_size or self.queue.empty():
+            self.flush()
+
+    def flush(self):
+        for handler in self.handlers:
+            handler.flush()
+        self._pending = 0
+
+    def stop(self):
+        if self._thread is not None:
+            super().stop()
+            self.flush()
+
+
+class RequestLogHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler non bloquant : dépose l'enregistrement et rend la main.
+
+    La file et le thread d'écriture (BatchingQueueListener) sont créés
+    paresseusement dans chaque processus : les threads ne survivent pas à
+    un fork des workers gunicorn.
+    """
+
+    def __init__(self, handlers, queue_size=10000, batch_size=256, audit_block_timeout=0.0):
+        super().__init__(None)
+        self.handlers = handlers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.audit_block_timeout = audit_block_timeout
+        self.listener = None
+        self.dropped = 0
+        self.blocked = 0
+        self._start_lock = threading.Lock()
+        self._pid = None
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.Queue(self.queue_size)
+            self.listener = BatchingQueueListener(self.queue, *self.handlers, batch_size=self.batch_size)
+            self.listener.start()
+            atexit.register(self.listener.stop)
+            self._pid = os.getpid()
+
+    def prepare(self, record):
+        # Même processus, enregistrement jamais modifié après coup : ni copie
+        # ni formatage dans le thread de la requête (fait par le listener)
+        return record
+
+    def enqueue(self, record):
+        self._ensure_started()
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if record.name == audit_logger.name and self.audit_block_timeout > 0:
+            # Contre-pression pour l'audit seulement : une ligne d'accès peut se perdre, pas un déploiement
+            self.blocked += 1
+            try:
+                self.queue.put(record, timeout=self.audit_block_timeout)
+                return
+            except queue.Full:
+                pass
+        self.dropped += 1
+
+    def stats(self):
+        """Profondeur de la file et enregistrements abandonnés (processus courant)."""
+        return {
+            "queued": self.queue.qsize() if self._pid == os.getpid() else 0,
+            "capacity": self.queue_size,
+            "dropped": self.dropped,
+            "blocked": self.blocked,
+            "files": [handler.baseFilename for handler in self.handlers],
+        }
+
+
+def request_actor():
+    """
+    Utilisateur à l'origine de la requête (None hors requête ou si inconnu).
+
+    En-tête posé par le proxy d'authentification (AUDIT_USER_HEADER), sinon
+    REMOTE_USER, sinon identifiant HTTP Basic.
+    """
+    if not has_request_context():
+        return None
+    header = current_app.config['AUDIT_USER_HEADER']
+    user = request.headers.get(header) if header else None
+    if not user:
+        user = request.environ.get('REMOTE_USER')
+    if not user and request.authorization:
+        user = request.authorization.username
+    return user or None
+
+
+def _log(logger, event, fields):
+    """logger.info() sans findCaller() : la pile d'appel n'apporte rien à ces journaux."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.handle(logger.makeRecord(logger.name, logging.INFO, '', 0, event, None, None,
+                                        extra={'fields': fields}))
+
+
+def _trace_id():
+    span = current_span()
+    return span.trace_id if span is not None else None
+
+
+def deployment_fields(workflow_name, payload):
+    """Champs d'audit d'un déclenchement : service, workflow, environnement, ressource, inputs."""
+    schema = get_schema(workflow_name)
+    inputs = (payload or {}).get('inputs') or {}
+    return {
+        "service": workflow_name,
+        "workflow": current_app.config['WORKFLOWS'].get(workflow_name),
+        "environment": inputs.get(schema.environment_input) if schema and schema.environment_input else None,
+        "resource": inputs.get(schema.name_input) if schema and schema.name_input else None,
+        "inputs": inputs,
+    }
+
+
+def audit(event, **fields):
+    """
+    Enregistre un événement d'audit (sans effet si AUDIT_LOG_ENABLED est faux).
+
+    Dans une requête, l'utilisateur, l'adresse du client et la trace sont
+    ajoutés s'ils ne sont pas fournis. Les secrets sont masqués à l'écriture.
+    """
+    if not current_app.extensions.get('audit_log'):
+        return
+    if has_request_context():
+        fields.setdefault('user', request_actor())
+        fields.setdefault('remote_addr', request.remote_addr)
+        fields.setdefault('trace_id', _trace_id())
+    _log(audit_logger, event, fields)
+
+
+def _start_timer():
+    request.environ['portal.log_started'] = time.perf_counter()
+
+
+def _log_request(response):
+    req = request._get_current_object()
+    started = req.environ.pop('portal.log_started', None)
+    if started is None or req.path in current_app.extensions['access_log_exclude']:
+        return response
+    service = req.environ.get('portal.metrics_service')
+    if service is None and req.view_args:
+        service = req.view_args.get('service')
+    _log(access_logger, 'request', {
+        "method": req.method,
+        "path": req.path,
+        "endpoint": req.endpoint,
+        "status": response.status_code,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        "bytes": response.content_length,
+        "remote_addr": req.remote_addr,
+        "user": request_actor(),
+        "user_agent": req.headers.get('User-Agent'),
+        "service": service,
+        "trace_id": _trace_id(),
+    })
+    return response
+
+
+def _log_path(app, key, default_name):
+    path = app.config[key]
+    if not path:
+        os.makedirs(app.instance_path, exist_ok=True)
+        path = os.path.join(app.instance_path, default_name)
+    return path
+
+
+def init_request_log(app):
+    """
+    Branche les journaux d'accès et d'audit (ACCESS_LOG_ENABLED, AUDIT_LOG_ENABLED).
+
+    Les loggers portal.access et portal.audit ne propagent pas vers la
+    racine : leurs lignes JSON ne vont que dans leurs fichiers.
+    """
+    loggers = []
+    handlers = []
+    for enabled, logger, key, name in (
+        (app.config['ACCESS_LOG_ENABLED'], access_logger, 'ACCESS_LOG_FILE', 'access.log'),
+        (app.config['AUDIT_LOG_ENABLED'], audit_logger, 'AUDIT_LOG_FILE', 'audit.log'),
+    ):
+        if not enabled:
+            continue
+        handler = BatchRotatingFileHandler(
+            _log_path(app, key, name), app.config['LOG_MAX_BYTES'], app.config['LOG_BACKUP_COUNT'],
+        )
+        handler.setFormatter(JsonFormatter())
+        handler.addFilter(logging.Filter(logger.name))
+        handlers.append(handler)
+        loggers.append(logger)
+
+    app.extensions['audit_log'] = app.config['AUDIT_LOG_ENABLED']
+    app.extensions['access_log_exclude'] = frozenset(
+        path.strip() for path in app.config['ACCESS_LOG_EXCLUDE'].split(',') if path.strip()
+    )
+    if not handlers:
+        app.extensions['request_log'] = None
+        return
+
+    queue_handler = RequestLogHandler(
+        handlers, app.config['LOG_QUEUE_SIZE'], app.config['LOG_BATCH_SIZE'], app.config['LOG_AUDIT_BLOCK_TIMEOUT'],
+    )
+    for logger in loggers:
+        # Une application par processus : remplace le handler d'une création précédente
+        for previous in [h for h in logger.handlers if isinstance(h, RequestLogHandler)]:
+            logger.removeHandler(previous)
+        logger.addHandler(queue_handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    app.extensions['request_log'] = queue_handler
+
+    if app.config['ACCESS_LOG_ENABLED']:
+        app.before_request(_start_timer)
+        app.after_request(_log_request)
@@ -1,19 +1,30 @@
 """Service pour générer les réponses standardisées."""
-from flask import render_template, current_app
+import time
+
+from flask import render_template, current_app, request, url_for
+
+from app.services.tracing import span
+
+
+def _render(template, **context):
+    """render_template() dans un span 'render' (visible dans les traces de requête)."""
+    with span('render', {"template": template}):
+        return render_template(template, **context)
 
 
 class ResponseService:
     """Service pour réponses standardisées."""
 
     @staticmethod
-    def success_response(service: str, title: str, details: dict):
+    def success_response(service: str, title: str, details: dict, deployment_id: str = None):
         """
         Génère une page HTML de succès.
 
         Args:
-            service: Nom du service AWS (ex: 'S3', 'LAMBDA')
-            title:   Titre affiché sur la page
-            details: Dictionnaire clé/valeur des informations de déploiement
+            service:       Nom du service AWS (ex: 'S3', 'LAMBDA')
+            title:         Titre affiché sur la page
+            details:       Dictionnaire clé/valeur des informations de déploiement
+            deployment_id: Identifiant de suivi du run (statut en direct si fourni)
 
         Returns:
             Réponse HTML 200
@@ -22,7 +33,7 @@ class ResponseService:
         github_owner = current_app.config.get('GITHUB_REPO_OWNER', '')
         github_repo  = current_app.config.get('GITHUB_REPO_NAME', '')
 
-        return render_template(
+        return _render(
             'success.html',
             service=service,
             color=color,
@@ -30,10 +41,11 @@ class ResponseService:
             details=details,
             github_owner=github_owner,
             github_repo=github_repo,
+            status_url=url_for('deployments.deployment_status', deployment_id=deployment_id) if deployment_id else None,
         )
 
     @staticmethod
-    def error_response(message: str, details: str = "", service: str = ""):
+    def error_response(message: str, details: str = "", service: str = "", status: int = 400):
         """
         Génère une page HTML d'erreur.
 
@@ -41,16 +53,134 @@ class ResponseService:
             message: Message d'erreur principal
             details: Détails techniques (réponse API, traceback…)
             service: Nom du service AWS
+            status:  Code HTTP de la réponse
 
         Returns:
-            Réponse HTML 400
+            Réponse HTML (400 par défaut)
         """
         color = current_app.config['SERVICE_COLORS'].get(service.upper(), '#ef4444')
 
-        return render_template(
+        return _render(
             'error.html',
             message=message,
             details=details,
             service=service,
             color=color,
-        ), 400
\ No newline at end of file
+        ), status
+
+    @staticmethod
+    def wants_json():
+        """Indique si le client préfère une réponse JSON (Accept ou ?format=json)."""
+        if request.args.get('format') == 'json':
+            return True
+        best = request.accept_mimetypes.best_match(['text/html', 'application/json'])
+        return best == 'application/json'
+
+    @staticmethod
+    def api_error(message: str, details: str = "", status: int = 400, errors: list = None):
+        """
+        Génère une erreur JSON de l'API (sans rendu de template).
+
+        Args:
+            message: Message d'erreur principal
+            details: Détails techniques (réponse API, exception…)
+            status:  Code HTTP de la réponse
+            errors:  Erreurs de validation par champ ({"path", "field", "error"})
+
+        Returns:
+            (dict, status)
+        """
+        body = {"error": message}
+        if details:
+            body["details"] = details
+        if errors:
+            body["errors"] = errors
+        return body, status
+
+    @staticmethod
+    def api_dispatched(dispatch_id: str, workflow_name: str, service: str, details: dict, deployment_id: str = None):
+        """
+        Génère la réponse JSON d'un déclenchement accepté par GitHub.
+
+        Returns:
+            (dict, 200) avec l'identifiant du déclenchement et l'URL de suivi du run
+        """
+        return {
+            "id": dispatch_id,
+            "status": "dispatched",
+            "workflow": workflow_name,
+            "service": service,
+            "details": details,
+            "deployment_id": deployment_id,
+            "deployment_url": (
+                url_for('deployments.deployment_status', deployment_id=deployment_id) if deployment_id else None
+            ),
+        }, 200
+
+    @staticmethod
+    def job_response(job, status: int = 200, as_json: bool = False):
+        """
+        Génère la page (ou le JSON) de suivi d'un déclenchement asynchrone.
+
+        Args:
+            job:     Job de la file de déclenchement
+            status:  Code HTTP (202 à la mise en file, 200 ensuite)
+            as_json: Force le JSON de l'API (Location vers /api/v1/jobs/<id>),
+                     sinon selon l'en-tête Accept
+
+        Returns:
+            Réponse HTML ou JSON avec en-tête Location vers /jobs/<id>
+        """
+        location = url_for('api.api_job' if as_json else 'jobs.job_status', job_id=job.id)
+        deployment_url = (
+            url_for('deployments.deployment_status', deployment_id=job.deployment_id)
+            if job.deployment_id else None
+        )
+        if as_json or ResponseService.wants_json():
+            body = dict(job.to_dict(), url=location, deployment_url=deployment_url)
+            return body, status, {'Location': location}
+
+        color = current_app.config['SERVICE_COLORS'].get(job.service.upper(), '#3b82f6')
+        return _render(
+            'job.html',
+            job=job,
+            color=color,
+            status_url=location,
+            deployment_url=deployment_url,
+            github_owner=current_app.config.get('GITHUB_REPO_OWNER', ''),
+            github_repo=current_app.config.get('GITHUB_REPO_NAME', ''),
+        ), status, {'Location': location}
+
+    @staticmethod
+    def history_response(entries: list, next_cursor: str, filters: dict, as_json: bool = False):
+        """
+        Génère la page (ou le JSON) d'une page de l'historique des déploiements.
+
+        Args:
+            entries:     Lignes de DeploymentHistory.page() ou search()
+            next_cursor: Curseur de la page suivante (None en fin d'historique)
+            filters:     Filtres de la requête (q, service, environment, limit), repris
+                         dans le lien de la page suivante
+            as_json:     Force le JSON de l'API, sinon selon l'en-tête Accept
+
+        Returns:
+            Réponse HTML ou JSON (items, next_cursor, next)
+        """
+        endpoint = 'api.api_history' if as_json else 'history.history'
+        params = {key: value for key, value in filters.items() if value}
+        next_url = url_for(endpoint, cursor=next_cursor, **params) if next_cursor else None
+        if as_json or ResponseService.wants_json():
+            return {"items": entries, "next_cursor": next_cursor, "next": next_url}
+
+        colors = current_app.config['SERVICE_COLORS']
+        for entry in entries:
+            entry['created_label'] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['created_at']))
+            entry['color'] = colors.get(entry['service'].replace('-', '').upper(), '#3b82f6')
+        return _render(
+            'history.html',
+            entries=entries,
+            filters=filters,
+            services=sorted(current_app.config['WORKFLOWS']),
+            next_url=next_url,
+            first_url=url_for(endpoint, **params) if 'cursor' in request.args else None,
+        )
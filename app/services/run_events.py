@@ -0,0 +1,142 @@
+"""Diffusion en direct (SSE) de l'état des runs suivis."""
+import os
+import queue
+import threading
+import time
+
+from flask import current_app
+
+from app.services.run_tracker import get_run_tracker
+
+# Champs dont le changement déclenche un événement
+EVENT_FIELDS = ('status', 'conclusion', 'run_id', 'html_url')
+
+# Intervalle minimal entre deux rafraîchissements d'un même run (secondes)
+MIN_WAIT = 0.5
+
+_create_lock = threading.Lock()
+
+
+class _Watcher:
+    """Poller unique d'un déploiement et ses abonnés (une file par flux SSE)."""
+
+    def __init__(self, deployment_id):
+        self.deployment_id = deployment_id
+        self.subscribers = set()
+        self.last_event = None
+        self.thread = None
+
+
+class RunEventHub:
+    """
+    Un seul poller par déploiement et par processus, quel que soit le
+    nombre d'onglets ouverts.
+
+    Chaque flux SSE s'abonne avec sa propre file ; le poller interroge le
+    RunTracker au rythme qu'il annonce (next_poll_in) et ne pousse un
+    événement qu'en cas de changement d'état. Entre workers gunicorn, la
+    réservation d'échéance du tracker garantit toujours un seul appel
+    GitHub par intervalle. Le poller s'arrête quand le run est terminé ou
+    que son dernier abonné se déconnecte.
+    """
+
+    def __init__(self, app, tracker):
+        self.app = app
+        self.tracker = tracker
+        self._watchers = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def subscribe(self, deployment_id):
+        """
+        Abonne un flux aux événements d'un déploiement.
+
+        Returns:
+            queue.Queue recevant des dicts d'état, puis None à la fermeture
+        """
+        subscriber = queue.Queue()
+        with self._lock:
+            if self._pid != os.getpid():
+                # Threads du processus parent perdus au fork
+                self._watchers = {}
+                self._pid = os.getpid()
+            watcher = self._watchers.get(deployment_id)
+            if watcher is None:
+                watcher = _Watcher(deployment_id)
+                watcher.thread = threading.Thread(
+                    target=self._poll,
+                    args=(watcher,),
+                    name=f"run-events-{deployment_id[:8]}",
+                    daemon=True,
+                )
+                self._watchers[deployment_id] = watcher
+                watcher.thread.start()
+            elif watcher.last_event is not None:
+                subscriber.put(watcher.last_event)
+            watcher.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, deployment_id, subscriber):
+        """Retire un flux ; le poller s'arrêtera à sa prochaine échéance s'il n'a plus d'abonnés."""
+        with self._lock:
+            watcher = self._watchers.get(deployment_id)
+            if watcher is not None:
+                watcher.subscribers.discard(subscriber)
+
+    def _broadcast(self, watcher, event):
+        with self._lock:
+            watcher.last_event = event
+            for subscriber in watcher.subscribers:
+                subscriber.put(event)
+
+    def _poll(self, watcher):
+        last_key = None
+        try:
+            while True:
+                with self.app.app_context():
+                    record = self.tracker.refresh(watcher.deployment_id)
+                if record is None:
+                    break
+                event = self.tracker.to_dict(record)
+                key = tuple(event[field] for field in EVENT_FIELDS)
+                if key != last_key:
+                    self._broadcast(watcher, event)
+                    last_key = key
+                if event['final']:
+                    break
+                with self._lock:
+                    if not watcher.subscribers:
+                        break
+                time.sleep(max(event['next_poll_in'], MIN_WAIT))
+        except Exception:
+            self.app.logger.exception("Suivi du run %s interrompu", watcher.deployment_id)
+        finally:
+            with self._lock:
+                if self._watchers.get(watcher.deployment_id) is watcher:
+                    del self._watchers[watcher.deployment_id]
+                for subscriber in watcher.subscribers:
+                    subscriber.put(None)
+
+    def stats(self):
+        """Pollers actifs et nombre de flux abonnés."""
+        with self._lock:
+            return {
+                'pollers': len(self._watchers),
+                'subscribers': sum(len(w.subscribers) for w in self._watchers.values()),
+            }
+
+
+def get_run_event_hub():
+    """Retourne le hub SSE de l'application courante, ou None si le suivi est désactivé."""
+    tracker = get_run_tracker()
+    if tracker is None:
+        return None
+    app = current_app._get_current_object()
+    hub = app.extensions.get('run_events')
+    if hub is None:
+        with _create_lock:
+            hub = app.extensions.get('run_events')
+            if hub is None:
+                hub = RunEventHub(app, tracker)
+                app.extensions['run_events'] = hub
+    return hub
@@ -0,0 +1,376 @@
+"""Suivi des runs GitHub Actions déclenchés par le portail."""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import current_app
+
+from app.services.github_service import GitHubService
+from app.services.state_store import connect, state_db_path, transaction
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deployment_runs (
+    dispatch_id    TEXT PRIMARY KEY,
+    workflow_name  TEXT NOT NULL,
+    workflow_file  TEXT NOT NULL,
+    dispatched_at  REAL NOT NULL,
+    run_id         INTEGER UNIQUE,
+    html_url       TEXT,
+    status         TEXT NOT NULL,
+    conclusion     TEXT,
+    run_created_at REAL,
+    run_started_at REAL,
+    run_updated_at REAL,
+    etag           TEXT,
+    poll_interval  REAL NOT NULL,
+    next_poll_at   REAL NOT NULL,
+    checked_at     REAL
+);
+CREATE INDEX IF NOT EXISTS ix_deployment_runs_pending
+    ON deployment_runs (workflow_file, run_id);
+CREATE TABLE IF NOT EXISTS workflow_run_lists (
+    workflow_file TEXT PRIMARY KEY,
+    etag          TEXT,
+    body          TEXT NOT NULL,
+    fetched_at    REAL NOT NULL
+);
+"""
+
+# Statut avant résolution du run (le dispatch GitHub ne renvoie pas d'id)
+STATUS_PENDING = 'pending'
+STATUS_COMPLETED = 'completed'
+STATUS_UNRESOLVED = 'unresolved'
+
+# Colonnes renseignées par le rapprochement avec un run
+RUN_COLUMNS = ('run_id', 'html_url', 'status', 'conclusion', 'run_created_at', 'run_started_at', 'run_updated_at')
+
+_create_lock = threading.Lock()
+
+
+def parse_github_time(value):
+    """Convertit un horodatage ISO 8601 GitHub ('...Z') en epoch, None si absent."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+class RunTracker:
+    """
+    Associe chaque dispatch à son run et suit son état.
+
+    Après un 204, le run est retrouvé dans la liste des runs
+    `workflow_dispatch` du workflow : les dispatches en attente d'un même
+    workflow sont rapprochés ensemble, du plus ancien au plus récent,
+    chacun prenant le plus ancien run non attribué créé après lui. Les appels sont conditionnels (If-None-Match) :
+    un 304 ne consomme pas de quota. L'intervalle de polling s'allonge tant
+    que rien ne change et revient au minimum à chaque changement d'état.
+    L'état est persisté dans SQLite (partagé entre workers) et gardé en
+    cache mémoire jusqu'à la prochaine échéance de polling.
+    """
+
+    def __init__(self, app, db_path, poll_min, poll_max, match_skew, resolve_timeout, cache_size):
+        self.app = app
+        self.db_path = db_path
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.match_skew = match_skew
+        self.resolve_timeout = resolve_timeout
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._initialized_pid = None
+
+    def _conn(self):
+        conn = connect(self.db_path)
+        if self._initialized_pid != os.getpid():
+            conn.executescript(_SCHEMA)
+            self._initialized_pid = os.getpid()
+        return conn
+
+    def _remember(self, record):
+        with self._lock:
+            self._cache[record['dispatch_id']] = record
+            self._cache.move_to_end(record['dispatch_id'])
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def register(self, workflow_name, dispatched_at, dispatch_id=None):
+        """
+        Enregistre un dispatch réussi à rapprocher d'un run.
+
+        Returns:
+            Identifiant du déploiement (dispatch_id)
+        """
+        dispatch_id = dispatch_id or uuid.uuid4().hex
+        record = {
+            'dispatch_id': dispatch_id,
+            'workflow_name': workflow_name,
+            'workflow_file': self.app.config['WORKFLOWS'][workflow_name],
+            'dispatched_at': dispatched_at,
+            'run_id': None,
+            'html_url': None,
+            'status': STATUS_PENDING,
+            'conclusion': None,
+            'run_created_at': None,
+            'run_started_at': None,
+            'run_updated_at': None,
+            'etag': None,
+            'poll_interval': self.poll_min,
+            'next_poll_at': dispatched_at + self.poll_min,
+            'checked_at': None,
+        }
+        conn = self._conn()
+        with transaction(conn):
+            conn.execute(
+                f"INSERT OR REPLACE INTO deployment_runs ({', '.join(record)}) "
+                f"VALUES ({', '.join('?' * len(record))})",
+                tuple(record.values()),
+            )
+        self._remember(record)
+        return dispatch_id
+
+    def get(self, dispatch_id):
+        """Dernier état connu (sans appel GitHub), ou None."""
+        with self._lock:
+            record = self._cache.get(dispatch_id)
+        if record is not None:
+            return dict(record)
+        row = self._conn().execute('SELECT * FROM deployment_runs WHERE dispatch_id = ?', (dispatch_id,)).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        self._remember(record)
+        return dict(record)
+
+    def refresh(self, dispatch_id):
+        """
+        Retourne l'état du déploiement, en interrogeant GitHub si l'échéance est passée.
+
+        Un seul worker interroge GitHub par échéance : la prochaine échéance
+        est réservée en base avant l'appel.
+        """
+        record = self.get(dispatch_id)
+        if record is None:
+            return None
+        now = time.time()
+        if record['status'] in (STATUS_COMPLETED, STATUS_UNRESOLVED) or now < record['next_poll_at']:
+            return record
+
+        conn = self._conn()
+        with transaction(conn):
+            claimed = conn.execute(
+                'UPDATE deployment_runs SET next_poll_at = ? WHERE dispatch_id = ? AND next_poll_at <= ?',
+                (now + record['poll_interval'], dispatch_id, now),
+            ).rowcount
+        if not claimed:
+            # Un autre worker vient de poller : relire son résultat en base
+            with self._lock:
+                self._cache.pop(dispatch_id, None)
+            return self.get(dispatch_id)
+
+        with self.app.app_context():
+            if record['run_id'] is None:
+                changed = self._resolve(record, now)
+            else:
+                changed = self._poll_run(record)
+
+        interval = self.poll_min if changed else min(record['poll_interval'] * 1.5, self.poll_max)
+        record['poll_interval'] = interval
+        record['next_poll_at'] = time.time() + interval
+        record['checked_at'] = time.time()
+        if not self._save(record):
+            return self.get(dispatch_id)
+        return dict(record)
+
+    def _resolve(self, record, now):
+        """
+        Cherche le run correspondant au dispatch. Retourne True si trouvé.
+
+        Tous les dispatches en attente du workflow sont rapprochés dans la
+        même transaction, dans l'ordre des dispatches : l'attribution ne
+        dépend pas de l'ordre dans lequel pages et flux SSE les interrogent
+        (sinon un dispatch récent interrogé le premier prendrait le run
+        d'un dispatch plus ancien).
+        """
+        runs = self._list_runs(record['workflow_file'])
+        created = {run['id']: parse_github_time(run.get('created_at')) or 0 for run in runs}
+        conn = self._conn()
+        assigned = {}
+        with transaction(conn):
+            row = conn.execute(
+                'SELECT * FROM deployment_runs WHERE dispatch_id = ?', (record['dispatch_id'],)
+            ).fetchone()
+            if row is not None and row['run_id'] is not None:
+                # Rapproché entre-temps, avec les dispatches plus anciens du workflow
+                record.update({column: row[column] for column in RUN_COLUMNS})
+                return True
+            claimed_ids = {
+                row['run_id'] for row in conn.execute(
+                    'SELECT run_id FROM deployment_runs WHERE workflow_file = ? AND run_id IS NOT NULL',
+                    (record['workflow_file'],),
+                )
+            }
+            candidates = sorted(
+                (run for run in runs if run['id'] not in claimed_ids),
+                key=lambda run: (created[run['id']], run['id']),
+            )
+            pending = conn.execute(
+                'SELECT dispatch_id, dispatched_at FROM deployment_runs '
+                'WHERE workflow_file = ? AND run_id IS NULL AND status = ? AND dispatched_at >= ? '
+                'ORDER BY dispatched_at, dispatch_id',
+                (record['workflow_file'], STATUS_PENDING, now - self.resolve_timeout),
+            ).fetchall()
+            for dispatch in pending:
+                earliest = dispatch['dispatched_at'] - self.match_skew
+                run = next((run for run in candidates if created[run['id']] >= earliest), None)
+                if run is None:
+                    break  # aucun run assez récent pour celui-ci, ni donc pour les suivants
+                candidates.remove(run)
+                match = {'run_id': run['id'], 'status': STATUS_PENDING}
+                self._apply_run(match, run)
+                conn.execute(
+                    f"UPDATE deployment_runs SET {', '.join(f'{c} = ?' for c in RUN_COLUMNS)} WHERE dispatch_id = ?",
+                    tuple(match[c] for c in RUN_COLUMNS) + (dispatch['dispatch_id'],),
+                )
+                assigned[dispatch['dispatch_id']] = run
+
+        with self._lock:
+            for dispatch_id in assigned:
+                self._cache.pop(dispatch_id, None)
+        run = assigned.get(record['dispatch_id'])
+        if run is not None:
+            record['run_id'] = run['id']
+            self._apply_run(record, run)
+            return True
+
+        if now - record['dispatched_at'] > self.resolve_timeout:
+            record['status'] = STATUS_UNRESOLVED
+            return True
+        return False
+
+    def _list_runs(self, workflow_file):
+        """Liste récente des runs workflow_dispatch, via ETag partagé par workflow."""
+        conn = self._conn()
+        cached = conn.execute(
+            'SELECT * FROM workflow_run_lists WHERE workflow_file = ?', (workflow_file,)
+        ).fetchone()
+        response = GitHubService.api_get(
+            f"actions/workflows/{workflow_file}/runs",
+            params={'event': 'workflow_dispatch', 'per_page': 30},
+            etag=cached['etag'] if cached else None,
+        )
+        if response.status_code == 304 and cached:
+            return json.loads(cached['body'])
+        if response.status_code != 200:
+            return json.loads(cached['body']) if cached else []
+
+        runs = response.json().get('workflow_runs', [])
+        with transaction(conn):
+            conn.execute(
+                'INSERT OR REPLACE INTO workflow_run_lists (workflow_file, etag, body, fetched_at) '
+                'VALUES (?, ?, ?, ?)',
+                (workflow_file, response.headers.get('ETag'), json.dumps(runs), time.time()),
+            )
+        return runs
+
+    def _poll_run(self, record):
+        """Rafraîchit un run connu. Retourne True si son état a changé."""
+        response = GitHubService.api_get(f"actions/runs/{record['run_id']}", etag=record['etag'])
+        if response.status_code != 200:
+            return False
+        before = (record['status'], record['conclusion'])
+        record['etag'] = response.headers.get('ETag')
+        self._apply_run(record, response.json())
+        return (record['status'], record['conclusion']) != before
+
+    @staticmethod
+    def _apply_run(record, run):
+        record['html_url'] = run.get('html_url')
+        record['status'] = run.get('status') or record['status']
+        record['conclusion'] = run.get('conclusion')
+        record['run_created_at'] = parse_github_time(run.get('created_at'))
+        record['run_started_at'] = parse_github_time(run.get('run_started_at')) or record['run_created_at']
+        record['run_updated_at'] = parse_github_time(run.get('updated_at'))
+
+    def _save(self, record):
+        """Enregistre l'état ; False s'il était périmé (run attribué entre-temps, relu en base)."""
+        conn = self._conn()
+        columns = [c for c in record if c != 'dispatch_id']
+        query = f"UPDATE deployment_runs SET {', '.join(f'{c} = ?' for c in columns)} WHERE dispatch_id = ?"
+        if record['run_id'] is None:
+            # Ne pas effacer un run attribué entre-temps avec un dispatch plus ancien
+            query += ' AND run_id IS NULL'
+        with transaction(conn):
+            saved = conn.execute(query, tuple(record[c] for c in columns) + (record['dispatch_id'],)).rowcount
+        if saved:
+            self._remember(record)
+        else:
+            with self._lock:
+                self._cache.pop(record['dispatch_id'], None)
+        return bool(saved)
+
+    @staticmethod
+    def timings(record, now=None):
+        """
+        Durées dérivées d'un état : attente en file et exécution (secondes).
+
+        Returns:
+            dict queue_time / run_time (None tant que non mesurables)
+        """
+        now = now or time.time()
+        created, started, updated = record['run_created_at'], record['run_started_at'], record['run_updated_at']
+        queue_time = run_time = None
+        if created is not None:
+            if record['status'] == 'queued':
+                queue_time = now - created
+            elif started is not None:
+                queue_time = max(0.0, started - created)
+        if started is not None and record['status'] not in ('queued', STATUS_PENDING):
+            end = updated if record['status'] == STATUS_COMPLETED and updated else now
+            run_time = max(0.0, end - started)
+        return {
+            'queue_time': round(queue_time, 1) if queue_time is not None else None,
+            'run_time': round(run_time, 1) if run_time is not None else None,
+        }
+
+    def to_dict(self, record):
+        """Représentation JSON d'un état de déploiement."""
+        return {
+            'id': record['dispatch_id'],
+            'workflow': record['workflow_name'],
+            'dispatched_at': record['dispatched_at'],
+            'run_id': record['run_id'],
+            'html_url': record['html_url'],
+            'status': record['status'],
+            'conclusion': record['conclusion'],
+            'final': record['status'] in (STATUS_COMPLETED, STATUS_UNRESOLVED),
+            'next_poll_in': round(max(0.0, record['next_poll_at'] - time.time()), 1),
+            **self.timings(record),
+        }
+
+
+def get_run_tracker():
+    """Retourne le tracker de l'application courante, ou None s'il est désactivé."""
+    app = current_app._get_current_object()
+    if not app.config['RUN_TRACKING_ENABLED']:
+        return None
+    tracker = app.extensions.get('run_tracker')
+    if tracker is None:
+        with _create_lock:
+            tracker = app.extensions.get('run_tracker')
+            if tracker is None:
+                tracker = RunTracker(
+                    app,
+                    state_db_path(app),
+                    poll_min=app.config['RUN_POLL_MIN'],
+                    poll_max=app.config['RUN_POLL_MAX'],
+                    match_skew=app.config['RUN_MATCH_SKEW'],
+                    resolve_timeout=app.config['RUN_RESOLVE_TIMEOUT'],
+                    cache_size=app.config['RUN_CACHE_SIZE'],
+                )
+                app.extensions['run_tracker'] = tracker
+    return tracker
@@ -0,0 +1,70 @@
+"""Base SQLite locale partagée entre les workers gunicorn (état d'exploitation)."""
+import os
+import sqlite3
+import threading
+
+from flask import current_app
+
+_local = threading.local()
+
+
+def state_db_path(app=None):
+    """
+    Chemin du fichier SQLite d'état.
+
+    STATE_DB s'il est configuré, sinon `state.db` dans le dossier instance/
+    de l'application (créé au besoin).
+    """
+    app = app or current_app
+    path = app.config.get('STATE_DB')
+    if not path:
+        os.makedirs(app.instance_path, exist_ok=True)
+        path = os.path.join(app.instance_path, 'state.db')
+    return path
+
+
+def connect(path):
+    """
+    Retourne la connexion SQLite du thread courant pour `path`.
+
+    Une connexion par thread et par processus (jamais partagée après un
+    fork), en mode WAL pour que lecteurs et écrivain ne se bloquent pas.
+    Les transactions sont pilotées explicitement (isolation_level=None).
+    """
+    key = (os.getpid(), path)
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(key)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=30000')
+        connections[key] = conn
+    return conn
+
+
+class transaction:
+    """
+    Transaction d'écriture `BEGIN IMMEDIATE` (verrou pris dès le début).
+
+    Usage :
+        with transaction(conn):
+            conn.execute(...)
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute('COMMIT')
+        else:
+            self.conn.execute('ROLLBACK')
+        return False
@@ -0,0 +1,353 @@
+"""
+Traces des requêtes : spans imbriqués exportés en JSON OTLP.
+
+Une requête échantillonnée (TRACE_SAMPLE_RATE, ou drapeau « sampled » d'un
+en-tête W3C traceparent entrant) ouvre un span racine ; span() ouvre des
+spans enfants (validation, dispatch, appel GitHub, rendu…) tant qu'un span
+est actif dans le contexte courant, et ne coûte presque rien sinon.
+
+Les spans terminés sont mis en tampon (borné : au-delà, ils sont comptés
+puis abandonnés) et écrits par un thread de fond du worker, hors du thread
+de la requête : une ligne JSON par lot dans TRACE_FILE (défaut :
+instance/traces.jsonl), au format ExportTraceServiceRequest d'OTLP/JSON —
+celui du « file exporter » du collecteur OpenTelemetry, relisible par
+`otelcol` (receiver otlpjsonfile) ou par jq.
+"""
+import atexit
+import contextlib
+import contextvars
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+
+from flask import current_app, request
+
+# SpanKind OTLP
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+# Status.code OTLP
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+TRACEPARENT_RE = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+_current_span = contextvars.ContextVar('portal_current_span', default=None)
+
+
+class Span:
+    """Opération chronométrée d'une trace (horodatages en nanosecondes epoch)."""
+
+    __slots__ = ('tracer', 'trace_id', 'span_id', 'parent_id', 'name', 'kind',
+                 'start_ns', 'end_ns', 'attributes', 'status', 'message')
+
+    def __init__(self, tracer, trace_id, parent_id, name, kind, attributes):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.status = None
+        self.message = None
+
+    def set_attribute(self, key, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def record_error(self, exc):
+        self.status = STATUS_ERROR
+        self.message = f"{type(exc).__name__}: {exc}"[:500]
+        self.attributes['exception.type'] = type(exc).__name__
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.tracer.export(self)
+
+    def to_otlp(self):
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": otlp_attributes(self.attributes),
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.status:
+            span["status"] = {"code": self.status, "message": self.message} if self.message else {"code": self.status}
+        return span
+
+
+class _NoopSpan:
+    """Span d'une requête non échantillonnée : ignore tout."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_error(self, exc):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def otlp_attributes(attributes):
+    """dict -> liste de KeyValue OTLP/JSON (entiers en chaîne, comme int64)."""
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            encoded = {"boolValue": value}
+        elif isinstance(value, int):
+            encoded = {"intValue": str(value)}
+        elif isinstance(value, float):
+            encoded = {"doubleValue": value}
+        else:
+            encoded = {"stringValue": str(value)}
+        result.append({"key": key, "value": encoded})
+    return result
+
+
+class Tracer:
+    """
+    Échantillonnage, tampon et export des spans d'un processus.
+
+    Le thread d'export est démarré paresseusement au premier span terminé
+    dans chaque worker (les threads ne survivent pas à un fork).
+    """
+
+    def __init__(self, path, sample_rate, service_name, logger, flush_interval=2.0, buffer_size=10000,
+                 batch_size=512):
+        self.path = path
+        self.logger = logger
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.resource = {"attributes": otlp_attributes({"service.name": service_name})}
+        self._buffer = deque()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pid = None
+        self.exported = 0
+        self.dropped = 0
+
+    def sample(self, traceparent=None):
+        """
+        Décide si une requête est tracée.
+
+        Avec un en-tête traceparent valide, la trace et la décision
+        d'échantillonnage de l'appelant sont reprises.
+
+        Returns:
+            (trace_id, parent_span_id ou None), ou None si non échantillonnée
+        """
+        if traceparent:
+            match = TRACEPARENT_RE.match(traceparent)
+            if match:
+                if not int(match.group(3), 16) & 1:
+                    return None
+                return match.group(1), match.group(2)
+        if random.random() < self.sample_rate:
+            return f"{random.getrandbits(128):032x}", None
+        return None
+
+    def start_trace(self, name, context, kind=KIND_SERVER, attributes=None):
+        """Span racine d'une trace échantillonnée (context : retour de sample())."""
+        trace_id, parent_id = context
+        return Span(self, trace_id, parent_id, name, kind, attributes or {})
+
+    def export(self, span):
+        """Met un span terminé en tampon (appelé par Span.end, sans E/S)."""
+        if len(self._buffer) >= self.buffer_size:
+            self.dropped += 1
+            return
+        self._buffer.append(span)
+        self._ensure_started()
+        if len(self._buffer) == self.batch_size:
+            self._wake.set()
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            threading.Thread(target=self._run, name="trace-exporter", daemon=True).start()
+            atexit.register(self.flush)
+            self._pid = os.getpid()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Écrit les spans en tampon (un lot OTLP par ligne, en un seul write)."""
+        with self._write_lock:
+            spans = []
+            while self._buffer:
+                spans.append(self._buffer.popleft().to_otlp())
+            if not spans:
+                return 0
+            lines = []
+            for start in range(0, len(spans), self.batch_size):
+                lines.append(json.dumps({
+                    "resourceSpans": [{
+                        "resource": self.resource,
+                        "scopeSpans": [{"scope": {"name": "app.services.tracing"},
+                                        "spans": spans[start:start + self.batch_size]}],
+                    }],
+                }, separators=(',', ':')))
+            try:
+                # O_APPEND + un seul write : les lots des workers ne s'entrelacent pas
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, ('\n'.join(lines) + '\n').encode())
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                self.dropped += len(spans)
+                self.logger.warning("Export de %d spans impossible (%s) : %s", len(spans), self.path, e)
+                return 0
+            self.exported += len(spans)
+            return len(spans)
+
+    def stats(self):
+        """Compteurs du processus courant."""
+        return {
+            "file": self.path,
+            "sample_rate": self.sample_rate,
+            "buffered": len(self._buffer),
+            "exported": self.exported,
+            "dropped": self.dropped,
+        }
+
+
+@contextlib.contextmanager
+def span(name, attributes=None, kind=KIND_INTERNAL):
+    """
+    Span enfant du span courant, actif pendant le bloc `with`.
+
+    Sans trace en cours (tracing désactivé, requête non échantillonnée,
+    thread de fond), retourne NOOP_SPAN. Une exception est enregistrée sur
+    le span (statut erreur) puis propagée.
+
+    Args:
+        name:       Nom de l'opération (ex: 'github.dispatch')
+        attributes: Attributs initiaux (les valeurs None sont ignorées)
+        kind:       SpanKind OTLP (KIND_CLIENT pour un appel sortant)
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+    child = Span(parent.tracer, parent.trace_id, parent.span_id, name, kind,
+                 {key: value for key, value in (attributes or {}).items() if value is not None})
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+def current_span():
+    """Span actif du contexte courant (None hors trace) : à passer à attach()."""
+    return _current_span.get()
+
+
+@contextlib.contextmanager
+def attach(parent):
+    """Rattache le bloc à un span d'un autre thread (ex. job de la file asynchrone)."""
+    token = _current_span.set(parent)
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+
+
+def get_tracer():
+    """Retourne le traceur de l'application courante (None si désactivé)."""
+    return current_app.extensions.get('tracer')
+
+
+def _start_request_trace():
+    req = request._get_current_object()
+    tracer = current_app.extensions['tracer']
+    context = tracer.sample(req.environ.get('HTTP_TRACEPARENT'))
+    if context is None:
+        return
+    rule = req.url_rule.rule if req.url_rule else None
+    root = tracer.start_trace(
+        f"{req.method} {rule or req.path}",
+        context,
+        attributes={
+            "http.request.method": req.method,
+            "url.path": req.path,
+            "http.route": rule or '',
+            "portal.endpoint": req.endpoint or '',
+        },
+    )
+    req.environ['portal.trace'] = (root, _current_span.set(root))
+
+
+def _record_status(response):
+    trace = request.environ.get('portal.trace')
+    if trace is not None:
+        trace[0].set_attribute("http.response.status_code", response.status_code)
+        if response.status_code >= 500:
+            trace[0].status = STATUS_ERROR
+    return response
+
+
+def _end_request_trace(exc):
+    trace = request.environ.pop('portal.trace', None)
+    if trace is None:
+        return
+    root, token = trace
+    if exc is not None:
+        root.record_error(exc)
+    _current_span.reset(token)
+    root.end()
+
+
+def init_tracing(app):
+    """Active les traces si TRACE_SAMPLE_RATE > 0 (un traceur par application)."""
+    rate = app.config['TRACE_SAMPLE_RATE']
+    if rate <= 0:
+        app.extensions['tracer'] = None
+        return
+    path = app.config['TRACE_FILE']
+    if not path:
+        os.makedirs(app.instance_path, exist_ok=True)
+        path = os.path.join(app.instance_path, 'traces.jsonl')
+    app.extensions['tracer'] = Tracer(
+        path,
+        sample_rate=min(rate, 1.0),
+        service_name=app.config['TRACE_SERVICE_NAME'],
+        logger=app.logger,
+        flush_interval=app.config['TRACE_FLUSH_INTERVAL'],
+        buffer_size=app.config['TRACE_BUFFER_SIZE'],
+    )
+    app.before_request(_start_request_trace)
+    app.after_request(_record_status)
+    app.teardown_request(_end_request_trace)
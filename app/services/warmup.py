@@ -0,0 +1,138 @@
+"""
+Démarrage des workers : templates précompilés, préchauffage, mesures.
+
+- `flask templates compile` (au build de l'image) remplit le cache de
+  bytecode Jinja (JINJA_BYTECODE_CACHE) : un worker charge ensuite le
+  bytecode au lieu de recompiler chaque template.
+- warm_up() compile/charge tous les templates et rend les pages cachées
+  (avec leurs variantes compressées). Appelé par les hooks de
+  gunicorn.conf.py : dans le maître avec preload_app (les workers en
+  héritent par copy-on-write), sinon dans chaque worker avant qu'il
+  n'accepte des connexions.
+- Les durées d'import/enregistrement des blueprints et du préchauffage
+  sont conservées dans app.extensions['startup'] (exposées sur /startup).
+"""
+import os
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from jinja2 import FileSystemBytecodeCache
+
+from app.services.page_cache import get_page_cache
+
+
+def init_warmup(app, blueprint_timings, started):
+    """
+    Active le cache de bytecode Jinja et enregistre les mesures de create_app().
+
+    Args:
+        app: Application Flask
+        blueprint_timings: {blueprint: {"import_ms", "register_ms"}}
+        started: time.perf_counter() au début de create_app()
+    """
+    folder = app.config.get('JINJA_BYTECODE_CACHE')
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(folder)
+    app.extensions['startup'] = {
+        "pid": os.getpid(),
+        "create_app_ms": round((time.perf_counter() - started) * 1000, 2),
+        "blueprints": blueprint_timings,
+        "bytecode_cache": bool(folder),
+        "warmup": None,
+    }
+    app.cli.add_command(templates_cli)
+
+
+def compile_templates(app):
+    """
+    Charge tous les templates dans le cache de l'environnement Jinja.
+
+    Avec un cache de bytecode, le premier appel (build de l'image) compile
+    et écrit le bytecode ; les suivants le relisent.
+
+    Returns:
+        Nombre de templates chargés
+    """
+    names = app.jinja_env.list_templates(extensions=('html',))
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+
+def warm_up(app):
+    """
+    Prépare le worker avant le premier client : templates et pages cachées.
+
+    Returns:
+        dict des durées (ms) et volumes, aussi stocké dans
+        app.extensions['startup']['warmup']
+    """
+    started = time.perf_counter()
+    templates = compile_templates(app)
+    compiled = time.perf_counter()
+
+    encodings = [name.strip() for name in app.config['WARMUP_ENCODINGS'].split(',') if name.strip()]
+    pages = 0
+    with app.app_context():
+        cache = get_page_cache()
+        for rule in app.url_map.iter_rules():
+            view = app.view_functions[rule.endpoint]
+            if cache is None or not getattr(view, 'cached_page', False) or rule.arguments:
+                continue
+            with app.test_request_context(rule.rule):
+                cache.preload(rule.endpoint, view.__wrapped__, encodings)
+            pages += 1
+
+    report = {
+        "templates": templates,
+        "templates_ms": round((compiled - started) * 1000, 2),
+        "pages": pages,
+        "pages_ms": round((time.perf_counter() - compiled) * 1000, 2),
+        "encodings": encodings,
+    }
+    app.extensions['startup']['warmup'] = report
+    app.logger.info(
+        "Préchauffage : %d templates en %.1f ms, %d pages en %.1f ms",
+        templates, report["templates_ms"], pages, report["pages_ms"],
+    )
+    return report
+
+
+def process_memory(pid='self'):
+    """
+    Mémoire d'un processus (Linux, /proc/<pid>/smaps_rollup), en Ko.
+
+    Returns:
+        dict rss, pss, uss (privée : ce que libèrerait l'arrêt du
+        processus), ou None si indisponible
+    """
+    kb = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            next(f, None)  # plage d'adresses [rollup]
+            for line in f:
+                key, _, value = line.partition(':')
+                kb[key] = int(value.split()[0])
+    except OSError:
+        return None
+    return {
+        "rss": kb.get('Rss', 0),
+        "pss": kb.get('Pss', 0),
+        "uss": kb.get('Private_Clean', 0) + kb.get('Private_Dirty', 0),
+    }
+
+
+templates_cli = AppGroup('templates', help="Templates Jinja.")
+
+
+@templates_cli.command('compile')
+def compile_command():
+    """Compile tous les templates dans le cache de bytecode (JINJA_BYTECODE_CACHE)."""
+    if current_app.jinja_env.bytecode_cache is None:
+        click.echo("JINJA_BYTECODE_CACHE non défini : templates vérifiés mais bytecode non conservé")
+    started = time.perf_counter()
+    count = compile_templates(current_app)
+    click.echo(f"{count} templates compilés en {(time.perf_counter() - started) * 1000:.1f} ms")
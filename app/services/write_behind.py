@@ -0,0 +1,214 @@
+"""
+Tampon d'écriture différée (write-behind) par worker.
+
+Le thread de la requête dépose l'opération dans un tampon en mémoire et
+rend la main ; un thread du worker l'écrit avec les suivantes en une seule
+transaction, dès que `batch_size` opérations attendent ou au plus tard
+`flush_interval` secondes après la précédente écriture.
+
+Tampon plein (écritures plus lentes que les requêtes) : l'appelant attend
+au plus `block_timeout` secondes qu'une écriture libère de la place
+(contre-pression), puis l'opération est déversée sur disque
+(<spill_dir>/<pid>.jsonl) et rejouée quand la base suit à nouveau. Un lot
+dont l'écriture échoue est déversé de la même façon. Les fichiers laissés
+par un worker mort sont repris par les autres.
+
+À l'arrêt propre du worker (worker_exit de gunicorn, lifespan ASGI,
+atexit), close() vide le tampon. Seul un arrêt brutal (SIGKILL) perd les opérations encore en
+mémoire.
+"""
+import atexit
+import collections
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class WriteBehindBuffer:
+    """
+    Tampon borné d'opérations (nom, ligne JSON-sérialisable) écrites par lots.
+
+    `write(ops)` reçoit une liste d'opérations et doit les écrire dans une
+    seule transaction (tout ou rien). Le thread d'écriture est démarré
+    paresseusement dans chaque processus (les threads ne survivent pas à un
+    fork).
+    """
+
+    def __init__(self, write, spill_dir, batch_size, flush_interval, capacity, block_timeout):
+        self.write = write
+        self.spill_dir = spill_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.capacity = capacity
+        self.block_timeout = block_timeout
+        self._ops = collections.deque()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._pid = None
+        self._closed = False
+        self.batches = self.written = self.spilled = self.replayed = self.blocked = 0
+
+    def ensure_started(self):
+        """Démarre le thread d'écriture du processus courant (une fois par worker)."""
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # Opérations héritées du maître : déjà écrites ou à écrire par lui
+            self._ops = collections.deque()
+            self._cond = threading.Condition()
+            self._write_lock = threading.Lock()
+            self._spill_lock = threading.Lock()
+            self._closed = False
+            self.batches = self.written = self.spilled = self.replayed = self.blocked = 0
+            threading.Thread(target=self._run, name="write-behind", daemon=True).start()
+            atexit.register(self.close)
+            self._pid = os.getpid()
+
+    def add(self, op, row):
+        """
+        Dépose une opération ; n'attend que si le tampon est plein.
+
+        Args:
+            op:  Nom de l'opération (interprété par `write`)
+            row: Ligne JSON-sérialisable (tuple ou liste de valeurs)
+        """
+        self.ensure_started()
+        with self._cond:
+            if len(self._ops) >= self.capacity and not self._closed:
+                self.blocked += 1
+                self._cond.notify_all()
+                self._cond.wait_for(lambda: len(self._ops) < self.capacity, self.block_timeout)
+            if len(self._ops) < self.capacity and not self._closed:
+                self._ops.append((op, row))
+                if len(self._ops) >= self.batch_size:
+                    self._cond.notify_all()
+                return
+        # Tampon toujours plein (ou worker en arrêt) : sur disque plutôt que perdu
+        self._spill([(op, row)])
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: len(self._ops) >= self.batch_size, self.flush_interval)
+            try:
+                self.flush()
+                self.replay()
+            except Exception:
+                logger.exception("Écriture différée : erreur inattendue")
+
+    def flush(self):
+        """Écrit toutes les opérations en attente, par lots de batch_size."""
+        with self._write_lock:
+            while True:
+                with self._cond:
+                    count = min(len(self._ops), self.batch_size)
+                    batch = [self._ops.popleft() for _ in range(count)]
+                    # Place libérée : les appelants en contre-pression repartent
+                    self._cond.notify_all()
+                if not batch:
+                    return
+                try:
+                    self.write(batch)
+                except Exception:
+                    logger.warning("Écriture différée : lot de %d opérations déversé sur disque",
+                                   len(batch), exc_info=True)
+                    self._spill(batch)
+                    return
+                self.batches += 1
+                self.written += len(batch)
+
+    def _spill(self, ops):
+        with self._spill_lock:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(os.path.join(self.spill_dir, f"{os.getpid()}.jsonl"), 'a', encoding='utf-8') as spill:
+                spill.write(''.join(json.dumps(op, separators=(',', ':')) + '\n' for op in ops))
+            self.spilled += len(ops)
+
+    def _claim_spills(self):
+        """Renomme en <pid>.<id>.replay les fichiers de ce worker et ceux des workers morts."""
+        pid = os.getpid()
+        try:
+            names = os.listdir(self.spill_dir)
+        except FileNotFoundError:
+            return []
+        claimed = []
+        for name in names:
+            owner = name.split('.', 1)[0]
+            if not owner.isdigit() or not name.endswith(('.jsonl', '.replay')):
+                continue
+            path = os.path.join(self.spill_dir, name)
+            if int(owner) == pid and name.endswith('.replay'):
+                claimed.append(path)
+                continue
+            if int(owner) != pid and _pid_alive(int(owner)):
+                continue
+            target = os.path.join(self.spill_dir, f"{pid}.{uuid.uuid4().hex}.replay")
+            try:
+                # Sous le verrou : aucun _spill() de ce worker n'écrit pendant le renommage
+                with self._spill_lock:
+                    os.rename(path, target)
+            except FileNotFoundError:
+                continue  # repris par un autre worker
+            claimed.append(target)
+        return claimed
+
+    def replay(self):
+        """Rejoue les opérations déversées sur disque quand le tampon en mémoire est vide."""
+        if self._ops or not os.path.isdir(self.spill_dir):
+            return
+        for path in self._claim_spills():
+            with open(path, encoding='utf-8') as spill:
+                ops = [tuple(json.loads(line)) for line in spill if line.strip()]
+            try:
+                # Un fichier, une transaction : rejoué en entier ou pas du tout
+                with self._write_lock:
+                    self.write(ops)
+            except Exception:
+                logger.warning("Écriture différée : rejeu de %s reporté", path, exc_info=True)
+                return
+            os.remove(path)
+            self.replayed += len(ops)
+
+    def close(self):
+        """Vide le tampon (arrêt du worker) ; sans effet hors du processus qui l'a démarré."""
+        if self._pid != os.getpid() or self._closed:
+            return
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        started = time.perf_counter()
+        self.flush()
+        logger.info("Écriture différée : tampon vidé en %.1f ms (%d opérations écrites)",
+                    (time.perf_counter() - started) * 1000, self.written)
+
+    def stats(self):
+        """Profondeur du tampon, lots écrits, opérations déversées et rejouées (processus courant)."""
+        current = self._pid == os.getpid()
+        return {
+            "pending": len(self._ops) if current else 0,
+            "capacity": self.capacity,
+            "batches": self.batches if current else 0,
+            "written": self.written if current else 0,
+            "blocked": self.blocked if current else 0,
+            "spilled": self.spilled if current else 0,
+            "replayed": self.replayed if current else 0,
+        }
@@ -0,0 +1,85 @@
+const form = document.getElementById('budgetForm');
+const submitBtn = document.getElementById('submitBtn');
+const spinner = document.getElementById('spinner');
+const btnText = document.getElementById('btnText');
+const alert = document.getElementById('alertBanner');
+const alertText = document.getElementById('alertText');
+
+function showAlert(msg) {
+    alertText.textContent = msg;
+    alert.style.display = 'flex';
+    alert.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+}
+
+function hideAlert() {
+    alert.style.display = 'none';
+}
+
+function addAlert() {
+    const container = document.getElementById('alertsList');
+    const row = document.createElement('div');
+    row.className = 'alert-row';
+    row.innerHTML = `
+        <input type="number" placeholder="%" class="alert-threshold" min="0" max="500">
+        <input type="email" placeholder="email@exemple.com" class="alert-email">
+        <button type="button" class="btn-icon" onclick="removeAlert(this)">×</button>
+    `;
+    container.appendChild(row);
+}
+
+function removeAlert(btn) {
+    if (document.querySelectorAll('#alertsList .alert-row').length > 1) {
+        btn.parentElement.remove();
+    } else {
+        showAlert("⚠️ Vous devez garder au moins un seuil d'alerte");
+    }
+}
+
+form.addEventListener('submit', function(e) {
+    hideAlert();
+
+    const budgetName = document.getElementById('budget_name').value.trim();
+    const budgetAmount = document.getElementById('budget_amount').value;
+
+    if (!budgetName || !budgetAmount) {
+        e.preventDefault();
+        showAlert("⚠️ Nom et montant obligatoires");
+        return false;
+    }
+
+    if (parseFloat(budgetAmount) <= 0) {
+        e.preventDefault();
+        showAlert("⚠️ Le montant doit être supérieur à 0");
+        return false;
+    }
+
+    // Collecter les alertes
+    const alerts = [];
+    document.querySelectorAll('#alertsList .alert-row').forEach(row => {
+        const threshold = row.querySelector('.alert-threshold').value.trim();
+        const email = row.querySelector('.alert-email').value.trim();
+
+        if (threshold && email) {
+            alerts.push({ threshold: parseFloat(threshold), email });
+        }
+    });
+
+    if (alerts.length === 0) {
+        e.preventDefault();
+        showAlert("⚠️ Ajoutez au moins un seuil d'alerte avec email");
+        return false;
+    }
+
+    // Ajouter au form
+    const hiddenInput = document.createElement('input');
+    hiddenInput.type = 'hidden';
+    hiddenInput.name = 'alerts';
+    hiddenInput.value = JSON.stringify(alerts);
+    form.appendChild(hiddenInput);
+
+    spinner.style.display = 'block';
+    btnText.textContent = 'Création en cours...';
+    submitBtn.disabled = true;
+});
+
+setTimeout(() => document.getElementById('budget_name').focus(), 400);
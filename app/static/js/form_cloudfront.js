@@ -0,0 +1,122 @@
+const originTypeInputs = document.querySelectorAll('input[name="origin_type"]');
+const originDomainInput = document.getElementById('origin_domain');
+const originHint = document.getElementById('originHint');
+const originValidation = document.getElementById('originValidation');
+const ttlSlider = document.getElementById('default_ttl');
+const ttlValue = document.getElementById('ttlValue');
+const cfDomainPreview = document.getElementById('cfDomainPreview');
+const form = document.getElementById('cloudfrontForm');
+const submitBtn = document.getElementById('submitBtn');
+const spinner = document.getElementById('spinner');
+const btnText = document.getElementById('btnText');
+const alert = document.getElementById('alertBanner');
+const alertText = document.getElementById('alertText');
+
+originTypeInputs.forEach(input => {
+    input.addEventListener('change', () => {
+        if (input.value === 's3') {
+            originHint.textContent = 'Ex: mon-bucket.s3.amazonaws.com ou mon-bucket.s3.us-east-1.amazonaws.com';
+            originDomainInput.placeholder = 'mon-bucket.s3.amazonaws.com';
+        } else {
+            originHint.textContent = 'Ex: mon-alb-123.us-east-1.elb.amazonaws.com ou api.example.com';
+            originDomainInput.placeholder = 'mon-alb-123.us-east-1.elb.amazonaws.com';
+        }
+    });
+});
+
+originDomainInput.addEventListener('input', () => {
+    const val = originDomainInput.value;
+    if (!val) {
+        originValidation.textContent = '';
+        originValidation.className = 'validation-msg';
+        return;
+    }
+
+    const originType = document.querySelector('input[name="origin_type"]:checked').value;
+
+    if (originType === 's3' && !val.includes('.s3')) {
+        originValidation.textContent = '⚠️ Domaine S3 doit contenir ".s3"';
+        originValidation.className = 'validation-msg error';
+    } else if (!val.includes('.')) {
+        originValidation.textContent = '❌ Domaine invalide';
+        originValidation.className = 'validation-msg error';
+    } else {
+        originValidation.textContent = '✅ Domaine valide';
+        originValidation.className = 'validation-msg success';
+    }
+
+    updateCfDomainPreview();
+});
+
+ttlSlider.addEventListener('input', () => {
+    const seconds = parseInt(ttlSlider.value);
+    if (seconds === 0) {
+        ttlValue.textContent = '0 (pas de cache)';
+    } else if (seconds < 3600) {
+        ttlValue.textContent = `${Math.floor(seconds / 60)}min`;
+    } else if (seconds < 86400) {
+        ttlValue.textContent = `${Math.floor(seconds / 3600)}h`;
+    } else {
+        ttlValue.textContent = `${Math.floor(seconds / 86400)}j`;
+    }
+});
+
+function updateCfDomainPreview() {
+    const randomId = Math.random().toString(36).substring(2, 15);
+    cfDomainPreview.textContent = `d${randomId}.cloudfront.net`;
+}
+
+function showAlert(msg) {
+    alertText.textContent = msg;
+    alert.style.display = 'flex';
+    alert.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+}
+
+function hideAlert() {
+    alert.style.display = 'none';
+}
+
+document.querySelectorAll('.toggle-row').forEach(row => {
+    row.addEventListener('click', e => {
+        if (e.target.tagName === 'INPUT') return;
+        const cb = row.querySelector('input[type="checkbox"]');
+        if (cb) cb.checked = !cb.checked;
+    });
+});
+
+form.addEventListener('submit', function(e) {
+    hideAlert();
+
+    const originDomain = originDomainInput.value.trim();
+    const aliases = document.getElementById('aliases').value.trim();
+    const acmArn = document.getElementById('acm_certificate_arn').value.trim();
+
+    if (!originDomain) {
+        e.preventDefault();
+        showAlert('Le domaine d\'origine est obligatoire');
+        originDomainInput.focus();
+        return false;
+    }
+
+    if (aliases && !acmArn) {
+        e.preventDefault();
+        showAlert('Un certificat ACM est requis pour utiliser des domaines personnalisés (CNAME)');
+        document.getElementById('acm_certificate_arn').focus();
+        return false;
+    }
+
+    if (acmArn && !acmArn.includes('us-east-1')) {
+        if (!confirm('⚠️ Le certificat ACM doit être dans us-east-1 pour CloudFront. Êtes-vous sûr qu\'il est dans la bonne région ?')) {
+            e.preventDefault();
+            return false;
+        }
+    }
+
+    spinner.style.display = 'block';
+    btnText.textContent = 'Pipeline en cours...';
+    submitBtn.disabled = true;
+});
+
+// Initial TTL display
+ttlSlider.dispatchEvent(new Event('input'));
+updateCfDomainPreview();
@@ -0,0 +1,97 @@
+const namespaceSelect = document.getElementById('namespace');
+const metricGrid = document.getElementById('metricGrid');
+const thresholdSlider = document.getElementById('threshold');
+const thresholdValue = document.getElementById('thresholdValue');
+const alarmCondition = document.getElementById('alarmCondition');
+
+const metricsByService = {
+    'AWS/EC2': [
+        { name: 'CPUUtilization', icon: '💻', desc: 'Utilisation processeur en %' },
+        { name: 'NetworkIn', icon: '📥', desc: 'Trafic réseau entrant en octets' },
+        { name: 'NetworkOut', icon: '📤', desc: 'Trafic réseau sortant en octets' },
+        { name: 'DiskReadBytes', icon: '💾', desc: 'Lecture disque en octets' },
+        { name: 'StatusCheckFailed', icon: '⚠️', desc: 'Échec des health checks' },
+    ],
+    'AWS/RDS': [
+        { name: 'CPUUtilization', icon: '💻', desc: 'Utilisation processeur en %' },
+        { name: 'DatabaseConnections', icon: '🔌', desc: 'Nombre de connexions actives' },
+        { name: 'FreeableMemory', icon: '🧠', desc: 'Mémoire disponible en octets' },
+        { name: 'FreeStorageSpace', icon: '💾', desc: 'Espace disque disponible' },
+    ],
+    'AWS/Lambda': [
+        { name: 'Invocations', icon: '🔄', desc: 'Nombre d\'invocations' },
+        { name: 'Errors', icon: '❌', desc: 'Nombre d\'erreurs' },
+        { name: 'Duration', icon: '⏱️', desc: 'Temps d\'exécution en ms' },
+        { name: 'Throttles', icon: '🚫', desc: 'Invocations limitées' },
+    ],
+    'AWS/ELB': [
+        { name: 'TargetResponseTime', icon: '⏱️', desc: 'Temps de réponse des targets' },
+        { name: 'UnHealthyHostCount', icon: '🔴', desc: 'Nombre de targets non-sains' },
+        { name: 'RequestCount', icon: '📊', desc: 'Nombre de requêtes' },
+        { name: 'HTTPCode_Target_5XX_Count', icon: '❌', desc: 'Erreurs 5xx des targets' },
+    ],
+    'AWS/S3': [
+        { name: 'BucketSizeBytes', icon: '📦', desc: 'Taille du bucket en octets' },
+        { name: 'NumberOfObjects', icon: '🔢', desc: 'Nombre d\'objets stockés' },
+    ],
+    'AWS/DynamoDB': [
+        { name: 'UserErrors', icon: '❌', desc: 'Erreurs utilisateur' },
+        { name: 'ConsumedReadCapacityUnits', icon: '📖', desc: 'Capacité de lecture consommée' },
+        { name: 'ConsumedWriteCapacityUnits', icon: '✍️', desc: 'Capacité d\'écriture consommée' },
+    ],
+};
+
+namespaceSelect.addEventListener('change', () => {
+    const service = namespaceSelect.value;
+    const metrics = metricsByService[service] || [];
+
+    metricGrid.innerHTML = metrics.map((m, i) => `
+        <label class="metric-card">
+            <input type="radio" name="metric_name" value="${m.name}" ${i === 0 ? 'checked' : ''}>
+            <div class="metric-name">${m.icon} ${m.name}</div>
+            <div class="metric-desc">${m.desc}</div>
+        </label>
+    `).join('');
+
+    updateAlarmPreview();
+});
+
+thresholdSlider.addEventListener('input', () => {
+    thresholdValue.textContent = thresholdSlider.value;
+    updateAlarmPreview();
+});
+
+function updateAlarmPreview() {
+    const metric = document.querySelector('input[name="metric_name"]:checked')?.value || 'CPUUtilization';
+    const threshold = thresholdSlider.value;
+    const operator = document.getElementById('comparison_operator').value;
+    const periods = document.querySelector('select[name="evaluation_periods"]').value;
+    const period = document.querySelector('select[name="period"]').value;
+
+    const operatorSymbol = {
+        'GreaterThanThreshold': '>',
+        'GreaterThanOrEqualToThreshold': '≥',
+        'LessThanThreshold': '<',
+        'LessThanOrEqualToThreshold': '≤'
+    }[operator] || '>';
+
+    const periodLabel = {
+        '60': '1 minute',
+        '300': '5 minutes',
+        '900': '15 minutes',
+        '3600': '1 heure'
+    }[period] || '5 minutes';
+
+    alarmCondition.innerHTML = `
+        Alarme si <strong>${metric}</strong> ${operatorSymbol} <span class="alarm-value">${threshold}%</span><br>
+        pendant <strong>${periods} périodes</strong> de <strong>${periodLabel}</strong>
+    `;
+}
+
+document.getElementById('comparison_operator').addEventListener('change', updateAlarmPreview);
+document.querySelector('select[name="evaluation_periods"]').addEventListener('change', updateAlarmPreview);
+document.querySelector('select[name="period"]').addEventListener('change', updateAlarmPreview);
+
+// Initial load
+namespaceSelect.value = 'AWS/EC2';
+namespaceSelect.dispatchEvent(new Event('change'));
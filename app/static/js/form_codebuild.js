@@ -0,0 +1,157 @@
+const form = document.getElementById('buildForm');
+const submitBtn = document.getElementById('submitBtn');
+const spinner = document.getElementById('spinner');
+const btnText = document.getElementById('btnText');
+const alert = document.getElementById('alertBanner');
+const alertText = document.getElementById('alertText');
+
+function showAlert(msg) {
+    alertText.textContent = msg;
+    alert.style.display = 'flex';
+    alert.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+}
+
+function hideAlert() {
+    alert.style.display = 'none';
+}
+
+// Validation du nom
+function validateProjectName() {
+    const name = document.getElementById('project_name').value.trim();
+    const validation = document.getElementById('nameValidation');
+
+    if (!name) {
+        validation.textContent = '';
+        validation.className = 'validation-msg';
+        return false;
+    }
+
+    if (!/^[a-zA-Z0-9_-]+$/.test(name)) {
+        validation.textContent = '❌ Caractères invalides';
+        validation.className = 'validation-msg error';
+        return false;
+    }
+
+    validation.textContent = '✅ Nom valide';
+    validation.className = 'validation-msg success';
+    return true;
+}
+
+document.getElementById('project_name').addEventListener('input', validateProjectName);
+
+// Affichage conditionnel des champs
+document.getElementById('source_type').addEventListener('change', function() {
+    const show = this.value && this.value !== 'NO_SOURCE' && this.value !== 'CODEPIPELINE';
+    document.getElementById('sourceFields').style.display = show ? 'block' : 'none';
+});
+
+document.getElementById('image').addEventListener('change', function() {
+    document.getElementById('customImageField').style.display = 
+        this.value === 'CUSTOM' ? 'block' : 'none';
+});
+
+document.getElementById('buildspec_type').addEventListener('change', function() {
+    if (this.value === 'file') {
+        document.getElementById('buildspecFileField').style.display = 'block';
+        document.getElementById('buildspecInlineField').style.display = 'none';
+    } else {
+        document.getElementById('buildspecFileField').style.display = 'none';
+        document.getElementById('buildspecInlineField').style.display = 'block';
+    }
+});
+
+document.getElementById('artifacts_type').addEventListener('change', function() {
+    document.getElementById('artifactsS3Field').style.display = 
+        this.value === 'S3' ? 'block' : 'none';
+});
+
+document.getElementById('enable_cache').addEventListener('change', function() {
+    document.getElementById('cacheField').style.display = this.checked ? 'block' : 'none';
+});
+
+document.getElementById('enable_env_vars').addEventListener('change', function() {
+    document.getElementById('envVarsContainer').classList.toggle('visible', this.checked);
+});
+
+// Variables d'environnement
+function addEnvVar() {
+    const container = document.getElementById('envVarsList');
+    const row = document.createElement('div');
+    row.className = 'env-var-row';
+    row.innerHTML = `
+        <input type="text" placeholder="Nom" class="env-var-key">
+        <input type="text" placeholder="Valeur" class="env-var-value">
+        <button type="button" class="btn-icon" onclick="removeEnvVar(this)">×</button>
+    `;
+    container.appendChild(row);
+}
+
+function removeEnvVar(btn) {
+    btn.parentElement.remove();
+}
+
+// Soumission
+form.addEventListener('submit', function(e) {
+    hideAlert();
+
+    const projectName = document.getElementById('project_name').value.trim();
+    const environment = document.getElementById('environment').value;
+    const sourceType = document.getElementById('source_type').value;
+
+    if (!projectName || !environment || !sourceType) {
+        e.preventDefault();
+        showAlert("⚠️ Veuillez remplir tous les champs obligatoires");
+        return false;
+    }
+
+    if (!validateProjectName()) {
+        e.preventDefault();
+        showAlert("⚠️ Le nom du projet est invalide");
+        document.getElementById('project_name').focus();
+        return false;
+    }
+
+    // Confirmation pour production
+    if (environment === 'prod') {
+        if (!confirm('⚠️ Vous allez créer un projet CodeBuild en PRODUCTION. Confirmez-vous ?')) {
+            e.preventDefault();
+            return false;
+        }
+    }
+
+    // Collecte des variables d'environnement
+    const envVars = [];
+    document.querySelectorAll('#envVarsList .env-var-row').forEach(row => {
+        const key = row.querySelector('.env-var-key').value.trim();
+        const value = row.querySelector('.env-var-value').value.trim();
+        if (key && value) {
+            envVars.push({ name: key, value: value });
+        }
+    });
+
+    if (envVars.length > 0) {
+        const hiddenInput = document.createElement('input');
+        hiddenInput.type = 'hidden';
+        hiddenInput.name = 'environment_variables';
+        hiddenInput.value = JSON.stringify(envVars);
+        form.appendChild(hiddenInput);
+    }
+
+    spinner.style.display = 'block';
+    btnText.textContent = 'Création du projet en cours...';
+    submitBtn.disabled = true;
+});
+
+// Toggle rows
+document.querySelectorAll('.toggle-row').forEach(row => {
+    row.addEventListener('click', function(e) {
+        if (e.target.type === 'checkbox') return;
+        const cb = this.querySelector('input[type="checkbox"]');
+        if (cb) {
+            cb.checked = !cb.checked;
+            cb.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+    });
+});
+
+setTimeout(() => document.getElementById('project_name').focus(), 400);
@@ -0,0 +1,174 @@
+const form = document.getElementById('deployForm');
+const submitBtn = document.getElementById('submitBtn');
+const spinner = document.getElementById('spinner');
+const btnText = document.getElementById('btnText');
+const alert = document.getElementById('alertBanner');
+const alertText = document.getElementById('alertText');
+
+function showAlert(msg) {
+    alertText.textContent = msg;
+    alert.style.display = 'flex';
+    alert.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+}
+
+function hideAlert() {
+    alert.style.display = 'none';
+}
+
+// Validation du nom
+function validateApplicationName() {
+    const name = document.getElementById('application_name').value.trim();
+    const validation = document.getElementById('nameValidation');
+
+    if (!name) {
+        validation.textContent = '';
+        validation.className = 'validation-msg';
+        return false;
+    }
+
+    if (!/^[a-zA-Z0-9_-]+$/.test(name)) {
+        validation.textContent = '❌ Caractères invalides';
+        validation.className = 'validation-msg error';
+        return false;
+    }
+
+    validation.textContent = '✅ Nom valide';
+    validation.className = 'validation-msg success';
+    return true;
+}
+
+document.getElementById('application_name').addEventListener('input', validateApplicationName);
+
+// Affichage conditionnel selon la plateforme
+document.getElementById('compute_platform').addEventListener('change', function() {
+    const platform = this.value;
+
+    document.getElementById('ec2TargetsSection').style.display = 'none';
+    document.getElementById('lambdaTargetsSection').style.display = 'none';
+    document.getElementById('ecsTargetsSection').style.display = 'none';
+    document.getElementById('blueGreenToggle').style.display = 'none';
+
+    if (platform === 'Server') {
+        document.getElementById('ec2TargetsSection').style.display = 'block';
+        document.getElementById('blueGreenToggle').style.display = 'flex';
+    } else if (platform === 'Lambda') {
+        document.getElementById('lambdaTargetsSection').style.display = 'block';
+    } else if (platform === 'ECS') {
+        document.getElementById('ecsTargetsSection').style.display = 'block';
+    }
+
+    // Update deployment config options
+    updateDeploymentConfigOptions(platform);
+});
+
+function updateDeploymentConfigOptions(platform) {
+    const select = document.getElementById('deployment_config');
+    const options = select.querySelectorAll('optgroup');
+
+    options.forEach(group => {
+        group.style.display = 'none';
+    });
+
+    if (platform === 'Server') {
+        options[0].style.display = 'block';
+        select.value = 'CodeDeployDefault.OneAtATime';
+    } else if (platform === 'Lambda') {
+        options[1].style.display = 'block';
+        select.value = 'CodeDeployDefault.LambdaCanary10Percent5Minutes';
+    } else if (platform === 'ECS') {
+        options[2].style.display = 'block';
+        select.value = 'CodeDeployDefault.ECSCanary10Percent5Minutes';
+    }
+}
+
+// Blue/Green config
+document.getElementById('blue_green_deployment').addEventListener('change', function() {
+    document.getElementById('blueGreenConfig').style.display = this.checked ? 'block' : 'none';
+});
+
+// Rollback config
+document.getElementById('auto_rollback').addEventListener('change', function() {
+    document.getElementById('rollbackConfig').style.display = this.checked ? 'block' : 'none';
+});
+
+// Load Balancer config
+document.getElementById('use_load_balancer').addEventListener('change', function() {
+    document.getElementById('loadBalancerConfig').style.display = this.checked ? 'block' : 'none';
+});
+
+document.getElementById('load_balancer_type').addEventListener('change', function() {
+    if (this.value === 'target_group') {
+        document.getElementById('targetGroupField').style.display = 'block';
+        document.getElementById('classicLBField').style.display = 'none';
+    } else {
+        document.getElementById('targetGroupField').style.display = 'none';
+        document.getElementById('classicLBField').style.display = 'block';
+    }
+});
+
+// Soumission
+form.addEventListener('submit', function(e) {
+    hideAlert();
+
+    const applicationName = document.getElementById('application_name').value.trim();
+    const computePlatform = document.getElementById('compute_platform').value;
+    const deploymentGroupName = document.getElementById('deployment_group_name').value.trim();
+    const environment = document.getElementById('environment').value;
+
+    if (!applicationName || !computePlatform || !deploymentGroupName || !environment) {
+        e.preventDefault();
+        showAlert("⚠️ Veuillez remplir tous les champs obligatoires");
+        return false;
+    }
+
+    if (!validateApplicationName()) {
+        e.preventDefault();
+        showAlert("⚠️ Le nom de l'application est invalide");
+        document.getElementById('application_name').focus();
+        return false;
+    }
+
+    // Validations spécifiques par plateforme
+    if (computePlatform === 'Lambda') {
+        const lambdaName = document.getElementById('lambda_function_name').value.trim();
+        if (!lambdaName) {
+            e.preventDefault();
+            showAlert("⚠️ Nom de fonction Lambda obligatoire");
+            return false;
+        }
+    } else if (computePlatform === 'ECS') {
+        const cluster = document.getElementById('ecs_cluster_name').value.trim();
+        const service = document.getElementById('ecs_service_name').value.trim();
+        if (!cluster || !service) {
+            e.preventDefault();
+            showAlert("⚠️ Cluster et service ECS obligatoires");
+            return false;
+        }
+    }
+
+    // Confirmation pour production
+    if (environment === 'prod') {
+        if (!confirm('⚠️ Vous allez créer une application CodeDeploy en PRODUCTION. Confirmez-vous ?')) {
+            e.preventDefault();
+            return false;
+        }
+    }
+
+    spinner.style.display = 'block';
+    btnText.textContent = 'Création en cours...';
+    submitBtn.disabled = true;
+});
+
+// Toggle rows
+document.querySelectorAll('.toggle-row').forEach(row => {
+    row.addEventListener('click', function(e) {
+        if (e.target.type === 'checkbox') return;
+        const cb = this.querySelector('input[type="checkbox"]');
+        if (cb) {
+            cb.checked = !cb.checked;
+            cb.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+    });
+});
+
+setTimeout(() => document.getElementById('application_name').focus(), 400);
@@ -0,0 +1,251 @@
+// ═══════════════════════════════════════════════════════════════════════════════
+// JAVASCRIPT - Logique du formulaire
+// ═══════════════════════════════════════════════════════════════════════════════
+
+const form = document.getElementById('pipelineForm');
+const submitBtn = document.getElementById('submitBtn');
+const spinner = document.getElementById('spinner');
+const btnText = document.getElementById('btnText');
+const alert = document.getElementById('alertBanner');
+const alertText = document.getElementById('alertText');
+
+// Tags system
+const tags = [];
+
+function showAlert(msg) {
+    alertText.textContent = msg;
+    alert.style.display = 'flex';
+    alert.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+}
+
+function hideAlert() {
+    alert.style.display = 'none';
+}
+
+// ── Affichage conditionnel des champs selon le provider source ────────
+document.getElementById('source_provider').addEventListener('change', function() {
+    const provider = this.value;
+    document.getElementById('githubFields').style.display = 'none';
+    document.getElementById('codecommitFields').style.display = 'none';
+    document.getElementById('s3Fields').style.display = 'none';
+
+    if (provider === 'GitHub' || provider === 'GitHubEnterprise' || provider === 'Bitbucket') {
+        document.getElementById('githubFields').style.display = 'block';
+    } else if (provider === 'CodeCommit') {
+        document.getElementById('codecommitFields').style.display = 'block';
+    } else if (provider === 'S3') {
+        document.getElementById('s3Fields').style.display = 'block';
+    }
+});
+
+// ── Affichage conditionnel des champs selon le provider de déploiement ────
+document.getElementById('deploy_provider').addEventListener('change', function() {
+    const provider = this.value;
+    document.getElementById('ecsFields').style.display = 'none';
+    document.getElementById('codedeployFields').style.display = 'none';
+    document.getElementById('lambdaFields').style.display = 'none';
+    document.getElementById('s3DeployFields').style.display = 'none';
+
+    if (provider.startsWith('ECS')) {
+        document.getElementById('ecsFields').style.display = 'block';
+    } else if (provider === 'CodeDeploy') {
+        document.getElementById('codedeployFields').style.display = 'block';
+    } else if (provider === 'Lambda') {
+        document.getElementById('lambdaFields').style.display = 'block';
+    } else if (provider === 'S3') {
+        document.getElementById('s3DeployFields').style.display = 'block';
+    }
+});
+
+// ── Toggles pour afficher/masquer les sections ────────────────────────
+document.getElementById('enable_build').addEventListener('change', function() {
+    document.getElementById('buildSection').style.display = this.checked ? 'block' : 'none';
+});
+
+document.getElementById('enable_test').addEventListener('change', function() {
+    document.getElementById('testSection').style.display = this.checked ? 'block' : 'none';
+});
+
+document.getElementById('manual_approval').addEventListener('change', function() {
+    document.getElementById('approvalSection').style.display = this.checked ? 'block' : 'none';
+});
+
+document.getElementById('enable_notifications').addEventListener('change', function() {
+    document.getElementById('notificationsSection').style.display = this.checked ? 'block' : 'none';
+});
+
+document.getElementById('enable_build_env_vars').addEventListener('change', function() {
+    document.getElementById('buildEnvVarsContainer').classList.toggle('visible', this.checked);
+});
+
+// ── Variables d'environnement du build ────────────────────────────────
+function addBuildEnvVar() {
+    const container = document.getElementById('buildEnvVarsList');
+    const row = document.createElement('div');
+    row.className = 'env-var-row';
+    row.innerHTML = `
+        <input type="text" placeholder="Clé" class="env-var-key">
+        <input type="text" placeholder="Valeur" class="env-var-value">
+        <button type="button" class="btn-icon" onclick="removeEnvVar(this)">×</button>
+    `;
+    container.appendChild(row);
+}
+
+function removeEnvVar(btn) {
+    btn.parentElement.remove();
+}
+
+// ── Tags input system ──────────────────────────────────────────────────
+function handleTagInput(e) {
+    if (e.key === 'Enter') {
+        e.preventDefault();
+        const input = e.target;
+        const value = input.value.trim();
+
+        if (value && value.includes('=')) {
+            const [key, val] = value.split('=').map(s => s.trim());
+            if (key && val) {
+                tags.push({ key, value: val });
+                addTagToUI(key, val);
+                input.value = '';
+                updateTagsHidden();
+            }
+        } else if (value) {
+            showAlert('Format de tag invalide. Utilisez: key=value');
+        }
+    }
+}
+
+function addTagToUI(key, value) {
+    const container = document.getElementById('tagsContainer');
+    const input = document.getElementById('tagsInput');
+
+    const tagElement = document.createElement('div');
+    tagElement.className = 'tag-item';
+    tagElement.innerHTML = `
+        ${key}=${value}
+        <span class="tag-remove" onclick="removeTag('${key}', this)">×</span>
+    `;
+
+    container.insertBefore(tagElement, input);
+}
+
+function removeTag(key, element) {
+    const index = tags.findIndex(t => t.key === key);
+    if (index > -1) {
+        tags.splice(index, 1);
+        element.parentElement.remove();
+        updateTagsHidden();
+    }
+}
+
+function updateTagsHidden() {
+    document.getElementById('tags').value = JSON.stringify(tags);
+}
+
+// ── Validation du formulaire ───────────────────────────────────────────
+function validatePipelineName() {
+    const name = document.getElementById('pipeline_name').value.trim();
+    const validation = document.getElementById('nameValidation');
+
+    if (!name) {
+        validation.textContent = '';
+        validation.className = 'validation-msg';
+        return false;
+    }
+
+    if (!/^[a-zA-Z0-9_-]+$/.test(name)) {
+        validation.textContent = '❌ Caractères invalides (alphanumériques, tirets, underscores uniquement)';
+        validation.className = 'validation-msg error';
+        return false;
+    }
+
+    if (name.length < 3) {
+        validation.textContent = '❌ Minimum 3 caractères';
+        validation.className = 'validation-msg error';
+        return false;
+    }
+
+    validation.textContent = '✅ Nom valide';
+    validation.className = 'validation-msg success';
+    return true;
+}
+
+document.getElementById('pipeline_name').addEventListener('input', validatePipelineName);
+
+// ── Soumission du formulaire ───────────────────────────────────────────
+form.addEventListener('submit', function(e) {
+    hideAlert();
+
+    const pipelineName = document.getElementById('pipeline_name').value.trim();
+    const environment = document.getElementById('environment').value;
+    const sourceProvider = document.getElementById('source_provider').value;
+    const deployProvider = document.getElementById('deploy_provider').value;
+
+    // Validations de base
+    if (!pipelineName || !environment || !sourceProvider || !deployProvider) {
+        e.preventDefault();
+        showAlert("⚠️ Veuillez remplir tous les champs obligatoires (marqués *)");
+        return false;
+    }
+
+    if (!validatePipelineName()) {
+        e.preventDefault();
+        showAlert("⚠️ Le nom du pipeline est invalide");
+        document.getElementById('pipeline_name').focus();
+        return false;
+    }
+
+    // Validation selon le provider source
+    if ((sourceProvider === 'GitHub' || sourceProvider === 'GitHubEnterprise') && !document.getElementById('repository').value.trim()) {
+        e.preventDefault();
+        showAlert("⚠️ Veuillez spécifier le repository GitHub");
+        return false;
+    }
+
+    // Confirmation pour production
+    if (environment === 'prod') {
+        if (!confirm('⚠️ ATTENTION\n\nVous allez créer un pipeline CI/CD en PRODUCTION.\n\nAssurez-vous que :\n• Toutes les ressources cibles existent\n• Les approbations manuelles sont activées\n• Les tests sont configurés\n\nConfirmez-vous ?')) {
+            e.preventDefault();
+            return false;
+        }
+    }
+
+    // Collecte des variables d'environnement
+    const envVars = [];
+    document.querySelectorAll('#buildEnvVarsList .env-var-row').forEach(row => {
+        const key = row.querySelector('.env-var-key').value.trim();
+        const value = row.querySelector('.env-var-value').value.trim();
+        if (key && value) {
+            envVars.push({ key, value });
+        }
+    });
+
+    if (envVars.length > 0) {
+        const hiddenInput = document.createElement('input');
+        hiddenInput.type = 'hidden';
+        hiddenInput.name = 'build_env_vars';
+        hiddenInput.value = JSON.stringify(envVars);
+        form.appendChild(hiddenInput);
+    }
+
+    // Procéder
+    spinner.style.display = 'block';
+    btnText.textContent = 'Création du pipeline en cours...';
+    submitBtn.disabled = true;
+});
+
+// ── Auto-focus premier champ ───────────────────────────────────────────
+setTimeout(() => document.getElementById('pipeline_name').focus(), 400);
+
+// ── Toggle rows: prevent double-click form submit ──────────────────────
+document.querySelectorAll('.toggle-row').forEach(row => {
+    row.addEventListener('click', function(e) {
+        if (e.target.type === 'checkbox') return;
+        const cb = this.querySelector('input[type="checkbox"]');
+        if (cb) {
+            cb.checked = !cb.checked;
+            cb.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+    });
+});
@@ -0,0 +1,56 @@
+// Validation live du champ email
+const emailInput  = document.getElementById('report_email');
+const emailValid  = document.getElementById('emailValid');
+const emailHint   = document.getElementById('emailHint');
+
+emailInput.addEventListener('input', function () {
+    const val   = this.value.trim();
+    const isOk  = /^[^\s@]+@[^\s@]+\.[^\s@]+$/.test(val);
+
+    if (val === '') {
+        // Vide → état neutre
+        this.classList.remove('valid', 'invalid');
+        emailValid.classList.remove('visible');
+        emailHint.style.display = 'none';
+        return;
+    }
+
+    if (isOk) {
+        this.classList.add('valid');
+        this.classList.remove('invalid');
+        emailValid.classList.add('visible');
+        emailHint.style.display = 'none';
+    } else {
+        this.classList.add('invalid');
+        this.classList.remove('valid');
+        emailValid.classList.remove('visible');
+        emailHint.style.display  = 'block';
+        emailHint.classList.add('error');
+    }
+});
+
+    const form = document.getElementById('ceForm');
+    const submitBtn = document.getElementById('submitBtn');
+    const spinner = document.getElementById('spinner');
+    const btnText = document.getElementById('btnText');
+
+    document.getElementById('enable_reports').addEventListener('change', function() {
+        document.getElementById('reportsField').style.display = this.checked ? 'block' : 'none';
+    });
+
+    document.querySelectorAll('.toggle-row').forEach(row => {
+        row.addEventListener('click', function(e) {
+            if (e.target.type === 'checkbox') return;
+            const cb = this.querySelector('input[type="checkbox"]');
+            if (cb) {
+                cb.checked = !cb.checked;
+                cb.dispatchEvent(new Event('change', { bubbles: true }));
+            }
+        });
+    });
+
+    form.addEventListener('submit', function(e) {
+        spinner.style.display = 'block';
+        btnText.textContent = 'Activation en cours...';
+        submitBtn.disabled = true;
+    });
@@ -0,0 +1,147 @@
+const nameInput       = document.getElementById('instance_name');
+    const nameCharCount   = document.getElementById('nameCharCount');
+    const nameValidation  = document.getElementById('nameValidation');
+    const osSelect        = document.getElementById('instance_os');
+    const osValidation    = document.getElementById('osValidation');
+    const form            = document.getElementById('ec2Form');
+    const submitBtn       = document.getElementById('submitBtn');
+    const spinner         = document.getElementById('spinner');
+    const btnText         = document.getElementById('btnText');
+    const alert           = document.getElementById('alertBanner');
+    const alertText       = document.getElementById('alertText');
+
+    function validateName(name) {
+        if (!name) return { ok: false, msg: '' };
+        if (name.length < 1 || name.length > 50) return { ok: false, msg: '❌ Doit contenir entre 1 et 50 caractères' };
+        if (!/^[a-zA-Z0-9_-]+$/.test(name)) return { ok: false, msg: '❌ Caractères invalides (lettres, chiffres, - et _ uniquement)' };
+        return { ok: true, msg: '✅ Nom valide' };
+    }
+
+    function updateNameUI() {
+        const val = nameInput.value;
+        const len = val.length;
+        nameCharCount.textContent = `${len} / 50`;
+        nameCharCount.style.color = len > 45 ? 'var(--orange)' : 'var(--gray-300)';
+
+        const { ok, msg } = validateName(val);
+        nameValidation.textContent = msg;
+        nameValidation.className = `validation-msg ${ok ? 'success' : (msg ? 'error' : '')}`;
+        nameInput.classList.toggle('error-field', !ok && !!msg);
+    }
+
+    nameInput.addEventListener('input', updateNameUI);
+
+    osSelect.addEventListener('change', () => {
+        const val = osSelect.value;
+        if (val && val.startsWith('ami-')) {
+            osValidation.textContent = '✅ AMI valide';
+            osValidation.className = 'validation-msg success';
+        } else if (val) {
+            osValidation.textContent = '❌ AMI invalide';
+            osValidation.className = 'validation-msg error';
+        } else {
+            osValidation.textContent = '';
+            osValidation.className = 'validation-msg';
+        }
+    });
+
+    function showAlert(msg) {
+        alertText.textContent = msg;
+        alert.style.display = 'flex';
+        alert.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+    }
+
+    function hideAlert() {
+        alert.style.display = 'none';
+    }
+
+    form.addEventListener('submit', function(e) {
+        hideAlert();
+
+        const instanceName = nameInput.value.trim();
+        const instanceOs   = osSelect.value.trim();
+        const instanceSize = document.getElementById('instance_size').value;
+        const instanceEnv  = document.getElementById('instance_env').value;
+
+        const { ok, msg } = validateName(instanceName);
+        if (!ok) {
+            e.preventDefault();
+            showAlert(`Nom invalide : ${msg}`);
+            nameInput.focus();
+            return false;
+        }
+
+        if (!instanceOs || !instanceOs.startsWith('ami-')) {
+            e.preventDefault();
+            showAlert("AMI invalide. Doit commencer par 'ami-'");
+            osSelect.focus();
+            return false;
+        }
+
+        if (!instanceSize) {
+            e.preventDefault();
+            showAlert("Veuillez sélectionner une taille d'instance.");
+            document.getElementById('instance_size').focus();
+            return false;
+        }
+
+        if (!instanceEnv) {
+            e.preventDefault();
+            showAlert("Veuillez sélectionner un environnement.");
+            document.getElementById('instance_env').focus();
+            return false;
+        }
+
+        if (instanceEnv === 'prod') {
+            if (!confirm('⚠️ Vous allez créer une instance en PRODUCTION. Confirmez-vous ?')) {
+                e.preventDefault();
+                return false;
+            }
+        }
+
+        spinner.style.display = 'block';
+        btnText.textContent = 'Pipeline en cours de déclenchement...';
+        submitBtn.disabled = true;
+    });
+
+    setTimeout(() => nameInput.focus(), 400);
+
+    // Ajouter dans la section <script>
+const regionSelect = document.getElementById('aws_region');
+
+// AMIs par région pour les OS courants
+const amiByRegion = {
+    'eu-north-1': {
+        'Amazon Linux 2023': 'ami-0c94855ba95c574c8',
+        'Ubuntu 22.04': 'ami-0014ce3e52359afbd',
+        'Debian 12': 'ami-0506d6d51f0ae83d7'
+    },
+    'eu-west-3': {
+        'Amazon Linux 2023': 'ami-0302f42a44bf53a45',
+        'Ubuntu 22.04': 'ami-0a0d8bc4b47f7c0c3',
+        'Debian 12': 'ami-0cb5f6c9935e9bcfd'
+    },
+    'eu-west-1': {
+        'Amazon Linux 2023': 'ami-0d71ea30463e0ff8d',
+        'Ubuntu 22.04': 'ami-0694d931cee176e7d',
+        'Debian 12': 'ami-0dcc0ebde7b2e00db'
+    },
+    // Ajouter les autres régions...
+};
+
+regionSelect.addEventListener('change', () => {
+    const region = regionSelect.value;
+    const currentOs = osSelect.value;
+
+    if (region && amiByRegion[region]) {
+        // Mettre à jour les AMI selon la région
+        osSelect.innerHTML = '<option value="">— Choisir l\'OS —</option>';
+        for (const [os, ami] of Object.entries(amiByRegion[region])) {
+            const option = document.createElement('option');
+            option.value = ami;
+            option.textContent = os;
+            if (ami === currentOs) option.selected = true;
+            osSelect.appendChild(option);
+        }
+    }
+});
@@ -0,0 +1,76 @@
+const lbNameInput = document.getElementById('lb_name');
+const nameValidation = document.getElementById('nameValidation');
+const lbDnsPreview = document.getElementById('lbDnsPreview');
+const form = document.getElementById('elbForm');
+const submitBtn = document.getElementById('submitBtn');
+const spinner = document.getElementById('spinner');
+const btnText = document.getElementById('btnText');
+const alert = document.getElementById('alertBanner');
+const alertText = document.getElementById('alertText');
+
+lbNameInput.addEventListener('input', () => {
+    const val = lbNameInput.value;
+    if (!val) {
+        nameValidation.textContent = '';
+        nameValidation.className = 'validation-msg';
+        return;
+    }
+
+    if (!/^[a-zA-Z0-9\-]+$/.test(val)) {
+        nameValidation.textContent = '❌ Caractères invalides (lettres, chiffres, tirets uniquement)';
+        nameValidation.className = 'validation-msg error';
+        lbNameInput.classList.add('error-field');
+    } else if (val.length > 32) {
+        nameValidation.textContent = '❌ Maximum 32 caractères';
+        nameValidation.className = 'validation-msg error';
+        lbNameInput.classList.add('error-field');
+    } else {
+        nameValidation.textContent = '✅ Nom valide';
+        nameValidation.className = 'validation-msg success';
+        lbNameInput.classList.remove('error-field');
+    }
+
+    updateDnsPreview();
+});
+
+function updateDnsPreview() {
+    const name = lbNameInput.value || 'lb-prod-web';
+    const random = Math.floor(Math.random() * 9999999999);
+    lbDnsPreview.textContent = `${name}-${random}.us-east-1.elb.amazonaws.com`;
+}
+
+function showAlert(msg) {
+    alertText.textContent = msg;
+    alert.style.display = 'flex';
+    alert.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+}
+
+function hideAlert() {
+    alert.style.display = 'none';
+}
+
+form.addEventListener('submit', function(e) {
+    hideAlert();
+
+    const lbName = lbNameInput.value.trim();
+    const subnets = document.querySelectorAll('input[name="subnets[]"]:checked');
+
+    if (!/^[a-zA-Z0-9\-]+$/.test(lbName)) {
+        e.preventDefault();
+        showAlert('Nom du Load Balancer invalide');
+        lbNameInput.focus();
+        return false;
+    }
+
+    if (subnets.length < 2) {
+        e.preventDefault();
+        showAlert('Veuillez sélectionner au moins 2 subnets dans des AZ différentes');
+        return false;
+    }
+
+    spinner.style.display = 'block';
+    btnText.textContent = 'Pipeline en cours...';
+    submitBtn.disabled = true;
+});
+
+updateDnsPreview();
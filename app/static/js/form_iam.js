@@ -0,0 +1,78 @@
+const policyEditor = document.getElementById('inline_policy');
+const jsonValidation = document.getElementById('jsonValidation');
+
+const templates = {
+    s3read: {
+        "Version": "2012-10-17",
+        "Statement": [{
+            "Effect": "Allow",
+            "Action": ["s3:GetObject", "s3:ListBucket"],
+            "Resource": [
+                "arn:aws:s3:::my-bucket",
+                "arn:aws:s3:::my-bucket/*"
+            ]
+        }]
+    },
+    ec2start: {
+        "Version": "2012-10-17",
+        "Statement": [{
+            "Effect": "Allow",
+            "Action": ["ec2:StartInstances", "ec2:StopInstances"],
+            "Resource": "arn:aws:ec2:*:*:instance/*"
+        }]
+    },
+    lambda: {
+        "Version": "2012-10-17",
+        "Statement": [{
+            "Effect": "Allow",
+            "Action": "lambda:InvokeFunction",
+            "Resource": "arn:aws:lambda:*:*:function:*"
+        }]
+    }
+};
+
+function loadTemplate(type) {
+    policyEditor.value = JSON.stringify(templates[type], null, 2);
+    validateJSON();
+}
+
+function validateJSON() {
+    const value = policyEditor.value.trim();
+    if (!value) {
+        jsonValidation.innerHTML = '';
+        return;
+    }
+
+    try {
+        JSON.parse(value);
+        jsonValidation.innerHTML = '<span class="validation-badge valid">✓ JSON valide</span>';
+    } catch (e) {
+        jsonValidation.innerHTML = `<span class="validation-badge invalid">✗ Erreur: ${e.message}</span>`;
+    }
+}
+
+policyEditor.addEventListener('input', validateJSON);
+
+document.getElementById('iamForm').addEventListener('submit', function(e) {
+    const resourceType = document.querySelector('input[name="resource_type"]:checked').value;
+    const resourceName = document.getElementById('resource_name').value;
+    const inlinePolicy = policyEditor.value.trim();
+
+    if (inlinePolicy) {
+        try {
+            JSON.parse(inlinePolicy);
+        } catch (err) {
+            e.preventDefault();
+            alert('❌ La politique JSON est invalide. Veuillez la corriger.');
+            return false;
+        }
+    }
+
+    const managedPolicies = document.querySelectorAll('input[name="managed_policies[]"]:checked');
+    if (!inlinePolicy && managedPolicies.length === 0) {
+        if (!confirm('⚠️ Aucune politique sélectionnée. Cette ressource n\'aura aucune permission. Continuer ?')) {
+            e.preventDefault();
+            return false;
+        }
+    }
+});
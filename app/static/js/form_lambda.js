@@ -0,0 +1,60 @@
+const memorySlider = document.getElementById('memory_size');
+const memoryValue = document.getElementById('memoryValue');
+const timeoutSlider = document.getElementById('timeout');
+const timeoutValue = document.getElementById('timeoutValue');
+const runtimeSelect = document.getElementById('runtime');
+const handlerInput = document.getElementById('handler');
+
+memorySlider.addEventListener('input', () => {
+    memoryValue.textContent = memorySlider.value;
+});
+
+timeoutSlider.addEventListener('input', () => {
+    timeoutValue.textContent = timeoutSlider.value;
+});
+
+runtimeSelect.addEventListener('change', () => {
+    const runtime = runtimeSelect.value;
+    if (runtime.startsWith('python')) {
+        handlerInput.value = 'lambda_function.lambda_handler';
+    } else if (runtime.startsWith('nodejs')) {
+        handlerInput.value = 'index.handler';
+    } else if (runtime.startsWith('java')) {
+        handlerInput.value = 'example.Handler::handleRequest';
+    } else if (runtime.startsWith('go')) {
+        handlerInput.value = 'main';
+    } else if (runtime.startsWith('dotnet')) {
+        handlerInput.value = 'Assembly::Namespace.ClassName::MethodName';
+    }
+});
+
+function addEnvVar() {
+    const container = document.getElementById('envVarsContainer');
+    const row = document.createElement('div');
+    row.className = 'env-var-row';
+    row.innerHTML = `
+        <input type="text" name="env_key[]" placeholder="Clé">
+        <input type="text" name="env_value[]" placeholder="Valeur">
+        <button type="button" class="btn-remove" onclick="removeEnvVar(this)">×</button>
+    `;
+    container.appendChild(row);
+}
+
+function removeEnvVar(btn) {
+    const container = document.getElementById('envVarsContainer');
+    if (container.children.length > 1) {
+        btn.parentElement.remove();
+    }
+}
+
+document.getElementById('lambdaForm').addEventListener('submit', function(e) {
+    const functionName = document.getElementById('function_name').value;
+    const environment = document.querySelector('select[name="environment"]').value;
+
+    if (environment === 'prod') {
+        if (!confirm(`⚠️ Déployer "${functionName}" en PRODUCTION ?`)) {
+            e.preventDefault();
+            return false;
+        }
+    }
+});
@@ -0,0 +1,140 @@
+const engineSelect = document.getElementById('engine');
+const versionSelect = document.getElementById('engine_version');
+const identifierInput = document.getElementById('db_identifier');
+const identifierValidation = document.getElementById('identifierValidation');
+const form = document.getElementById('rdsForm');
+const submitBtn = document.getElementById('submitBtn');
+const spinner = document.getElementById('spinner');
+const btnText = document.getElementById('btnText');
+const alert = document.getElementById('alertBanner');
+const alertText = document.getElementById('alertText');
+
+const versions = {
+    mysql: ['8.0.35', '8.0.33', '5.7.44'],
+    postgres: ['15.4', '15.3', '14.9', '13.12'],
+    mariadb: ['10.11.5', '10.6.14', '10.5.21']
+};
+
+engineSelect.addEventListener('change', () => {
+    const engine = engineSelect.value;
+    versionSelect.innerHTML = '<option value="">— Choisir la version —</option>';
+
+    if (engine && versions[engine]) {
+        versions[engine].forEach(v => {
+            const opt = document.createElement('option');
+            opt.value = v;
+            opt.textContent = v;
+            versionSelect.appendChild(opt);
+        });
+        versionSelect.disabled = false;
+    } else {
+        versionSelect.disabled = true;
+    }
+});
+
+identifierInput.addEventListener('input', () => {
+    const val = identifierInput.value;
+    if (!val) {
+        identifierValidation.textContent = '';
+        identifierValidation.className = 'validation-msg';
+        return;
+    }
+
+    if (!/^[a-z][a-z0-9\-]*$/.test(val)) {
+        identifierValidation.textContent = '❌ Doit commencer par une lettre minuscule et ne contenir que a-z, 0-9, -';
+        identifierValidation.className = 'validation-msg error';
+        identifierInput.classList.add('error-field');
+    } else if (val.length > 63) {
+        identifierValidation.textContent = '❌ Maximum 63 caractères';
+        identifierValidation.className = 'validation-msg error';
+        identifierInput.classList.add('error-field');
+    } else {
+        identifierValidation.textContent = '✅ Identifier valide';
+        identifierValidation.className = 'validation-msg success';
+        identifierInput.classList.remove('error-field');
+    }
+});
+
+function generatePassword() {
+    const chars = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!@#$%^&*';
+    let pwd = '';
+    for (let i = 0; i < 16; i++) {
+        pwd += chars.charAt(Math.floor(Math.random() * chars.length));
+    }
+    document.getElementById('password').value = pwd;
+    document.getElementById('password').type = 'text';
+    setTimeout(() => {
+        if (confirm('Mot de passe généré ! Voulez-vous le copier dans le presse-papier ?')) {
+            navigator.clipboard.writeText(pwd);
+            alert('Mot de passe copié !');
+        }
+    }, 100);
+}
+
+function showAlert(msg) {
+    alertText.textContent = msg;
+    alert.style.display = 'flex';
+    alert.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+}
+
+function hideAlert() {
+    alert.style.display = 'none';
+}
+
+form.addEventListener('submit', function(e) {
+    hideAlert();
+
+    const dbIdentifier = identifierInput.value.trim();
+    const engine = engineSelect.value;
+    const engineVersion = versionSelect.value;
+    const instanceClass = document.getElementById('instance_class').value;
+    const username = document.getElementById('username').value.trim();
+    const password = document.getElementById('password').value;
+    const environment = document.getElementById('environment').value;
+
+    if (!/^[a-z][a-z0-9\-]*$/.test(dbIdentifier)) {
+        e.preventDefault();
+        showAlert('DB Identifier invalide');
+        identifierInput.focus();
+        return false;
+    }
+
+    if (!engine || !engineVersion || !instanceClass) {
+        e.preventDefault();
+        showAlert('Veuillez remplir tous les champs obligatoires');
+        return false;
+    }
+
+    if (!username || username.length < 3) {
+        e.preventDefault();
+        showAlert('Username doit contenir au moins 3 caractères');
+        document.getElementById('username').focus();
+        return false;
+    }
+
+    if (!password || password.length < 8) {
+        e.preventDefault();
+        showAlert('Le mot de passe doit contenir au moins 8 caractères');
+        document.getElementById('password').focus();
+        return false;
+    }
+
+    if (environment === 'prod') {
+        if (!confirm('⚠️ Vous allez créer une base de données en PRODUCTION. Confirmez-vous ?')) {
+            e.preventDefault();
+            return false;
+        }
+    }
+
+    spinner.style.display = 'block';
+    btnText.textContent = 'Pipeline en cours...';
+    submitBtn.disabled = true;
+});
+
+document.querySelectorAll('.toggle-row').forEach(row => {
+    row.addEventListener('click', e => {
+        if (e.target.tagName === 'INPUT') return;
+        const cb = row.querySelector('input[type="checkbox"]');
+        if (cb) cb.checked = !cb.checked;
+    });
+});
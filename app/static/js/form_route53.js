@@ -0,0 +1,86 @@
+const zoneNameInput = document.getElementById('zone_name');
+const recordNameInput = document.getElementById('record_name');
+const recordTypeInputs = document.querySelectorAll('input[name="record_type"]');
+const recordValueInput = document.getElementById('record_value');
+const ttlSlider = document.getElementById('ttl');
+const ttlValue = document.getElementById('ttlValue');
+const recordHint = document.getElementById('recordHint');
+
+const previewDomain = document.getElementById('previewDomain');
+const previewRecordName = document.getElementById('previewRecordName');
+const previewType = document.getElementById('previewType');
+const previewValue = document.getElementById('previewValue');
+const previewTTL = document.getElementById('previewTTL');
+
+const recordHints = {
+    'A': 'Adresse IPv4 (ex: 203.0.113.1)',
+    'AAAA': 'Adresse IPv6 (ex: 2001:0db8:85a3::8a2e:0370:7334)',
+    'CNAME': 'Nom de domaine canonical (ex: example.com)',
+    'MX': 'Priorité et serveur mail (ex: 10 mail.example.com)',
+    'TXT': 'Texte entre guillemets (ex: "v=spf1 include:_spf.google.com ~all")',
+    'NS': 'Nom du serveur DNS (ex: ns1.example.com)'
+};
+
+const recordPlaceholders = {
+    'A': '203.0.113.1',
+    'AAAA': '2001:0db8:85a3::8a2e:0370:7334',
+    'CNAME': 'example.com',
+    'MX': '10 mail.example.com',
+    'TXT': '"v=spf1 include:_spf.google.com ~all"',
+    'NS': 'ns1.example.com'
+};
+
+recordTypeInputs.forEach(input => {
+    input.addEventListener('change', () => {
+        const type = input.value;
+        recordHint.textContent = recordHints[type] || '';
+        recordValueInput.placeholder = recordPlaceholders[type] || '';
+        updatePreview();
+    });
+});
+
+ttlSlider.addEventListener('input', () => {
+    ttlValue.textContent = ttlSlider.value;
+    updatePreview();
+});
+
+function updatePreview() {
+    const zoneName = zoneNameInput.value || 'example.com';
+    const recordName = recordNameInput.value;
+    const recordType = document.querySelector('input[name="record_type"]:checked').value;
+    const recordValue = recordValueInput.value || recordPlaceholders[recordType];
+    const ttl = ttlSlider.value;
+
+    const fullDomain = recordName ? `${recordName}.${zoneName}` : zoneName;
+
+    previewDomain.textContent = fullDomain;
+    previewRecordName.textContent = fullDomain + '.';
+    previewType.textContent = recordType;
+    previewValue.textContent = recordValue;
+    previewTTL.textContent = ttl;
+}
+
+zoneNameInput.addEventListener('input', updatePreview);
+recordNameInput.addEventListener('input', updatePreview);
+recordValueInput.addEventListener('input', updatePreview);
+
+document.querySelectorAll('.toggle-row').forEach(row => {
+    row.addEventListener('click', e => {
+        if (e.target.tagName === 'INPUT') return;
+        const cb = row.querySelector('input[type="checkbox"]');
+        if (cb) cb.checked = !cb.checked;
+    });
+});
+
+document.getElementById('route53Form').addEventListener('submit', function(e) {
+    const zoneName = zoneNameInput.value;
+    if (!zoneName) {
+        e.preventDefault();
+        alert('⚠️ Le nom de domaine est obligatoire');
+        return false;
+    }
+
+    document.getElementById('nsServers').style.display = 'block';
+});
+
+updatePreview();
@@ -0,0 +1,219 @@
+/* ── Bucket name validation ─────────────────────────────────── */
+    const bucketInput     = document.getElementById('bucket_name');
+    const bucketValidMsg  = document.getElementById('bucketValidation');
+    const bucketCharCount = document.getElementById('bucketCharCount');
+    const urlPreview      = document.getElementById('urlPreview');
+    const urlBucketSlot   = document.getElementById('urlBucketSlot');
+    const regionSelect    = document.getElementById('bucket_region');
+
+    function validateBucketName(name) {
+        if (!name) return { ok: false, msg: '' };
+        if (name.length < 3)  return { ok: false, msg: '❌ Minimum 3 caractères requis' };
+        if (name.length > 63) return { ok: false, msg: '❌ Maximum 63 caractères' };
+        if (!/^[a-z0-9]/.test(name)) return { ok: false, msg: '❌ Doit commencer par une lettre minuscule ou un chiffre' };
+        if (!/[a-z0-9]$/.test(name)) return { ok: false, msg: '❌ Doit finir par une lettre minuscule ou un chiffre' };
+        if (/[^a-z0-9-]/.test(name)) return { ok: false, msg: '❌ Caractères invalides (majuscules, underscores non permis)' };
+        if (/--/.test(name))          return { ok: false, msg: '❌ Deux tirets consécutifs non permis' };
+        if (/^\d+\.\d+\.\d+\.\d+$/.test(name)) return { ok: false, msg: '❌ Ne peut pas ressembler à une adresse IP' };
+        return { ok: true, msg: '✅ Nom valide' };
+    }
+
+    function updateBucketUI() {
+        const val = bucketInput.value;
+        const len = val.length;
+        bucketCharCount.textContent = `${len} / 63`;
+        bucketCharCount.style.color = len > 55 ? 'var(--amber)' : 'var(--gray-300)';
+
+        const { ok, msg } = validateBucketName(val);
+        bucketValidMsg.textContent = msg;
+        bucketValidMsg.className = `validation-msg ${ok ? 'success' : (msg ? 'error' : '')}`;
+        bucketInput.classList.toggle('error-field', !ok && !!msg);
+
+        if (val.length >= 3) {
+            urlPreview.classList.add('visible');
+            urlBucketSlot.textContent = val || '...';
+        } else {
+            urlPreview.classList.remove('visible');
+        }
+    }
+
+    bucketInput.addEventListener('input', updateBucketUI);
+    regionSelect.addEventListener('change', () => {
+        if (bucketInput.value.length >= 3) {
+            const reg = regionSelect.value;
+            const base = `https://${bucketInput.value}.s3-website.${reg}.amazonaws.com`;
+            document.getElementById('urlPreviewText').innerHTML =
+                `https://<span class="highlight" id="urlBucketSlot">${bucketInput.value}</span>.s3-website.${reg}.amazonaws.com`;
+        }
+    });
+
+    /* ── File upload UX ─────────────────────────────────────────── */
+    const fileInput         = document.getElementById('site_files');
+    const fileSelectedInfo  = document.getElementById('fileSelectedInfo');
+    const fileSelectedText  = document.getElementById('fileSelectedText');
+    const uploadZone        = document.getElementById('uploadZone');
+    const filesValidation   = document.getElementById('filesValidation');
+
+    function humanSize(bytes) {
+        if (bytes < 1024) return bytes + ' B';
+        if (bytes < 1024 * 1024) return (bytes / 1024).toFixed(1) + ' KB';
+        return (bytes / 1024 / 1024).toFixed(2) + ' MB';
+    }
+
+    fileInput.addEventListener('change', () => {
+        const files = fileInput.files;
+        if (!files.length) {
+            fileSelectedInfo.classList.remove('visible');
+            return;
+        }
+        const total = Array.from(files).reduce((s, f) => s + f.size, 0);
+        fileSelectedText.textContent =
+            `${files.length} fichier(s) sélectionné(s) · ${humanSize(total)} au total`;
+        fileSelectedInfo.classList.add('visible');
+        filesValidation.textContent = '';
+        filesValidation.className = 'validation-msg';
+
+        // Validate: check index.html present
+        const names = Array.from(files).map(f => f.name);
+        const indexDoc = document.getElementById('index_document').value || 'index.html';
+        if (!names.includes(indexDoc)) {
+            filesValidation.textContent = `⚠️ Fichier "${indexDoc}" non trouvé parmi les fichiers sélectionnés`;
+            filesValidation.className = 'validation-msg warning';
+        } else {
+            filesValidation.textContent = `✅ Document index "${indexDoc}" détecté`;
+            filesValidation.className = 'validation-msg success';
+        }
+    });
+
+    /* Drag & Drop */
+    ['dragenter','dragover'].forEach(evt =>
+        uploadZone.addEventListener(evt, e => {
+            e.preventDefault();
+            uploadZone.classList.add('drag-over');
+        })
+    );
+    ['dragleave','drop'].forEach(evt =>
+        uploadZone.addEventListener(evt, e => {
+            e.preventDefault();
+            uploadZone.classList.remove('drag-over');
+        })
+    );
+    uploadZone.addEventListener('drop', e => {
+        if (e.dataTransfer.files.length) {
+            fileInput.files = e.dataTransfer.files;
+            fileInput.dispatchEvent(new Event('change'));
+        }
+    });
+
+    /* ── Progress Steps controller ──────────────────────────────── */
+    function setActiveStep(n) {
+        document.querySelectorAll('.step-item').forEach(el => {
+            const s = parseInt(el.dataset.step);
+            el.classList.toggle('active', s === n);
+            el.classList.toggle('done', s < n);
+        });
+    }
+
+    /* Track scroll position through form sections */
+    const sections = [
+        document.querySelector('[data-step="1"]'),
+    ];
+    const fieldIds = ['bucket_name', 'block_public_acls', 'index_document', 'site_files'];
+    fieldIds.forEach((id, i) => {
+        const el = document.getElementById(id);
+        if (el) {
+            el.addEventListener('focus', () => setActiveStep(i + 1));
+        }
+    });
+
+    /* ── Form Submission ────────────────────────────────────────── */
+    const form      = document.getElementById('s3Form');
+    const submitBtn = document.getElementById('submitBtn');
+    const spinner   = document.getElementById('spinner');
+    const btnText   = document.getElementById('btnText');
+    const alert     = document.getElementById('alertBanner');
+    const alertText = document.getElementById('alertText');
+
+    function showAlert(msg) {
+        alertText.textContent = msg;
+        alert.style.display = 'flex';
+        alert.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+    }
+
+    function hideAlert() {
+        alert.style.display = 'none';
+    }
+
+    form.addEventListener('submit', function(e) {
+        hideAlert();
+
+        const bucketName    = bucketInput.value.trim();
+        const bucketEnv     = document.getElementById('bucket_env').value;
+        const indexDoc      = document.getElementById('index_document').value.trim();
+        const files         = fileInput.files;
+
+        // Validate bucket name
+        const { ok, msg } = validateBucketName(bucketName);
+        if (!ok) {
+            e.preventDefault();
+            showAlert(`Nom du bucket invalide : ${msg}`);
+            bucketInput.focus();
+            return false;
+        }
+
+        // Validate env
+        if (!bucketEnv) {
+            e.preventDefault();
+            showAlert("Veuillez sélectionner un environnement.");
+            document.getElementById('bucket_env').focus();
+            return false;
+        }
+
+        // Validate files
+        if (!files.length) {
+            e.preventDefault();
+            showAlert("Veuillez sélectionner au moins un fichier à uploader.");
+            return false;
+        }
+
+        // Validate index document presence
+        const fileNames = Array.from(files).map(f => f.name);
+        if (!fileNames.includes(indexDoc)) {
+            e.preventDefault();
+            showAlert(`Le fichier index "${indexDoc}" n'est pas présent parmi les fichiers sélectionnés.`);
+            return false;
+        }
+
+        // Prod confirmation
+        if (bucketEnv === 'prod') {
+            if (!confirm('⚠️ Vous allez déployer un bucket S3 en PRODUCTION avec accès public. Confirmez-vous ?')) {
+                e.preventDefault();
+                return false;
+            }
+        }
+
+        // Proceed
+        setActiveStep(4);
+        spinner.style.display = 'block';
+        btnText.textContent = 'Pipeline en cours de déclenchement...';
+        submitBtn.disabled = true;
+    });
+
+    /* ── Toggle rows: prevent double-click form submit ──────────── */
+    document.querySelectorAll('.toggle-row').forEach(row => {
+    row.addEventListener('click', function(e) {
+        // Ne pas traiter si on clique directement sur l'input
+        if (e.target.type === 'checkbox') return;
+
+        // Trouver le checkbox dans cette row
+        const cb = this.querySelector('input[type="checkbox"]');
+        if (cb) {
+            cb.checked = !cb.checked;
+            // Déclencher l'événement change pour mettre à jour les calculs
+            cb.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+    });
+});
+
+    /* ── Auto-focus first field on load ──────────────────────────── */
+    setTimeout(() => bucketInput.focus(), 400);
@@ -0,0 +1,142 @@
+(function() {
+    'use strict';
+
+    const form = document.getElementById('secretForm');
+    const alertBanner = document.getElementById('alertBanner');
+    const alertText = document.getElementById('alertText');
+    const secretName = document.getElementById('secret_name');
+    const nameCharCount = document.getElementById('nameCharCount');
+    const nameValidation = document.getElementById('nameValidation');
+    const secretType = document.getElementById('secret_type');
+    const databaseFields = document.getElementById('databaseFields');
+    const otherField = document.getElementById('otherField');
+    const enableRotation = document.getElementById('enable_rotation');
+    const rotationFields = document.getElementById('rotationFields');
+    const enableReplication = document.getElementById('enable_replication');
+    const replicationField = document.getElementById('replicationField');
+    const submitBtn = document.getElementById('submitBtn');
+    const spinner = document.getElementById('spinner');
+    const btnText = document.getElementById('btnText');
+
+    // Validation du nom
+    function validateSecretName(name) {
+        if (!name) return { ok: false, msg: '' };
+        if (!name.startsWith('/')) return { ok: false, msg: '❌ Doit commencer par /' };
+        if (name.length < 2 || name.length > 64) return { ok: false, msg: '❌ Entre 2 et 64 caractères' };
+        if (!/^\/[a-zA-Z0-9\/_-]+$/.test(name)) return { ok: false, msg: '❌ Lettres, chiffres, /, - et _ uniquement' };
+        return { ok: true, msg: '✅ Nom valide' };
+    }
+
+    secretName.addEventListener('input', function() {
+        const val = this.value;
+        const len = val.length;
+        nameCharCount.textContent = len + ' / 64';
+        nameCharCount.style.color = len > 58 ? 'var(--red)' : 'var(--gray-300)';
+
+        const { ok, msg } = validateSecretName(val);
+        nameValidation.textContent = msg;
+        nameValidation.className = 'validation-msg ' + (ok ? 'success' : (msg ? 'error' : ''));
+    });
+
+    // Type de secret
+    secretType.addEventListener('change', function() {
+        const val = this.value;
+        databaseFields.style.display = (val === 'database') ? 'block' : 'none';
+        otherField.style.display = (val === 'api_key' || val === 'certificate' || val === 'other') ? 'block' : 'none';
+    });
+
+    // Toggle rotation
+    enableRotation.addEventListener('change', function() {
+        rotationFields.style.display = this.checked ? 'block' : 'none';
+    });
+
+    // Toggle réplication
+    enableReplication.addEventListener('change', function() {
+        replicationField.style.display = this.checked ? 'block' : 'none';
+    });
+
+    // Toggle rows cliquables
+    document.querySelectorAll('.toggle-row').forEach(row => {
+        row.addEventListener('click', function(e) {
+            if (e.target.type === 'checkbox') return;
+            const cb = this.querySelector('input[type="checkbox"]');
+            if (cb) {
+                cb.checked = !cb.checked;
+                cb.dispatchEvent(new Event('change'));
+            }
+        });
+    });
+
+    function showAlert(msg) {
+        alertText.textContent = msg;
+        alertBanner.style.display = 'flex';
+        alertBanner.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+    }
+
+    function hideAlert() {
+        alertBanner.style.display = 'none';
+    }
+
+    form.addEventListener('submit', function(e) {
+        hideAlert();
+
+        const name = secretName.value.trim();
+        const env = document.getElementById('environment').value;
+        const type = secretType.value;
+
+        const { ok, msg } = validateSecretName(name);
+        if (!ok) {
+            e.preventDefault();
+            showAlert('Nom invalide : ' + msg);
+            secretName.focus();
+            return false;
+        }
+
+        if (!env) {
+            e.preventDefault();
+            showAlert('Veuillez sélectionner un environnement');
+            document.getElementById('environment').focus();
+            return false;
+        }
+
+        if (!type) {
+            e.preventDefault();
+            showAlert('Veuillez sélectionner un type de secret');
+            secretType.focus();
+            return false;
+        }
+
+        // Validation selon type
+        if (type === 'database') {
+            const user = document.getElementById('db_username').value.trim();
+            const pass = document.getElementById('db_password').value.trim();
+            if (!user || !pass) {
+                e.preventDefault();
+                showAlert('Username et password DB sont obligatoires');
+                return false;
+            }
+        } else if (type !== 'database') {
+            const val = document.getElementById('secret_value').value.trim();
+            if (!val) {
+                e.preventDefault();
+                showAlert('La valeur du secret est obligatoire');
+                document.getElementById('secret_value').focus();
+                return false;
+            }
+        }
+
+        // Confirmation prod
+        if (env === 'prod') {
+            if (!confirm('⚠️ Vous créez un secret en PRODUCTION. Confirmez-vous ?')) {
+                e.preventDefault();
+                return false;
+            }
+        }
+
+        spinner.style.display = 'block';
+        btnText.textContent = 'Création en cours...';
+        submitBtn.disabled = true;
+    });
+
+    setTimeout(() => secretName.focus(), 400);
+})();
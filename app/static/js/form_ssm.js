@@ -0,0 +1,131 @@
+const form = document.getElementById('ssmForm');
+const submitBtn = document.getElementById('submitBtn');
+const spinner = document.getElementById('spinner');
+const btnText = document.getElementById('btnText');
+const alert = document.getElementById('alertBanner');
+const alertText = document.getElementById('alertText');
+
+function showAlert(msg) {
+    alertText.textContent = msg;
+    alert.style.display = 'flex';
+    alert.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+}
+
+function hideAlert() {
+    alert.style.display = 'none';
+}
+
+// Gestion des paramètres
+function addParam() {
+    const container = document.getElementById('parametersList');
+    const row = document.createElement('div');
+    row.className = 'param-row';
+    row.innerHTML = `
+        <input type="text" placeholder="Nom" class="param-name">
+        <div class="select-wrapper">
+            <select class="param-type">
+                <option value="String">String</option>
+                <option value="SecureString">SecureString 🔒</option>
+                <option value="StringList">StringList</option>
+            </select>
+        </div>
+        <input type="text" placeholder="Valeur" class="param-value">
+        <button type="button" class="btn-icon" onclick="removeParam(this)">×</button>
+    `;
+    container.appendChild(row);
+}
+
+function removeParam(btn) {
+    btn.parentElement.remove();
+}
+
+// Toggles
+document.getElementById('use_kms').addEventListener('change', function() {
+    document.getElementById('kmsField').style.display = this.checked ? 'block' : 'none';
+});
+
+document.getElementById('enable_session_manager').addEventListener('change', function() {
+    document.getElementById('sessionManagerField').style.display = this.checked ? 'block' : 'none';
+});
+
+document.getElementById('session_logging').addEventListener('change', function() {
+    const value = this.value;
+    document.getElementById('s3LoggingField').style.display = 
+        (value === 's3' || value === 'both') ? 'block' : 'none';
+});
+
+document.getElementById('enable_notifications').addEventListener('change', function() {
+    document.getElementById('notificationsField').style.display = this.checked ? 'block' : 'none';
+});
+
+// Soumission
+form.addEventListener('submit', function(e) {
+    hideAlert();
+
+    const environment = document.getElementById('environment').value;
+    const namespace = document.getElementById('namespace').value.trim();
+
+    if (!environment || !namespace) {
+        e.preventDefault();
+        showAlert("⚠️ Environnement et namespace obligatoires");
+        return false;
+    }
+
+    // Valider le namespace
+    if (!namespace.startsWith('/')) {
+        e.preventDefault();
+        showAlert("⚠️ Le namespace doit commencer par /");
+        return false;
+    }
+
+    // Collecter les paramètres
+    const params = [];
+    document.querySelectorAll('#parametersList .param-row').forEach(row => {
+        const name = row.querySelector('.param-name').value.trim();
+        const type = row.querySelector('.param-type').value;
+        const value = row.querySelector('.param-value').value.trim();
+
+        if (name && value) {
+            params.push({ name, type, value });
+        }
+    });
+
+    if (params.length === 0) {
+        e.preventDefault();
+        showAlert("⚠️ Ajoutez au moins un paramètre");
+        return false;
+    }
+
+    // Ajouter les paramètres au form
+    const hiddenInput = document.createElement('input');
+    hiddenInput.type = 'hidden';
+    hiddenInput.name = 'parameters';
+    hiddenInput.value = JSON.stringify(params);
+    form.appendChild(hiddenInput);
+
+    // Confirmation pour production
+    if (environment === 'prod') {
+        if (!confirm('⚠️ Vous allez créer des paramètres en PRODUCTION. Confirmez-vous ?')) {
+            e.preventDefault();
+            return false;
+        }
+    }
+
+    spinner.style.display = 'block';
+    btnText.textContent = 'Création en cours...';
+    submitBtn.disabled = true;
+});
+
+// Toggle rows
+document.querySelectorAll('.toggle-row').forEach(row => {
+    row.addEventListener('click', function(e) {
+        if (e.target.type === 'checkbox') return;
+        const cb = this.querySelector('input[type="checkbox"]');
+        if (cb) {
+            cb.checked = !cb.checked;
+            cb.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+    });
+});
+
+setTimeout(() => document.getElementById('environment').focus(), 400);
@@ -0,0 +1,21 @@
+const form = document.getElementById('taForm');
+const submitBtn = document.getElementById('submitBtn');
+const spinner = document.getElementById('spinner');
+const btnText = document.getElementById('btnText');
+
+document.querySelectorAll('.toggle-row').forEach(row => {
+    row.addEventListener('click', function(e) {
+        if (e.target.type === 'checkbox') return;
+        const cb = this.querySelector('input[type="checkbox"]');
+        if (cb) {
+            cb.checked = !cb.checked;
+            cb.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+    });
+});
+
+form.addEventListener('submit', function(e) {
+    spinner.style.display = 'block';
+    btnText.textContent = 'Activation en cours...';
+    submitBtn.disabled = true;
+});
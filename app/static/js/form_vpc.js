@@ -0,0 +1,102 @@
+const cidrSelect = document.getElementById('cidr_block');
+const azSelect = document.getElementById('availability_zones');
+const natCheckbox = document.getElementById('enable_nat_gateway');
+const subnetGrid = document.getElementById('subnetGrid');
+const diagramSubnets = document.getElementById('diagramSubnets');
+const vpcLabel = document.getElementById('vpcLabel');
+const costValue = document.getElementById('costValue');
+
+const azNames = ['us-west-2a', 'us-west-2b', 'us-west-2c'];
+
+function calculateSubnets() {
+    const cidr = cidrSelect.value;
+    const azCount = parseInt(azSelect.value);
+
+    if (!cidr) return;
+
+    const baseCidr = cidr.split('/')[0];
+    const baseOctets = baseCidr.split('.');
+
+    const subnets = [];
+    let octetOffset = 0;
+
+    for (let i = 0; i < azCount; i++) {
+        // Public subnet
+        subnets.push({
+            type: 'Public',
+            cidr: `${baseOctets[0]}.${baseOctets[1]}.${octetOffset}.0/24`,
+            az: azNames[i],
+            isPublic: true
+        });
+        octetOffset++;
+
+        // Private subnet
+        subnets.push({
+            type: 'Private',
+            cidr: `${baseOctets[0]}.${baseOctets[1]}.${octetOffset}.0/24`,
+            az: azNames[i],
+            isPublic: false
+        });
+        octetOffset++;
+    }
+
+    return subnets;
+}
+
+function updatePreview() {
+    const subnets = calculateSubnets();
+    if (!subnets) return;
+
+    // Update subnet grid
+    subnetGrid.innerHTML = subnets.map(s => `
+        <div class="subnet-item">
+            <div class="subnet-type">${s.type}</div>
+            <div class="subnet-cidr">${s.cidr}</div>
+            <div class="subnet-az">${s.az}</div>
+        </div>
+    `).join('');
+
+    // Update diagram
+    vpcLabel.textContent = `VPC ${cidrSelect.value}`;
+    diagramSubnets.innerHTML = subnets.map(s => `
+        <div class="subnet-box ${s.isPublic ? 'public' : 'private'}">
+            <strong>${s.type}</strong><br>
+            ${s.cidr}<br>
+            <span style="font-size: 9px; opacity: 0.7;">${s.az}</span>
+        </div>
+    `).join('');
+
+    // Update cost
+    const azCount = parseInt(azSelect.value);
+    const natEnabled = natCheckbox.checked;
+    const costPerNat = 32; // $32/mois approximativement
+    const totalCost = natEnabled ? azCount * costPerNat : 0;
+    costValue.textContent = `~$${totalCost}/mois`;
+}
+
+cidrSelect.addEventListener('change', updatePreview);
+azSelect.addEventListener('change', updatePreview);
+natCheckbox.addEventListener('change', updatePreview);
+
+document.querySelectorAll('.toggle-row').forEach(row => {
+    row.addEventListener('click', e => {
+        if (e.target.tagName === 'INPUT') return;
+        const cb = row.querySelector('input[type="checkbox"]');
+        if (cb) {
+            cb.checked = !cb.checked;
+            updatePreview();
+        }
+    });
+});
+
+// Initial update
+updatePreview();
+
+document.getElementById('vpcForm').addEventListener('submit', function(e) {
+    const vpcName = document.getElementById('vpc_name').value;
+    if (!vpcName) {
+        e.preventDefault();
+        alert('⚠️ Le nom du VPC est obligatoire');
+        return false;
+    }
+});
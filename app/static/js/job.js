@@ -0,0 +1,41 @@
+(function () {
+    const statusEl = document.getElementById('job-status');
+    const errorEl = document.getElementById('job-error');
+    const waitEl = document.getElementById('job-wait');
+    const url = statusEl.dataset.statusUrl;
+    const runLink = document.getElementById('run-link');
+    let tracking = false;
+
+    function track(deploymentUrl) {
+        if (tracking || !deploymentUrl) return;
+        tracking = true;
+        trackRun(deploymentUrl, runLink);
+    }
+
+    function poll() {
+        fetch(url, { headers: { 'Accept': 'application/json' } })
+            .then(r => r.ok ? r.json() : null)
+            .then(job => {
+                if (!job) return;
+                statusEl.textContent = job.status;
+                statusEl.dataset.status = job.status;
+                waitEl.textContent = job.wait_time.toFixed(2);
+                track(job.deployment_url);
+                if (job.error) {
+                    errorEl.textContent = job.error;
+                    errorEl.hidden = false;
+                }
+                if (job.status === 'queued' || job.status === 'running') {
+                    setTimeout(poll, 1500);
+                } else if (job.status === 'retrying') {
+                    setTimeout(poll, 5000);
+                }
+            })
+            .catch(() => setTimeout(poll, 5000));
+    }
+
+    if (['queued', 'running', 'retrying'].includes(statusEl.dataset.status)) {
+        setTimeout(poll, 1000);
+    }
+    track(statusEl.dataset.deploymentUrl);
+})();
@@ -0,0 +1,49 @@
+// Flux SSE /deployments/<id>/events ; à défaut, interroge /deployments/<id>
+// au rythme indiqué par le serveur (next_poll_in)
+window.trackRun = function (url, link) {
+    const box = document.getElementById('run-status');
+    const stateEl = document.getElementById('run-state');
+    const queueEl = document.getElementById('run-queue-time');
+    const runEl = document.getElementById('run-time');
+    const seconds = v => v === null ? '—' : v.toFixed(1) + 's';
+    box.hidden = false;
+
+    function render(run) {
+        stateEl.textContent = run.conclusion ? run.status + ' · ' + run.conclusion : run.status;
+        stateEl.dataset.conclusion = run.conclusion || '';
+        queueEl.textContent = seconds(run.queue_time);
+        runEl.textContent = seconds(run.run_time);
+        if (run.html_url && link) link.href = run.html_url;
+    }
+
+    function poll() {
+        fetch(url, { headers: { 'Accept': 'application/json' } })
+            .then(r => r.ok ? r.json() : null)
+            .then(run => {
+                if (!run) return;
+                render(run);
+                if (!run.final) setTimeout(poll, Math.max(run.next_poll_in, 1) * 1000);
+            })
+            .catch(() => setTimeout(poll, 10000));
+    }
+
+    if (!window.EventSource) {
+        poll();
+        return;
+    }
+    let received = false;
+    const source = new EventSource(url + '/events');
+    source.addEventListener('status', e => {
+        const run = JSON.parse(e.data);
+        received = true;
+        render(run);
+        if (run.final) source.close();
+    });
+    source.onerror = () => {
+        // Flux refusé avant tout événement (proxy, 404) : repli sur le polling
+        if (!received) {
+            source.close();
+            poll();
+        }
+    };
+};
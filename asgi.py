@@ -0,0 +1,6 @@
+"""Point d'entrée ASGI pour la production (uvicorn, ou gunicorn avec un worker uvicorn)."""
+import os
+from app import create_app
+from app.asgi import PortalASGI
+
+app = PortalASGI(create_app(os.getenv('FLASK_ENV', 'production')))
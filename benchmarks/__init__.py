@@ -0,0 +1 @@
+"""Benchmarks et outils de mesure locaux (serveur GitHub factice, charge)."""
@@ -0,0 +1,68 @@
+"""
+Benchmark : WSGI (gthread) contre ASGI (uvicorn) sous latence GitHub injectée.
+
+Lance successivement l'application sous gunicorn avec un seul worker :
+  - wsgi : `wsgi:app`, worker gthread à --threads threads (un
+    déclenchement synchrone occupe un thread pendant tout l'appel GitHub) ;
+  - asgi : `asgi:app`, worker uvicorn (l'appel GitHub est attendu sur la
+    boucle d'événements, ASGI_THREADS threads pour le reste).
+puis envoie --requests POST /s3/trigger avec --concurrency clients
+simultanés vers le serveur GitHub factice, qui répond après --latency-ms.
+Affiche le débit, les latences vues par le client et les codes HTTP.
+
+Usage :
+    python -m benchmarks.bench_asgi --latency-ms 1000 --concurrency 200 --requests 1000
+"""
+import argparse
+import os
+import tempfile
+from collections import Counter
+
+from benchmarks.common import print_table, summarize
+from benchmarks.fake_github import start_server
+from benchmarks.load_test import drive, start_gunicorn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency-ms', type=float, default=1000.0, help="latence injectée côté GitHub")
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=16, help="threads du worker gthread")
+    parser.add_argument('--modes', default='wsgi,asgi')
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency_ms / 1000.0)
+    rows, throughput = {}, {}
+    for mode in args.modes.split(','):
+        options = argparse.Namespace(
+            workers=1, worker_class='gthread', threads=args.threads, asgi=mode == 'asgi',
+            dispatch_mode='sync', rate_limiting=False,
+            # Chaque requête est un déclenchement distinct : pas de rejeu
+            env=['IDEMPOTENCY_ENABLED=false', 'ACCESS_LOG_ENABLED=false', 'AUDIT_LOG_ENABLED=false'],
+        )
+        state_db = os.path.join(tempfile.mkdtemp(prefix='bench-asgi-'), 'state.db')
+        process, base_url = start_gunicorn(options, server.url, state_db)
+        try:
+            results, elapsed = drive(base_url, ['/s3/trigger'], args.concurrency, 0, args.requests)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+        label = f"{mode} ({args.threads} threads)" if mode == 'wsgi' else mode
+        rows[label] = summarize([latency for _, _, latency in results])
+        codes = Counter(str(status) for _, status, _ in results)
+        throughput[label] = (len(results) / elapsed, dict(codes))
+
+    print_table(
+        f"1 worker, {args.concurrency} clients, {args.requests} POST /s3/trigger, "
+        f"GitHub à {args.latency_ms:.0f} ms",
+        rows,
+    )
+    print()
+    for label, (rps, codes) in throughput.items():
+        print(f"{label:<28}{rps:>8.1f} req/s   {codes}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
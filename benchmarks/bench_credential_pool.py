@@ -0,0 +1,91 @@
+"""
+Benchmark : débit de déclenchement avec 1 jeton vs un pool de N jetons.
+
+Le serveur GitHub factice applique un quota distinct par jeton
+(--per-token). On envoie la même rafale de dispatches avec un seul PAT
+puis avec le pool, et on compte ceux acceptés avant épuisement des quotas.
+
+Usage :
+    python -m benchmarks.bench_credential_pool --requests 400 --tokens 4 --rate-limit 100
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from app.services.credential_pool import get_credential_pool
+from app.services.github_service import GitHubService
+from app.services.rate_limit_service import RateLimitExceeded
+from benchmarks.bench_github_session import PAYLOAD
+from benchmarks.common import print_table, summarize, timed
+from benchmarks.fake_github import start_server
+
+
+def run(server_url, tokens, count, concurrency):
+    """Rafale de `count` dispatches ; retourne (acceptés, refusés, latences, stats du pool)."""
+    app = create_app('testing')
+    app.config.update(
+        GITHUB_API_URL=server_url,
+        GITHUB_TOKEN=tokens[0],
+        GITHUB_TOKENS=','.join(tokens[1:]),
+        GITHUB_POOL_SIZE=max(concurrency, app.config['GITHUB_POOL_SIZE']),
+        STATE_DB=os.path.join(tempfile.mkdtemp(), 'state.db'),
+        RATE_LIMIT_RATE=1000.0,
+        RATE_LIMIT_BURST=1000,
+        RATE_LIMIT_RESERVE=0,
+        RATE_LIMIT_MAX_WAIT=0.5,
+    )
+
+    def one(_):
+        with app.app_context():
+            try:
+                response, elapsed = timed(GitHubService.trigger_workflow, "ec2", PAYLOAD)
+            except RateLimitExceeded:
+                return False, None
+        return response.status_code == 204, elapsed
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(count)))
+    with app.app_context():
+        stats = get_credential_pool().stats()
+        GitHubService.close_session()
+    accepted = [elapsed for ok, elapsed in results if ok]
+    return len(accepted), count - len(accepted), accepted, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--tokens', type=int, default=4)
+    parser.add_argument('--rate-limit', type=int, default=100, help="Quota par jeton et par fenêtre")
+    parser.add_argument('--latency-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    tokens = [f"bench-token-{i}" for i in range(args.tokens)]
+    rows, report = {}, []
+    for label, subset in (("1 jeton", tokens[:1]), (f"pool de {args.tokens} jetons", tokens)):
+        # Serveur neuf à chaque scénario : quotas pleins
+        server = start_server(latency=args.latency_ms / 1000.0, rate_limit=args.rate_limit,
+                              window=3600, per_token=True)
+        try:
+            started = time.perf_counter()
+            accepted, refused, samples, stats = run(server.url, subset, args.requests, args.concurrency)
+            elapsed = time.perf_counter() - started
+        finally:
+            server.shutdown()
+        if samples:
+            rows[label] = summarize(samples)
+        report.append((label, accepted, refused, elapsed, stats))
+
+    print_table(f"Dispatches acceptés ({args.requests} envoyés, quota {args.rate_limit}/jeton)", rows)
+    for label, accepted, refused, elapsed, stats in report:
+        print(f"\n{label}: {accepted} acceptés, {refused} refusés en {elapsed:.2f}s")
+        for name, usage in stats['credentials'].items():
+            print(f"  {name}: {usage['requests']} requêtes, restant {usage['remaining']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark : lecture + validation + construction du payload par formulaire.
+
+Mesure, pour chaque service, le temps de schema.build() sur un formulaire
+valide (benchmarks.sample_forms) et sur un formulaire vide (toutes les
+erreurs remontées), avec un ImmutableMultiDict comme request.form.
+
+Usage :
+    python -m benchmarks.bench_form_schema --iterations 20000
+"""
+import argparse
+import time
+
+from werkzeug.datastructures import ImmutableMultiDict
+
+from app import create_app
+from app.services.form_schema import get_schema
+from app.services.validation_service import ValidationError
+from benchmarks.common import summarize
+from benchmarks.sample_forms import SAMPLE_FORMS, sample_form, service_slug
+
+
+def measure(build, form, iterations, repeats):
+    """Durée moyenne d'un appel (secondes) pour chaque répétition."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            try:
+                build(form)
+            except ValidationError:
+                pass
+        samples.append((time.perf_counter() - start) / iterations)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    totals = {'valide': 0.0, 'vide': 0.0}
+    print(f"{'service':<20}{'champs':>8}{'valide (µs)':>14}{'vide (µs)':>12}")
+    with app.app_context():
+        for path in sorted(SAMPLE_FORMS):
+            slug = service_slug(path)
+            schema = get_schema(slug)
+            valid = ImmutableMultiDict(sample_form(path, 1))
+            schema.build(valid)  # le formulaire d'exemple doit être valide
+            row = {}
+            for label, form in (('valide', valid), ('vide', ImmutableMultiDict())):
+                # p50 des répétitions : robuste aux pauses du GC
+                row[label] = summarize(measure(schema.build, form, args.iterations, args.repeats))['p50'] * 1000
+                totals[label] += row[label]
+            print(f"{slug:<20}{len(schema.field_names):>8}{row['valide']:>14.2f}{row['vide']:>12.2f}")
+    print(f"{'total':<20}{'':>8}{totals['valide']:>14.2f}{totals['vide']:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark : requests.post par dispatch vs session GitHub poolée.
+
+Lance le serveur GitHub factice en local puis mesure la latence de
+GitHubService.trigger_workflow face à l'ancien appel `requests.post`
+(nouvelle connexion TCP/TLS à chaque déclenchement), en séquentiel
+et en concurrent.
+
+Usage :
+    python -m benchmarks.bench_github_session --requests 2000 --concurrency 16
+    # HTTPS (handshake TLS inclus) avec un certificat local :
+    REQUESTS_CA_BUNDLE=cert.pem python -m benchmarks.bench_github_session \\
+        --certfile cert.pem --keyfile key.pem
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from app import create_app
+from app.services.github_service import GitHubService
+from benchmarks.common import print_table, summarize, timed
+from benchmarks.fake_github import start_server
+
+PAYLOAD = {
+    "ref": "main",
+    "inputs": {
+        "instance_name": "bench-instance",
+        "instance_os": "ami-0123456789abcdef0",
+        "instance_size": "t3.micro",
+        "instance_env": "dev",
+    },
+}
+
+
+def legacy_trigger(app, workflow_name, payload):
+    """Reproduit l'ancien GitHubService.trigger_workflow (requests.post direct)."""
+    workflow_file = app.config['WORKFLOWS'][workflow_name]
+    url = (
+        f"{app.config['GITHUB_API_URL']}/repos/"
+        f"{app.config['GITHUB_REPO_OWNER']}/{app.config['GITHUB_REPO_NAME']}/"
+        f"actions/workflows/{workflow_file}/dispatches"
+    )
+    headers = {
+        'Accept': 'application/vnd.github.v3+json',
+        'Authorization': f"token {app.config['GITHUB_TOKEN']}",
+    }
+    return requests.post(url, headers=headers, json=payload, timeout=10)
+
+
+def pooled_trigger(app, workflow_name, payload):
+    """Appel via la session poolée du processus."""
+    with app.app_context():
+        return GitHubService.trigger_workflow(workflow_name, payload)
+
+
+def run_sequential(func, app, count):
+    samples = []
+    for _ in range(count):
+        response, elapsed = timed(func, app, "ec2", PAYLOAD)
+        assert response.status_code == 204, response.status_code
+        samples.append(elapsed)
+    return samples
+
+
+def run_concurrent(func, app, count, concurrency):
+    def one(_):
+        response, elapsed = timed(func, app, "ec2", PAYLOAD)
+        assert response.status_code == 204, response.status_code
+        return elapsed
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, range(count)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help="Latence simulée côté serveur")
+    parser.add_argument('--certfile')
+    parser.add_argument('--keyfile')
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency_ms / 1000.0,
+                          certfile=args.certfile, keyfile=args.keyfile)
+    app = create_app('testing')
+    app.config.update(
+        GITHUB_API_URL=server.url,
+        GITHUB_TOKEN='bench-token',
+        GITHUB_POOL_SIZE=max(args.concurrency, app.config['GITHUB_POOL_SIZE']),
+    )
+
+    try:
+        # Échauffement (ouverture du pool, imports paresseux)
+        run_sequential(pooled_trigger, app, 10)
+        run_sequential(legacy_trigger, app, 10)
+
+        print_table(f"Séquentiel ({args.requests} dispatches)", {
+            'requests.post (legacy)': summarize(run_sequential(legacy_trigger, app, args.requests)),
+            'session poolée': summarize(run_sequential(pooled_trigger, app, args.requests)),
+        })
+        print_table(f"Concurrent ({args.requests} dispatches, {args.concurrency} threads)", {
+            'requests.post (legacy)': summarize(
+                run_concurrent(legacy_trigger, app, args.requests, args.concurrency)),
+            'session poolée': summarize(
+                run_concurrent(pooled_trigger, app, args.requests, args.concurrency)),
+        })
+    finally:
+        with app.app_context():
+            GitHubService.close_session()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark : historique des déploiements à --rows lignes (SQLite).
+
+Remplit une base d'historique temporaire (insertion en masse, hors mesure)
+puis mesure :
+  - l'écriture d'un déclenchement : record() (ligne de la requête) et
+    complete() (issue définitive de l'outbox), une transaction chacune ;
+  - la lecture d'une page de --limit lignes, sans filtre, par service et
+    par service + environnement : première page, --pages pages en suivant
+    le curseur (pagination par clé), page au milieu de l'historique ;
+  - à titre de comparaison, la page du milieu lue avec OFFSET.
+
+Usage :
+    python -m benchmarks.bench_history --rows 1000000 --limit 50
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from app import create_app
+from app.services.history import encode_cursor, get_history
+from benchmarks.common import print_table, summarize, timed
+
+ENVIRONMENTS = ('dev', 'staging', 'prod')
+
+
+def fill(history, services, rows, batch=50_000):
+    """Insère `rows` lignes étalées sur un an, par transactions de `batch` lignes."""
+    conn = history._conn()
+    started = time.time() - 365 * 24 * 3600
+    step = 365 * 24 * 3600 / rows
+    random.seed(1)
+    for offset in range(0, rows, batch):
+        values = []
+        for i in range(offset, min(offset + batch, rows)):
+            service, environment = random.choice(services), random.choice(ENVIRONMENTS)
+            name = f"{service}-{environment}-{i}"
+            values.append((
+                uuid.uuid4().hex, service, environment, name, f"terraform-{service}.yml",
+                json.dumps({"name": name, "env": environment}), 'dispatched', 200, 204, 1,
+                started + i * step, 120.0, started + i * step + 0.12,
+            ))
+        conn.execute('BEGIN')
+        conn.executemany(
+            'INSERT INTO deployment_history (dispatch_id, service, environment, resource, workflow, inputs, '
+            'outcome, status, github_status, attempts, created_at, duration_ms, finished_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            values,
+        )
+        conn.execute('COMMIT')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--limit', type=int, default=50, help="taille de page")
+    parser.add_argument('--writes', type=int, default=2000, help="déclenchements écrits (record + complete)")
+    parser.add_argument('--pages', type=int, default=200, help="pages suivies par curseur")
+    parser.add_argument('--reads', type=int, default=200, help="lectures de la première page")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix='bench-history-')
+    app = create_app('testing')
+    app.config.update(HISTORY_ENABLED=True, HISTORY_DB=os.path.join(folder, 'history.db'),
+                      HISTORY_MAX_PAGE_SIZE=max(args.limit, 500))
+    services = sorted(app.config['WORKFLOWS'])
+
+    with app.app_context():
+        history = get_history()
+        _, elapsed = timed(fill, history, services, args.rows)
+        print(f"{args.rows} lignes insérées en {elapsed:.1f} s ({args.rows / elapsed:,.0f} lignes/s), "
+              f"{os.path.getsize(history.db_path) / 1e6:.0f} Mo")
+
+        records, completions = [], []
+        for i in range(args.writes):
+            item = {
+                'id': uuid.uuid4().hex, 'workflow_name': 's3', 'created_at': time.time(),
+                'payload': {'ref': 'main', 'inputs': {'bucket_name': f"bench-{i}", 'bucket_env': 'dev'}},
+            }
+            _, duration = timed(history.complete, item, 'dispatched', 204, None, 1)
+            completions.append(duration)
+            _, duration = timed(history.record, 's3', item['payload'], 'dispatched', dispatch_id=item['id'],
+                                status=200, github_status=204, user='bench', duration_ms=12.0)
+            records.append(duration)
+        print_table(f"Écriture d'un déclenchement à {args.rows} lignes", {
+            'complete() (insertion)': summarize(completions),
+            'record() (mise à jour)': summarize(records),
+        })
+
+        rows = {}
+        conn = history._conn()
+        for label, filters in (
+            ('tout', {}),
+            ('service', {'service': 'ec2'}),
+            ('service+env', {'service': 'ec2', 'environment': 'prod'}),
+        ):
+            first = [timed(history.page, limit=args.limit, **filters)[1] for _ in range(args.reads)]
+            rows[f"{label} : page 1"] = summarize(first)
+
+            deep, cursor = [], None
+            for _ in range(args.pages):
+                (entries, cursor), duration = timed(history.page, limit=args.limit, cursor=cursor, **filters)
+                deep.append(duration)
+                if cursor is None:
+                    break
+            rows[f"{label} : curseur"] = summarize(deep)
+
+            # Milieu de l'historique filtré : curseur contre OFFSET
+            where = ' AND '.join(f"{column} = ?" for column in filters)
+            where = f"WHERE {where} " if where else ''
+            middle = conn.execute(f"SELECT COUNT(*) FROM deployment_history {where}",
+                                  tuple(filters.values())).fetchone()[0] // 2
+            sql = (f"SELECT * FROM deployment_history {where}"
+                   "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?")
+            position = conn.execute(sql, (*filters.values(), 1, middle)).fetchone()
+            cursor = encode_cursor(position['created_at'], position['id'])
+            rows[f"{label} : milieu curseur"] = summarize([
+                timed(history.page, limit=args.limit, cursor=cursor, **filters)[1] for _ in range(20)
+            ])
+            rows[f"{label} : milieu OFFSET"] = summarize([
+                timed(lambda: conn.execute(sql, (*filters.values(), args.limit, middle)).fetchall())[1]
+                for _ in range(20)
+            ])
+        print_table(f"Lecture d'une page de {args.limit} lignes à {args.rows} lignes", rows)
+
+
+if __name__ == '__main__':
+    main()
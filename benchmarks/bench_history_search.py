@@ -0,0 +1,145 @@
+"""
+Benchmark : recherche plein texte dans l'historique à --rows déploiements.
+
+Remplit une base d'historique temporaire avec des inputs réalistes (nom de
+ressource, propriétaire, centre de coût, tags, description de pipeline),
+l'index FTS5 étant alimenté par le trigger à chaque insertion, puis mesure :
+  - le remplissage avec et sans index (--rows / 10 lignes), pour le coût du
+    trigger à l'écriture ;
+  - complete() d'un déclenchement, une transaction (index compris) ;
+  - la première page de --limit résultats pour des recherches rares ou
+    fréquentes : mot exact, préfixe, champ ciblé, combinaisons, filtre
+    service + environnement ;
+  - --pages pages en suivant le curseur d'une recherche fréquente.
+
+Usage :
+    python -m benchmarks.bench_history_search --rows 1000000 --limit 50
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from app import create_app
+from app.services.history import DeploymentHistory, get_history
+from benchmarks.bench_history import ENVIRONMENTS
+from benchmarks.common import print_table, summarize, timed
+
+OWNERS = [f"owner{n:04d}" for n in range(2000)]
+TEAMS = ('data', 'payments', 'platform', 'mobile', 'network', 'billing', 'security', 'crm')
+WORDS = ('pipeline', 'déploiement', 'actifs', 'facturation', 'clients', 'orange', 'money', 'portail',
+         'migration', 'nocturne', 'réplication', 'sauvegarde', 'analytics', 'temps', 'réel', 'api')
+
+
+def row(services, i, created_at):
+    service, environment = random.choice(services), random.choice(ENVIRONMENTS)
+    team = random.choice(TEAMS)
+    name = f"sonatel-{team}-{service}-{i}"
+    inputs = {
+        "name": name, "environment": environment, "region": "eu-west-3",
+        "owner": random.choice(OWNERS), "cost_center": f"CC-{random.randrange(500):03d}",
+        "tags": json.dumps([{"key": "Team", "value": team}, {"key": "Project", "value": f"proj{i % 5000}"}]),
+        "description": ' '.join(random.sample(WORDS, 6)), "enable_build": "true",
+    }
+    return (
+        uuid.uuid4().hex, service, environment, name, f"terraform-{service}.yml",
+        json.dumps(inputs), 'dispatched', 200, 204, 1, created_at, 120.0, created_at + 0.12,
+    )
+
+
+def fill(history, services, rows, batch=50_000):
+    """Insère `rows` lignes étalées sur un an, par transactions de `batch` lignes (trigger compris)."""
+    conn = history._conn()
+    started = time.time() - 365 * 24 * 3600
+    step = 365 * 24 * 3600 / rows
+    random.seed(1)
+    for offset in range(0, rows, batch):
+        values = [row(services, i, started + i * step) for i in range(offset, min(offset + batch, rows))]
+        conn.execute('BEGIN')
+        conn.executemany(
+            'INSERT INTO deployment_history (dispatch_id, service, environment, resource, workflow, inputs, '
+            'outcome, status, github_status, attempts, created_at, duration_ms, finished_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            values,
+        )
+        conn.execute('COMMIT')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--limit', type=int, default=50, help="taille de page")
+    parser.add_argument('--writes', type=int, default=1000, help="déclenchements écrits (complete)")
+    parser.add_argument('--reads', type=int, default=50, help="exécutions de chaque recherche")
+    parser.add_argument('--pages', type=int, default=100, help="pages suivies par curseur")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix='bench-history-search-')
+    app = create_app('testing')
+    app.config.update(HISTORY_ENABLED=True, HISTORY_SEARCH_ENABLED=True, HISTORY_BUFFER_ENABLED=False,
+                      HISTORY_DB=os.path.join(folder, 'history.db'), HISTORY_MAX_PAGE_SIZE=max(args.limit, 500))
+    services = sorted(app.config['WORKFLOWS'])
+
+    sample = max(args.rows // 10, 1)
+    for label, search in (('sans index', False), ('avec index', True)):
+        store = DeploymentHistory(os.path.join(folder, f"fill-{search}.db"), 50, 500, search=search)
+        _, elapsed = timed(fill, store, services, sample)
+        print(f"Remplissage {label:<11}: {sample / elapsed:>9,.0f} lignes/s")
+
+    with app.app_context():
+        history = get_history()
+        _, elapsed = timed(fill, history, services, args.rows)
+        print(f"{args.rows} lignes indexées en {elapsed:.1f} s ({args.rows / elapsed:,.0f} lignes/s), "
+              f"{os.path.getsize(history.db_path) / 1e6:.0f} Mo")
+
+        completions = []
+        for i in range(args.writes):
+            item = {
+                'id': uuid.uuid4().hex, 'workflow_name': 'codepipeline', 'created_at': time.time(),
+                'payload': {'ref': 'main', 'inputs': {
+                    'pipeline_name': f"bench-{i}", 'environment': 'dev', 'owner': 'bench', 'cost_center': 'CC-999',
+                    'tags': '[{"key": "Team", "value": "bench"}]', 'description': 'pipeline du benchmark',
+                }},
+            }
+            completions.append(timed(history.complete, item, 'dispatched', 204, None, 1)[1])
+        print_table(f"Écriture d'un déclenchement à {args.rows} lignes", {
+            'complete() (insertion + index)': summarize(completions),
+        })
+
+        middle = history._conn().execute('SELECT resource FROM deployment_history WHERE id = ?',
+                                         (args.rows // 2,)).fetchone()['resource']
+        rows = {}
+        searches = (
+            ('ressource exacte', middle, {}),
+            ('mot rare', 'proj4242', {}),
+            ('préfixe rare', 'proj424*', {}),
+            ('owner:', 'owner:owner0042', {}),
+            ('cost_center:', 'cost_center:CC-042', {}),
+            ('tags:', 'tags:payments', {}),
+            ('description: fréquent', 'description:clients', {}),
+            ('préfixe court', 'mi*', {}),
+            ('2 champs', 'tags:billing owner:owner0007', {}),
+            ('fréquent + service/env', 'sonatel-data', {'service': 'rds', 'environment': 'prod'}),
+            ('rare + service/env', 'owner:owner0042', {'service': 'ec2', 'environment': 'prod'}),
+            ('aucun résultat', 'introuvable', {}),
+        )
+        for label, query, filters in searches:
+            rows[f"{label} ({query})"] = summarize(
+                [timed(history.search, query, limit=args.limit, **filters)[1] for _ in range(args.reads)]
+            )
+        print_table(f"Première page de {args.limit} résultats à {args.rows} lignes", rows)
+
+        deep, cursor = [], None
+        for _ in range(args.pages):
+            (entries, cursor), duration = timed(history.search, 'tags:payments', limit=args.limit, cursor=cursor)
+            deep.append(duration)
+            if cursor is None:
+                break
+        print_table(f"{len(deep)} pages de 'tags:payments' en suivant le curseur", {'curseur': summarize(deep)})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark : pré-validation des payloads contre les variables Terraform.
+
+Mesure :
+  - la lecture de tous les modules de INFRA_MODULES (analyse HCL, compilation
+    des conditions, lecture des workflows), faite une fois au démarrage ;
+  - pour chaque service, contract.check() seul sur les inputs du formulaire
+    d'exemple (benchmarks.sample_forms), puis schema.build() avec et sans
+    contrat : le surcoût de la pré-validation par déclenchement.
+
+Usage :
+    python -m benchmarks.bench_infra_schema --iterations 20000
+"""
+import argparse
+import time
+
+from werkzeug.datastructures import ImmutableMultiDict
+
+from app import create_app
+from app.services.form_schema import get_schema
+from app.services.infra_schema import load_index
+from benchmarks.bench_form_schema import measure
+from benchmarks.common import summarize
+from benchmarks.sample_forms import SAMPLE_FORMS, sample_form, service_slug
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--loads', type=int, default=20, help="lectures complètes des modules")
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    loads = []
+    for _ in range(args.loads):
+        started = time.perf_counter()
+        index = load_index(app)
+        loads.append(time.perf_counter() - started)
+    variables = sum(len(module.variables) for module in index.modules.values())
+    validations = sum(len(variable.validations) for module in index.modules.values()
+                      for variable in module.variables.values())
+    print(f"Lecture de {len(index.modules)} modules ({variables} variables, {validations} validations) : "
+          f"p50 {summarize(loads)['p50']:.1f} ms")
+
+    totals = {'check': 0.0, 'contrat': 0.0, 'sans': 0.0}
+    print(f"\n{'service':<20}{'contrôles':>10}{'check (µs)':>12}{'build (µs)':>12}{'sans (µs)':>11}")
+    with app.app_context():
+        for path in sorted(SAMPLE_FORMS):
+            slug = service_slug(path)
+            schema = get_schema(slug)
+            contract = index.contracts.get(slug)
+            if contract is None:
+                continue
+            form = ImmutableMultiDict(sample_form(path, 1))
+            schema.contract = contract
+            payload, _ = schema.build(form)  # le formulaire d'exemple doit passer le contrat
+            inputs = payload['inputs']
+            row = {
+                # p50 des répétitions : robuste aux pauses du GC
+                'check': summarize(measure(contract.check, inputs, args.iterations, args.repeats))['p50'] * 1000,
+                'contrat': summarize(measure(schema.build, form, args.iterations, args.repeats))['p50'] * 1000,
+            }
+            schema.contract = None
+            row['sans'] = summarize(measure(schema.build, form, args.iterations, args.repeats))['p50'] * 1000
+            schema.contract = contract
+            for label, value in row.items():
+                totals[label] += value
+            print(f"{slug:<20}{len(contract._checks):>10}{row['check']:>12.2f}{row['contrat']:>12.2f}"
+                  f"{row['sans']:>11.2f}")
+    print(f"{'total':<20}{'':>10}{totals['check']:>12.2f}{totals['contrat']:>12.2f}{totals['sans']:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
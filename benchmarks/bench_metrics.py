@@ -0,0 +1,67 @@
+"""
+Benchmark : surcoût de l'instrumentation Prometheus par requête.
+
+Mesure le temps d'un GET en appelant directement l'application WSGI, avec
+METRICS_ENABLED=false puis true, sur des requêtes courtes (où le surcoût
+relatif est le plus visible) : /health, l'accueil et un formulaire servis
+par le cache de pages.
+
+Avec --multiprocess, PROMETHEUS_MULTIPROC_DIR pointe vers un dossier
+temporaire avant l'import de prometheus_client, comme sous gunicorn : les
+valeurs sont alors écrites dans des fichiers mmap.
+
+Usage :
+    python -m benchmarks.bench_metrics --iterations 2000 [--multiprocess]
+"""
+import argparse
+import os
+import tempfile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--repeats', type=int, default=15)
+    parser.add_argument('--multiprocess', action='store_true', help="valeurs en fichiers mmap (mode gunicorn)")
+    args = parser.parse_args()
+
+    if args.multiprocess:
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='prometheus-')
+    else:
+        os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+
+    # Imports après PROMETHEUS_MULTIPROC_DIR : prometheus_client le lit à l'import
+    from werkzeug.test import EnvironBuilder
+
+    from app import create_app
+    from app.config import config
+    from benchmarks.bench_page_cache import call, measure
+    from benchmarks.common import summarize
+
+    apps = {}
+    for enabled in (False, True):
+        # init_metrics() lit METRICS_ENABLED dans create_app()
+        config['testing'].METRICS_ENABLED = enabled
+        apps[enabled] = create_app('testing')
+    if not apps[True].extensions['metrics']:
+        parser.error("métriques indisponibles (prometheus-client non installé ?)")
+
+    print(f"mode : {'multiprocessus (mmap)' if args.multiprocess else 'registre en mémoire'}")
+    print(f"{'page':<12}{'sans (µs)':>11}{'avec (µs)':>11}{'surcoût (µs)':>14}{'%':>7}")
+    for path in ('/health', '/', '/ec2'):
+        environ = EnvironBuilder(path=path, headers={'Accept-Encoding': 'gzip'}).get_environ()
+        samples = {False: [], True: []}
+        for enabled in (False, True):
+            call(apps[enabled], environ)
+        # Répétitions alternées : les variations de fréquence CPU touchent les deux modes
+        for _ in range(args.repeats):
+            for enabled in (False, True):
+                samples[enabled] += measure(apps[enabled], environ, args.iterations, 1)
+        # p50 des répétitions : robuste aux pauses du GC
+        row = [summarize(samples[enabled])['p50'] * 1000 for enabled in (False, True)]
+        delta = row[1] - row[0]
+        print(f"{path:<12}{row[0]:>11.1f}{row[1]:>11.1f}{delta:>14.1f}{delta / row[0] * 100:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark : validation par lots de noms de ressources.
+
+Mesure schema.validate_names() sur des lots de taille croissante (mélange
+de noms valides, invalides, doublons et collisions avec des noms déjà
+déployés) et affiche le coût par nom, qui doit rester constant si la
+validation est linéaire.
+
+Usage :
+    python -m benchmarks.bench_name_validation --service s3 --sizes 1000 10000 100000
+"""
+import argparse
+import time
+
+from app import create_app
+from app.services.form_schema import get_schema
+from benchmarks.common import summarize
+
+
+def make_names(size):
+    """Lot de test : ~5 % de doublons, ~5 % d'invalides, ~5 % de collisions."""
+    names = []
+    for i in range(size):
+        if i % 20 == 7 and names:
+            names.append(names[i // 2])
+        elif i % 20 == 13:
+            names.append(f"Bad--Name_{i}")
+        else:
+            names.append(f"app-{i:07d}-data")
+    existing = frozenset(f"app-{i:07d}-data" for i in range(0, size, 20))
+    return names, existing
+
+
+def measure(schema, names, existing, repeats):
+    """Durée (secondes) de chaque répétition."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        schema.validate_names(names, existing)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--service', default='s3')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    with app.app_context():
+        schema = get_schema(args.service)
+        if schema is None or schema.name_field is None:
+            parser.error(f"pas de validation de noms pour '{args.service}'")
+        print(f"{'noms':>10}{'invalides':>12}{'total (ms)':>14}{'par nom (µs)':>15}")
+        for size in args.sizes:
+            names, existing = make_names(size)
+            invalid = schema.validate_names(names, existing)['invalid']
+            # p50 des répétitions : robuste aux pauses du GC
+            elapsed = summarize(measure(schema, names, existing, args.repeats))['p50']
+            print(f"{size:>10}{invalid:>12}{elapsed:>14.1f}{elapsed / size * 1000:>15.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark : service des pages HTML avec et sans cache de rendu.
+
+Pour chaque page (accueil, aide, formulaires), mesure le temps d'un GET en
+appelant directement l'application WSGI (sans le coût du client de test) :
+  - sans cache : rendu Jinja à chaque requête (PAGE_CACHE_ENABLED=false) ;
+  - cache, gzip : corps compressé servi depuis la mémoire ;
+  - 304 : requête conditionnelle If-None-Match.
+
+Usage :
+    python -m benchmarks.bench_page_cache --iterations 500
+"""
+import argparse
+import time
+
+from werkzeug.test import EnvironBuilder
+
+from app import create_app
+from benchmarks.bench_page_weight import page_paths
+from benchmarks.common import summarize
+
+
+def call(app, environ):
+    """Exécute une requête WSGI et retourne (statut, en-têtes, corps)."""
+    result = {}
+
+    def start_response(status, headers, exc_info=None):
+        result['status'], result['headers'] = status, dict(headers)
+
+    body = b''.join(app(dict(environ), start_response))
+    return result['status'], result['headers'], body
+
+
+def measure(app, environ, iterations, repeats):
+    """Durée moyenne d'une requête (secondes) pour chaque répétition."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            call(app, environ)
+        samples.append((time.perf_counter() - start) / iterations)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    uncached = create_app('testing')
+    uncached.config['PAGE_CACHE_ENABLED'] = False
+    cached = create_app('testing')
+    gzip = {'Accept-Encoding': 'gzip'}
+
+    totals = [0.0, 0.0, 0.0]
+    print(f"{'page':<20}{'sans cache (µs)':>17}{'cache gzip (µs)':>17}{'304 (µs)':>11}")
+    for path in page_paths(cached):
+        environ = EnvironBuilder(path=path, headers=gzip).get_environ()
+        etag = call(cached, environ)[1]['ETag']
+        conditional = EnvironBuilder(path=path, headers=dict(gzip, **{'If-None-Match': etag})).get_environ()
+        row = [
+            measure(uncached, environ, args.iterations, args.repeats),
+            measure(cached, environ, args.iterations, args.repeats),
+            measure(cached, conditional, args.iterations, args.repeats),
+        ]
+        # p50 des répétitions : robuste aux pauses du GC
+        row = [summarize(samples)['p50'] * 1000 for samples in row]
+        totals = [total + value for total, value in zip(totals, row)]
+        print(f"{path:<20}{row[0]:>17.1f}{row[1]:>17.1f}{row[2]:>11.1f}")
+    print(f"{'total':<20}{totals[0]:>17.1f}{totals[1]:>17.1f}{totals[2]:>11.1f}")
+    print(f"stats cache : {cached.extensions['page_cache'].stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark : octets transférés par page, avant/après le pipeline d'assets.
+
+Pour chaque page HTML (accueil, aide, formulaires), mesure via le client de
+test Flask :
+  - 1re visite : HTML + CSS/JS référencés, dans l'encodage négocié
+    (br si le paquet brotli est installé, sinon gzip) ;
+  - visite suivante : ce qui est re-téléchargé, cache navigateur chaud.
+    Les fichiers /assets sont immutables ; les fichiers /static sont
+    revalidés (304, corps vide).
+Le parcours complet visite toutes les pages avec un seul cache : un fichier
+partagé (base.css, forms.css) n'est compté qu'une fois.
+
+La référence « avant » rend les templates et fichiers statiques d'une
+révision git (--baseline) avec le même code applicatif. Le cache de pages
+(HTML compressé) est désactivé des deux côtés, sauf avec --page-cache qui
+l'active pour la mesure « après ».
+
+Usage :
+    python -m benchmarks.bench_page_weight --baseline <révision> [--page-cache]
+"""
+import argparse
+import gzip
+import io
+import os
+import re
+import subprocess
+import tarfile
+import tempfile
+
+from jinja2 import FileSystemLoader
+
+from app import create_app
+from app.services.assets import brotli, build_assets
+
+ASSET_REF_RE = re.compile(r'(?:href|src)="(/(?:static|assets)/[^"]+)"')
+
+
+def page_paths(app):
+    """Pages HTML sans paramètre : accueil, aide et formulaires de service."""
+    return ['/', '/aide'] + sorted(rule.rule for rule in app.url_map.iter_rules() if rule.endpoint.endswith('_form'))
+
+
+def measure(app, paths, encoding):
+    """
+    Returns:
+        (par page {path: (1re visite, visite suivante)}, total du parcours complet)
+    """
+    client = app.test_client()
+    headers = {'Accept-Encoding': encoding}
+    sizes = {}
+    seen = set()
+    journey = 0
+    for path in paths:
+        response = client.get(path, headers=headers)
+        html = response.get_data()
+        first, repeat = len(html), len(html)
+        journey += len(html)
+        encoding = response.headers.get('Content-Encoding')
+        if encoding == 'br':
+            html = brotli.decompress(html)
+        elif encoding == 'gzip':
+            html = gzip.decompress(html)
+        for ref in dict.fromkeys(ASSET_REF_RE.findall(html.decode())):
+            size = len(client.get(ref, headers=headers).get_data())
+            first += size
+            if ref not in seen:
+                seen.add(ref)
+                journey += size
+        sizes[path] = (first, repeat)
+    return sizes, journey
+
+
+def baseline_app(revision):
+    """Application dont les templates et app/static viennent de la révision git donnée."""
+    archive = subprocess.run(
+        ['git', 'archive', revision, 'app/templates', 'app/static'],
+        check=True, capture_output=True,
+    ).stdout
+    folder = tempfile.mkdtemp(prefix='baseline-')
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(folder)
+    app = create_app('testing')
+    app.config['PAGE_CACHE_ENABLED'] = False
+    app.jinja_loader = FileSystemLoader(os.path.join(folder, 'app', 'templates'))
+    app.static_folder = os.path.join(folder, 'app', 'static')
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', help="révision git de référence (templates à styles inline)")
+    parser.add_argument('--page-cache', action='store_true', help="HTML servi (compressé) par le cache de pages")
+    args = parser.parse_args()
+
+    encoding = 'br, gzip' if brotli is not None else 'gzip'
+    app = create_app('testing')
+    app.config['PAGE_CACHE_ENABLED'] = args.page_cache
+    app.config['ASSETS_FOLDER'] = tempfile.mkdtemp(prefix='assets-')
+    build_assets(app.static_folder, app.config['ASSETS_FOLDER'])
+    paths = page_paths(app)
+    after, after_journey = measure(app, paths, encoding)
+
+    before, before_journey = {}, None
+    if args.baseline:
+        before, before_journey = measure(baseline_app(args.baseline), paths, encoding)
+
+    print(f"Accept-Encoding: {encoding} — octets par page")
+    print(f"{'page':<20}{'avant':>10}{'1re visite':>13}{'suivante':>11}")
+    for path in paths:
+        first, repeat = after[path]
+        old = before[path][0] if path in before else 0
+        print(f"{path:<20}{old or '-':>10}{first:>13}{repeat:>11}")
+    totals = [sum(before[p][0] for p in before), sum(v[0] for v in after.values()), sum(v[1] for v in after.values())]
+    print(f"{'total':<20}{totals[0] or '-':>10}{totals[1]:>13}{totals[2]:>11}")
+    print(f"parcours complet (cache partagé) : avant {before_journey or '-'} / après {after_journey} octets")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark : latence des requêtes avec et sans journaux d'accès/audit.
+
+Trois modes, mesurés en alternance en appelant directement l'application
+WSGI :
+  - désactivés : ACCESS_LOG_ENABLED=false, AUDIT_LOG_ENABLED=false ;
+  - file : configuration normale (QueueHandler, écriture par lots dans le
+    thread du listener) ;
+  - synchrone : mêmes enregistrements JSON, mais écrits par un FileHandler
+    directement dans le thread de la requête (ce que la file évite).
+Requêtes : GET /ec2 (journal d'accès) et POST /s3/trigger vers le serveur
+GitHub factice (accès + audit). --fsync fait synchroniser chaque écriture du
+mode synchrone sur disque, pour approcher un disque lent ou chargé.
+
+Usage :
+    python -m benchmarks.bench_request_log --requests 300 [--fsync]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from werkzeug.test import EnvironBuilder
+
+from app import create_app
+from app.config import config
+from app.services.request_log import JsonFormatter, access_logger, audit_logger
+from benchmarks.bench_page_cache import call
+from benchmarks.common import summarize
+from benchmarks.fake_github import start_server
+from benchmarks.sample_forms import sample_form
+
+
+class FsyncFileHandler(logging.FileHandler):
+    """FileHandler qui synchronise le fichier sur disque après chaque enregistrement."""
+
+    def flush(self):
+        super().flush()
+        if self.stream is not None:
+            os.fsync(self.stream.fileno())
+
+
+def use(handler):
+    """Attache `handler` (seul) aux loggers d'accès et d'audit."""
+    for logger in (access_logger, audit_logger):
+        logger.handlers = [handler] if handler is not None else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=300, help="requêtes par mode et par répétition")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--fsync', action='store_true', help="fsync après chaque écriture (mode synchrone)")
+    args = parser.parse_args()
+
+    server = start_server()
+    folder = tempfile.mkdtemp(prefix='request-log-')
+    apps = {}
+    for label, enabled in (('désactivés', False), ('file', True)):
+        config['testing'].ACCESS_LOG_ENABLED = config['testing'].AUDIT_LOG_ENABLED = enabled
+        config['testing'].ACCESS_LOG_FILE = os.path.join(folder, 'access.log')
+        config['testing'].AUDIT_LOG_FILE = os.path.join(folder, 'audit.log')
+        app = create_app('testing')
+        app.config.update(
+            GITHUB_API_URL=server.url,
+            GITHUB_TOKEN='bench',
+            STATE_DB=os.path.join(folder, f"{label}.db"),
+            RATE_LIMIT_ENABLED=False,
+            IDEMPOTENCY_ENABLED=False,
+        )
+        apps[label] = app
+
+    queued = apps['file'].extensions['request_log']
+    synchronous = (FsyncFileHandler if args.fsync else logging.FileHandler)(
+        os.path.join(folder, 'sync.log'), encoding='utf-8',
+    )
+    synchronous.setFormatter(JsonFormatter())
+    modes = {
+        'désactivés': (apps['désactivés'], None),
+        'file': (apps['file'], queued),
+        'synchrone': (apps['file'], synchronous),
+    }
+
+    print(f"{'requête':<18}{'mode':<12}{'p50 (µs)':>10}{'p90':>9}{'p99':>9}{'max':>10}")
+    for label, method, path in (('GET /ec2', 'GET', '/ec2'), ('POST /s3/trigger', 'POST', '/s3/trigger')):
+        environs = [
+            EnvironBuilder(path=path, method=method, data=sample_form(path, i) if method == 'POST' else None)
+            .get_environ()
+            for i in range(args.requests)
+        ]
+        samples = {mode: [] for mode in modes}
+        # Répétitions alternées : les variations de fréquence CPU touchent tous les modes
+        for _ in range(args.repeats):
+            for mode, (app, handler) in modes.items():
+                use(handler)
+                for environ in environs:
+                    start = time.perf_counter()
+                    call(app, environ)
+                    samples[mode].append(time.perf_counter() - start)
+        for mode, values in samples.items():
+            stats = summarize(values)
+            print(f"{label:<18}{mode:<12}{stats['p50'] * 1000:>10.1f}{stats['p90'] * 1000:>9.1f}"
+                  f"{stats['p99'] * 1000:>9.1f}{stats['max'] * 1000:>10.1f}")
+
+    use(queued)
+    queued.listener.stop()
+    print(f"\nfile : {queued.stats()}")
+
+
+if __name__ == '__main__':
+    main()
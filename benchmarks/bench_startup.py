@@ -0,0 +1,126 @@
+"""
+Benchmark : démarrage à froid et mémoire des workers gunicorn.
+
+Compare deux modes, avec gunicorn.conf.py :
+  - paresseux : ni preload, ni préchauffage, ni bytecode Jinja (chaque
+    worker importe l'application et compile les templates au premier accès) ;
+  - préchargé : bytecode compilé au préalable (`flask templates compile`),
+    application préchargée et préchauffée dans le maître.
+
+Mesures : délai jusqu'au premier /health, latence du premier accès à chaque
+page, puis — après avoir sollicité tous les workers — mémoire privée (USS)
+par worker et PSS totale (maître + workers), lue dans /proc (Linux).
+
+Usage :
+    python -m benchmarks.bench_startup --workers 4
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from app import create_app
+from app.services.warmup import process_memory
+from benchmarks.bench_page_weight import page_paths
+from benchmarks.load_test import ROOT, free_port
+
+
+def children(pid):
+    """PID des processus fils (workers gunicorn) d'un processus."""
+    pids = []
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    if int(f.read().rsplit(')', 1)[1].split()[1]) == pid:
+                        pids.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+    return pids
+
+
+def run(mode, workers, paths, rounds):
+    """Démarre gunicorn dans le mode donné et retourne ses mesures."""
+    port = free_port()
+    env = dict(
+        os.environ,
+        FLASK_ENV='production',
+        STATE_DB=os.path.join(tempfile.mkdtemp(), 'state.db'),
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        GUNICORN_WORKERS=str(workers),
+    )
+    if mode == 'préchargé':
+        env.update(GUNICORN_PRELOAD='true', WARMUP_ON_START='true', JINJA_BYTECODE_CACHE=tempfile.mkdtemp())
+        subprocess.run(
+            [sys.executable, '-m', 'flask', '--app', 'wsgi', 'templates', 'compile'],
+            cwd=ROOT, env=env, check=True, capture_output=True,
+        )
+    else:
+        env.update(GUNICORN_PRELOAD='false', WARMUP_ON_START='false', JINJA_BYTECODE_CACHE='')
+
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--log-level', 'warning', 'wsgi:app'],
+        cwd=ROOT, env=env,
+    )
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"gunicorn s'est arrêté au démarrage (code {process.returncode})")
+            try:
+                if requests.get(f"{base_url}/health", timeout=1).status_code == 200:
+                    break
+            except requests.RequestException:
+                time.sleep(0.05)
+        ready = time.perf_counter() - started
+
+        session = requests.Session()
+        first_hits = []
+        for path in paths:
+            start = time.perf_counter()
+            session.get(base_url + path).raise_for_status()
+            first_hits.append(time.perf_counter() - start)
+
+        # Sollicite tous les workers pour comparer des états stables
+        with ThreadPoolExecutor(max_workers=workers * 4) as pool:
+            list(pool.map(lambda path: requests.get(base_url + path).status_code, paths * rounds))
+
+        memory = {pid: process_memory(pid) for pid in children(process.pid)}
+        master = process_memory(process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+
+    return {
+        "ready_ms": ready * 1000,
+        "first_hit_ms": sorted(hit * 1000 for hit in first_hits),
+        "worker_uss_kb": [m["uss"] for m in memory.values() if m],
+        "total_pss_kb": sum(m["pss"] for m in memory.values() if m) + (master["pss"] if master else 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=20, help="requêtes par page pour solliciter les workers")
+    args = parser.parse_args()
+
+    paths = page_paths(create_app('testing'))
+    print(f"{'mode':<12}{'prêt (ms)':>11}{'1er accès p50':>15}{'max':>9}{'somme':>9}"
+          f"{'USS/worker (Mo)':>17}{'PSS totale (Mo)':>17}")
+    for mode in ('paresseux', 'préchargé'):
+        result = run(mode, args.workers, paths, args.rounds)
+        hits = result["first_hit_ms"]
+        uss = result["worker_uss_kb"]
+        print(f"{mode:<12}{result['ready_ms']:>11.0f}{hits[len(hits) // 2]:>15.1f}{hits[-1]:>9.1f}{sum(hits):>9.1f}"
+              f"{sum(uss) / max(len(uss), 1) / 1024:>17.1f}{result['total_pss_kb'] / 1024:>17.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark : surcoût des traces par requête.
+
+Compare, en appelant directement l'application WSGI, une page servie par le
+cache (GET /ec2) et un déclenchement complet (POST /s3/trigger vers le
+serveur GitHub factice, sans latence) avec :
+  - traces désactivées (TRACE_SAMPLE_RATE=0) ;
+  - traces actives, requête non échantillonnée (traceparent « sampled=0 ») ;
+  - traces actives, requête échantillonnée (tous les spans tamponnés).
+L'écriture du fichier se fait dans le thread d'export : seule la mise en
+tampon est comptée dans la requête.
+
+Usage :
+    python -m benchmarks.bench_tracing --iterations 300
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from werkzeug.test import EnvironBuilder
+
+from app import create_app
+from app.config import config
+from benchmarks.bench_page_cache import call
+from benchmarks.common import summarize
+from benchmarks.fake_github import start_server
+from benchmarks.sample_forms import sample_form
+
+TRACEPARENT = "00-{}-{}-{:02x}".format('1' * 32, '2' * 16, 0)
+
+
+def measure(app, environs, repeats):
+    """Durée moyenne d'une requête (secondes) par répétition, sur la liste d'environs."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for environ in environs:
+            call(app, environ)
+        samples.append((time.perf_counter() - start) / len(environs))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--repeats', type=int, default=9)
+    args = parser.parse_args()
+
+    server = start_server()
+    folder = tempfile.mkdtemp(prefix='tracing-')
+    apps = {}
+    for mode, rate in (('désactivées', 0.0), ('non échantillonnée', 1.0), ('échantillonnée', 1.0)):
+        config['testing'].TRACE_SAMPLE_RATE = rate
+        config['testing'].TRACE_FILE = os.path.join(folder, 'traces.jsonl')
+        app = create_app('testing')
+        app.config.update(
+            GITHUB_API_URL=server.url,
+            GITHUB_TOKEN='bench',
+            STATE_DB=os.path.join(folder, f"{len(apps)}.db"),
+            RATE_LIMIT_ENABLED=False,
+            IDEMPOTENCY_ENABLED=False,
+        )
+        apps[mode] = app
+
+    print(f"{'requête':<18}" + ''.join(f"{mode:>22}" for mode in apps) + "   (µs, p50)")
+    for label, method, path in (('GET /ec2', 'GET', '/ec2'), ('POST /s3/trigger', 'POST', '/s3/trigger')):
+        environs, samples = {}, {}
+        for mode, app in apps.items():
+            headers = {'traceparent': TRACEPARENT} if mode == 'non échantillonnée' else {}
+            environs[mode] = [
+                EnvironBuilder(
+                    path=path, method=method, headers=headers,
+                    data=sample_form(path, i) if method == 'POST' else None,
+                ).get_environ()
+                for i in range(args.iterations)
+            ]
+            call(app, environs[mode][0])
+            samples[mode] = []
+        # Répétitions alternées : les variations de fréquence CPU touchent tous les modes
+        for _ in range(args.repeats):
+            for mode, app in apps.items():
+                samples[mode] += measure(app, environs[mode], 1)
+        row = [summarize(samples[mode])['p50'] * 1000 for mode in apps]
+        print(f"{label:<18}" + ''.join(f"{value:>22.1f}" for value in row))
+
+    tracer = apps['échantillonnée'].extensions['tracer']
+    start = time.perf_counter()
+    tracer.flush()
+    print(f"\nexport : {tracer.stats()} (dernier flush {(time.perf_counter() - start) * 1000:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
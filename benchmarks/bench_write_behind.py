@@ -0,0 +1,141 @@
+"""
+Benchmark : historique écrit directement ou par le tampon d'écriture différée.
+
+Deux mesures, avec HISTORY_BUFFER_ENABLED=false (une transaction par ligne,
+dans le thread appelant) puis true (lots écrits par le thread du tampon) :
+  - latence de POST /s3/trigger vers le serveur GitHub factice, en
+    appelant directement l'application WSGI (requête + complete() de
+    l'outbox + record() de la requête) ;
+  - débit de la base : --threads threads écrivent chacun --ops
+    déclenchements (complete() puis record()) le plus vite possible ; le
+    temps compte jusqu'à ce que tout soit en base (tampon vidé).
+--synchronous FULL fait synchroniser chaque transaction sur disque (fsync),
+au lieu de NORMAL (WAL synchronisé aux checkpoints).
+
+Usage :
+    python -m benchmarks.bench_write_behind --requests 500 --threads 8 --ops 2000
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from werkzeug.test import EnvironBuilder
+
+from app import create_app
+from app.config import config
+from app.services.history import drain_history, get_history
+from benchmarks.bench_page_cache import call
+from benchmarks.common import print_table, summarize
+from benchmarks.fake_github import start_server
+from benchmarks.sample_forms import sample_form
+
+MODES = (('direct', False), ('tampon', True))
+
+
+def make_app(folder, label, buffered, server_url):
+    config['testing'].HISTORY_BUFFER_ENABLED = buffered
+    app = create_app('testing')
+    app.config.update(
+        GITHUB_API_URL=server_url,
+        GITHUB_TOKEN='bench',
+        STATE_DB=os.path.join(folder, f"{label}-state.db"),
+        HISTORY_DB=os.path.join(folder, f"{label}-history.db"),
+        RATE_LIMIT_ENABLED=False,
+        IDEMPOTENCY_ENABLED=False,
+        ACCESS_LOG_ENABLED=False,
+    )
+    return app
+
+
+def use_synchronous(history, mode):
+    """Applique PRAGMA synchronous=`mode` à chaque écriture, quel que soit le thread qui écrit."""
+    write = history.write
+
+    def synchronized_write(ops):
+        history._conn().execute(f"PRAGMA synchronous={mode}")
+        write(ops)
+
+    history.write = synchronized_write
+    if history.buffer is not None:
+        history.buffer.write = synchronized_write
+
+
+def throughput(app, threads, ops, synchronous):
+    """Déclenchements écrits par seconde, tampon vidé compris."""
+    barrier = threading.Barrier(threads + 1)
+
+    def writer():
+        with app.app_context():
+            history = get_history()
+            barrier.wait()
+            for i in range(ops):
+                item = {
+                    'id': uuid.uuid4().hex, 'workflow_name': 's3', 'created_at': time.time(),
+                    'payload': {'ref': 'main', 'inputs': {'bucket_name': f"bench-{i}", 'bucket_env': 'dev'}},
+                }
+                history.complete(item, 'dispatched', 204, None, 1)
+                history.record('s3', item['payload'], 'dispatched', dispatch_id=item['id'], status=200,
+                               github_status=204, user='bench', duration_ms=12.0)
+
+    with app.app_context():
+        use_synchronous(get_history(), synchronous)
+    workers = [threading.Thread(target=writer) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    history = app.extensions['history']
+    if history.buffer is not None:
+        # Lignes déversées sur disque comprises (tampon plein)
+        history.buffer.flush()
+        history.buffer.replay()
+    elapsed = time.perf_counter() - started
+    return threads * ops / elapsed, history.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500, help="POST par mode et par répétition")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--threads', type=int, default=8, help="threads écrivains (débit)")
+    parser.add_argument('--ops', type=int, default=2000, help="déclenchements par thread (débit)")
+    parser.add_argument('--synchronous', default='NORMAL', choices=('NORMAL', 'FULL'))
+    args = parser.parse_args()
+
+    server = start_server()
+    folder = tempfile.mkdtemp(prefix='bench-write-behind-')
+    apps = {label: make_app(folder, label, buffered, server.url) for label, buffered in MODES}
+
+    environs = [
+        EnvironBuilder(path='/s3/trigger', method='POST', data=sample_form('/s3/trigger', i)).get_environ()
+        for i in range(args.requests)
+    ]
+    samples = {label: [] for label in apps}
+    for label, app in apps.items():
+        with app.app_context():
+            use_synchronous(get_history(), args.synchronous)
+    # Répétitions alternées : les variations de fréquence CPU touchent les deux modes
+    for _ in range(args.repeats):
+        for label, app in apps.items():
+            for environ in environs:
+                start = time.perf_counter()
+                call(app, environ)
+                samples[label].append(time.perf_counter() - start)
+    print_table(f"POST /s3/trigger (synchronous={args.synchronous})",
+                {label: summarize(values) for label, values in samples.items()})
+
+    print(f"\n== Débit : {args.threads} threads x {args.ops} déclenchements (complete + record) ==")
+    for label, buffered in MODES:
+        app = make_app(folder, f"{label}-debit", buffered, server.url)
+        rate, stats = throughput(app, args.threads, args.ops, args.synchronous)
+        print(f"{label:<10}{rate:>12,.0f} déclenchements/s   {stats}")
+        drain_history(app)
+
+
+if __name__ == '__main__':
+    main()
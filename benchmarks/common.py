@@ -0,0 +1,51 @@
+"""Utilitaires partagés par les benchmarks."""
+import statistics
+import time
+
+
+def percentile(samples, pct):
+    """Percentile par interpolation linéaire (samples non vide)."""
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples):
+    """
+    Résume une liste de latences (secondes) en millisecondes.
+
+    Returns:
+        dict avec count, mean, p50, p90, p99, max
+    """
+    return {
+        'count': len(samples),
+        'mean': statistics.fmean(samples) * 1000,
+        'p50': percentile(samples, 50) * 1000,
+        'p90': percentile(samples, 90) * 1000,
+        'p99': percentile(samples, 99) * 1000,
+        'max': max(samples) * 1000,
+    }
+
+
+def timed(func, *args, **kwargs):
+    """Exécute func et retourne (résultat, durée en secondes)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def print_table(title, rows):
+    """Affiche un tableau {libellé: summarize(...)} aligné."""
+    print(f"\n== {title} ==")
+    print(f"{'mode':<28}{'n':>7}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for label, stats in rows.items():
+        print(
+            f"{label:<28}{stats['count']:>7}"
+            f"{stats['mean']:>10.3f}{stats['p50']:>10.3f}{stats['p90']:>10.3f}"
+            f"{stats['p99']:>10.3f}{stats['max']:>10.3f}"
+        )
+    print("(latences en ms)")
@@ -0,0 +1,400 @@
+"""
+Serveur GitHub factice pour les benchmarks et les tests de charge locaux.
+
+Endpoints implémentés (HTTP/1.1 keep-alive) :
+    POST /repos/<owner>/<repo>/actions/workflows/<file>/dispatches  → 204, crée un run
+    GET  /repos/<owner>/<repo>/actions/workflows/<file>/runs        → liste des runs
+    GET  /repos/<owner>/<repo>/actions/runs/<id>                    → détail d'un run
+    GET  /rate_limit                                                → quota courant
+    POST /app/installations/<id>/access_tokens                      → 201, jeton d'installation
+
+Les runs passent de queued à in_progress puis completed selon des durées
+configurables. Les GET renvoient un ETag et répondent 304 (sans décompter
+le quota) si If-None-Match correspond. Latence (avec jitter), injection
+d'erreurs 5xx et quota X-RateLimit-* (global ou par jeton) sont réglables.
+
+Usage :
+    python -m benchmarks.fake_github --port 8787 --latency-ms 20 --rate-limit 100 --per-token \\
+        --error-rate 0.02 --queue-seconds 2 --run-seconds 10
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import random
+import re
+import ssl
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DISPATCH_RE = re.compile(r'^/repos/[^/]+/[^/]+/actions/workflows/([^/]+)/dispatches$')
+WORKFLOW_RUNS_RE = re.compile(r'^/repos/([^/]+)/([^/]+)/actions/workflows/([^/]+)/runs$')
+RUN_RE = re.compile(r'^/repos/[^/]+/[^/]+/actions/runs/(\d+)$')
+ACCESS_TOKENS_RE = re.compile(r'^/app/installations/(\d+)/access_tokens$')
+
+
+def iso(timestamp):
+    """Horodatage epoch → ISO 8601 UTC au format GitHub."""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Handler HTTP/1.1 minimal imitant l'API GitHub Actions."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'FakeGitHub/1.0'
+
+    def log_message(self, format, *args):
+        """Silence les logs d'accès (bruit pendant les mesures)."""
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        if body:
+            self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _simulate(self):
+        """
+        Latence et erreurs injectées, communes à toutes les requêtes.
+
+        Returns:
+            True si une erreur a été renvoyée (la requête s'arrête là)
+        """
+        delay = self.server.latency + random.uniform(0, self.server.latency_jitter)
+        if delay:
+            time.sleep(delay)
+        if self.server.error_rate and random.random() < self.server.error_rate:
+            with self.server.lock:
+                self.server.injected_errors += 1
+            self._send(self.server.error_status, b'{"message": "Server Error"}')
+            return True
+        return False
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length) if length else b''
+
+        if self._simulate():
+            return
+
+        match = ACCESS_TOKENS_RE.match(self.path)
+        if match:
+            self._issue_installation_token(match.group(1))
+            return
+
+        match = DISPATCH_RE.match(self.path)
+        if not match:
+            self._send(404, b'{"message": "Not Found"}')
+            return
+
+        token = self.headers.get('Authorization', '')
+        allowed, headers = self.server.consume_quota(token)
+        if not allowed:
+            self._send(403, b'{"message": "API rate limit exceeded"}', headers)
+            return
+
+        with self.server.lock:
+            self.server.dispatch_count += 1
+            self.server.dispatches_by_token[token] = self.server.dispatches_by_token.get(token, 0) + 1
+        self.server.create_run(match.group(1), body)
+        self._send(204, headers=headers)
+
+    def do_GET(self):
+        if self._simulate():
+            return
+
+        url = urlsplit(self.path)
+        token = self.headers.get('Authorization', '')
+        if url.path == '/rate_limit':
+            self._send(200, json.dumps(self.server.rate_limit_status(token)).encode('utf-8'))
+            return
+
+        match = WORKFLOW_RUNS_RE.match(url.path)
+        if match:
+            query = parse_qs(url.query)
+            per_page = int(query.get('per_page', ['30'])[0])
+            body = self.server.list_runs(match.group(3), query.get('event', [None])[0], per_page)
+            self._send_resource(body, token)
+            return
+
+        match = RUN_RE.match(url.path)
+        if match:
+            run = self.server.get_run(int(match.group(1)))
+            if run is None:
+                self._send(404, b'{"message": "Not Found"}')
+                return
+            self._send_resource(run, token)
+            return
+
+        self._send(404, b'{"message": "Not Found"}')
+
+    def _send_resource(self, resource, token):
+        """Réponse conditionnelle : 304 si l'ETag n'a pas changé, sinon 200 décompté du quota."""
+        body = json.dumps(resource, sort_keys=True).encode('utf-8')
+        etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+        if self.headers.get('If-None-Match') == etag:
+            with self.server.lock:
+                self.server.not_modified += 1
+            self._send(304, headers={'ETag': etag})
+            return
+        allowed, headers = self.server.consume_quota(token)
+        if not allowed:
+            self._send(403, b'{"message": "API rate limit exceeded"}', headers)
+            return
+        self._send(200, body, dict(headers, ETag=etag))
+
+    def _issue_installation_token(self, installation_id):
+        """Délivre un jeton d'installation (le JWT Bearer n'est pas vérifié)."""
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            self._send(401, b'{"message": "A JSON web token could not be decoded"}')
+            return
+        body = {
+            'token': f"ghs_fake_{installation_id}_{next(self.server.token_counter)}",
+            'expires_at': iso(time.time() + self.server.token_ttl),
+        }
+        self._send(201, json.dumps(body).encode('utf-8'))
+
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    """Serveur multi-threadé avec compteurs, runs et quotas partagés."""
+
+    daemon_threads = True
+    # File d'attente listen() : la valeur par défaut (5) fait perdre des SYN
+    # dès qu'un client ouvre des centaines de connexions simultanées
+    request_queue_size = 1024
+
+    def __init__(self, address, latency=0.0, rate_limit=0, window=3600, per_token=False, token_ttl=3600,
+                 latency_jitter=0.0, error_rate=0.0, error_status=502, queue_seconds=2.0,
+                 run_seconds=10.0, failure_rate=0.0):
+        super().__init__(address, FakeGitHubHandler)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.lock = threading.Lock()
+        self.dispatch_count = 0
+        self.dispatches_by_token = {}
+        self.injected_errors = 0
+        self.not_modified = 0
+        self.rate_limit = rate_limit
+        self.window = window
+        self.per_token = per_token
+        self.token_ttl = token_ttl
+        self.token_counter = itertools.count(1)
+        # Quota par jeton (clé = en-tête Authorization) ou global (clé None)
+        self.quotas = {}
+        self.queue_seconds = queue_seconds
+        self.run_seconds = run_seconds
+        self.failure_rate = failure_rate
+        self.run_ids = itertools.count(1000)
+        self.runs = {}
+
+    def consume_quota(self, token=None):
+        """
+        Décompte une requête du quota de la fenêtre courante.
+
+        Args:
+            token: En-tête Authorization de la requête (quota par jeton)
+
+        Returns:
+            (autorisé, en-têtes X-RateLimit-* à renvoyer)
+        """
+        if not self.rate_limit:
+            return True, {}
+        key = token if self.per_token else None
+        with self.lock:
+            now = time.time()
+            quota = self.quotas.get(key)
+            if quota is None or now >= quota['reset_at']:
+                quota = self.quotas[key] = {'used': 0, 'reset_at': now + self.window}
+            allowed = quota['used'] < self.rate_limit
+            if allowed:
+                quota['used'] += 1
+            headers = {
+                'X-RateLimit-Limit': str(self.rate_limit),
+                'X-RateLimit-Remaining': str(self.rate_limit - quota['used']),
+                'X-RateLimit-Reset': str(int(quota['reset_at'])),
+            }
+            if not allowed:
+                headers['Retry-After'] = str(int(quota['reset_at'] - now) + 1)
+        return allowed, headers
+
+    def rate_limit_status(self, token=None):
+        """Corps de GET /rate_limit pour ce jeton (sans décompter le quota)."""
+        limit = self.rate_limit or 5000
+        with self.lock:
+            quota = self.quotas.get(token if self.per_token else None)
+            used = quota['used'] if quota and time.time() < quota['reset_at'] else 0
+            reset = quota['reset_at'] if quota else time.time() + self.window
+        core = {'limit': limit, 'remaining': limit - used, 'used': used, 'reset': int(reset)}
+        return {'resources': {'core': core}, 'rate': core}
+
+    def create_run(self, workflow_file, body):
+        """Enregistre le run créé par un dispatch (issue tirée selon failure_rate)."""
+        try:
+            inputs = json.loads(body or b'{}').get('inputs') or {}
+        except ValueError:
+            inputs = {}
+        with self.lock:
+            run_id = next(self.run_ids)
+            self.runs[run_id] = {
+                'id': run_id,
+                'workflow_file': workflow_file,
+                'created': time.time(),
+                'fails': random.random() < self.failure_rate,
+                'inputs': inputs,
+            }
+
+    def _render_run(self, run):
+        """Représentation API d'un run à l'instant présent."""
+        now = time.time()
+        started = run['created'] + self.queue_seconds
+        finished = started + self.run_seconds
+        if now < started:
+            status, conclusion, updated = 'queued', None, run['created']
+        elif now < finished:
+            status, conclusion, updated = 'in_progress', None, started
+        else:
+            status, conclusion, updated = 'completed', 'failure' if run['fails'] else 'success', finished
+        return {
+            'id': run['id'],
+            'name': run['workflow_file'],
+            'event': 'workflow_dispatch',
+            'status': status,
+            'conclusion': conclusion,
+            'created_at': iso(run['created']),
+            'run_started_at': iso(started) if now >= started else None,
+            'updated_at': iso(updated),
+            'html_url': f"https://github.com/fake/fake/actions/runs/{run['id']}",
+        }
+
+    def list_runs(self, workflow_file, event, per_page):
+        """Runs d'un workflow, du plus récent au plus ancien."""
+        with self.lock:
+            runs = [r for r in self.runs.values() if r['workflow_file'] == workflow_file]
+        runs.sort(key=lambda r: r['id'], reverse=True)
+        if event not in (None, 'workflow_dispatch'):
+            runs = []
+        rendered = [self._render_run(r) for r in runs[:per_page]]
+        return {'total_count': len(runs), 'workflow_runs': rendered}
+
+    def get_run(self, run_id):
+        with self.lock:
+            run = self.runs.get(run_id)
+        return self._render_run(run) if run else None
+
+    def handle_error(self, request, client_address):
+        """Ignore les connexions keep-alive fermées par le client (fin de test)."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def counters(self):
+        """Compteurs cumulés (pour les rapports de benchmark)."""
+        with self.lock:
+            return {
+                'dispatches': self.dispatch_count,
+                'runs': len(self.runs),
+                'injected_errors': self.injected_errors,
+                'not_modified': self.not_modified,
+            }
+
+    @property
+    def url(self):
+        scheme = 'https' if isinstance(self.socket, ssl.SSLSocket) else 'http'
+        host, port = self.server_address[:2]
+        return f"{scheme}://{host}:{port}"
+
+
+def start_server(host='127.0.0.1', port=0, latency=0.0, certfile=None, keyfile=None,
+                 rate_limit=0, window=3600, per_token=False, token_ttl=3600, **options):
+    """
+    Démarre le serveur factice dans un thread daemon.
+
+    Args:
+        host: Adresse d'écoute
+        port: Port (0 = port libre choisi par l'OS)
+        latency: Latence artificielle par requête, en secondes
+        certfile: Certificat PEM pour servir en HTTPS (optionnel)
+        keyfile: Clé privée PEM associée (optionnel)
+        rate_limit: Requêtes autorisées par fenêtre (0 = illimité)
+        window: Durée de la fenêtre de quota, en secondes
+        per_token: Quota distinct par jeton plutôt que global
+        token_ttl: Durée de validité des jetons d'installation, en secondes
+        **options: latency_jitter, error_rate, error_status, queue_seconds,
+                   run_seconds, failure_rate (voir FakeGitHubServer)
+
+    Returns:
+        FakeGitHubServer démarré (appeler .shutdown() pour l'arrêter)
+    """
+    server = FakeGitHubServer((host, port), latency=latency, rate_limit=rate_limit, window=window,
+                              per_token=per_token, token_ttl=token_ttl, **options)
+    if certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def add_server_arguments(parser):
+    """Options du serveur factice, partagées avec le test de charge."""
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--latency-jitter-ms', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=0)
+    parser.add_argument('--window', type=float, default=3600)
+    parser.add_argument('--per-token', action='store_true', help="Quota distinct par jeton")
+    parser.add_argument('--token-ttl', type=float, default=3600)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Part des requêtes en erreur 5xx")
+    parser.add_argument('--error-status', type=int, default=502)
+    parser.add_argument('--queue-seconds', type=float, default=2.0, help="Durée d'un run en file")
+    parser.add_argument('--run-seconds', type=float, default=10.0, help="Durée d'exécution d'un run")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Part des runs en échec")
+
+
+def server_options(args):
+    """Arguments de start_server() depuis les options parsées."""
+    return {
+        'latency': args.latency_ms / 1000.0,
+        'latency_jitter': args.latency_jitter_ms / 1000.0,
+        'rate_limit': args.rate_limit,
+        'window': args.window,
+        'per_token': args.per_token,
+        'token_ttl': args.token_ttl,
+        'error_rate': args.error_rate,
+        'error_status': args.error_status,
+        'queue_seconds': args.queue_seconds,
+        'run_seconds': args.run_seconds,
+        'failure_rate': args.failure_rate,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur GitHub factice")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--certfile')
+    parser.add_argument('--keyfile')
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = start_server(args.host, args.port, certfile=args.certfile, keyfile=args.keyfile,
+                          **server_options(args))
+    print(f"Fake GitHub API en écoute sur {server.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+"""
+Test de charge de bout en bout : gunicorn + serveur GitHub factice.
+
+Démarre le serveur GitHub factice (ou utilise --github-url), lance
+l'application sous gunicorn avec la configuration de workers demandée,
+puis envoie en concurrence des POST valides sur toutes les routes
+trigger_* (découvertes dans l'url_map), ou en JSON sur /api/v1/<service>
+avec --api. Le rapport JSON contient le
+débit, les percentiles de latence (global et par route), le taux
+d'erreur et l'histogramme des codes HTTP.
+
+Usage :
+    python -m benchmarks.load_test --workers 4 --worker-class gthread --threads 16 \\
+        --concurrency 64 --duration 30 --latency-ms 50 --error-rate 0.01 \\
+        --output benchmarks/results/gthread-4x16.json
+
+Avec --asgi, l'application est servie par `asgi:app` sous des workers
+uvicorn (voir app/asgi.py) au lieu de `wsgi:app`.
+"""
+import argparse
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+
+from app import create_app
+from benchmarks.common import print_table, summarize
+from benchmarks.fake_github import add_server_arguments, server_options, start_server
+from benchmarks.sample_forms import sample_form, service_slug
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASGI_WORKER_CLASS = 'uvicorn.workers.UvicornWorker'
+
+
+def trigger_routes():
+    """Chemins des routes POST dont l'endpoint commence par trigger_."""
+    app = create_app('testing')
+    return sorted(
+        rule.rule for rule in app.url_map.iter_rules()
+        if 'POST' in rule.methods and rule.endpoint.rsplit('.', 1)[-1].startswith('trigger_')
+    )
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(args, github_url, state_db):
+    """
+    Lance l'application sous gunicorn et attend que /health réponde.
+
+    Returns:
+        (processus gunicorn, URL de base de l'application)
+    """
+    port = free_port()
+    command = [
+        sys.executable, '-m', 'gunicorn',
+        '-w', str(args.workers),
+        '-k', ASGI_WORKER_CLASS if args.asgi else args.worker_class,
+        '--threads', str(args.threads),
+        '-b', f"127.0.0.1:{port}",
+        '--log-level', 'warning',
+        'asgi:app' if args.asgi else 'wsgi:app',
+    ]
+    env = dict(
+        os.environ,
+        FLASK_ENV='production',
+        GITHUB_API_URL=github_url,
+        GITHUB_TOKEN=os.environ.get('GITHUB_TOKEN', 'load-test-token'),
+        STATE_DB=state_db,
+        DISPATCH_MODE=args.dispatch_mode,
+        RATE_LIMIT_ENABLED='true' if args.rate_limiting else 'false',
+    )
+    for item in args.env:
+        key, _, value = item.partition('=')
+        env[key] = value
+
+    process = subprocess.Popen(command, cwd=ROOT, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn s'est arrêté au démarrage (code {process.returncode})")
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gunicorn n'a pas répondu sur /health en 30 s")
+
+
+def drive(base_url, routes, concurrency, duration, total, api=False):
+    """
+    Envoie les requêtes en round-robin sur les routes.
+
+    S'arrête après `total` requêtes si fourni, sinon après `duration` secondes.
+    Avec `api`, chaque formulaire part en JSON sur /api/v1/<service>.
+
+    Returns:
+        (liste de (route, code HTTP ou None, latence en s), durée écoulée)
+    """
+    counter = itertools.count()
+    lock = threading.Lock()
+    results = []
+    local = threading.local()
+    started = time.perf_counter()
+    deadline = started + duration
+
+    def worker():
+        session = local.session = requests.Session()
+        while True:
+            n = next(counter)
+            if (total and n >= total) or (not total and time.perf_counter() >= deadline):
+                break
+            path = routes[n % len(routes)]
+            form = sample_form(path, n)
+            begin = time.perf_counter()
+            try:
+                if api:
+                    url = f"{base_url}/api/v1/{service_slug(path)}"
+                    status = session.post(url, json=form, timeout=60).status_code
+                else:
+                    status = session.post(f"{base_url}{path}", data=form, timeout=60).status_code
+            except requests.RequestException:
+                status = None
+            elapsed = time.perf_counter() - begin
+            with lock:
+                results.append((path, status, elapsed))
+        session.close()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    return results, time.perf_counter() - started
+
+
+def build_report(args, results, elapsed, github_counters):
+    """Rapport JSON : configuration, débit, latences, erreurs."""
+    ok = lambda status: status in (200, 202)
+    by_route = defaultdict(list)
+    for path, status, latency in results:
+        by_route[path].append((status, latency))
+
+    def section(samples):
+        errors = sum(1 for status, _ in samples if not ok(status))
+        return {
+            'requests': len(samples),
+            'errors': errors,
+            'error_rate': errors / len(samples) if samples else 0.0,
+            'latency_ms': summarize([latency for _, latency in samples]) if samples else None,
+            'status_codes': dict(Counter(str(status) for status, _ in samples)),
+        }
+
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                  capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        revision = None
+
+    overall = section([(status, latency) for _, status, latency in results])
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'git_revision': revision,
+        'config': {
+            'workers': args.workers,
+            'worker_class': ASGI_WORKER_CLASS if args.asgi else args.worker_class,
+            'asgi': args.asgi,
+            'threads': args.threads,
+            'concurrency': args.concurrency,
+            'dispatch_mode': args.dispatch_mode,
+            'api': args.api,
+            'rate_limiting': args.rate_limiting,
+            'duration': args.duration if not args.requests else None,
+            'requests': args.requests or None,
+            'github': server_options(args) if not args.github_url else {'url': args.github_url},
+        },
+        'elapsed': elapsed,
+        'throughput_rps': len(results) / elapsed if elapsed else 0.0,
+        'overall': overall,
+        'routes': {path: section(samples) for path, samples in sorted(by_route.items())},
+        'github': github_counters,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--worker-class', default='gthread')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--concurrency', type=int, default=32, help="Clients simultanés")
+    parser.add_argument('--duration', type=float, default=20.0, help="Durée du test, en secondes")
+    parser.add_argument('--requests', type=int, default=0, help="Nombre fixe de requêtes (prioritaire)")
+    parser.add_argument('--asgi', action='store_true', help="asgi:app sous des workers uvicorn")
+    parser.add_argument('--dispatch-mode', choices=('sync', 'async'), default='sync')
+    parser.add_argument('--api', action='store_true', help="Requêtes JSON sur /api/v1/<service>")
+    parser.add_argument('--rate-limiting', action='store_true', help="Garde l'ordonnanceur de quota actif")
+    parser.add_argument('--env', action='append', default=[], metavar='CLÉ=VALEUR',
+                        help="Variable d'environnement supplémentaire pour gunicorn")
+    parser.add_argument('--routes', help="Sous-ensemble de routes, séparées par des virgules")
+    parser.add_argument('--github-url', help="API GitHub existante (sinon serveur factice intégré)")
+    parser.add_argument('--output', default=os.path.join('benchmarks', 'results', 'load_test.json'))
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    routes = args.routes.split(',') if args.routes else trigger_routes()
+    server = None if args.github_url else start_server(**server_options(args))
+    github_url = args.github_url or server.url
+    state_db = os.path.join(tempfile.mkdtemp(), 'state.db')
+
+    process, base_url = start_gunicorn(args, github_url, state_db)
+    try:
+        results, elapsed = drive(base_url, routes, args.concurrency, args.duration, args.requests, args.api)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        if server is not None:
+            counters = server.counters()
+            server.shutdown()
+        else:
+            counters = None
+
+    report = build_report(args, results, elapsed, counters)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    rows = {path: stats['latency_ms'] for path, stats in report['routes'].items() if stats['latency_ms']}
+    if report['overall']['latency_ms']:
+        rows['(toutes)'] = report['overall']['latency_ms']
+    print_table(
+        f"{args.workers} workers {report['config']['worker_class']} x {args.threads} threads, "
+        f"{args.concurrency} clients",
+        rows,
+    )
+    overall = report['overall']
+    print(f"\n{overall['requests']} requêtes en {elapsed:.1f}s : {report['throughput_rps']:.1f} req/s, "
+          f"taux d'erreur {overall['error_rate']:.2%} {overall['status_codes']}")
+    print(f"Rapport écrit dans {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Formulaires valides pour chaque route de déclenchement (test de charge).
+
+`{n}` est remplacé par un numéro de requête unique : chaque POST porte
+des noms distincts et n'est donc pas dé-dupliqué par la clé d'idempotence.
+"""
+
+SAMPLE_FORMS = {
+    '/ec2/trigger': {
+        'instance_name': 'load-ec2-{n}',
+        'instance_os': 'ami-0abcdef1234567890',
+        'instance_size': 't3.micro',
+        'instance_env': 'dev',
+    },
+    '/lambda/trigger': {
+        'function_name': 'load-lambda-{n}',
+        'runtime': 'python3.11',
+        'handler': 'index.handler',
+        'environment': 'dev',
+    },
+    '/s3/trigger': {
+        'bucket_name': 'load-bucket-{n}',
+        'bucket_env': 'dev',
+    },
+    '/rds/trigger': {
+        'db_identifier': 'load-db-{n}',
+        'engine': 'postgres',
+        'engine_version': '16.3',
+        'instance_class': 'db.t3.micro',
+        'username': 'loadadmin',
+        'password': 'LoadTest-Passw0rd',
+        'environment': 'dev',
+    },
+    '/vpc/trigger': {
+        'vpc_name': 'load-vpc-{n}',
+    },
+    '/elb/trigger': {
+        'lb_name': 'load-lb-{n}',
+    },
+    '/cloudfront/trigger': {
+        'origin_domain': 'load-{n}.example.com',
+    },
+    '/route53/trigger': {
+        'zone_name': 'load-{n}.example.com',
+        'record_value': '192.0.2.10',
+    },
+    '/iam/trigger': {
+        'resource_type': 'role',
+        'resource_name': 'load-role-{n}',
+    },
+    '/secrets-manager/trigger': {
+        'secret_name': 'load/secret-{n}',
+        'environment': 'dev',
+        'secret_type': 'api_key',
+        'secret_value': 'load-test-value',
+    },
+    '/cloudwatch/trigger': {
+        'alarm_name': 'load-alarm-{n}',
+        'metric_name': 'CPUUtilization',
+        'threshold': '80',
+    },
+    '/trigger-codepipeline': {
+        'pipeline_name': 'load-pipeline-{n}',
+        'environment': 'dev',
+        'source_provider': 'CodeCommit',
+        'codecommit_repository': 'load-repo',
+        'deploy_provider': 'S3',
+        's3_deploy_bucket': 'load-deploy-bucket',
+    },
+    '/trigger-codebuild': {
+        'project_name': 'load-build-{n}',
+        'environment': 'dev',
+        'source_type': 'NO_SOURCE',
+    },
+    '/trigger-codedeploy': {
+        'application_name': 'load-app-{n}',
+        'compute_platform': 'Server',
+        'deployment_group_name': 'load-group-{n}',
+        'environment': 'dev',
+    },
+    '/trigger-ssm': {
+        'environment': 'dev',
+        'namespace': '/load/{n}',
+    },
+    '/trigger-budgets': {
+        'budget_name': 'load-budget-{n}',
+        'budget_amount': '100',
+    },
+    '/trigger-cost-explorer': {
+        'report_name': 'load-report-{n}',
+    },
+    '/trigger-trusted-advisor': {
+        'check_name': 'load-check-{n}',
+    },
+}
+
+
+def service_slug(path):
+    """Slug du service d'une route de déclenchement ('/trigger-ssm' → 'ssm')."""
+    return path.strip('/').replace('/trigger', '').replace('trigger-', '')
+
+
+def sample_form(path, n):
+    """
+    Formulaire de la route `path` pour la requête numéro `n`.
+
+    Args:
+        path: Chemin de la route de déclenchement
+        n: Numéro unique de la requête
+
+    Returns:
+        dict des champs du formulaire ({} si la route n'est pas connue)
+    """
+    return {key: value.replace('{n}', str(n)) for key, value in SAMPLE_FORMS.get(path, {}).items()}
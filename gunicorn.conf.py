@@ -0,0 +1,90 @@
+"""
+Configuration gunicorn (production), chargée automatiquement depuis la racine.
+
+preload_app : l'application est créée et préchauffée une seule fois dans
+le maître ; les workers forkés partagent ce code, ces templates et ces
+pages en copy-on-write au lieu de tout reconstruire chacun. Sans preload,
+chaque worker se préchauffe avant d'accepter des connexions.
+
+Mode ASGI : GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker avec
+l'application `asgi:app` (déclenchements GitHub attendus sans bloquer de
+thread, voir app/asgi.py) ; `wsgi:app` reste servi par les workers gthread.
+
+Métriques : PROMETHEUS_MULTIPROC_DIR (un dossier temporaire par instance
+si non fourni) fait écrire à chaque worker ses métriques dans des fichiers
+mmap que /metrics agrège.
+"""
+import gc
+import os
+import shutil
+import tempfile
+
+# Doit précéder tout import de prometheus_client, donc de l'application
+_metrics_dir_owned = not os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+if _metrics_dir_owned:
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='prometheus-')
+
+from app.services.history import drain_history  # noqa: E402
+from app.services.warmup import warm_up  # noqa: E402
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', '4'))
+
+# Workers à threads : les flux SSE ouverts n'immobilisent pas un processus entier
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '16'))
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+
+def on_starting(server):
+    # Dossier imposé par l'environnement : valeurs d'une exécution précédente
+    folder = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    os.makedirs(folder, exist_ok=True)
+    for name in os.listdir(folder):
+        if name.endswith('.db'):
+            os.remove(os.path.join(folder, name))
+
+
+def when_ready(server):
+    # Maître : application déjà chargée si preload_app, workers pas encore forkés
+    if server.cfg.preload_app:
+        _warm_up(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    # Worker : application chargée, boucle d'acceptation pas encore démarrée
+    if not worker.cfg.preload_app:
+        _warm_up(worker.wsgi)
+
+
+def _warm_up(app):
+    app = getattr(app, 'flask_app', app)  # asgi:app enveloppe l'application Flask
+    if app.config['WARMUP_ON_START']:
+        warm_up(app)
+
+
+def pre_fork(server, worker):
+    # Objets du maître exclus du GC : sinon le premier passage du collecteur
+    # dans un worker réécrit leurs en-têtes et duplique les pages partagées
+    gc.freeze()
+
+
+def worker_exit(server, worker):
+    # Worker en arrêt propre : lignes d'historique encore en mémoire écrites en base
+    app = getattr(worker, 'wsgi', None)
+    if app is not None:
+        drain_history(getattr(app, 'flask_app', app))
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    if _metrics_dir_owned:
+        shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
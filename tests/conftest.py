@@ -0,0 +1,70 @@
+"""
+Fixtures communes aux tests.
+
+Chaque test reçoit une application 'testing' isolée : bases SQLite (état,
+historique) dans tmp_path, journaux et sonde de fond désactivés, appels
+GitHub dirigés vers le serveur factice de benchmarks/fake_github.py.
+"""
+import pytest
+
+from app import create_app
+from app.config import TestingConfig
+from benchmarks.fake_github import start_server
+
+
+@pytest.fixture
+def github():
+    """Serveur GitHub factice sur un port libre (runs courts : 0,2 s en file, 0,5 s d'exécution)."""
+    server = start_server(queue_seconds=0.2, run_seconds=0.5)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch, github):
+    """
+    Fabrique d'applications de test.
+
+    Les réglages sont posés sur TestingConfig avant create_app() : ceux lus
+    au démarrage (journaux, sonde, schémas) comme ceux lus paresseusement
+    par les services. monkeypatch les restaure à la fin du test.
+
+    Args (de la fabrique):
+        **overrides: Réglages de configuration propres au test
+
+    Returns:
+        Fonction make(**overrides) → application Flask
+    """
+    def make(**overrides):
+        settings = {
+            'GITHUB_API_URL': github.url,
+            'GITHUB_TOKEN': 'test-token',
+            'GITHUB_TOKENS': '',
+            'GITHUB_APP_ID': '',
+            'STATE_DB': str(tmp_path / 'state.db'),
+            'HISTORY_DB': str(tmp_path / 'history.db'),
+            'HISTORY_BUFFER_ENABLED': False,
+            'ACCESS_LOG_ENABLED': False,
+            'AUDIT_LOG_ENABLED': False,
+            'HEALTH_CHECK_ENABLED': False,
+            'TRACE_SAMPLE_RATE': 0.0,
+            'DISPATCH_MODE': 'sync',
+        }
+        settings.update(overrides)
+        for name, value in settings.items():
+            monkeypatch.setattr(TestingConfig, name, value, raising=False)
+        return create_app('testing')
+
+    return make
+
+
+@pytest.fixture
+def app(make_app):
+    """Application de test avec les réglages par défaut de make_app."""
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
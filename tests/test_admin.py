@@ -0,0 +1,35 @@
+"""Endpoints d'administration : désactivés par défaut, jeton exigé s'il est configuré."""
+import pytest
+
+ADMIN_PATHS = (
+    '/rate-limit', '/credentials', '/page-cache', '/startup',
+    '/jobs/stats', '/outbox/stats', '/history/stats', '/deployments/stats',
+)
+
+
+@pytest.mark.parametrize('path', ADMIN_PATHS)
+def test_admin_endpoints_are_disabled_by_default(client, path):
+    response = client.get(path)
+    assert response.status_code == 404
+    assert 'ADMIN_ENDPOINTS_ENABLED' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('path', ADMIN_PATHS)
+def test_admin_endpoints_require_token(make_app, path):
+    client = make_app(ADMIN_ENDPOINTS_ENABLED=True, ADMIN_TOKEN='s3cret').test_client()
+
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    response = client.get(path, headers={'Authorization': 'Bearer s3cret'})
+    assert response.status_code == 200
+    assert response.is_json
+
+
+def test_admin_endpoints_open_without_token_when_enabled(make_app):
+    client = make_app(ADMIN_ENDPOINTS_ENABLED=True).test_client()
+    assert client.get('/startup').status_code == 200
+
+
+def test_health_and_metrics_stay_public(client):
+    assert client.get('/health/live').status_code == 200
+    assert client.get('/metrics').status_code == 200
@@ -0,0 +1,173 @@
+"""Adaptateur ASGI : cycle de requête Flask, flux, étapes de déclenchement sur la boucle."""
+import asyncio
+import time
+from urllib.parse import urlencode
+
+import pytest
+from flask import Response
+
+from app.asgi import PortalASGI
+from benchmarks.sample_forms import sample_form
+
+pytest.importorskip('aiohttp')
+
+
+async def request(asgi, method, path, body=b'', headers=()):
+    """Une requête HTTP ASGI ; retourne (statut, en-têtes, morceaux du corps)."""
+    received = []
+    delivered = False
+
+    async def receive():
+        nonlocal delivered
+        if not delivered:
+            delivered = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        received.append(message)
+
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': b'', 'root_path': '',
+        'http_version': '1.1', 'scheme': 'http', 'server': ('testserver', 80), 'client': ('127.0.0.1', 50000),
+        'headers': [(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+    }
+    await asgi(scope, receive, send)
+    start, *bodies = received
+    assert start['type'] == 'http.response.start'
+    assert not bodies[-1].get('more_body')
+    return start['status'], dict(start['headers']), [message['body'] for message in bodies]
+
+
+def serve(asgi, scenario):
+    """Exécute `scenario()` entre le démarrage et l'arrêt (lifespan) de l'application ASGI."""
+    async def main():
+        inbox, outbox = asyncio.Queue(), asyncio.Queue()
+        lifespan = asyncio.create_task(asgi({'type': 'lifespan'}, inbox.get, outbox.put))
+        await inbox.put({'type': 'lifespan.startup'})
+        assert (await outbox.get())['type'] == 'lifespan.startup.complete'
+        try:
+            return await scenario()
+        finally:
+            await inbox.put({'type': 'lifespan.shutdown'})
+            assert (await outbox.get())['type'] == 'lifespan.shutdown.complete'
+            await lifespan
+    return asyncio.run(main())
+
+
+def trigger(asgi, n):
+    body = urlencode(sample_form('/s3/trigger', n)).encode('ascii')
+    return request(asgi, 'POST', '/s3/trigger', body,
+                   [('content-type', 'application/x-www-form-urlencoded')])
+
+
+@pytest.fixture
+def hooked_app(make_app):
+    """Application avec des hooks et des vues de test qui tracent le cycle de requête."""
+    app = make_app(PROPAGATE_EXCEPTIONS=False)
+    events = []
+    app.extensions['test_events'] = events
+
+    @app.before_request
+    def before():
+        events.append('before')
+
+    @app.after_request
+    def after(response):
+        events.append('after')
+        response.headers['X-Hooked'] = 'yes'
+        return response
+
+    @app.teardown_request
+    def teardown(error):
+        events.append(('teardown', type(error).__name__ if error else None))
+
+    @app.route('/_test/hello')
+    def hello():
+        events.append('view')
+        return 'hello'
+
+    @app.route('/_test/fail')
+    def fail():
+        raise RuntimeError("boom")
+
+    @app.route('/_test/stream')
+    def stream():
+        return Response((chunk for chunk in (b'one\n', b'two\n', b'three\n')), mimetype='application/x-ndjson')
+
+    return app
+
+
+def test_request_runs_flask_hooks_in_order(hooked_app):
+    asgi = PortalASGI(hooked_app)
+    status, headers, body = serve(asgi, lambda: request(asgi, 'GET', '/_test/hello'))
+
+    assert status == 200
+    assert headers[b'x-hooked'] == b'yes'
+    assert b''.join(body) == b'hello'
+    assert hooked_app.extensions['test_events'] == ['before', 'view', 'after', ('teardown', None)]
+
+
+def test_unhandled_error_reaches_teardown(hooked_app):
+    asgi = PortalASGI(hooked_app)
+    status, _, _ = serve(asgi, lambda: request(asgi, 'GET', '/_test/fail'))
+
+    assert status == 500
+    assert hooked_app.extensions['test_events'][-1] == ('teardown', 'RuntimeError')
+
+
+def test_streamed_response_is_relayed_chunk_by_chunk(hooked_app):
+    asgi = PortalASGI(hooked_app)
+    status, headers, body = serve(asgi, lambda: request(asgi, 'GET', '/_test/stream'))
+
+    assert status == 200
+    assert headers[b'x-hooked'] == b'yes'
+    assert body == [b'one\n', b'two\n', b'three\n', b'']
+
+
+def test_trigger_is_dispatched_through_deferred_steps(app, github):
+    asgi = PortalASGI(app)
+    status, _, _ = serve(asgi, lambda: trigger(asgi, 1))
+
+    assert status == 200
+    assert github.counters()['dispatches'] == 1
+
+
+def test_quota_wait_does_not_hold_a_pool_thread(make_app, github):
+    # Un seul thread : l'attente d'un créneau ne doit pas bloquer les autres requêtes
+    app = make_app(ASGI_THREADS=1, RATE_LIMIT_RATE=1.0, RATE_LIMIT_BURST=1)
+    asgi = PortalASGI(app)
+
+    async def scenario():
+        assert (await trigger(asgi, 1))[0] == 200
+        waiting = asyncio.create_task(trigger(asgi, 2))
+        await asyncio.sleep(0.2)
+        started = time.perf_counter()
+        status, _, _ = await request(asgi, 'GET', '/health/live')
+        elapsed = time.perf_counter() - started
+        assert not waiting.done()
+        assert (await waiting)[0] == 200
+        return status, elapsed
+
+    status, elapsed = serve(asgi, scenario)
+    assert status == 200
+    assert elapsed < 0.3
+    assert github.counters()['dispatches'] == 2
+
+
+def test_concurrent_waits_resume_on_any_pool_thread(make_app, github):
+    # Plusieurs threads : une attente (quota, requête identique) reprend sur
+    # un autre thread que celui qui l'a commencée, pendant que ce dernier
+    # sert d'autres écritures dans la base d'état
+    app = make_app(ASGI_THREADS=8, RATE_LIMIT_RATE=10.0, RATE_LIMIT_BURST=1)
+    asgi = PortalASGI(app)
+
+    async def scenario():
+        requests = [trigger(asgi, n) for n in range(1, 21)]
+        requests += [trigger(asgi, 1), trigger(asgi, 2)]  # renvois identiques : attente de la clé
+        requests += [request(asgi, 'GET', '/health/live') for _ in range(20)]
+        return await asyncio.gather(*requests)
+
+    results = serve(asgi, scenario)
+    assert [status for status, _, _ in results if not 200 <= status < 300] == []
+    assert github.counters()['dispatches'] == 20
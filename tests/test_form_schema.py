@@ -0,0 +1,290 @@
+"""
+Schémas de formulaires : payloads construits depuis les options des templates.
+
+tests/data/form_payloads.json a été enregistré en postant les mêmes
+formulaires aux anciennes routes écrites à la main (avant form_schema) :
+pour chaque service, les inputs du formulaire de benchmarks/sample_forms.py
+puis, pour chaque <option>, bouton radio ou case à cocher du template, les
+inputs qui en diffèrent. Une option absente du fichier et des rejets
+attendus ci-dessous fait échouer le test : tout nouveau choix doit être
+vérifié.
+"""
+import json
+from html.parser import HTMLParser
+from pathlib import Path
+
+import pytest
+
+from app.services.form_schema import get_schema
+from app.services.validation_service import ValidationError
+from benchmarks.sample_forms import SAMPLE_FORMS, sample_form, service_slug
+
+TEMPLATES = Path(__file__).resolve().parent.parent / 'app' / 'templates'
+BASELINE = json.loads((Path(__file__).parent / 'data' / 'form_payloads.json').read_text(encoding='utf-8'))
+PATHS = {service_slug(path): path for path in SAMPLE_FORMS}
+
+# Champ vidé dans le formulaire d'exemple → erreurs attendues
+REQUIRED = {
+    'ec2': {
+        'instance_name': [('instance_name', "Nom obligatoire")],
+        'instance_os': [('instance_os', "AMI obligatoire")],
+        'instance_size': [('instance_size', "Type d'instance obligatoire")],
+        'instance_env': [('instance_env', "Environnement obligatoire")],
+    },
+    'lambda': {
+        'function_name': [('function_name', "Nom de la fonction obligatoire")],
+        'runtime': [('runtime', "Runtime obligatoire")],
+        'handler': [('handler', "Handler obligatoire")],
+        'environment': [('environment', "Environnement obligatoire")],
+    },
+    's3': {
+        'bucket_name': [('bucket_name', "Nom de bucket obligatoire")],
+        'bucket_env': [('bucket_env', "Environnement obligatoire")],
+    },
+    'rds': {
+        'db_identifier': [('db_identifier', "DB Identifier obligatoire")],
+        'engine': [('engine', "Moteur obligatoire")],
+        'engine_version': [('engine_version', "Version du moteur obligatoire")],
+        'instance_class': [('instance_class', "Classe d'instance obligatoire")],
+        'username': [('username', "Username obligatoire")],
+        'password': [('password', "Mot de passe obligatoire")],
+        'environment': [('environment', "Environnement obligatoire")],
+    },
+    'vpc': {'vpc_name': [('vpc_name', "Nom du VPC obligatoire")]},
+    'elb': {'lb_name': [('lb_name', "Nom du Load Balancer obligatoire")]},
+    'cloudfront': {'origin_domain': [('origin_domain', "Domaine d'origine obligatoire")]},
+    'route53': {
+        'zone_name': [('zone_name', "Nom de zone obligatoire")],
+        'record_value': [('record_value', "Valeur de l'enregistrement obligatoire")],
+    },
+    'iam': {
+        'resource_type': [('resource_type', "Type de ressource obligatoire")],
+        'resource_name': [('resource_name', "Nom de la ressource obligatoire")],
+    },
+    'secrets-manager': {
+        'secret_name': [('secret_name', "Nom du secret obligatoire")],
+        'environment': [('environment', "Environnement obligatoire")],
+        'secret_type': [('secret_type', "Type de secret obligatoire")],
+        'secret_value': [('secret_value', "La valeur du secret est obligatoire")],
+    },
+    'cloudwatch': {
+        'alarm_name': [('alarm_name', "Nom de l'alarme obligatoire")],
+        'metric_name': [('metric_name', "Métrique obligatoire")],
+        'threshold': [('threshold', "Seuil obligatoire")],
+    },
+    'codepipeline': {
+        'pipeline_name': [('pipeline_name', "Nom de pipeline obligatoire")],
+        'environment': [('environment', "Environnement obligatoire")],
+        'source_provider': [('source_provider', "Provider source obligatoire")],
+        'codecommit_repository': [('codecommit_repository', "Nom du repository CodeCommit obligatoire")],
+        'deploy_provider': [('deploy_provider', "Provider de déploiement obligatoire")],
+        's3_deploy_bucket': [('s3_deploy_bucket', "Bucket S3 de destination obligatoire")],
+    },
+    'codebuild': {
+        'project_name': [('project_name', "Nom de projet obligatoire")],
+        'environment': [('environment', "Environnement obligatoire")],
+        'source_type': [
+            ('source_type', "Type de source obligatoire"),
+            ('source_location', "Emplacement source obligatoire pour ce type de source"),
+        ],
+    },
+    'codedeploy': {
+        'application_name': [('application_name', "Nom obligatoire")],
+        'compute_platform': [('compute_platform', "Plateforme obligatoire")],
+        'deployment_group_name': [('deployment_group_name', "Deployment group obligatoire")],
+        'environment': [('environment', "Environnement obligatoire")],
+    },
+    'ssm': {
+        'environment': [('environment', "Environnement obligatoire")],
+        'namespace': [('namespace', "Namespace obligatoire")],
+    },
+    'budgets': {
+        'budget_name': [('budget_name', "Nom du budget obligatoire")],
+        'budget_amount': [('budget_amount', "Montant obligatoire")],
+    },
+}
+
+# Option du template qui rend d'autres champs obligatoires → erreurs attendues
+CONDITIONAL = {
+    ('secrets-manager', 'secret_type', 'database'): [
+        ('db_username', "Champ db_username obligatoire pour type database"),
+        ('db_password', "Champ db_password obligatoire pour type database"),
+    ],
+    ('codepipeline', 'source_provider', 'GitHub'): [
+        ('repository', "Repository obligatoire pour GitHub/Bitbucket"),
+    ],
+    ('codepipeline', 'source_provider', 'GitHubEnterprise'): [
+        ('repository', "Repository obligatoire pour GitHub/Bitbucket"),
+    ],
+    ('codepipeline', 'source_provider', 'Bitbucket'): [
+        ('repository', "Repository obligatoire pour GitHub/Bitbucket"),
+    ],
+    ('codepipeline', 'source_provider', 'S3'): [
+        ('s3_bucket', "Bucket S3 source obligatoire"),
+        ('s3_object_key', "Clé S3 source obligatoire"),
+    ],
+    ('codepipeline', 'deploy_provider', 'CodeDeploy'): [
+        ('codedeploy_application', "Application CodeDeploy obligatoire"),
+        ('codedeploy_deployment_group', "Deployment group CodeDeploy obligatoire"),
+    ],
+    ('codepipeline', 'deploy_provider', 'ECS'): [
+        ('ecs_cluster', "Cluster ECS obligatoire"),
+        ('ecs_service', "Service ECS obligatoire"),
+    ],
+    ('codepipeline', 'deploy_provider', 'ECS-BlueGreen'): [
+        ('ecs_cluster', "Cluster ECS obligatoire"),
+        ('ecs_service', "Service ECS obligatoire"),
+    ],
+    ('codepipeline', 'deploy_provider', 'Lambda'): [
+        ('lambda_function_name', "Nom de fonction Lambda obligatoire"),
+    ],
+    ('codebuild', 'source_type', 'CODECOMMIT'): [
+        ('source_location', "Emplacement source obligatoire pour ce type de source"),
+    ],
+    ('codebuild', 'source_type', 'GITHUB'): [
+        ('source_location', "Emplacement source obligatoire pour ce type de source"),
+    ],
+    ('codebuild', 'source_type', 'GITHUB_ENTERPRISE'): [
+        ('source_location', "Emplacement source obligatoire pour ce type de source"),
+    ],
+    ('codebuild', 'source_type', 'BITBUCKET'): [
+        ('source_location', "Emplacement source obligatoire pour ce type de source"),
+    ],
+    ('codebuild', 'source_type', 'S3'): [
+        ('source_location', "Emplacement source obligatoire pour ce type de source"),
+    ],
+    ('codebuild', 'image', 'CUSTOM'): [
+        ('custom_image', "Image personnalisée obligatoire"),
+    ],
+    ('codebuild', 'artifacts_type', 'S3'): [
+        ('artifacts_bucket', "Bucket S3 obligatoire pour les artifacts"),
+    ],
+    ('codebuild', 'enable_cache', 'on'): [
+        ('cache_bucket', "Bucket S3 obligatoire pour le cache"),
+    ],
+    ('codedeploy', 'compute_platform', 'Lambda'): [
+        ('lambda_function_name', "Nom de fonction Lambda obligatoire"),
+    ],
+    ('codedeploy', 'compute_platform', 'ECS'): [
+        ('ecs_cluster_name', "Cluster ECS obligatoire"),
+        ('ecs_service_name', "Service ECS obligatoire"),
+    ],
+}
+
+
+class TemplateControls(HTMLParser):
+    """Valeurs proposées par un template : <option>, boutons radio et cases à cocher."""
+
+    def __init__(self):
+        super().__init__()
+        self.choices = []
+        self._select = None
+
+    def _add(self, name, value):
+        if name and value and (name, value) not in self.choices:
+            self.choices.append((name, value))
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'select':
+            self._select = attrs.get('name')
+        elif tag == 'option' and self._select:
+            self._add(self._select, attrs.get('value'))
+        elif tag == 'input' and attrs.get('type') == 'radio':
+            self._add(attrs.get('name'), attrs.get('value'))
+        elif tag == 'input' and attrs.get('type') == 'checkbox':
+            self._add(attrs.get('name'), 'on')
+
+    def handle_endtag(self, tag):
+        if tag == 'select':
+            self._select = None
+
+
+def template_choices(slug):
+    parser = TemplateControls()
+    parser.feed((TEMPLATES / f"form_{slug.replace('-', '_')}.html").read_text(encoding='utf-8'))
+    return parser.choices
+
+
+def build(app, slug, form):
+    """Construit le payload du service, ou retourne les erreurs [(champ, message)]."""
+    with app.app_context():
+        try:
+            payload, _ = get_schema(slug).build(form)
+        except ValidationError as error:
+            return None, [(e['field'], e['error']) for e in error.errors]
+    assert payload['ref'] == 'main'
+    return payload['inputs'], None
+
+
+def base_form(slug):
+    return sample_form(PATHS[slug], 1)
+
+
+@pytest.mark.parametrize('slug', sorted(BASELINE))
+def test_sample_form_builds_baseline_payload(app, slug):
+    inputs, errors = build(app, slug, base_form(slug))
+    assert errors is None
+    assert inputs == BASELINE[slug]['inputs']
+
+
+@pytest.mark.parametrize('slug', sorted(BASELINE))
+def test_template_options_build_baseline_payloads(app, slug):
+    baseline = BASELINE[slug]
+    for name, value in template_choices(slug):
+        inputs, errors = build(app, slug, dict(base_form(slug), **{name: value}))
+        expected_errors = CONDITIONAL.get((slug, name, value))
+        if expected_errors is not None:
+            assert inputs is None, (name, value)
+            assert errors == expected_errors
+            continue
+        assert value in baseline['options'].get(name, {}), f"{slug}: option {name}={value} non enregistrée"
+        assert errors is None, (name, value, errors)
+        assert inputs == dict(baseline['inputs'], **baseline['options'][name][value]), (name, value)
+
+
+@pytest.mark.parametrize('slug', sorted(REQUIRED))
+def test_required_fields_are_rejected(app, slug):
+    for field, expected in REQUIRED[slug].items():
+        absent = {key: value for key, value in base_form(slug).items() if key != field}
+        for form in (dict(base_form(slug), **{field: ''}), dict(base_form(slug), **{field: '   '}), absent):
+            inputs, errors = build(app, slug, form)
+            assert inputs is None
+            assert errors == expected, field
+
+
+@pytest.mark.parametrize('slug', sorted({slug for slug, _, _ in CONDITIONAL}))
+def test_conditional_fields_are_accepted_once_filled(app, slug):
+    for (service, name, value), expected in CONDITIONAL.items():
+        if service != slug:
+            continue
+        form = dict(base_form(slug), **{name: value})
+        for field, _ in expected:
+            form[field] = 'conditional-value'
+
+        inputs, errors = build(app, slug, form)
+        assert errors is None, (name, value, errors)
+        assert 'conditional-value' in inputs.values()
+
+
+def test_optional_forms_have_no_required_field(app):
+    for slug in ('cost-explorer', 'trusted-advisor'):
+        form = {key: '' for key in base_form(slug)}
+        _, errors = build(app, slug, form)
+        assert errors is None
+
+
+@pytest.mark.parametrize('slug', ['s3', 'secrets-manager', 'codepipeline'])
+def test_batch_names_use_form_field_rules(app, slug):
+    with app.app_context():
+        name_field = get_schema(slug).name_field
+    names = ['valid-name-1', 'Bad_Name', 'a--b', 'x', '-edge-', 'n' * 600, 'bad name', 'valid-name-1']
+    with app.app_context():
+        report = get_schema(slug).validate_names(names)
+    errors = {error['index']: error['error'] for error in report['errors']}
+
+    assert errors.pop(len(names) - 1) == "Doublon de l'élément 0"
+    for index, name in enumerate(names[:-1]):
+        _, form_errors = build(app, slug, dict(base_form(slug), **{name_field: name}))
+        form_errors = [message for field, message in form_errors or () if field == name_field]
+        assert errors.get(index) == (form_errors[0] if form_errors else None), name
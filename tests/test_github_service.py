@@ -0,0 +1,30 @@
+"""Session HTTP partagée vers GitHub : réutilisation, keep-alive, fork."""
+from app.services import github_service
+from app.services.github_service import GitHubService
+
+
+def test_session_is_shared_by_requests(app):
+    with app.app_context():
+        assert GitHubService.get_session() is GitHubService.get_session()
+
+
+def test_session_is_rebuilt_after_fork(app, monkeypatch):
+    with app.app_context():
+        session = GitHubService.get_session()
+        # PID différent : processus enfant qui a hérité de la session du parent
+        monkeypatch.setattr(github_service, '_session_pid', -1)
+        assert GitHubService.get_session() is not session
+
+
+def test_dispatches_reuse_one_keep_alive_connection(app, github):
+    with app.app_context():
+        GitHubService.close_session()
+        statuses = [
+            GitHubService.trigger_workflow('s3', {'ref': 'main', 'inputs': {'bucket_name': f"bucket-{i}"}}).status_code
+            for i in range(3)
+        ]
+        pools = GitHubService.get_session().get_adapter(github.url).poolmanager.pools
+        opened = [pools[key].num_connections for key in pools.keys()]
+    assert statuses == [204, 204, 204]
+    assert github.counters()['dispatches'] == 3
+    assert opened == [1]
@@ -0,0 +1,58 @@
+"""Sonde de disponibilité /health/ready : prêt, dégradé, indisponible, désactivée."""
+import pytest
+
+from app.services.health import get_health_checker
+
+
+def ready_probe(app):
+    """Vérifie de manière synchrone puis interroge la sonde."""
+    client = app.test_client()
+    client.get('/health/live')  # démarre le vérificateur du worker (résultat hérité effacé)
+    with app.app_context():
+        get_health_checker().refresh()
+    return client.get('/health/ready')
+
+
+@pytest.fixture
+def health_app(make_app):
+    def make(**overrides):
+        return make_app(HEALTH_CHECK_ENABLED=True, HEALTH_CHECK_INTERVAL=60, **overrides)
+    return make
+
+
+def test_disabled_checker_reports_it(client):
+    response = client.get('/health/ready')
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "ready", "checks": "disabled"}
+    assert response.headers['Cache-Control'] == 'no-store'
+
+
+def test_ready_when_all_checks_pass(health_app):
+    response = ready_probe(health_app())
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['status'] == 'ready'
+    assert set(body['checks']) == {'github', 'outbox', 'queue'}
+    assert all(check['ok'] for check in body['checks'].values())
+
+
+def test_outbox_backlog_only_degrades(health_app):
+    # Arriéré partagé par tous les workers : ne pas les retirer tous du load balancer
+    response = ready_probe(health_app(HEALTH_MAX_OUTBOX_PENDING=-1))
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['status'] == 'degraded'
+    assert body['checks']['outbox']['ok'] is False
+
+
+def test_worker_queue_saturation_is_not_ready(health_app):
+    response = ready_probe(health_app(HEALTH_MAX_QUEUE_RATIO=0.0, HEALTH_MAX_OUTBOX_PENDING=-1))
+    assert response.status_code == 503
+    assert response.get_json()['status'] == 'not_ready'
+
+
+def test_unreachable_github_is_not_ready(health_app):
+    response = ready_probe(health_app(GITHUB_API_URL='http://127.0.0.1:9', HEALTH_GITHUB_TIMEOUT=0.5))
+    body = response.get_json()
+    assert response.status_code == 503
+    assert body['checks']['github']['ok'] is False
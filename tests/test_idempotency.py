@@ -0,0 +1,49 @@
+"""Dé-duplication des déclenchements identiques (clés d'idempotence)."""
+import threading
+
+import pytest
+from werkzeug.datastructures import ImmutableMultiDict
+
+from app.services.form_schema import get_schema
+from app.services.idempotency_service import canonical_fingerprint, get_idempotency_store
+from benchmarks.sample_forms import sample_form
+
+FORM = sample_form('/s3/trigger', 1)
+
+
+@pytest.fixture
+def pending_original(app):
+    """Réserve la clé du formulaire FORM comme le ferait une requête identique en cours."""
+    with app.app_context():
+        payload, _ = get_schema('s3').build(ImmutableMultiDict(FORM))
+        key = canonical_fingerprint('s3', payload)
+        store = get_idempotency_store()
+        assert store.begin(key, key) == ('new', None)
+    return store, key
+
+
+def test_double_submission_is_replayed(client, github):
+    first = client.post('/s3/trigger', data=FORM)
+    second = client.post('/s3/trigger', data=FORM)
+    assert first.status_code == second.status_code == 200
+    assert second.headers['Idempotent-Replayed'] == 'true'
+    assert github.counters()['dispatches'] == 1
+
+
+def test_resubmission_after_failed_original_is_dispatched(app, client, github, pending_original):
+    store, key = pending_original
+    # La requête d'origine échoue pendant l'attente du renvoi et libère la clé
+    threading.Timer(0.2, store.release, (key,)).start()
+
+    response = client.post('/s3/trigger', data=FORM)
+    assert response.status_code == 200
+    assert 'Idempotent-Replayed' not in response.headers
+    assert github.counters()['dispatches'] == 1
+
+
+def test_identical_request_still_running_is_rejected(make_app, github, pending_original):
+    app = make_app(IDEMPOTENCY_WAIT=0.2)
+    response = app.test_client().post('/s3/trigger', data=FORM)
+    assert response.status_code == 409
+    assert "déjà en cours" in response.get_data(as_text=True)
+    assert github.counters()['dispatches'] == 0
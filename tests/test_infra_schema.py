@@ -0,0 +1,208 @@
+"""Variables des modules Terraform : analyseur HCL, contrat des payloads, rapport de dérive."""
+import json
+import textwrap
+
+import pytest
+
+from app.services.form_schema import get_schema
+from app.services.infra_schema import Contract, HclError, Module, read_variables, read_workflow
+from app.services.validation_service import ValidationError
+from benchmarks.sample_forms import sample_form, service_slug
+
+VARIABLES = '''\
+# Module de démonstration
+variable "name" {
+  type        = string
+  description = <<-EOT
+    Nom de la ressource,
+    sur deux lignes
+  EOT
+
+  validation {
+    condition     = can(regex("^[a-z][a-z0-9-]{2,62}$", var.name))
+    error_message = "Nom invalide."
+  }
+}
+
+variable "size" {
+  type    = number
+  default = 128
+  validation {
+    condition     = var.size >= 128 && var.size <= 10240
+    error_message = "Taille entre 128 et 10240."
+  }
+}
+
+variable "region" {
+  type    = string
+  default = "eu-west-3"
+  validation {
+    condition     = contains(["eu-west-3", "us-east-1"], var.region)
+    error_message = "Région non supportée."
+  }
+}
+
+variable "enabled" {
+  type    = bool
+  default = false
+}
+
+variable "password" {
+  type      = string
+  sensitive = true
+  validation {
+    condition     = length(var.password) >= 8
+    error_message = "Mot de passe trop court."
+  }
+}
+
+variable "tags" {
+  type    = map(string)
+  default = {}
+}
+
+variable "cidrs" {
+  type    = list(string)
+  default = ["10.0.0.0/24"]
+  validation {
+    condition     = alltrue([for c in var.cidrs : can(cidrhost(c, 0))])
+    error_message = "CIDR invalide."
+  }
+}
+'''
+
+VALID = {'name': 'demo-app', 'size': '256', 'region': 'us-east-1', 'enabled': 'true', 'password': 'long-enough'}
+
+
+@pytest.fixture
+def module(tmp_path):
+    (tmp_path / 'variables.tf').write_text(VARIABLES, encoding='utf-8')
+    return Module('demo', str(tmp_path))
+
+
+@pytest.fixture
+def contract(module):
+    return Contract('demo', module, list(module.variables))
+
+
+def test_parser_reads_types_defaults_and_validations(module):
+    variables = module.variables
+    assert module.errors == []
+    assert list(variables) == ['name', 'size', 'region', 'enabled', 'password', 'tags', 'cidrs']
+
+    assert (variables['name'].type_name, variables['name'].required) == ('string', True)
+    assert (variables['size'].primitive, variables['size'].default) == ('number', 128)
+    assert variables['region'].default == 'eu-west-3'
+    assert (variables['enabled'].primitive, variables['enabled'].default) == ('bool', False)
+    assert variables['password'].sensitive
+    assert (variables['tags'].type_name, variables['tags'].primitive) == ('map(string)', None)
+    assert variables['cidrs'].default == ['10.0.0.0/24']
+
+    (validation,) = variables['size'].validations
+    assert validation.condition == 'var.size >= 128 && var.size <= 10240'
+    assert validation.message == "Taille entre 128 et 10240."
+    (unsupported,) = variables['cidrs'].validations
+    assert unsupported.predicate is None
+    assert unsupported.reason
+
+
+def test_parser_rejects_malformed_file(tmp_path):
+    path = tmp_path / 'variables.tf'
+    path.write_text('variable "broken" {\n  type = string\n', encoding='utf-8')
+    with pytest.raises(HclError):
+        read_variables(str(path))
+    assert Module('broken', str(tmp_path)).errors
+
+
+def test_workflow_maps_inputs_to_variables(tmp_path):
+    workflow = tmp_path / 'terraform-demo.yml'
+    workflow.write_text(textwrap.dedent('''\
+        env:
+          TF_VAR_region: ${{ github.event.inputs.bucket_region }}
+        jobs:
+          apply:
+            steps:
+              - run: |
+                  terraform apply \\
+                    -var="name=${{ github.event.inputs.name }}" \\
+                    -var="tags=$(echo '${{ inputs.tags }}' | jq -c .)"
+    '''), encoding='utf-8')
+
+    pairs, computed, used = read_workflow(str(workflow))
+    assert pairs == [('bucket_region', 'region'), ('name', 'name')]
+    assert computed == {'tags'}
+    assert used == {'bucket_region', 'name', 'tags'}
+
+
+def test_contract_accepts_valid_inputs(contract):
+    assert contract.check(VALID) == []
+
+
+def test_contract_rejects_what_terraform_would(contract):
+    errors = contract.check({'name': 'Bad', 'size': '64', 'region': 'ap-south-1',
+                             'enabled': 'yes', 'password': 'short'})
+    assert errors == [
+        ('enabled', "var.enabled attend true ou false, reçu 'yes'"),
+        ('name', "Nom invalide."),
+        ('size', "Taille entre 128 et 10240."),
+        ('region', "Région non supportée."),
+        ('password', "Mot de passe trop court."),
+    ]
+
+
+def test_contract_hides_sensitive_values(contract, module):
+    module.variables['size'].sensitive = True
+    sensitive = Contract('demo', module, list(module.variables))
+    assert sensitive.check(dict(VALID, size='abc')) == [('size', "var.size attend un nombre")]
+    assert contract.check(dict(VALID, size='abc')) == [('size', "var.size attend un nombre, reçu 'abc'")]
+
+
+def test_empty_optional_input_falls_back_to_module_default(contract):
+    assert contract.check(dict(VALID, size='', region='', enabled='')) == []
+    assert contract.check(dict(VALID, size='  ')) == []
+    # Variable obligatoire : la chaîne vide est transmise et contrôlée
+    assert contract.check(dict(VALID, name='')) == [('name', "Nom invalide.")]
+
+
+@pytest.mark.parametrize('path, field', [
+    ('/lambda/trigger', 'memory_size'),
+    ('/lambda/trigger', 'timeout'),
+    ('/s3/trigger', 'bucket_region'),
+    ('/s3/trigger', 'storage_class'),
+    ('/trigger-codebuild', 'timeout'),
+    ('/trigger-codebuild', 'compute_type'),
+    ('/rds/trigger', 'allocated_storage'),
+    ('/elb/trigger', 'target_group_port'),
+])
+def test_empty_optional_form_field_is_accepted(app, path, field):
+    with app.app_context():
+        schema = get_schema(service_slug(path))
+        assert schema.contract is not None
+        payload, _ = schema.build(dict(sample_form(path, 1), **{field: ''}))
+    (input_name,) = [f.input for f in schema.declaration.fields if f.name == field]
+    assert payload['inputs'][input_name] == ''
+
+
+def test_form_value_refused_by_module_is_rejected(app):
+    with app.app_context():
+        with pytest.raises(ValidationError) as error:
+            get_schema('s3').build(dict(sample_form('/s3/trigger', 1), bucket_region='ap-south-1'))
+    (detail,) = error.value.errors
+    assert detail['field'] == 'bucket_region'
+    assert detail['error'].startswith("Région : Région non supportée.")
+
+
+def test_drift_report_on_repository_infra(app):
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['infra', 'drift'])
+
+    assert result.exit_code == 1
+    errors = [line.strip() for line in result.output.splitlines() if line.strip().startswith('erreur')]
+    assert errors == ["erreur    var.alert_thresholds obligatoire (sans défaut) jamais transmise"]
+    assert "\n[budgets]\n" in result.output
+    assert result.output.rstrip().splitlines()[-1].startswith("1 erreurs, ")
+
+    report = json.loads(runner.invoke(args=['infra', 'drift', '--json']).output)
+    assert [(e['service'], e['message']) for e in report if e['level'] == 'erreur'] == [
+        ('budgets', "var.alert_thresholds obligatoire (sans défaut) jamais transmise"),
+    ]
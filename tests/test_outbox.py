@@ -0,0 +1,83 @@
+"""Outbox des déclenchements : bail, reprise par le dispatcher, issue écrite par le seul détenteur."""
+import threading
+
+import pytest
+
+from app.services.outbox import DELIVERED, ITEM_DISPATCHED, ITEM_PENDING, LOST, get_outbox
+from benchmarks.fake_github import start_server
+
+PAYLOAD = {'ref': 'main', 'inputs': {'bucket_name': 'lease-test', 'bucket_env': 'dev'}}
+
+
+def record(outbox):
+    return outbox.record('s3', PAYLOAD, 'S3', 'Bucket S3', {})
+
+
+def take_over(outbox, item):
+    """Fait expirer le bail de la ligne et la fait reprendre, comme le dispatcher de fond."""
+    conn = outbox._conn()
+    conn.execute('UPDATE dispatch_outbox SET lease_until = 0 WHERE id = ?', (item['id'],))
+    (claimed,) = outbox.claim_due(10)
+    assert claimed['lease_token'] != item['lease_token']
+    return claimed
+
+
+@pytest.fixture
+def slow_github():
+    server = start_server(latency=0.4)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_attempt_delivers_and_records_outcome(app, github):
+    with app.app_context():
+        outbox = get_outbox()
+        item = record(outbox)
+        result = outbox.attempt(item)
+        assert result.outcome == DELIVERED
+        assert outbox.get(item['id'])['state'] == ITEM_DISPATCHED
+    assert github.counters()['dispatches'] == 1
+
+
+def test_expired_lease_is_not_dispatched_again(app, github):
+    with app.app_context():
+        outbox = get_outbox()
+        item = record(outbox)
+        claimed = take_over(outbox, item)
+
+        # La requête d'origine reprend après l'expiration de son bail (attente de quota, GitHub lent)
+        result = outbox.attempt(item)
+        assert result.outcome == LOST
+        assert github.counters()['dispatches'] == 0
+        assert outbox.get(item['id'])['state'] == ITEM_PENDING
+
+        assert outbox.attempt(claimed).outcome == DELIVERED
+    assert github.counters()['dispatches'] == 1
+
+
+def test_outcome_of_overrun_attempt_does_not_overwrite_new_owner(make_app, slow_github):
+    app = make_app(GITHUB_API_URL=slow_github.url)
+    with app.app_context():
+        outbox = get_outbox()
+        item = record(outbox)
+        claimed = {}
+
+        def dispatcher():
+            with app.app_context():
+                claimed['item'] = take_over(outbox, item)
+                claimed['result'] = outbox.attempt(claimed['item'])
+
+        # Bail perdu pendant l'appel GitHub : le dispatcher reprend et termine la ligne
+        thread = threading.Timer(0.1, dispatcher)
+        thread.start()
+        result = outbox.attempt(item)
+        thread.join()
+
+        assert result.outcome == LOST
+        assert result.status_code == 204
+        assert claimed['result'].outcome == DELIVERED
+        row = outbox.get(item['id'])
+        assert row['state'] == ITEM_DISPATCHED
+        assert row['lease_token'] == claimed['item']['lease_token']
+        assert row['attempts'] == 1
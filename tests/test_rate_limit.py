@@ -0,0 +1,103 @@
+"""Ordonnanceur des déclenchements : recharge selon le quota GitHub observé."""
+import json
+import time
+
+import pytest
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from app.services.rate_limit_service import get_rate_limiter, parse_rate_limit_headers
+from benchmarks.fake_github import start_server
+from benchmarks.sample_forms import sample_form
+
+
+def github_response(status=200, **headers):
+    response = Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    return response
+
+
+@pytest.fixture
+def quota_github():
+    """Serveur factice qui annonce un quota GitHub réaliste (5000 requêtes / heure)."""
+    server = start_server(rate_limit=5000)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_bulk_is_not_paced_while_quota_has_headroom(make_app, quota_github):
+    app = make_app(GITHUB_API_URL=quota_github.url)
+    items = [sample_form('/ec2/trigger', i) for i in range(40)]
+
+    started = time.perf_counter()
+    response = app.test_client().post('/bulk/ec2?concurrency=5', json=items)
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    elapsed = time.perf_counter() - started
+
+    results = [line for line in lines if 'index' in line]
+    assert response.status_code == 200
+    assert len(results) == 40 and all(r['status'] == 'dispatched' for r in results)
+    assert quota_github.counters()['dispatches'] == 40
+    # Au rythme d'un jeton par seconde, le lot prendrait plus de 30 s
+    assert elapsed < 5
+    with app.app_context():
+        assert get_rate_limiter().stats()['queue_delay']['max'] < 0.5
+
+
+def test_refill_rate_follows_observed_quota(make_app):
+    app = make_app(RATE_LIMIT_RATE=100.0, RATE_LIMIT_BURST=1, RATE_LIMIT_RESERVE=100)
+    with app.app_context():
+        scheduler = get_rate_limiter()
+        # 10 requêtes au-delà de la réserve, reset dans 5 s : 2 jetons par seconde
+        scheduler.record_response(github_response(
+            **{'X-RateLimit-Limit': '5000', 'X-RateLimit-Remaining': '110',
+               'X-RateLimit-Reset': str(int(time.time()) + 5)}
+        ), bucket='test')
+        assert scheduler.acquire(2, bucket='test') < 0.1
+        waited = scheduler.acquire(2, bucket='test')
+        assert 0.2 < waited < 1.0
+        assert scheduler.stats()['buckets']['test']['refill_rate'] <= 2.5
+
+
+def test_refill_rate_is_capped_by_configured_rate(make_app):
+    app = make_app(RATE_LIMIT_RATE=1.0, RATE_LIMIT_BURST=1)
+    with app.app_context():
+        scheduler = get_rate_limiter()
+        scheduler.record_response(github_response(
+            **{'X-RateLimit-Limit': '5000', 'X-RateLimit-Remaining': '4900',
+               'X-RateLimit-Reset': str(int(time.time()) + 60)}
+        ), bucket='test')
+        assert scheduler.stats()['buckets']['test']['refill_rate'] == 1.0
+
+
+def test_below_reserve_only_production_is_dispatched(make_app):
+    app = make_app(RATE_LIMIT_RESERVE=100, RATE_LIMIT_MAX_WAIT=1)
+    with app.app_context():
+        scheduler = get_rate_limiter()
+        scheduler.record_response(github_response(
+            **{'X-RateLimit-Limit': '5000', 'X-RateLimit-Remaining': '50',
+               'X-RateLimit-Reset': str(int(time.time()) + 600)}
+        ), bucket='test')
+        assert scheduler.acquire(0, bucket='test') < 0.1
+        with pytest.raises(Exception, match="Quota GitHub insuffisant"):
+            scheduler.acquire(2, bucket='test')
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('120', 120.0),
+    ('-5', 0.0),
+    ('Wed, 21 Oct 2015 07:28:00 GMT', 0.0),
+    ('garbage', None),
+    ('Wed, 99 Foo 2015', None),
+])
+def test_retry_after_header(value, expected):
+    assert parse_rate_limit_headers({'Retry-After': value})['retry_after'] == expected
+
+
+def test_invalid_retry_after_does_not_fail_the_dispatch(make_app):
+    app = make_app()
+    with app.app_context():
+        limited = get_rate_limiter().record_response(github_response(403, **{'Retry-After': 'soon'}))
+    assert limited is False
@@ -0,0 +1,69 @@
+"""Rapprochement des dispatches avec leurs runs GitHub Actions."""
+import time
+
+import pytest
+
+from app.services.github_service import GitHubService
+from app.services.run_tracker import get_run_tracker
+
+
+def dispatch(app, dispatch_id):
+    """Déclenche le workflow s3 sur le serveur factice et enregistre le dispatch."""
+    with app.app_context():
+        dispatched_at = time.time()
+        response = GitHubService.trigger_workflow('s3', {'ref': 'main', 'inputs': {'bucket_name': dispatch_id}})
+        assert response.status_code == 204
+        get_run_tracker().register('s3', dispatched_at, dispatch_id)
+
+
+def refresh(app, dispatch_id):
+    with app.app_context():
+        return get_run_tracker().refresh(dispatch_id)
+
+
+@pytest.fixture
+def tracked_app(make_app):
+    return make_app(RUN_POLL_MIN=0.0)
+
+
+def run_ids(github):
+    with github.lock:
+        return sorted(github.runs)
+
+
+def test_runs_follow_dispatch_order_when_newest_is_polled_first(tracked_app, github):
+    dispatch(tracked_app, 'older')
+    dispatch(tracked_app, 'newer')
+    first_run, second_run = run_ids(github)
+
+    newer = refresh(tracked_app, 'newer')
+    older = refresh(tracked_app, 'older')
+
+    assert (older['run_id'], newer['run_id']) == (first_run, second_run)
+    assert older['html_url'].endswith(f"/runs/{first_run}")
+
+
+def test_runs_follow_dispatch_order_across_workers(make_app, github):
+    # Deux workers : bases partagées, caches mémoire distincts
+    worker_a = make_app(RUN_POLL_MIN=0.0)
+    worker_b = make_app(RUN_POLL_MIN=0.0)
+    dispatch(worker_a, 'older')
+    dispatch(worker_b, 'newer')
+    for app in (worker_a, worker_b):
+        # Chaque worker a déjà consulté les deux déploiements avant que les runs existent
+        with app.app_context():
+            get_run_tracker().get('older')
+            get_run_tracker().get('newer')
+    first_run, second_run = run_ids(github)
+
+    assert refresh(worker_b, 'newer')['run_id'] == second_run
+    assert refresh(worker_a, 'older')['run_id'] == first_run
+    assert refresh(worker_a, 'newer')['run_id'] == second_run
+
+
+def test_dispatch_without_run_stays_pending(tracked_app):
+    with tracked_app.app_context():
+        get_run_tracker().register('s3', time.time(), 'lost')
+    record = refresh(tracked_app, 'lost')
+    assert record['run_id'] is None
+    assert record['status'] == 'pending'